@@ -1,18 +1,32 @@
 from datetime import timedelta
 from types import NoneType
-from typing import Any, Callable, Optional, Sequence
+from typing import Any, Callable, List, Optional, Sequence
 from gqlapi.endpoints.alima_account.stripe import (
     StripeWebHookListener,
     StripeWebHookListenerTransferAutoPayments,
 )
+from gqlapi.endpoints.core.invoice_file import MxInvoiceFileDownload
+from gqlapi.endpoints.core.metrics import MetricsEndpoint
 from gqlapi.endpoints.retool.data_orchestration import RetoolWorkflowJob
 from gqlapi.utils.automation import DataContext
+from gqlapi.db import ReadReplicaRouter
+from gqlapi.repository.loaders import RecordLoaders
+from gqlapi.utils.metrics import (
+    GRAPHQL_OPERATION_DB_SECONDS,
+    GRAPHQL_OPERATION_QUERIES,
+    current_query_stats,
+    operation_label,
+    register_operations,
+    start_query_stats,
+)
 
 from starlette.requests import Request
 from starlette.websockets import WebSocket
 from starlette.responses import Response
 from strawberry.schema import BaseSchema, Schema as StrawberrySchema
 from strawberry.asgi import GraphQL
+from strawberry.http import GraphQLRequestData
+from strawberry.types import ExecutionResult
 from firebase_admin import App as FirebaseApp
 from databases import Database
 from pymongo.database import Database as MongoDatabase
@@ -24,6 +38,23 @@ from gqlapi.domain.models.v2.utils import T
 from gqlapi.endpoints.retool.retool_resource import RetoolResource
 
 
+def schema_root_fields(schema: BaseSchema) -> List[str]:
+    """Query, mutation and subscription field names of the schema"""
+    _schema = getattr(schema, "_schema", None)
+    if _schema is None:
+        return []
+    return [
+        name
+        for root in (
+            _schema.query_type,
+            _schema.mutation_type,
+            _schema.subscription_type,
+        )
+        if root is not None
+        for name in root.fields
+    ]
+
+
 class AuthedGraphQL(GraphQL):
     def __init__(
         self,
@@ -37,6 +68,7 @@ class AuthedGraphQL(GraphQL):
         connection_init_wait_timeout: timedelta = ...,
         firebase_rest_api: Optional[FirebaseAuthApi] = None,
         sql_database: Optional[Database] = None,
+        read_router: Optional[ReadReplicaRouter] = None,
         authos_database: Optional[Database] = None,
         mongo_database: Optional[MongoDatabase] = None,
         # [TODO] update into correct interface
@@ -54,6 +86,8 @@ class AuthedGraphQL(GraphQL):
         )
         # SQL connection
         self._sql = sql_database if sql_database is not None else None
+        # SQL read replica router
+        self._read_router = read_router if read_router is not None else None
         # Authos SQL connection
         self._authos = authos_database if authos_database is not None else None
         # MONGO connection
@@ -68,11 +102,17 @@ class AuthedGraphQL(GraphQL):
             if auth_permissions_repo_class
             else None
         )
+        # operations named after root fields are labeled in metrics
+        register_operations(schema_root_fields(schema))
 
     @property
     def sql(self) -> Database | NoneType:
         return self._sql
 
+    @property
+    def read_router(self) -> ReadReplicaRouter | NoneType:
+        return self._read_router
+
     @property
     def authos(self) -> Database | NoneType:
         return self._authos
@@ -89,6 +129,25 @@ class AuthedGraphQL(GraphQL):
     def auth_permissions_repo(self) -> T | NoneType:
         return self._auth_permissions_repo
 
+    async def parse_http_body(self, request: Any) -> GraphQLRequestData:
+        request_data = await super().parse_http_body(request)
+        # tag the request query stats with its operation
+        stats = current_query_stats()
+        if stats is not None:
+            stats.operation = operation_label(request_data.operation_name)
+        return request_data
+
+    async def execute_operation(
+        self, request: Request, context: Any, root_value: Any
+    ) -> ExecutionResult:
+        stats = start_query_stats()
+        try:
+            return await super().execute_operation(request, context, root_value)
+        finally:
+            operation = stats.operation or "anonymous"
+            GRAPHQL_OPERATION_QUERIES.observe(stats.queries, operation=operation)
+            GRAPHQL_OPERATION_DB_SECONDS.observe(stats.db_time, operation=operation)
+
     async def get_context(
         self, request: Request | WebSocket, response: Optional[Response] = None
     ) -> Any:
@@ -96,6 +155,12 @@ class AuthedGraphQL(GraphQL):
         # Add SQL database connection
         if self.sql is not None:
             _db.sql = self.sql
+            # Add SQL read connection (replica or primary if lagging)
+            _db.sql_read = (
+                await self.read_router.get()
+                if self.read_router is not None
+                else self.sql
+            )
         # Add Authos database connection
         if self.authos is not None:
             _db.authos = self.authos
@@ -105,6 +170,10 @@ class AuthedGraphQL(GraphQL):
         # Add Firebase Auth API connection
         if self.firebase is not None:
             _db.firebase = self.firebase
+        # Add request-scoped batching loaders
+        _db.loaders = RecordLoaders(
+            sql=getattr(_db, "sql_read", None), mongo=self.mongo
+        )
         # Ref: https://strawberry.rocks/docs/integrations/asgi
         # Ref: https://strawberry.rocks/docs/guides/authentication
         # [TODO] perform permissions request from DB
@@ -120,6 +189,7 @@ class GraphqlAPIApp(StarlettBaseApp):
         firebase_app: FirebaseApp,
         firebase_rest_api: FirebaseAuthApi,
         sql_database: Database | NoneType = None,
+        read_router: ReadReplicaRouter | NoneType = None,
         authos_database: Database | NoneType = None,
         mongo_database: MongoDatabase | NoneType = None,
         on_startup: Callable | NoneType = None,
@@ -134,6 +204,7 @@ class GraphqlAPIApp(StarlettBaseApp):
             graphiql=debug,
             firebase_rest_api=firebase_rest_api,
             sql_database=sql_database,
+            read_router=read_router,
             authos_database=authos_database,
             mongo_database=mongo_database,
         )
@@ -141,6 +212,12 @@ class GraphqlAPIApp(StarlettBaseApp):
         self.starlette.add_websocket_route("/graphql", self._gql_app)
         self.starlette.add_route("/retool", RetoolResource, methods=["GET"])
         self.starlette.add_route("/data_orch", RetoolWorkflowJob, methods=["POST"])
+        self.starlette.add_route(
+            "/invoice/{mx_invoice_id}/{file_type}",
+            MxInvoiceFileDownload,
+            methods=["GET"],
+        )
+        self.starlette.add_route("/metrics", MetricsEndpoint, methods=["GET"])
         self.starlette.add_route(
             "/webhook/stripe-payment-intent", StripeWebHookListener, methods=["POST"]
         )
@@ -1,7 +1,41 @@
-from typing import AsyncIterator, TypeVar
+import atexit
+from dataclasses import dataclass, field
+from datetime import datetime
+import inspect
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    TypeVar,
+)
 from strawberry.types import Info as StrawberryInfo
 from strawberry.extensions import SchemaExtension
 
+from gqlapi.config import (
+    GRAPHQL_TRACING_EXPORTERS,
+    GRAPHQL_TRACING_JSONL_PATH,
+    GRAPHQL_TRACING_SAMPLE_RATE,
+)
+from gqlapi.utils.metrics import (
+    GRAPHQL_PHASE_SECONDS,
+    GRAPHQL_RESOLVER_SECONDS,
+    current_query_stats,
+    operation_label,
+    start_query_stats,
+)
+
 T = TypeVar("T")
 
 
@@ -54,3 +88,215 @@ class AccessLevelExtension(SchemaExtension):
         print("GraphQL execution start")
         yield
         print("GraphQL execution end")
+
+
+@dataclass
+class OperationTrace:
+    """Timings of a single GraphQL operation (seconds)"""
+
+    operation: str
+    operation_type: str
+    started_at: datetime
+    duration: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+    db_queries: int = 0
+    db_time: float = 0.0
+    errors: int = 0
+    # (Type.field, seconds) of async and root resolvers, sampled operations only
+    resolvers: List[Tuple[str, float]] = field(default_factory=list)
+
+    def to_json(self) -> Dict[str, Any]:
+        _resolvers: Dict[str, Dict[str, Any]] = {}
+        for name, elapsed in self.resolvers:
+            _res = _resolvers.setdefault(
+                name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            _res["count"] += 1
+            _res["total_ms"] += elapsed * 1000
+            _res["max_ms"] = max(_res["max_ms"], elapsed * 1000)
+        return {
+            "ts": self.started_at.isoformat(),
+            "operation": self.operation,
+            "operation_type": self.operation_type,
+            "duration_ms": round(self.duration * 1000, 3),
+            "phases_ms": {k: round(v * 1000, 3) for k, v in self.phases.items()},
+            "db_queries": self.db_queries,
+            "db_ms": round(self.db_time * 1000, 3),
+            "errors": self.errors,
+            "resolvers": {
+                k: {
+                    "count": v["count"],
+                    "total_ms": round(v["total_ms"], 3),
+                    "max_ms": round(v["max_ms"], 3),
+                }
+                for k, v in _resolvers.items()
+            },
+        }
+
+
+class TraceExporter:
+    def export(self, trace: OperationTrace) -> None:
+        raise NotImplementedError
+
+
+class PrometheusTraceExporter(TraceExporter):
+    """Records traces into the process metrics registry (served at /metrics)"""
+
+    def export(self, trace: OperationTrace) -> None:
+        GRAPHQL_PHASE_SECONDS.observe(
+            trace.duration, operation=trace.operation, phase="total"
+        )
+        for phase, elapsed in trace.phases.items():
+            GRAPHQL_PHASE_SECONDS.observe(
+                elapsed, operation=trace.operation, phase=phase
+            )
+        for name, elapsed in trace.resolvers:
+            GRAPHQL_RESOLVER_SECONDS.observe(elapsed, field=name)
+
+
+class JsonLinesTraceExporter(TraceExporter):
+    """Appends one JSON object per operation to a local file.
+
+    Lines are handed off to a writer thread (batched writes), so file I/O
+    never blocks the event loop. Traces are dropped if the queue is full.
+    """
+
+    def __init__(self, path: str, max_pending: int = 10000) -> None:
+        self.path = path
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: OperationTrace) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(json.dumps(trace.to_json()))
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._write_loop, name="graphql-trace-writer", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _write_loop(self) -> None:
+        _file: Optional[TextIO] = None
+        running = True
+        while running:
+            lines = [self._queue.get()]
+            # drain pending lines: one write and flush per batch
+            while not self._queue.empty():
+                lines.append(self._queue.get_nowait())
+            if None in lines:
+                running = False
+                lines = [line for line in lines if line is not None]
+            if not lines:
+                continue
+            try:
+                if _file is None:
+                    _file = open(self.path, "a", encoding="utf-8")
+                _file.write("".join(line + "\n" for line in lines))  # type: ignore
+                _file.flush()
+            except OSError as e:
+                logging.warning(f"Could not write GraphQL trace to {self.path}: {e}")
+        if _file is not None:
+            _file.close()
+
+    def close(self) -> None:
+        """Write pending traces and stop the writer thread"""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def build_trace_exporters(names: str) -> List[TraceExporter]:
+    """Exporters from a comma separated list of names (prometheus, jsonl)"""
+    exporters: List[TraceExporter] = []
+    for name in [n.strip().lower() for n in names.split(",") if n.strip()]:
+        if name == "prometheus":
+            exporters.append(PrometheusTraceExporter())
+        elif name == "jsonl":
+            exporters.append(JsonLinesTraceExporter(GRAPHQL_TRACING_JSONL_PATH))
+        else:
+            logging.warning(f"Unknown GraphQL trace exporter: {name}")
+    return exporters
+
+
+class TracingExtension(SchemaExtension):
+    """GraphQL extension recording phase durations, DB queries and (for a
+    sample of operations) resolver timings of each operation.
+
+    Resolvers of non sampled operations run untouched, and only async
+    and root resolvers are timed, so plain attribute fields add no overhead.
+    """
+
+    exporters: List[TraceExporter] = build_trace_exporters(GRAPHQL_TRACING_EXPORTERS)
+    sample_rate: float = GRAPHQL_TRACING_SAMPLE_RATE
+
+    def on_operation(self) -> Iterator[None]:
+        start = time.perf_counter()
+        self.trace = OperationTrace(
+            operation="anonymous", operation_type="", started_at=datetime.utcnow()
+        )
+        self.sampled = random.random() < self.sample_rate
+        # stats are started per request by the app, but not when executing
+        #  the schema directly (tests, scripts)
+        stats = current_query_stats() or start_query_stats()
+        queries, db_time = stats.queries, stats.db_time
+        yield
+        self.trace.duration = time.perf_counter() - start
+        self.trace.db_queries = stats.queries - queries
+        self.trace.db_time = stats.db_time - db_time
+        self.trace.errors = len(self.execution_context.errors or [])
+        # bounded label (client operation names), as in app query stats
+        self.trace.operation = operation_label(self.execution_context.operation_name)
+        try:
+            self.trace.operation_type = self.execution_context.operation_type.value
+        except Exception:
+            # unparsable document
+            pass
+        for exporter in self.exporters:
+            exporter.export(self.trace)
+
+    def on_parse(self) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.trace.phases["parse"] = time.perf_counter() - start
+
+    def on_validate(self) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.trace.phases["validate"] = time.perf_counter() - start
+
+    def on_execute(self) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.trace.phases["execute"] = time.perf_counter() - start
+
+    def resolve(self, _next, root, info: StrawberryInfo, *args, **kwargs):
+        if not self.sampled:
+            return _next(root, info, *args, **kwargs)
+        start = time.perf_counter()
+        result = _next(root, info, *args, **kwargs)
+        name = f"{info.parent_type.name}.{info.field_name}"
+        if inspect.isawaitable(result):
+            return self._resolve_async(result, name, start)
+        if info.path.prev is None:
+            self.trace.resolvers.append((name, time.perf_counter() - start))
+        return result
+
+    async def _resolve_async(self, result: Awaitable[Any], name: str, start: float):
+        try:
+            return await result
+        finally:
+            self.trace.resolvers.append((name, time.perf_counter() - start))
@@ -1,5 +1,6 @@
 import strawberry
 
+from gqlapi.app.extensions import TracingExtension
 from gqlapi.endpoints import (
     AlimaMutation,
     AlimaQuery,
@@ -30,4 +31,9 @@ class Mutation(
 # Schema
 # --------------
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    # tracing is disabled when no exporter is configured
+    extensions=[TracingExtension] if TracingExtension.exporters else [],
+)
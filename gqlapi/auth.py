@@ -1,5 +1,10 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import copy
+import hashlib
 import logging
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
 
 from starlette.authentication import (
     AuthenticationBackend,
@@ -12,11 +17,17 @@ from firebase_admin import credentials
 from firebase_admin import initialize_app
 from firebase_admin import App as FirebaseApp
 
+from gqlapi.config import (
+    FIREBASE_CERTS_REFRESH_INTERVAL,
+    FIREBASE_TOKEN_CACHE_SIZE,
+    FIREBASE_VERIFY_WORKERS,
+)
 from gqlapi.domain.models.v2.utils import AlimaCustomerType
 from gqlapi.domain.interfaces.v2.authos.ecommerce_session import (
     AuthosTokenHandlerInterface,
 )
 from gqlapi.domain.interfaces.v2.user.firebase import FirebaseTokenRepositoryInterface
+from gqlapi.utils.cache import TTLCache
 
 
 def initialize_firebase(fb_service_account: str) -> FirebaseApp:
@@ -86,6 +97,51 @@ class AlimaAuthBackend(AuthenticationBackend):
         super().__init__()
         self.repo = auth_repo
         self.authos_token_handler = authos_token_handler
+        # decoded firebase tokens by token hash, expiring at the token's exp
+        self.token_cache = TTLCache(maxsize=FIREBASE_TOKEN_CACHE_SIZE)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=FIREBASE_VERIFY_WORKERS, thread_name_prefix="fb-verify"
+        )
+        self._certs_task: Optional[asyncio.Task] = None
+
+    async def _refresh_certs(self) -> None:
+        """Keep Google public certs warm so verification never waits on them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(self._executor, self.repo.refresh_public_certs)
+            except Exception as e:
+                logging.warning("Could not refresh Firebase public certs")
+                logging.error(e)
+            await asyncio.sleep(FIREBASE_CERTS_REFRESH_INTERVAL)
+
+    async def verify_token(self, token: str) -> Dict[str, Any]:
+        """Verify Firebase ID token, cached until the token expires.
+            Cache misses are verified in the dedicated executor and
+            concurrent requests with the same token share the verification.
+        """
+        if self._certs_task is None or self._certs_task.done():
+            self._certs_task = asyncio.create_task(self._refresh_certs())
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        decoded = self.token_cache.get(key)
+        if decoded is None:
+            fut = self._inflight.get(key)
+            if fut is None:
+                loop = asyncio.get_running_loop()
+                fut = loop.run_in_executor(self._executor, self.repo.verify_token, token)
+                self._inflight[key] = fut
+                try:
+                    decoded = await asyncio.shield(fut)
+                finally:
+                    self._inflight.pop(key, None)
+                self.token_cache.set(
+                    key, decoded, ttl=decoded["valid_until"].timestamp() - time.time()
+                )
+            else:
+                decoded = await asyncio.shield(fut)
+        # copy user info, so it is not shared between requests
+        return {**decoded, "info": copy.copy(decoded["info"])}
 
     async def authenticate(self, request):
         if "Authorization" not in request.headers:
@@ -95,19 +151,19 @@ class AlimaAuthBackend(AuthenticationBackend):
             scheme, credentials = _auth.split()
             if scheme.lower() == "restobasic":
                 # alima restaurant validation
-                decoded = self.repo.verify_token(credentials)
+                decoded = await self.verify_token(credentials)
                 return AuthCredentials(["authenticated"]), AlimaRestoUser(decoded)
             if scheme.lower() == "supplybasic":
                 # alima supplier validation
-                decoded = self.repo.verify_token(credentials)
+                decoded = await self.verify_token(credentials)
                 return AuthCredentials(["authenticated"]), AlimaSupplyUser(decoded)
             if scheme.lower() == "driverbasic":
                 # alima driver validation
-                decoded = self.repo.verify_token(credentials)
+                decoded = await self.verify_token(credentials)
                 return AuthCredentials(["authenticated"]), AlimaDriverUser(decoded)
             if scheme.lower() == "employeebasic":
                 # alima employee validation
-                decoded = self.repo.verify_token(credentials)
+                decoded = await self.verify_token(credentials)
                 return AuthCredentials(["authorized_employee"]), AlimaEmployeeUser(
                     decoded
                 )
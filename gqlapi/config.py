@@ -49,12 +49,24 @@ AUTHOS_SECRET_KEY = cfg(
 )
 AUTHOS_ALGORITHM = "HS256"
 AUTHOS_TOKEN_TTL = 7  # days
+# bcrypt work factor (hashes with less rounds are rehashed on login) / hashing workers
+AUTHOS_BCRYPT_ROUNDS = cfg("AUTHOS_BCRYPT_ROUNDS", cast=int, default=12)
+AUTHOS_HASHING_WORKERS = cfg("AUTHOS_HASHING_WORKERS", cast=int, default=2)
+# authos sessions & users cache (seconds / max entries per process)
+AUTHOS_SESSION_CACHE_TTL = cfg("AUTHOS_SESSION_CACHE_TTL", cast=float, default=30.0)
+AUTHOS_SESSION_CACHE_SIZE = cfg("AUTHOS_SESSION_CACHE_SIZE", cast=int, default=10000)
 
 # Aux services
 FIREBASE_SERVICE_ACCOUNT = cfg(
     "FIREBASE_SERVICE_ACCOUNT", cast=json.loads, default="{}"
 )
 FIREBASE_SECRET_KEY = cfg("FIREBASE_SECRET_KEY", cast=str, default="")
+# verified id tokens cache (max entries) / verification workers / certs refresh (seconds)
+FIREBASE_TOKEN_CACHE_SIZE = cfg("FIREBASE_TOKEN_CACHE_SIZE", cast=int, default=10000)
+FIREBASE_VERIFY_WORKERS = cfg("FIREBASE_VERIFY_WORKERS", cast=int, default=4)
+FIREBASE_CERTS_REFRESH_INTERVAL = cfg(
+    "FIREBASE_CERTS_REFRESH_INTERVAL", cast=float, default=1800.0
+)
 SENDGRID_API_KEY = cfg("SENDGRID_API_KEY", cast=str, default="")
 RESEND_API_KEY = cfg("RESEND_API_KEY", cast=str, default="")
 RESEND_SINGLE_SENDER = cfg("RESEND_SINGLE_SENDER", cast=str, default="")
@@ -85,6 +97,11 @@ if ENV.lower() != "prod":
     READ_DATABASE_URL = READ_DATABASE_URL.replace(
         database=READ_DATABASE_URL.database + f"_{ENV.lower()}"
     )
+# read replica: max tolerated replication lag (secs) and how often it is checked
+READ_DATABASE_MAX_LAG = cfg("RDS_READ_MAX_LAG", cast=float, default=5.0)
+READ_DATABASE_LAG_CHECK_INTERVAL = cfg(
+    "RDS_READ_LAG_CHECK_INTERVAL", cast=float, default=10.0
+)
 # database Authos SQL
 DATABASE_AUTHOS_NAME = cfg("DB_AUTHOS_NAME", cast=str, default="authos")
 DATABASE_AUTHOS_URL = DatabaseURL(
@@ -100,13 +117,61 @@ MONGO_URI = cfg("MONGO_URI", cast=str, default="mongodb://localhost:27017")
 if ENV.lower() != "prod":
     MONGO_DB_NAME = MONGO_DB_NAME + f"_{ENV.lower()}"
 MONGO_SECRET_BYPASS = cfg("MONGO_SECRET_BYPASS", cast=str, default="")
+# benchmark dataset databases (seed script), never the app ones
+BENCH_DATABASE_URL = cfg("BENCH_DATABASE_URL", cast=str, default="")
+BENCH_MONGO_URI = cfg("BENCH_MONGO_URI", cast=str, default="")
+BENCH_MONGO_DB = cfg("BENCH_MONGO_DB", cast=str, default="alima_bench")
 # algolia
 ALGOLIA_APP_ID = cfg("ALGOLIA_APP_ID", cast=str, default="")
 ALGOLIA_SEARCH_KEY = cfg("ALGOLIA_SEARCH_KEY", cast=str, default="")
 ALGOLIA_INDEX_NAME = cfg("ALGOLIA_INDEX_NAME", cast=str, default="")
+# ecommerce catalog cache (seconds / max entries per process)
+ECOMMERCE_CATALOG_CACHE_TTL = cfg("ECOMMERCE_CATALOG_CACHE_TTL", cast=float, default=60.0)
+ECOMMERCE_CATALOG_CACHE_SIZE = cfg("ECOMMERCE_CATALOG_CACHE_SIZE", cast=int, default=2048)
+# invoice files blob store (content addressed): absolute path of a mounted
+#   persistent volume, empty disables it (files are kept in mx_invoice)
+BLOB_STORE_PATH = cfg("BLOB_STORE_PATH", cast=str, default="")
+BLOB_STORE_CHUNK_SIZE = cfg("BLOB_STORE_CHUNK_SIZE", cast=int, default=65536)
+# query instrumentation: slow query log threshold (ms, 0 disables) / metrics endpoint token
+#   (required outside dev)
+QUERY_SLOW_LOG_MS = cfg("QUERY_SLOW_LOG_MS", cast=float, default=500.0)
+METRICS_TOKEN = cfg("METRICS_TOKEN", cast=str, default="")
+# graphql operation names labeled in metrics besides schema root fields (comma separated)
+GRAPHQL_METRICS_OPERATIONS = cfg("GRAPHQL_METRICS_OPERATIONS", cast=str, default="")
+# graphql tracing: exporters ("prometheus", "jsonl", comma separated, empty disables)
+#   / jsonl output file / share of operations with per-resolver timings
+GRAPHQL_TRACING_EXPORTERS = cfg("GRAPHQL_TRACING_EXPORTERS", cast=str, default="prometheus")
+GRAPHQL_TRACING_JSONL_PATH = cfg("GRAPHQL_TRACING_JSONL_PATH", cast=str, default="./graphql_traces.jsonl")
+GRAPHQL_TRACING_SAMPLE_RATE = cfg("GRAPHQL_TRACING_SAMPLE_RATE", cast=float, default=0.1)
+# supplier price list link tables: dual write / read from them (once backfilled)
+PRICE_LIST_LINKS_WRITE = cfg("PRICE_LIST_LINKS_WRITE", cast=bool, default=True)
+PRICE_LIST_LINKS_READ = cfg("PRICE_LIST_LINKS_READ", cast=bool, default=False)
+# effective prices table: refresh on price list changes / read from it (once refreshed)
+EFFECTIVE_PRICES_WRITE = cfg("EFFECTIVE_PRICES_WRITE", cast=bool, default=True)
+EFFECTIVE_PRICES_READ = cfg("EFFECTIVE_PRICES_READ", cast=bool, default=False)
+# in-process product search index for storefront search (loaded at startup)
+#   / max products matched by a search / max seconds before reloading an index
+PRODUCT_SEARCH_INDEX = cfg("PRODUCT_SEARCH_INDEX", cast=bool, default=False)
+PRODUCT_SEARCH_MAX_RESULTS = cfg("PRODUCT_SEARCH_MAX_RESULTS", cast=int, default=500)
+PRODUCT_SEARCH_INDEX_MAX_AGE = cfg("PRODUCT_SEARCH_INDEX_MAX_AGE", cast=float, default=900.0)
 
 # retool
 RETOOL_SECRET_BYPASS = cfg("RETOOL_SECRET_BYPASS", cast=str, default="")
+# script jobs queue (data orchestration)
+SCRIPT_JOB_WORKER_CONCURRENCY = cfg("SCRIPT_JOB_WORKER_CONCURRENCY", cast=int, default=4)
+SCRIPT_JOB_VISIBILITY_TIMEOUT = cfg(
+    "SCRIPT_JOB_VISIBILITY_TIMEOUT", cast=float, default=300.0
+)  # seconds
+SCRIPT_JOB_POLL_INTERVAL = cfg("SCRIPT_JOB_POLL_INTERVAL", cast=float, default=5.0)
+SCRIPT_JOB_MAX_ATTEMPTS = cfg("SCRIPT_JOB_MAX_ATTEMPTS", cast=int, default=1)
+SCRIPT_JOB_RETRY_BACKOFF = cfg("SCRIPT_JOB_RETRY_BACKOFF", cast=float, default=60.0)
+# max attempts by script name, only for idempotent scripts (others run once)
+SCRIPT_JOB_ATTEMPTS = cfg(
+    "SCRIPT_JOB_ATTEMPTS", cast=json.loads, default='{"run_daily_effective_prices": 3}'
+)
+# max running jobs by script name, i.e. '{"script_monitor": 2}'
+SCRIPT_JOB_LIMITS = cfg("SCRIPT_JOB_LIMITS", cast=json.loads, default="{}")
+SCRIPT_JOB_DEFAULT_LIMIT = cfg("SCRIPT_JOB_DEFAULT_LIMIT", cast=int, default=1)
 
 # support contact
 ALIMA_SUPPORT_PHONE = "7751084135"
@@ -1,5 +1,7 @@
 from glob import glob
 import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from asyncpg import InvalidCatalogNameError
 import databases
 
@@ -7,13 +9,189 @@ from gqlapi.config import (
     DATABASE_AUTHOS_URL,
     DATABASE_URL,
     DATABASE_DEFAULT,
+    READ_DATABASE_LAG_CHECK_INTERVAL,
+    READ_DATABASE_MAX_LAG,
+    QUERY_SLOW_LOG_MS,
     READ_DATABASE_URL,
     app_path as APP_PATH,
 )
+from gqlapi.utils.metrics import (
+    DB_POOL_WAIT_SECONDS,
+    DB_QUERY_ERRORS,
+    Gauge,
+    bind_sql,
+    observe_query,
+    query_caller,
+    registry,
+)
+
+
+class InstrumentedDatabase(databases.Database):
+    """SQL database that times every query, tagged with the repository
+    class and method that issued it, logs slow queries with their bound
+    SQL and times the waits to acquire a pool connection.
+    """
+
+    instances: List["InstrumentedDatabase"] = []
+
+    def __init__(
+        self,
+        url: Any,
+        name: str = "primary",
+        slow_query_ms: float = QUERY_SLOW_LOG_MS,
+        **options: Any,
+    ) -> None:
+        super().__init__(url, **options)
+        self.name = name
+        self.slow_query_ms = slow_query_ms
+        # time pool acquisition of every new backend connection
+        _connection = self._backend.connection
+
+        def _timed_connection():
+            conn = _connection()
+            _acquire = conn.acquire
+
+            async def _timed_acquire() -> None:
+                start = time.perf_counter()
+                try:
+                    await _acquire()
+                finally:
+                    DB_POOL_WAIT_SECONDS.observe(
+                        time.perf_counter() - start, db=self.name
+                    )
+
+            conn.acquire = _timed_acquire
+            return conn
+
+        self._backend.connection = _timed_connection  # type: ignore
+        InstrumentedDatabase.instances.append(self)
+
+    async def _observe(
+        self, run: Callable, query: Any, values: Optional[Dict[str, Any]], *args
+    ) -> Any:
+        repository, method = query_caller()
+        start = time.perf_counter()
+        try:
+            return await run(query, values, *args)
+        except Exception:
+            DB_QUERY_ERRORS.inc(db=self.name, repository=repository, method=method)
+            raise
+        finally:
+            observe_query(
+                self.name,
+                repository,
+                method,
+                time.perf_counter() - start,
+                statement=lambda: bind_sql(
+                    query, values if isinstance(values, dict) else None
+                ),
+                slow_query_ms=self.slow_query_ms,
+            )
+
+    async def fetch_all(self, query, values=None):  # type: ignore
+        return await self._observe(super().fetch_all, query, values)
+
+    async def fetch_one(self, query, values=None):  # type: ignore
+        return await self._observe(super().fetch_one, query, values)
+
+    async def fetch_val(self, query, values=None, column=0):  # type: ignore
+        return await self._observe(super().fetch_val, query, values, column)
+
+    async def execute(self, query, values=None):  # type: ignore
+        return await self._observe(super().execute, query, values)
 
-database = databases.Database(DATABASE_URL)
-read_database = databases.Database(READ_DATABASE_URL)
-authos_database = databases.Database(DATABASE_AUTHOS_URL)
+    async def execute_many(self, query, values):  # type: ignore
+        return await self._observe(super().execute_many, query, values)
+
+    def pool_stats(self) -> Tuple[int, int]:
+        """Pool (size, idle connections), zeros if not connected"""
+        pool = getattr(self._backend, "_pool", None)
+        if pool is None:
+            return 0, 0
+        return pool.get_size(), pool.get_idle_size()
+
+
+def _pool_gauge(idx: int) -> Callable[[], Dict[Tuple[str, ...], float]]:
+    def _values() -> Dict[Tuple[str, ...], float]:
+        return {
+            (db.name,): db.pool_stats()[idx]
+            for db in InstrumentedDatabase.instances
+            if db.is_connected
+        }
+
+    return _values
+
+
+registry.register(
+    Gauge("db_pool_size", "SQL pool connections", ("db",), _pool_gauge(0))
+)
+registry.register(
+    Gauge("db_pool_idle", "SQL pool idle connections", ("db",), _pool_gauge(1))
+)
+
+database = InstrumentedDatabase(DATABASE_URL, name="primary")
+read_database = InstrumentedDatabase(READ_DATABASE_URL, name="read")
+authos_database = InstrumentedDatabase(DATABASE_AUTHOS_URL, name="authos")
+
+
+class ReadReplicaRouter:
+    """Selects the connection used for read-only queries.
+
+    Returns the read replica while it is connected and its replication lag
+    is under `max_lag` seconds, otherwise it falls back to the primary.
+    Lag is sampled at most once every `check_interval` seconds.
+    """
+
+    LAG_QUERY = """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(
+                EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0
+            )
+        END AS lag
+    """
+
+    def __init__(
+        self,
+        primary: databases.Database,
+        replica: databases.Database,
+        max_lag: float = READ_DATABASE_MAX_LAG,
+        check_interval: float = READ_DATABASE_LAG_CHECK_INTERVAL,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._healthy = True
+        self._last_check = 0.0
+
+    @property
+    def has_replica(self) -> bool:
+        return str(self.primary.url) != str(self.replica.url)
+
+    async def _check_lag(self) -> None:
+        self._last_check = time.monotonic()
+        try:
+            lag = await self.replica.fetch_val(self.LAG_QUERY)
+            self._healthy = float(lag or 0) <= self.max_lag
+            if not self._healthy:
+                logging.warning(
+                    f"Read replica lagging {lag}s, routing reads to primary"
+                )
+        except Exception as e:
+            logging.warning(f"Read replica not available: {e}")
+            self._healthy = False
+
+    async def get(self) -> databases.Database:
+        if not self.has_replica or not self.replica.is_connected:
+            return self.primary
+        if time.monotonic() - self._last_check >= self.check_interval:
+            await self._check_lag()
+        return self.replica if self._healthy else self.primary
+
+
+read_router = ReadReplicaRouter(database, read_database)
 
 
 async def create_db():
@@ -82,7 +260,12 @@ async def db_startup():
             logging.error(e)
             logging.warn("DB engine not initiated!")
     # connect to read database
-    await read_database.connect()
+    if read_router.has_replica:
+        try:
+            await read_database.connect()
+        except Exception as e:
+            logging.error(e)
+            logging.warning("Read replica not connected, reads will use primary")
     logging.info(f"Connecting {DATABASE_AUTHOS_URL.database}..")
     # connect to authos database
     try:
@@ -98,5 +281,8 @@ async def db_startup():
 async def db_shutdown():
     logging.info(f"Closing connection {DATABASE_URL.database}..")
     await database.disconnect()
+    if read_database.is_connected:
+        logging.info(f"Closing read connection {READ_DATABASE_URL.database}..")
+        await read_database.disconnect()
     logging.info(f"Closing connection {DATABASE_AUTHOS_URL.database}..")
     await authos_database.disconnect()
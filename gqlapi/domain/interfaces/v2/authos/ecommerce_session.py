@@ -131,3 +131,11 @@ class UserSessionRepositoryInterface(ABC):
         ref_secret_key: str,
     ) -> bool:
         raise NotImplementedError
+
+    @abstractmethod
+    def invalidate_user_sessions(
+        self,
+        ecommerce_user_id: UUID,
+        ref_secret_key: str,
+    ) -> int:
+        raise NotImplementedError
@@ -69,6 +69,12 @@ class CartProductRepositoryInterface(ABC):
     ) -> List[Dict[Any, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def add_many_with_tax(
+        self, cart_products: List[CartProduct]
+    ) -> List[Dict[Any, Any]]:
+        raise NotImplementedError
+
     @abstractmethod
     async def search_with_tax(self, cart_id: Optional[UUID] = None) -> Sequence:
         raise NotImplementedError
@@ -78,3 +84,9 @@ class CartProductRepositoryInterface(ABC):
         self, cart_id: Optional[UUID] = None
     ) -> List[Dict[Any, Any]]:
         raise NotImplementedError
+
+    @abstractmethod
+    async def find_many_with_tax(
+        self, cart_ids: List[UUID]
+    ) -> Dict[UUID, List[Dict[Any, Any]]]:
+        raise NotImplementedError
@@ -1,7 +1,8 @@
 from abc import abstractmethod
+import base64
 from datetime import datetime, date
 from types import NoneType
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from uuid import UUID
 
 # from gqlapi.domain.interfaces.v2.orden.orden import OrdenGQL
@@ -51,10 +52,29 @@ class MxInvoiceGQL:
     orden: MxInvoiceOrden
     supplier: SupplierBusiness
     restaurant_branch: RestaurantBranch
-    pdf_file: Optional[str] = None
-    xml_file: Optional[str] = None
     invoice_type: Optional[str] = None
     cancel_result: Optional[str] = None
+    # loads file content by type ("pdf" | "xml"), only called
+    #   when the file is requested in the query
+    file_loader: strawberry.Private[
+        Optional[Callable[[str], Awaitable[bytes | NoneType]]]
+    ] = None
+
+    async def _encoded_file(self, file_type: str) -> Optional[str]:
+        if self.file_loader is None:
+            return None
+        _file = await self.file_loader(file_type)
+        if not _file:
+            return None
+        return base64.b64encode(_file).decode("utf-8")
+
+    @strawberry.field
+    async def pdf_file(self) -> Optional[str]:
+        return await self._encoded_file("pdf")
+
+    @strawberry.field
+    async def xml_file(self) -> Optional[str]:
+        return await self._encoded_file("xml")
 
 
 @strawberry.type
@@ -390,6 +410,16 @@ class MxInvoiceRepositoryInterface:
     ) -> Dict[Any, Any]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def fetch_file(
+        self, mx_invoice_id: UUID, file_type: str, blob_key: Optional[str] = None
+    ) -> bytes | NoneType:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fetch_file_info(self, mx_invoice_id: UUID) -> Dict[str, Any]:
+        raise NotImplementedError
+
     @abstractmethod
     async def fetch_invoice_details_by_orden(
         self, orden_id: UUID
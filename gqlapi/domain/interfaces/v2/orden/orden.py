@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from datetime import date, datetime
 from types import NoneType
-from typing import List, Dict, Any, Optional, Sequence
+from typing import List, Dict, Any, Optional, Sequence, Set
 from uuid import UUID
 from gqlapi.domain.interfaces.v2.integrations.integrations import (
     IntegrationWebhookHandlerInterface,
@@ -104,6 +104,24 @@ class OrdenPaystatusGQL:
     pay_receipts: Optional[List[PaymentReceiptGQL]] = None
 
 
+@strawberry.type
+class OrdenEdgeGQL:
+    cursor: str
+    node: OrdenGQL
+
+
+@strawberry.type
+class OrdenPageInfoGQL:
+    has_next_page: bool
+    end_cursor: Optional[str] = None
+
+
+@strawberry.type
+class OrdenConnectionGQL:
+    edges: List[OrdenEdgeGQL]
+    page_info: OrdenPageInfoGQL
+
+
 @strawberry.type
 class ExportOrdenGQL:
     file: str  # encoded file
@@ -118,6 +136,14 @@ OrdenResult = strawberry.union(
     ),
 )
 
+OrdenConnectionResult = strawberry.union(
+    "OrdenConnectionResult",
+    (
+        OrdenError,
+        OrdenConnectionGQL,
+    ),
+)
+
 OrdenStatusResult = strawberry.union(
     "OrdenStatusResult",
     (
@@ -302,9 +328,22 @@ class OrdenHandlerInterface(ABC):
         payment_method: Optional[PayMethodType] = None,
         from_date: Optional[date] = None,
         to_date: Optional[date] = None,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+        hydrate: Optional[Set[str]] = None,
     ) -> List[OrdenGQL]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def search_orden_connection(
+        self,
+        first: int,
+        after: Optional[str] = None,
+        hydrate: Optional[Set[str]] = None,
+        **filters: Any,
+    ) -> OrdenConnectionGQL:
+        raise NotImplementedError
+
     @abstractmethod
     async def find_orden(
         self,
@@ -403,6 +442,10 @@ class OrdenRepositoryInterface(ABC):
     async def count_by_supplier_business(self, supplier_business_id: UUID) -> int:
         raise NotImplementedError
 
+    @abstractmethod
+    async def next_orden_number(self, supplier_business_id: UUID) -> int:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_created_at_range(
         self, supplier_business_id: UUID, from_date: datetime, until_date: datetime
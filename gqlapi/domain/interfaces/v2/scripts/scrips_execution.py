@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 import datetime
 from types import NoneType
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 
@@ -24,3 +24,49 @@ class ScriptExecutionRepositoryInterface(ABC):
         active: Optional[bool] = None,
     ) -> bool:
         raise NotImplementedError
+
+
+class ScriptJobRepositoryInterface(ABC):
+    @abstractmethod
+    async def enqueue(
+        self,
+        script_execution_id: UUID,
+        script_name: str,
+        args: Optional[Dict[str, Any]] = None,
+        max_attempts: int = 1,
+    ) -> UUID | NoneType:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def claim(
+        self,
+        worker_id: str,
+        visibility_timeout: float,
+        limits: Dict[str, int],
+        default_limit: int = 1,
+    ) -> Dict[str, Any] | NoneType:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def heartbeat(
+        self, id: UUID, worker_id: str, visibility_timeout: float
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete(self, id: UUID, worker_id: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fail(
+        self,
+        id: UUID,
+        worker_id: str,
+        error: str,
+        retry_in: Optional[float] = None,
+    ) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fail_expired(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
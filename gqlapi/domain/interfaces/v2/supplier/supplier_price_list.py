@@ -215,6 +215,21 @@ class SupplierPriceListRepositoryInterface(ABC):
     ) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def fetch_price_list_links(
+        self, supplier_price_list_ids: List[UUID]
+    ) -> Dict[UUID, Dict[str, List[UUID]]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refresh_effective_prices(
+        self,
+        supplier_unit_ids: Optional[List[UUID]] = None,
+        supplier_business_id: Optional[UUID] = None,
+        price_list_name: Optional[str] = None,
+    ) -> None:
+        raise NotImplementedError
+
     @abstractmethod
     async def fetch_price_list_to_export(
         self, supplier_product_price_list_id: UUID, supplier_business_id: UUID
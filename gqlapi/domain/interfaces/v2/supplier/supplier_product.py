@@ -407,6 +407,14 @@ class SupplierProductRepositoryInterface(ABC):
     ) -> List[Dict[Any, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def fetch_search_documents(
+        self,
+        supplier_business_id: UUID,
+        supplier_product_ids: Optional[List[UUID]] = None,
+    ) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
 
 class SupplierProductPriceRepositoryInterface(ABC):
     @deprecated("Use add() instead", "domain")
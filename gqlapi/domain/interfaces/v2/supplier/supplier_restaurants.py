@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from types import NoneType
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from gqlapi.domain.interfaces.v2.authos.ecommerce_user import EcommerceUser
 from gqlapi.domain.interfaces.v2.supplier.supplier_product import SupplierProductDetails
@@ -201,6 +201,17 @@ class SupplierRestaurantsHandlerInterface(ABC):
     ) -> List[SupplierProductDetails]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def find_ecommerce_catalog_page(
+        self,
+        supplier_unit_id: UUID,
+        restaurant_branch_id: Optional[UUID],
+        search: str,
+        page: int,
+        page_size: int,
+    ) -> Tuple[List[SupplierProductDetails], int]:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_ecommerce_categories(
         self,
@@ -244,6 +244,18 @@ class SupplierUnitRepositoryInterface(ABC):
     ) -> int:
         raise NotImplementedError
 
+    @abstractmethod
+    async def fetch_catalog_version(self, supplier_unit_id: UUID) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def bump_catalog_version(
+        self,
+        supplier_unit_ids: Optional[List[UUID]] = None,
+        supplier_business_id: Optional[UUID] = None,
+    ) -> None:
+        raise NotImplementedError
+
     async def raw_query(
         self, query: str, vals: Dict[str, Any], **kwargs
     ) -> List[Dict[str, Any]]:
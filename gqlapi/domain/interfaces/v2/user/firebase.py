@@ -25,3 +25,7 @@ class FirebaseTokenRepositoryInterface(ABC):
     @abstractmethod
     def verify_token(self, token: str) -> Dict[Any, Any]:
         raise NotImplementedError
+
+    @abstractmethod
+    def refresh_public_certs(self) -> None:
+        raise NotImplementedError
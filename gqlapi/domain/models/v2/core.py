@@ -248,6 +248,8 @@ class MxInvoice(ABC):
     invoice_provider: Optional[str] = None
     pdf_file: Optional[bytes] = None
     xml_file: Optional[bytes] = None
+    pdf_blob_key: Optional[str] = None
+    xml_blob_key: Optional[str] = None
     total: float
     status: InvoiceStatusType
     result: Optional[str] = None
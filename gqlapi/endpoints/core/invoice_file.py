@@ -0,0 +1,138 @@
+from typing import Any, Dict
+from uuid import UUID
+
+from starlette.endpoints import HTTPEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from gqlapi.db import database as sqldatabase
+from gqlapi.domain.models.v2.utils import AlimaCustomerType
+from gqlapi.errors import GQLApiException
+from gqlapi.lib.environ.environ.environ import get_app
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.mongo import mongo_db as mongodatabase
+from gqlapi.repository.core.invoice import MX_INVOICE_FILE_TYPES, MxInvoiceRepository
+from gqlapi.repository.restaurant.restaurant_user import (
+    RestaurantUserPermissionRepository,
+    RestaurantUserRepository,
+)
+from gqlapi.repository.supplier.supplier_user import (
+    SupplierUserPermissionRepository,
+    SupplierUserRepository,
+)
+from gqlapi.repository.user.core_user import CoreUserRepository
+from gqlapi.utils.automation import InjectedStrawberryInfo
+from gqlapi.utils.blob_store import blob_store_enabled, get_blob_store
+
+logger = get_logger(get_app())
+
+MX_INVOICE_FILE_MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "xml": "application/xml",
+}
+
+
+async def _has_invoice_access(
+    _info: InjectedStrawberryInfo, user: Any, mx_inv: Dict[str, Any]
+) -> bool:
+    """Verify user belongs to the supplier or restaurant business of the invoice"""
+    if user.user_type == AlimaCustomerType.INTERNAL_USER:
+        return True
+    if user.user_type not in [AlimaCustomerType.SUPPLY, AlimaCustomerType.DEMAND]:
+        return False
+    try:
+        core_user = await CoreUserRepository(_info).fetch_by_firebase_id(  # type: ignore
+            user.firebase_user.firebase_id
+        )
+        if not core_user or not core_user.id:
+            return False
+        if user.user_type == AlimaCustomerType.SUPPLY:
+            supplier_user = await SupplierUserRepository(_info).fetch(core_user.id)  # type: ignore
+            if not supplier_user:
+                return False
+            su_perms = await SupplierUserPermissionRepository(
+                _info  # type: ignore
+            ).fetch_by_supplier_business(mx_inv["supplier_business_id"])
+            return supplier_user["id"] in [sup["supplier_user_id"] for sup in su_perms]
+        rest_user = await RestaurantUserRepository(_info).fetch(core_user.id)  # type: ignore
+        ru_perms = await RestaurantUserPermissionRepository(_info).fetch(rest_user.id)  # type: ignore
+    except GQLApiException as ge:
+        logger.warning(ge.msg)
+        return False
+    if not ru_perms:
+        return False
+    return ru_perms.restaurant_business_id == mx_inv["restaurant_business_id"]
+
+
+class MxInvoiceFileDownload(HTTPEndpoint):
+    """Download PDF or XML file of a Mx Invoice
+
+    Files are streamed in chunks from the blob store, instead of being
+    base64 encoded into the GraphQL response.
+
+    Path Parameters
+    ---------------
+    mx_invoice_id : UUID
+    file_type : str
+        "pdf" | "xml"
+    """
+
+    async def get(self, request: Request) -> Response:
+        if not request.user.is_authenticated:
+            return JSONResponse(
+                {"error": "Access Denied", "status": "error"}, status_code=401
+            )
+        file_type = request.path_params["file_type"]
+        if file_type not in MX_INVOICE_FILE_TYPES:
+            return JSONResponse(
+                {"error": f"{file_type} is not a valid file type", "status": "error"},
+                status_code=400,
+            )
+        try:
+            mx_invoice_id = UUID(request.path_params["mx_invoice_id"])
+        except ValueError:
+            return JSONResponse(
+                {"error": "Invalid invoice id", "status": "error"}, status_code=400
+            )
+        try:
+            _info = InjectedStrawberryInfo(db=sqldatabase, mongo=mongodatabase)
+            mx_inv_repo = MxInvoiceRepository(_info)  # type: ignore (safe)
+            mx_inv = await mx_inv_repo.fetch_file_info(mx_invoice_id)
+            if not mx_inv or not await _has_invoice_access(_info, request.user, mx_inv):
+                return JSONResponse(
+                    {"error": "Invoice not found", "status": "error"}, status_code=404
+                )
+            headers = {
+                "Content-Disposition": (
+                    f'attachment; filename="{mx_inv["sat_invoice_uuid"]}.{file_type}"'
+                ),
+                # content addressed, files never change
+                "Cache-Control": "private, max-age=31536000, immutable",
+            }
+            media_type = MX_INVOICE_FILE_MEDIA_TYPES[file_type]
+            blob_key = mx_inv[f"{file_type}_blob_key"]
+            if blob_key and blob_store_enabled():
+                blob_store = get_blob_store()
+                if await blob_store.exists(blob_key):
+                    headers["ETag"] = f'"{blob_key}"'
+                    if request.headers.get("if-none-match") == headers["ETag"]:
+                        return Response(status_code=304, headers=headers)
+                    return StreamingResponse(
+                        blob_store.stream(blob_key),
+                        media_type=media_type,
+                        headers=headers,
+                    )
+            # not in blob store, read from inline column
+            _file = await mx_inv_repo.fetch_file(mx_invoice_id, file_type)
+            if not _file:
+                return JSONResponse(
+                    {"error": "File not found", "status": "error"}, status_code=404
+                )
+            return Response(_file, media_type=media_type, headers=headers)
+        except Exception as e:
+            logger.warning(f"Error downloading invoice file: {mx_invoice_id}")
+            logger.error(e)
+            return JSONResponse(
+                {"error": "Error downloading invoice file", "status": "error"},
+                status_code=500,
+            )
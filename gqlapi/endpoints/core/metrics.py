@@ -0,0 +1,28 @@
+import hmac
+
+from starlette.endpoints import HTTPEndpoint
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+
+from gqlapi.config import ENV, METRICS_TOKEN
+from gqlapi.utils.metrics import registry
+
+
+class MetricsEndpoint(HTTPEndpoint):
+    """Process metrics (query timings, pool waits, queries per GraphQL
+    operation) in Prometheus text format.
+
+    Requires `Authorization: Bearer {METRICS_TOKEN}`; without a token it is
+    only served in dev.
+    """
+
+    async def get(self, request: Request) -> Response:
+        if not METRICS_TOKEN and ENV.lower() != "dev":
+            return PlainTextResponse("Metrics disabled", status_code=403)
+        if METRICS_TOKEN:
+            _auth = request.headers.get("Authorization", "")
+            if not hmac.compare_digest(_auth, f"Bearer {METRICS_TOKEN}"):
+                return PlainTextResponse("Unauthorized", status_code=401)
+        return PlainTextResponse(
+            registry.render(), media_type="text/plain; version=0.0.4"
+        )
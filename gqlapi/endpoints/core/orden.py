@@ -9,7 +9,7 @@ from gqlapi.domain.interfaces.v2.supplier.supplier_invoice import INVOICE_PAYMEN
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.handlers.integrations.integrations import IntegrationsWebhookandler
 from gqlapi.repository.integrarions.integrations import IntegrationWebhookRepository
-from gqlapi.utils.helpers import serialize_encoded_file
+from gqlapi.utils.helpers import selected_field_names, serialize_encoded_file
 from gqlapi.utils.notifications import send_supplier_whatsapp_invoice_reminder
 from gqlapi.lib.logger.logger.basic_logger import get_logger
 
@@ -54,6 +54,7 @@ from gqlapi.domain.interfaces.v2.orden.orden import (
     DeliveryTimeWindowInput,
     ExportOrdenGQL,
     ExportOrdenResult,
+    OrdenConnectionResult,
     OrdenError,
     OrdenPaystatusGQL,
     OrdenPaystatusResult,
@@ -86,7 +87,11 @@ from gqlapi.app.permissions import (
 )
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 from gqlapi.handlers.core.invoice import MxInvoiceHandler, MxSatCertificateHandler
-from gqlapi.handlers.core.orden import OrdenHandler, OrdenHookListener
+from gqlapi.handlers.core.orden import (
+    ORDEN_RELATIONS,
+    OrdenHandler,
+    OrdenHookListener,
+)
 from gqlapi.handlers.restaurant.restaurant_branch import RestaurantBranchHandler
 from gqlapi.handlers.restaurant.restaurant_business import RestaurantBusinessHandler
 from gqlapi.repository.core.cart import CartProductRepository, CartRepository
@@ -1518,6 +1523,8 @@ class OrdenQuery:
         payment_method: Optional[PayMethodType] = None,
         from_date: Optional[date] = None,
         to_date: Optional[date] = None,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
     ) -> List[OrdenResult]:  # type: ignore
         logger.info("get ordenes")
         # instantiate handler
@@ -1547,6 +1554,11 @@ class OrdenQuery:
                 payment_method,
                 from_date,
                 to_date,
+                first=first,
+                after=after,
+                # only hydrate the relations requested in the query
+                hydrate=ORDEN_RELATIONS
+                & selected_field_names(info.selected_fields[0].selections),
             )
             return _resp
         except GQLApiException as ge:
@@ -1561,6 +1573,68 @@ class OrdenQuery:
                 )
             ]
 
+    @strawberry.field(
+        name="getOrdenesConnection",
+        permission_classes=[IsAuthenticated],
+    )
+    async def get_ordenes_connection(
+        self,
+        info: StrawberryInfo,
+        first: int = 50,
+        after: Optional[str] = None,
+        orden_type: Optional[OrdenType] = None,
+        status: Optional[OrdenStatusType] = None,
+        paystatus: Optional[PayStatusType] = None,
+        restaurant_branch_id: Optional[UUID] = None,
+        supplier_business_id: Optional[UUID] = None,
+        supplier_unit_id: Optional[UUID] = None,
+        payment_method: Optional[PayMethodType] = None,
+        from_date: Optional[date] = None,
+        to_date: Optional[date] = None,
+    ) -> OrdenConnectionResult:  # type: ignore
+        logger.info("get ordenes connection")
+        # instantiate handler
+        _handler = OrdenHandler(
+            orden_repo=OrdenRepository(info),
+            orden_det_repo=OrdenDetailsRepository(info),
+            orden_status_repo=OrdenStatusRepository(info),
+            orden_payment_repo=OrdenPaymentStatusRepository(info),
+            cart_prod_repo=CartProductRepository(info),
+            supp_bus_repo=SupplierBusinessRepository(info),
+            supp_unit_repo=SupplierUnitRepository(info),
+            supp_bus_acc_repo=SupplierBusinessAccountRepository(info),
+            rest_branc_repo=RestaurantBranchRepository(info),
+        )
+        try:
+            # call handler
+            return await _handler.search_orden_connection(
+                first=first,
+                after=after,
+                # only hydrate the relations requested in the query
+                hydrate=ORDEN_RELATIONS
+                & selected_field_names(
+                    info.selected_fields[0].selections, ["edges", "node"]
+                ),
+                orden_type=orden_type,
+                status=status,
+                paystatus=paystatus,
+                restaurant_branch_id=restaurant_branch_id,
+                supplier_business_id=supplier_business_id,
+                supplier_unit_id=supplier_unit_id,
+                payment_method=payment_method,
+                from_date=from_date,
+                to_date=to_date,
+            )
+        except GQLApiException as ge:
+            logger.warning(ge)
+            return OrdenError(msg=ge.msg, code=ge.error_code)
+        except Exception as e:
+            logger.error(e)
+            return OrdenError(
+                msg="Could not retrieve Ordenes",
+                code=GQLApiErrorCodeType.UNEXPECTED_ERROR.value,
+            )
+
     @strawberry.field(
         name="getExternalOrden",
         permission_classes=[],
@@ -229,6 +229,7 @@ class AuthosEcommercePwdRestoreMutation:
             _handler = EcommercePasswordHandler(
                 pwd_restore_repo=PwdRestoreRepository(info),
                 ecommerce_user_repo=EcommerceUserRepository(info),
+                user_session_repo=UserSessionRepository(info),
             )
             # reset passwd if token is valid
             resp_flag = await _handler.reset_password(
@@ -82,6 +82,7 @@ class SupplierProductMutation:
             category_repo=CategoryRepository(info),
             supplier_product_repo=SupplierProductRepository(info),
             supplier_product_price_repo=SupplierProductPriceRepository(info),
+            supplier_unit_repo=SupplierUnitRepository(info),
             # supplier_product_stock_repo=SupplierProductStockRepository(info),
         )
         spl_handler = SupplierPriceListHandler(
@@ -377,6 +378,7 @@ class SupplierProductMutation:
             category_repo=CategoryRepository(info),
             supplier_product_repo=SupplierProductRepository(info),
             supplier_product_price_repo=SupplierProductPriceRepository(info),
+            supplier_unit_repo=SupplierUnitRepository(info),
             # supplier_product_stock_repo=SupplierProductStockRepository(info),
         )
         _spp_handler = SupplierPriceListHandler(
@@ -520,6 +522,7 @@ class SupplierProductMutation:
             category_repo=CategoryRepository(info),
             supplier_product_repo=SupplierProductRepository(info),
             supplier_product_price_repo=SupplierProductPriceRepository(info),
+            supplier_unit_repo=SupplierUnitRepository(info),
             # supplier_product_stock_repo=SupplierProductStockRepository(info),
         )
         _spp_handler = SupplierPriceListHandler(
@@ -1196,7 +1196,7 @@ class AlimaAccountHandler(AlimaAccountHandlerInterface):
             GlobalInformation=global_information,
         )
         try:
-            internal_invoice_create = self.facturama_api.new_internal_invoice(
+            internal_invoice_create = await self.facturama_api.new_internal_invoice(
                 invoice=internal_invoice
             )
             if internal_invoice_create.get("status") != "ok":
@@ -2329,7 +2329,7 @@ class AlimaAccountListener(AlimaAccountListenerInterface):
                     )
                 )
         # verify if project in vercel already
-        find_record = vercel_api.find_project(ecomm_proj)
+        find_record = await vercel_api.find_project(ecomm_proj)
         if find_record.status == "error" and find_record.status_code == 404:
             logger.info("Project not found, creating new project")
         if find_record.status == "ok":
@@ -2337,7 +2337,7 @@ class AlimaAccountListener(AlimaAccountListenerInterface):
             return False
 
         gd_record_exists = False
-        find_gd_record = go_daddy_api.find_record(ecomm_domain.split(".")[0], "CNAME")
+        find_gd_record = await go_daddy_api.find_record(ecomm_domain.split(".")[0], "CNAME")
         if find_gd_record.status == "error" and find_gd_record.status_code == 404:
             logger.info("CNAME record not found, creating new record")
         if find_gd_record.status == "ok" and find_gd_record.result:
@@ -2346,7 +2346,7 @@ class AlimaAccountListener(AlimaAccountListenerInterface):
 
         # create new domain in godaddy
         if not gd_record_exists:
-            domain_resp_gd = go_daddy_api.new_cname_record(
+            domain_resp_gd = await go_daddy_api.new_cname_record(
                 ecomm_domain.split(".")[0], "cname.vercel-dns.com."
             )
             if domain_resp_gd.status == "error":
@@ -2354,7 +2354,7 @@ class AlimaAccountListener(AlimaAccountListenerInterface):
                 logger.error(domain_resp_gd.msg)
 
         # create new project in vercel
-        project_resp = vercel_api.new_project(
+        project_resp = await vercel_api.new_project(
             project_name=ecomm_proj,
             root_directory="apps/commerce-template",
             framework="nextjs",
@@ -2368,11 +2368,11 @@ class AlimaAccountListener(AlimaAccountListenerInterface):
             logger.error(project_resp.msg)
             return False
         # create new domain in vercel
-        domain_resp = vercel_api.new_domain(ecomm_proj, ecomm_domain)
+        domain_resp = await vercel_api.new_domain(ecomm_proj, ecomm_domain)
         if domain_resp.status == "error":
             logger.error(domain_resp.msg)
             return False
-        project_created = vercel_api.find_project(ecomm_proj)
+        project_created = await vercel_api.find_project(ecomm_proj)
         if project_created.status == "error":
             logger.error(project_created.msg)
             return False
@@ -2387,7 +2387,7 @@ class AlimaAccountListener(AlimaAccountListenerInterface):
         ):
             logger.error("Error to create project")
             return False
-        deployment = vercel_api.new_deployment(
+        deployment = await vercel_api.new_deployment(
             project_name=ecomm_proj,
             repo_id=project_created_json["link"]["repoId"],
             github_branch="main",
@@ -1,8 +1,11 @@
 from types import NoneType
-from typing import List, Optional
-import unicodedata
+from typing import Awaitable, Callable, Hashable, List, Optional, Tuple
 from uuid import UUID
-from gqlapi.config import ENV as DEV_ENV
+from gqlapi.config import (
+    ECOMMERCE_CATALOG_CACHE_SIZE,
+    ECOMMERCE_CATALOG_CACHE_TTL,
+    ENV as DEV_ENV,
+)
 from gqlapi.lib.clients.clients.cloudinaryapi.cloudinary import CloudinaryApi, Folders
 from gqlapi.domain.interfaces.v2.b2bcommerce.ecommerce_seller import (
     EcommerceAssignSellerUnitMsg,
@@ -30,10 +33,21 @@ from gqlapi.domain.models.v2.supplier import (
     SupplierBusinessCommertialConditions,
 )
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
-from gqlapi.models.delivery_zones import get_delivery_zone
+from gqlapi.lib.environ.environ.environ import get_app
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.models.delivery_zones import get_delivery_zone, normalize_unit_name
 from gqlapi.repository.user.core_user import CoreUserRepositoryInterface
+from gqlapi.utils.cache import TTLCache
 from strawberry.file_uploads import Upload
 
+# logger
+logger = get_logger(get_app())
+
+# storefront catalog responses, keyed by supplier unit catalog version
+catalog_cache = TTLCache(
+    maxsize=ECOMMERCE_CATALOG_CACHE_SIZE, ttl=ECOMMERCE_CATALOG_CACHE_TTL
+)
+
 
 class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
     def __init__(
@@ -193,77 +207,83 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
                 status=False,
             )
         # verify which supplier unit is assigned to delivery zone
-        for su in ecomm_seller.units:
-            if su.deleted or not su.delivery_info or not su.delivery_info.regions:
-                continue
-            if dz_type == "default":
-                for dz in su.delivery_info.regions:
+        assigned_su = None
+        _units = [
+            su
+            for su in ecomm_seller.units
+            if not su.deleted and su.delivery_info and su.delivery_info.regions
+        ]
+        if dz_type == "default":
+            for su in _units:
+                for dz in su.delivery_info.regions:  # type: ignore (safe)
                     # [TODO]: fix this validation and store regions homogeneusly with the same format
-                    if (
-                        str(dz).lower() == assigned_dz.lower()
-                        or str(dz).lower() in assigned_dz.lower()
-                    ):
-                        # create supplier restaurant assignation
-                        try:
-                            await self.supplier_restaurant_assign_handler.add_supplier_restaurant_relation(
-                                supplier_unit_id=su.id,
-                                restaurant_branch_id=restaurant_branch_id,
-                                approved=False,
-                                priority=1,
-                                rating=None,
-                                review=None,
-                                created_by=core_user.id,
-                            )
-                            return EcommerceAssignSellerUnitMsg(
-                                msg="Restaurant branch assigned to supplier unit",
-                                supplier_unit_id=su.id,
-                                status=True,
-                            )
-                        except Exception:
-                            return EcommerceAssignSellerUnitMsg(
-                                msg="Error creating supplier restaurant assignation",
-                                supplier_unit_id=None,
-                                status=False,
-                            )
-            if dz_type == "custom":
-                # For custom try with the supplier unit names
-                normed_su_name = "".join(
-                    [
-                        c
-                        for c in unicodedata.normalize(
-                            "NFKD", su.unit_name.lower().replace(" ", "_")
-                        )
-                        if not unicodedata.combining(c)
-                    ]
+                    _dz = str(dz).lower()
+                    if _dz == assigned_dz or _dz in assigned_dz:
+                        assigned_su = su
+                        break
+                if assigned_su:
+                    break
+        if dz_type == "custom":
+            # For custom try with the supplier unit names
+            units_by_name = {}
+            for su in _units:
+                units_by_name.setdefault(normalize_unit_name(su.unit_name), su)
+            assigned_su = units_by_name.get(assigned_dz)
+        if assigned_su:
+            # create supplier restaurant assignation
+            try:
+                await self.supplier_restaurant_assign_handler.add_supplier_restaurant_relation(
+                    supplier_unit_id=assigned_su.id,
+                    restaurant_branch_id=restaurant_branch_id,
+                    approved=False,
+                    priority=1,
+                    rating=None,
+                    review=None,
+                    created_by=core_user.id,
+                )
+                return EcommerceAssignSellerUnitMsg(
+                    msg="Restaurant branch assigned to supplier unit",
+                    supplier_unit_id=assigned_su.id,
+                    status=True,
+                )
+            except Exception:
+                return EcommerceAssignSellerUnitMsg(
+                    msg="Error creating supplier restaurant assignation",
+                    supplier_unit_id=None,
+                    status=False,
                 )
-                if normed_su_name == assigned_dz:
-                    try:
-                        await self.supplier_restaurant_assign_handler.add_supplier_restaurant_relation(
-                            supplier_unit_id=su.id,
-                            restaurant_branch_id=restaurant_branch_id,
-                            approved=False,
-                            priority=1,
-                            rating=None,
-                            review=None,
-                            created_by=core_user.id,
-                        )
-                        return EcommerceAssignSellerUnitMsg(
-                            msg="Restaurant branch assigned to supplier unit",
-                            supplier_unit_id=su.id,
-                            status=True,
-                        )
-                    except Exception:
-                        return EcommerceAssignSellerUnitMsg(
-                            msg="Error creating supplier restaurant assignation",
-                            supplier_unit_id=None,
-                            status=False,
-                        )
         return EcommerceAssignSellerUnitMsg(
             msg="No supplier unit available for restaurant branch",
             supplier_unit_id=None,
             status=False,
         )
 
+    async def _cached_catalog(
+        self,
+        supplier_unit_id: UUID,
+        key: Tuple[Hashable, ...],
+        build_fn: Callable[[], Awaitable[EcommerceSellerCatalog]],
+    ) -> EcommerceSellerCatalog:
+        """Get catalog from cache or build it.
+            Cache key includes the supplier unit catalog version, which is bumped
+            on every product, price list or stock change of the unit.
+        """
+        try:
+            version = await self.supplier_unit_handler.repository.fetch_catalog_version(
+                supplier_unit_id
+            )
+        except Exception as e:
+            logger.warning("Issues fetching catalog version, skipping cache")
+            logger.error(e)
+            return await build_fn()
+        _key = (str(supplier_unit_id), version) + key
+        catalog = catalog_cache.get(_key)
+        if catalog is not None:
+            return catalog
+        catalog = await build_fn()
+        catalog_cache.set(_key, catalog)
+        return catalog
+
     async def fetch_seller_spec_catalog_info(
         self,
         supplier_unit_id: UUID,
@@ -272,7 +292,23 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
         page: int,
         page_size: int,
     ) -> EcommerceSellerCatalog:
-        prods = await self.supplier_restaurant_assign_handler.get_ecommerce_supplier_restaurant_products(
+        return await self._cached_catalog(
+            supplier_unit_id,
+            ("SPECIFIC", str(restaurant_branch_id), search, page, page_size),
+            lambda: self._build_seller_spec_catalog_info(
+                supplier_unit_id, restaurant_branch_id, search, page, page_size
+            ),
+        )
+
+    async def _build_seller_spec_catalog_info(
+        self,
+        supplier_unit_id: UUID,
+        restaurant_branch_id: UUID,
+        search: str,
+        page: int,
+        page_size: int,
+    ) -> EcommerceSellerCatalog:
+        prods, results_num = await self.supplier_restaurant_assign_handler.find_ecommerce_catalog_page(
             supplier_unit_id=supplier_unit_id,
             restaurant_branch_id=restaurant_branch_id,
             search=search,
@@ -282,11 +318,6 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
         categs = await self.supplier_restaurant_assign_handler.get_ecommerce_categories(
             supplier_unit_id=supplier_unit_id,
         )
-        results_num = await self.supplier_restaurant_assign_handler.count_ecommerce_supplier_restaurant_products(
-            supplier_unit_id=supplier_unit_id,
-            restaurant_branch_id=restaurant_branch_id,
-            search=search,
-        )
         return EcommerceSellerCatalog(
             supplier_unit_id=supplier_unit_id,
             restaurant_branch_id=restaurant_branch_id,
@@ -303,8 +334,24 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
         page: int,
         page_size: int,
     ) -> EcommerceSellerCatalog:
-        prods = await self.supplier_restaurant_assign_handler.get_ecommerce_default_supplier_products(
+        return await self._cached_catalog(
+            supplier_unit_id,
+            ("DEFAULT", search, page, page_size),
+            lambda: self._build_seller_default_catalog_info(
+                supplier_unit_id, search, page, page_size
+            ),
+        )
+
+    async def _build_seller_default_catalog_info(
+        self,
+        supplier_unit_id: UUID,
+        search: str,
+        page: int,
+        page_size: int,
+    ) -> EcommerceSellerCatalog:
+        prods, results_num = await self.supplier_restaurant_assign_handler.find_ecommerce_catalog_page(
             supplier_unit_id=supplier_unit_id,
+            restaurant_branch_id=None,
             search=search,
             page=page,
             page_size=page_size,
@@ -312,10 +359,6 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
         categs = await self.supplier_restaurant_assign_handler.get_ecommerce_categories(
             supplier_unit_id=supplier_unit_id,
         )
-        results_num = await self.supplier_restaurant_assign_handler.count_ecommerce_default_supplier_products(
-            supplier_unit_id=supplier_unit_id,
-            search=search,
-        )
         return EcommerceSellerCatalog(
             supplier_unit_id=supplier_unit_id,
             restaurant_branch_id=None,
@@ -330,6 +373,20 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
         supplier_unit_id: UUID,
         restaurant_branch_id: UUID,
         supplier_product_id: UUID,
+    ) -> EcommerceSellerCatalog:
+        return await self._cached_catalog(
+            supplier_unit_id,
+            ("SPECIFIC_DETAILS", str(restaurant_branch_id), str(supplier_product_id)),
+            lambda: self._build_seller_spec_product_details(
+                supplier_unit_id, restaurant_branch_id, supplier_product_id
+            ),
+        )
+
+    async def _build_seller_spec_product_details(
+        self,
+        supplier_unit_id: UUID,
+        restaurant_branch_id: UUID,
+        supplier_product_id: UUID,
     ) -> EcommerceSellerCatalog:
         prod = await self.supplier_restaurant_assign_handler.get_ecommerce_supplier_restaurant_product_details(
             supplier_unit_id=supplier_unit_id,
@@ -358,6 +415,19 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
         self,
         supplier_unit_id: UUID,
         supplier_product_id: UUID,
+    ) -> EcommerceSellerCatalog:
+        return await self._cached_catalog(
+            supplier_unit_id,
+            ("DEFAULT_DETAILS", str(supplier_product_id)),
+            lambda: self._build_seller_default_product_details(
+                supplier_unit_id, supplier_product_id
+            ),
+        )
+
+    async def _build_seller_default_product_details(
+        self,
+        supplier_unit_id: UUID,
+        supplier_product_id: UUID,
     ) -> EcommerceSellerCatalog:
         prod = await self.supplier_restaurant_assign_handler.get_ecommerce_default_supplier_product_detail(
             supplier_unit_id=supplier_unit_id,
@@ -553,12 +623,12 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
         file_data: bytes = await image.read()  # type: ignore
         # Split the path by '/'
         img_key = str(supplier_business_id) + "_" + image_type
-        cloudinary_api.delete(
+        await cloudinary_api.delete(
             folder=Folders.MARKETPLACE.value,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
             img_key=img_key,
         )
-        route = cloudinary_api.upload(
+        route = await cloudinary_api.upload(
             folder=Folders.MARKETPLACE.value,
             img_file=file_data,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
@@ -578,7 +648,7 @@ class EcommerceSellerHandler(EcommerceSellerHandlerInterface):
         cloudinary_api = CloudinaryApi(env=DEV_ENV)
         # Split the path by '/'
         img_key = str(supplier_business_id) + "_" + image_type
-        status = cloudinary_api.delete(
+        status = await cloudinary_api.delete(
             folder=Folders.MARKETPLACE.value,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
             img_key=img_key,
@@ -238,7 +238,7 @@ class B2BEcommerceUserHandler(B2BEcommerceUserHandlerInterface):
         rba = rba_list[0]
         characters = string.ascii_letters + string.digits
         password = "".join(secrets.choice(characters) for _ in range(12))
-        hpswd = EcommerceJWTHandler.hash_password(password)
+        hpswd = await EcommerceJWTHandler.hash_password_async(password)
         ecommerce_id = uuid.uuid4()
         ecommerce_gql = IEcommerceUser(
             id=ecommerce_id,
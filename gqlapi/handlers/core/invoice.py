@@ -1,9 +1,10 @@
+import asyncio
 import base64
 from datetime import date, datetime, timedelta
 from enum import Enum
 import json
 from types import NoneType
-from typing import Any, Dict, Optional, List
+from typing import Any, Awaitable, Callable, Dict, Optional, List, Tuple
 from uuid import UUID, uuid4
 
 from bs4 import BeautifulSoup
@@ -307,16 +308,7 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
             orden=MxInvoiceOrden(**mx_inv_assoc),
             supplier=supplier,
             restaurant_branch=branch,
-            pdf_file=(
-                base64.b64encode(mx_inv["pdf_file"]).decode("utf-8")
-                if isinstance(mx_inv["pdf_file"], bytes)
-                else None
-            ),
-            xml_file=(
-                base64.b64encode(mx_inv["xml_file"]).decode("utf-8")
-                if isinstance(mx_inv["xml_file"], bytes)
-                else None
-            ),
+            file_loader=self._invoice_file_loader(mx_inv),
         )
         return mx_inv_gql
 
@@ -369,12 +361,6 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
                     error_code=GQLApiErrorCodeType.FETCH_SQL_DB_EMPTY_RECORD.value,
                 )
             try:
-                pdf = ""
-                xml = ""
-                if "pdf_file" in _inv:
-                    pdf = base64.b64encode(_inv["pdf_file"]).decode("utf-8")
-                if "xml_file" in _inv:
-                    xml = base64.b64encode(_inv["xml_file"]).decode("utf-8")
                 mx_inv = MxInvoiceGQL(
                     id=_inv["mx_invoice_id"],
                     orden_id=orden_id,
@@ -396,8 +382,7 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
                     ),
                     supplier=supplier,
                     restaurant_branch=branch,
-                    pdf_file=pdf,
-                    xml_file=xml,
+                    file_loader=self._invoice_file_loader(_inv, "mx_invoice_id"),
                     cancel_result=_inv["cancel_result"],
                 )
                 mx_inv_list.append(mx_inv)
@@ -409,6 +394,64 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
                 )
         return mx_inv_list
 
+    def _invoice_file_loader(
+        self, mx_inv: Dict[str, Any], id_key: str = "id"
+    ) -> Callable[[str], Awaitable[bytes | NoneType]]:
+        """Build lazy loader of invoice files, reusing the blob keys of the
+            fetched record so only files not migrated yet are read from DB
+
+        Parameters
+        ----------
+        mx_inv : Dict[str, Any]
+            Invoice record with `pdf_blob_key` and `xml_blob_key`
+        id_key : str
+            Key of the invoice id in the record
+
+        Returns
+        -------
+        Callable[[str], Awaitable[bytes | NoneType]]
+        """
+        mx_invoice_id = mx_inv[id_key]
+        blob_keys = {
+            "pdf": mx_inv.get("pdf_blob_key"),
+            "xml": mx_inv.get("xml_blob_key"),
+        }
+
+        async def _load(file_type: str) -> bytes | NoneType:
+            return await self.mx_invoice_repository.fetch_file(
+                mx_invoice_id, file_type, blob_keys.get(file_type)
+            )
+
+        return _load
+
+    async def _fetch_invoice_parties(
+        self, invoices: List[Dict[str, Any]]
+    ) -> Tuple[Dict[UUID, SupplierBusiness], Dict[UUID, RestaurantBranch]]:
+        """Fetch suppliers and branches of invoices, indexed by id
+
+        Parameters
+        ----------
+        invoices : List[Dict[str, Any]]
+            Invoice records with `supplier_business_id` and `restaurant_branch_id`
+
+        Returns
+        -------
+        Tuple[Dict[UUID, SupplierBusiness], Dict[UUID, RestaurantBranch]]
+        """
+        supp_ids = list({inv["supplier_business_id"] for inv in invoices})
+        branch_ids = list({inv["restaurant_branch_id"] for inv in invoices})
+        _supps, _branches = await asyncio.gather(
+            asyncio.gather(*[self.supplier_business_repo.get(_id) for _id in supp_ids]),
+            asyncio.gather(*[self.restaurant_branch_repo.get(_id) for _id in branch_ids]),
+        )
+        suppliers_idx = {
+            _id: SupplierBusiness(**_s) for _id, _s in zip(supp_ids, _supps)
+        }
+        branches_idx = {
+            _id: RestaurantBranch(**_b) for _id, _b in zip(branch_ids, _branches)
+        }
+        return suppliers_idx, branches_idx
+
     async def fetch_invoices(self, orden_ids: List[UUID]) -> List[MxInvoiceGQL]:
         """Get invoices from MX Invoice DB
 
@@ -424,23 +467,9 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
         mult_invs = await self.mx_invoice_repository.fetch_multiple_associated(
             orden_ids
         )
-        # fetch suppliers
-        suppliers_idx = {}
-        for inv in mult_invs:
-            if inv["supplier_business_id"] in suppliers_idx:
-                continue
-            suppliers_idx[inv["supplier_business_id"]] = SupplierBusiness(
-                **await self.supplier_business_repo.get(inv["supplier_business_id"])
-            )
-        # fetch branches
-        branches_idx = {}
-        for inv in mult_invs:
-            if inv["restaurant_branch_id"] in branches_idx:
-                continue
-            branches_idx[inv["restaurant_branch_id"]] = RestaurantBranch(
-                **await self.restaurant_branch_repo.get(inv["restaurant_branch_id"])
-            )
-        # build response - [TODO] - extend to return XML and PDF files
+        # fetch suppliers and branches (concurrently, so lookups get batched)
+        suppliers_idx, branches_idx = await self._fetch_invoice_parties(mult_invs)
+        # build response (files are resolved only if requested)
         list_mx_invs = []
         for mx_inv in mult_invs:
             mx_inv_gql = MxInvoiceGQL(
@@ -464,16 +493,7 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
                 ),
                 supplier=suppliers_idx[mx_inv["supplier_business_id"]],
                 restaurant_branch=branches_idx[mx_inv["restaurant_branch_id"]],
-                pdf_file=(
-                    base64.b64encode(mx_inv["pdf_file"]).decode("utf-8")
-                    if isinstance(mx_inv["pdf_file"], bytes)
-                    else None
-                ),
-                xml_file=(
-                    base64.b64encode(mx_inv["xml_file"]).decode("utf-8")
-                    if isinstance(mx_inv["xml_file"], bytes)
-                    else None
-                ),
+                file_loader=self._invoice_file_loader(mx_inv),
                 invoice_type=mx_inv["payment_method"],
             )
             list_mx_invs.append(mx_inv_gql)
@@ -1945,12 +1965,10 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
                     error_code=GQLApiErrorCodeType.FETCH_SQL_DB_EMPTY_RECORD.value,
                 )
             try:
-                pdf = ""
-                xml = ""
-                if "pdf_file" in _inv:
-                    pdf = base64.b64encode(_inv["pdf_file"]).decode("utf-8")
-                if "xml_file" in _inv:
-                    xml = base64.b64encode(_inv["xml_file"]).decode("utf-8")
+                _load_file = self._invoice_file_loader(_inv, "mx_invoice_id")
+                _pdf, _xml = await asyncio.gather(_load_file("pdf"), _load_file("xml"))
+                pdf = base64.b64encode(_pdf).decode("utf-8") if _pdf else ""
+                xml = base64.b64encode(_xml).decode("utf-8") if _xml else ""
                 mx_cert = MxSatInvoicingCertificateInfo(**mx_cert_inf)
                 cust_mx_inv = CustomerMxInvoiceGQL(
                     sat_id=_inv["invoice_provider_id"],  # type: ignore
@@ -2031,22 +2049,8 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
         if not _invs:
             logger.warning("No invoices found")
             return []
-        # fetch suppliers
-        suppliers_idx = {}
-        for inv in _invs:
-            if inv["supplier_business_id"] in suppliers_idx:
-                continue
-            suppliers_idx[inv["supplier_business_id"]] = SupplierBusiness(
-                **await self.supplier_business_repo.get(inv["supplier_business_id"])
-            )
-        # fetch branches
-        branches_idx = {}
-        for inv in _invs:
-            if inv["restaurant_branch_id"] in branches_idx:
-                continue
-            branches_idx[inv["restaurant_branch_id"]] = RestaurantBranch(
-                **await self.restaurant_branch_repo.get(inv["restaurant_branch_id"])
-            )
+        # fetch suppliers and branches (concurrently, so lookups get batched)
+        suppliers_idx, branches_idx = await self._fetch_invoice_parties(_invs)
         # build response
         list_mx_invs = []
         for mx_inv in _invs:
@@ -2071,16 +2075,7 @@ class MxInvoiceHandler(MxInvoiceHandlerInterface):
                 ),
                 supplier=suppliers_idx[mx_inv["supplier_business_id"]],
                 restaurant_branch=branches_idx[mx_inv["restaurant_branch_id"]],
-                pdf_file=(
-                    base64.b64encode(mx_inv["pdf_file"]).decode("utf-8")
-                    if isinstance(mx_inv["pdf_file"], bytes)
-                    else None
-                ),
-                xml_file=(
-                    base64.b64encode(mx_inv["xml_file"]).decode("utf-8")
-                    if isinstance(mx_inv["xml_file"], bytes)
-                    else None
-                ),
+                file_loader=self._invoice_file_loader(mx_inv),
             )
             list_mx_invs.append(mx_inv_gql)
         return list_mx_invs
@@ -1,11 +1,13 @@
+import asyncio
 import base64
 from datetime import date, datetime
 import json
 from types import NoneType
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Set, Tuple
 from uuid import UUID
 import uuid
 from gqlapi.lib.clients.clients.email_api.mails import send_email
+from gqlapi.lib.clients.clients.http.transport import get_transport
 from gqlapi.lib.clients.clients.stripeapi.stripe_api import StripeApi, StripeCurrency
 from gqlapi.repository.scripts.scripts_execution import ScriptExecutionRepository
 
@@ -27,10 +29,13 @@ from gqlapi.domain.interfaces.v2.orden.invoice import (
 )
 from gqlapi.domain.interfaces.v2.orden.orden import (
     MxInvoiceComplementGQL,
+    OrdenConnectionGQL,
     OrdenDetailsRepositoryInterface,
+    OrdenEdgeGQL,
     OrdenGQL,
     OrdenHandlerInterface,
     OrdenHookListenerInterface,
+    OrdenPageInfoGQL,
     OrdenPaymentStatusRepositoryInterface,
     OrdenPaystatusGQL,
     OrdenRepositoryInterface,
@@ -101,8 +106,8 @@ from gqlapi.config import RESEND_SINGLE_SENDER
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 from gqlapi.repository.user.core_user import CoreUserRepositoryInterface
 from gqlapi.utils.datetime import from_iso_format
-from gqlapi.utils.domain_mapper import sql_to_domain
-from gqlapi.utils.helpers import list_into_strtuple
+from gqlapi.utils.domain_mapper import domain_to_dict, sql_to_domain
+from gqlapi.utils.helpers import decode_cursor, encode_cursor, list_into_strtuple
 from gqlapi.utils.notifications import (
     send_ecommerce_restaurant_email_confirmation,
     send_restaurant_changed_status_v2,
@@ -117,6 +122,19 @@ import requests
 # logger
 logger = get_logger(get_app())
 
+# orden relations that can be hydrated on search
+ORDEN_RELATIONS = {"cart", "branch", "supplier"}
+# max ordenes per page (`first`)
+ORDEN_PAGE_MAX_SIZE = 200
+
+
+def validate_page_size(first: int, max_size: int = ORDEN_PAGE_MAX_SIZE) -> None:
+    if first < 1 or first > max_size:
+        raise GQLApiException(
+            msg=f"Page size must be between 1 and {max_size}",
+            error_code=GQLApiErrorCodeType.DATAVAL_WRONG_DATATYPE.value,
+        )
+
 
 class OrdenHandler(OrdenHandlerInterface):
     def __init__(
@@ -207,52 +225,58 @@ class OrdenHandler(OrdenHandlerInterface):
         ------
         GQLApiException
         """
-        # create cart
-        cart_id = await self.cart_repo.new(
-            Cart(id=uuid.uuid4(), active=True, created_by=core_user.id)
-        )
-        subtotal = 0
-        for cp in cart_products:
-            try:
-                if cp.quantity < 0.0009:
-                    continue
-                _subtotal = cp.subtotal
-                if cp.quantity is not None and cp.unit_price is not None:
-                    _subtotal = cp.quantity * cp.unit_price
-                await self.cart_prod_repo.new(
-                    CartProduct(
-                        cart_id=cart_id,
-                        supplier_product_id=cp.supplier_product_id,
-                        supplier_product_price_id=cp.supplier_product_price_id,
-                        quantity=cp.quantity,
-                        created_by=core_user.id,
-                        sell_unit=cp.sell_unit,
-                        unit_price=cp.unit_price,
-                        subtotal=_subtotal,
-                        comments=cp.comments,
+        # create cart and cart products in a single transaction
+        try:
+            async with self.cart_repo.db.transaction():
+                cart_id = await self.cart_repo.new(
+                    Cart(id=uuid.uuid4(), active=True, created_by=core_user.id)
+                )
+                subtotal = 0
+                _cart_prods = []
+                for cp in cart_products:
+                    if cp.quantity < 0.0009:
+                        continue
+                    _subtotal = cp.subtotal
+                    if cp.quantity is not None and cp.unit_price is not None:
+                        _subtotal = cp.quantity * cp.unit_price
+                    _cart_prods.append(
+                        CartProduct(
+                            cart_id=cart_id,
+                            supplier_product_id=cp.supplier_product_id,
+                            supplier_product_price_id=cp.supplier_product_price_id,
+                            quantity=cp.quantity,
+                            created_by=core_user.id,
+                            sell_unit=cp.sell_unit,
+                            unit_price=cp.unit_price,
+                            subtotal=_subtotal,
+                            comments=cp.comments,
+                        )
                     )
+                    if cp.subtotal:
+                        subtotal += cp.subtotal
+                # insert all products at once - returns supplier product tax info
+                _cart_prods_res = await self.cart_prod_repo.add_many_with_tax(
+                    _cart_prods
                 )
-                if cp.subtotal:
-                    subtotal += cp.subtotal
-            except Exception as e:
-                logger.error(e)
-                # delete cart
+                # close cart
                 await self.cart_repo.update(
                     cart_id, active=False, closed_at=datetime.utcnow()
                 )
-                raise GQLApiException(
-                    msg="Error creating cart product",
-                    error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
-                )
+        except GQLApiException as ge:
+            raise ge
+        except Exception as e:
+            logger.error(e)
+            raise GQLApiException(
+                msg="Error creating cart product",
+                error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
+            )
         # compute totals
         cart_produc_res = []
         taxes = 0
         subtotal_without_tax = 0
-        for prod in await self.cart_prod_repo.search_with_tax(cart_id=cart_id):
+        for prod in _cart_prods_res:
             supp_prod = dict(prod)
             cprod = CartProductGQL(**sql_to_domain(prod, CartProduct))
-            if cprod.quantity < 0.0009:
-                continue
             cprod.supp_prod = SupplierProduct(**json.loads(supp_prod["tax_json"]))  # type: ignore
             if cprod.supp_prod:
                 if cprod.supp_prod.tax and cprod.subtotal:
@@ -281,9 +305,6 @@ class OrdenHandler(OrdenHandlerInterface):
         # get cashback
         # total -= cashback
 
-        # close cart
-        await self.cart_repo.update(cart_id, active=False, closed_at=datetime.utcnow())
-        # return
         return {
             "cart_id": cart_id,
             "cart_product_res": cart_produc_res,
@@ -533,10 +554,10 @@ class OrdenHandler(OrdenHandlerInterface):
             source_type=OrdenSourceType.AUTOMATION,
         )
 
-    async def _new_orden(
+    async def _create_orden(
         self,
+        core_user: CoreUser,
         orden_type: OrdenType,
-        firebase_id: str,
         restaurant_branch_id: UUID,
         supplier_unit_id: UUID,
         cart_products: List[CartProduct],
@@ -549,57 +570,57 @@ class OrdenHandler(OrdenHandlerInterface):
         delivery_time: Optional[DeliveryTimeWindow] = None,
         delivery_type: Optional[SellingOption] = None,
         approved_by: Optional[UUID] = None,
-        discount_code: Optional[str] = None,  # noqa
-        cashback_transation_id: Optional[UUID] = None,  # noqa
         shipping_cost: Optional[float] = None,
         packaging_cost: Optional[float] = None,
         service_fee: Optional[float] = None,
         source_type: Optional[OrdenSourceType] = OrdenSourceType.AUTOMATION,
-    ) -> OrdenGQL:  # type: ignore
-        # get core user
-        core_user = await self.core_user_repo.fetch_by_firebase_id(firebase_id)
-        if not core_user or not core_user.id:
-            raise GQLApiException(
-                msg="User not found",
-                error_code=GQLApiErrorCodeType.FETCH_SQL_DB_NOT_FOUND.value,
-            )
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Create cart, orden, details, status and paystatus
+            in a single transaction: either all records are created or none.
 
-        # create cart
-        cart_res = await self._build_cart(
-            core_user,
-            cart_products,
-            shipping_cost=shipping_cost,
-            packaging_cost=packaging_cost,
-            service_fee=service_fee,
-        )
-        if supplier_business_id:
-            orden_count = await self.orden_repo.count_by_supplier_business(
-                supplier_business_id=supplier_business_id
-            )
-        else:
+        Returns
+        -------
+        Tuple[Dict[str, Any], Dict[str, Any]]
+            Orden dict (with status, details and paystatus) and cart result
+
+        Raises
+        ------
+        GQLApiException
+        """
+        if not supplier_business_id:
             raise GQLApiException(
-                msg="Error to get orden count",
+                msg="Error to get orden number",
                 error_code=GQLApiErrorCodeType.DATAVAL_NO_DATA.value,
             )
-        # create orden
-        orden_id = await self.orden_repo.add(
-            Orden(
-                id=uuid.uuid4(),
-                orden_type=orden_type,
-                orden_number=str(orden_count + 1),
-                source_type=source_type,
-                created_by=core_user.id,
-            )
-        )
-        orden = await self.orden_repo.get(orden_id)
-
-        ord_details_uuid = uuid.uuid4()
         if not delivery_time:
             delivery_time = DeliveryTimeWindow(9, 18)
+        _now = datetime.utcnow()
         try:
-            await self.orden_det_repo.new(
-                OrdenDetails(
-                    id=ord_details_uuid,
+            async with self.orden_repo.db.transaction():
+                # create cart
+                cart_res = await self._build_cart(
+                    core_user,
+                    cart_products,
+                    shipping_cost=shipping_cost,
+                    packaging_cost=packaging_cost,
+                    service_fee=service_fee,
+                )
+                orden_number = await self.orden_repo.next_orden_number(
+                    supplier_business_id=supplier_business_id
+                )
+                # create orden
+                orden_obj = Orden(
+                    id=uuid.uuid4(),
+                    orden_type=orden_type,
+                    orden_number=str(orden_number),
+                    source_type=source_type,
+                    created_by=core_user.id,
+                    created_at=_now,
+                    last_updated=_now,
+                )
+                orden_id = await self.orden_repo.add(orden_obj)
+                orden_details = OrdenDetails(
+                    id=uuid.uuid4(),
                     orden_id=orden_id,
                     version=1,
                     restaurant_branch_id=restaurant_branch_id,
@@ -627,63 +648,93 @@ class OrdenHandler(OrdenHandlerInterface):
                     payment_method=payment_method if payment_method else None,
                     approved_by=approved_by,
                     created_by=core_user.id,
+                    created_at=_now,
                 )
-            )
-            # create delivery status
-            await self.orden_status_repo.new(
-                OrdenStatus(
+                await self.orden_det_repo.new(orden_details)
+                # create delivery status
+                orden_status = OrdenStatus(
                     id=uuid.uuid4(),
                     orden_id=orden_id,
                     status=status,
                     created_by=core_user.id,  # type: ignore
+                    created_at=_now,
                 )
-            )
-
-            # create payment status
-            await self.orden_payment_repo.new(
-                OrdenPayStatus(
+                await self.orden_status_repo.new(orden_status)
+                # create payment status
+                orden_paystatus = OrdenPayStatus(
                     id=uuid.uuid4(),
                     orden_id=orden_id,
                     status=paystatus,
                     created_by=core_user.id,  # type: ignore
+                    created_at=_now,
                 )
-            )
+                await self.orden_payment_repo.new(orden_paystatus)
+        except GQLApiException as ge:
+            raise ge
         except Exception as e:
             logger.error(e)
-            # if error creating delete orden
-            await self.orden_status_repo.new(
-                OrdenStatus(
-                    id=uuid.uuid4(),
-                    orden_id=orden_id,
-                    status=OrdenStatusType(
-                        DataTypeDecoder.get_orden_status_value("canceled")
-                    ),
-                    created_by=core_user.id,
-                )
-            )
             raise GQLApiException(
                 msg="Error creating orden details",
                 error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
             )
+        # construct response from the created records
+        orden = domain_to_dict(orden_obj)
+        orden["status"] = orden_status
+        orden["details"] = orden_details
+        orden["paystatus"] = orden_paystatus
+        return orden, cart_res
 
-        # construct response
-        orden_status = await self.orden_status_repo.get(orden_id)
-        orden_status["status"] = DataTypeDecoder.get_orden_status_value(
-            orden_status["status"]
-        )
-        orden["status"] = OrdenStatus(**orden_status)
-        orden_details = await self.orden_det_repo.get(ord_details_uuid)
-        if orden_details["delivery_time"]:
-            orden_details["delivery_time"] = DeliveryTimeWindow.parse(
-                orden_details["delivery_time"]
-            )
-        orden["details"] = OrdenDetails(**orden_details)
-        orden_paystatus = await self.orden_payment_repo.get(orden_id)
-        if orden_paystatus["status"]:
-            orden_paystatus["status"] = DataTypeDecoder.get_orden_paystatus_value(
-                orden_paystatus["status"]
+    async def _new_orden(
+        self,
+        orden_type: OrdenType,
+        firebase_id: str,
+        restaurant_branch_id: UUID,
+        supplier_unit_id: UUID,
+        cart_products: List[CartProduct],
+        status: Optional[OrdenStatusType] = None,
+        supplier_business_id: Optional[UUID] = None,
+        comments: Optional[str] = None,
+        payment_method: Optional[PayMethodType] = None,
+        paystatus: Optional[PayStatusType] = None,
+        delivery_date: Optional[datetime] = None,
+        delivery_time: Optional[DeliveryTimeWindow] = None,
+        delivery_type: Optional[SellingOption] = None,
+        approved_by: Optional[UUID] = None,
+        discount_code: Optional[str] = None,  # noqa
+        cashback_transation_id: Optional[UUID] = None,  # noqa
+        shipping_cost: Optional[float] = None,
+        packaging_cost: Optional[float] = None,
+        service_fee: Optional[float] = None,
+        source_type: Optional[OrdenSourceType] = OrdenSourceType.AUTOMATION,
+    ) -> OrdenGQL:  # type: ignore
+        # get core user
+        core_user = await self.core_user_repo.fetch_by_firebase_id(firebase_id)
+        if not core_user or not core_user.id:
+            raise GQLApiException(
+                msg="User not found",
+                error_code=GQLApiErrorCodeType.FETCH_SQL_DB_NOT_FOUND.value,
             )
-        orden["paystatus"] = OrdenPayStatus(**orden_paystatus)
+        # create cart and orden
+        orden, cart_res = await self._create_orden(
+            core_user,
+            orden_type,
+            restaurant_branch_id,
+            supplier_unit_id,
+            cart_products,
+            status=status,
+            supplier_business_id=supplier_business_id,
+            comments=comments,
+            payment_method=payment_method,
+            paystatus=paystatus,
+            delivery_date=delivery_date,
+            delivery_time=delivery_time,
+            delivery_type=delivery_type,
+            approved_by=approved_by,
+            shipping_cost=shipping_cost,
+            packaging_cost=packaging_cost,
+            service_fee=service_fee,
+            source_type=source_type,
+        )
         # branch
         _branch = await self.rest_branc_repo.get(restaurant_branch_id)
         rest_branch = RestaurantBranch(**_branch)
@@ -742,7 +793,7 @@ class OrdenHandler(OrdenHandlerInterface):
                             "email": supp_bus_acc.email,
                             "name": sup_business.name,
                         },
-                        orden_details=OrdenDetails(**orden_details),
+                        orden_details=orden["details"],
                         branch_name=rest_branch.branch_name,
                         contact_number=(
                             supp_bus_acc.phone_number
@@ -763,12 +814,12 @@ class OrdenHandler(OrdenHandlerInterface):
                 and orden_type == OrdenType.NORMAL
             ):
                 try:
-                    send_supplier_whatsapp_confirmation(
+                    await send_supplier_whatsapp_confirmation(
                         to_wa={
                             "phone": supp_bus_acc.phone_number,
                             "name": sup_business.name,
                         },
-                        orden_details=OrdenDetails(**orden_details),
+                        orden_details=orden["details"],
                         branch_name=rest_branch.branch_name,
                         contact_number=ALIMA_SUPPORT_PHONE,
                         delivery_address=rest_branch.full_address,
@@ -797,7 +848,7 @@ class OrdenHandler(OrdenHandlerInterface):
                                 + " - "
                                 + rest_branch.branch_name,
                             },
-                            orden_details=OrdenDetails(**orden_details),
+                            orden_details=orden["details"],
                             cart_products=cart_res["cart_product_res"],
                             orden_number=orden["orden_number"],
                             rest_branch_name=rest_branch.branch_name,
@@ -837,127 +888,27 @@ class OrdenHandler(OrdenHandlerInterface):
                 msg="User not found",
                 error_code=GQLApiErrorCodeType.FETCH_SQL_DB_NOT_FOUND.value,
             )
-        # create cart
-        cart_res = await self._build_cart(
+        # create cart and orden
+        orden, cart_res = await self._create_orden(
             core_user,
+            orden_type,
+            restaurant_branch_id,
+            supplier_unit_id,
             cart_products,
+            status=status,
+            supplier_business_id=supplier_business_id,
+            comments=comments,
+            payment_method=payment_method,
+            paystatus=paystatus,
+            delivery_date=delivery_date,
+            delivery_time=delivery_time,
+            delivery_type=delivery_type,
+            approved_by=approved_by,
             shipping_cost=shipping_cost,
             packaging_cost=packaging_cost,
             service_fee=service_fee,
+            source_type=source_type,
         )
-        if supplier_business_id:
-            orden_count = await self.orden_repo.count_by_supplier_business(
-                supplier_business_id=supplier_business_id
-            )
-        else:
-            raise GQLApiException(
-                msg="Error to get orden count",
-                error_code=GQLApiErrorCodeType.DATAVAL_NO_DATA.value,
-            )
-
-        # create orden
-        orden_id = await self.orden_repo.add(
-            Orden(
-                id=uuid.uuid4(),
-                orden_type=orden_type,
-                orden_number=str(orden_count + 1),
-                source_type=source_type,
-                created_by=core_user.id,
-            )
-        )
-        orden = await self.orden_repo.get(orden_id)
-
-        ord_details_uuid = uuid.uuid4()
-        if not delivery_time:
-            delivery_time = DeliveryTimeWindow(9, 18)
-        try:
-            await self.orden_det_repo.new(
-                OrdenDetails(
-                    id=ord_details_uuid,
-                    orden_id=orden_id,
-                    version=1,
-                    restaurant_branch_id=restaurant_branch_id,
-                    supplier_unit_id=supplier_unit_id,
-                    cart_id=cart_res["cart_id"],
-                    delivery_date=delivery_date,
-                    delivery_time=delivery_time,
-                    delivery_type=delivery_type,
-                    subtotal_without_tax=(
-                        cart_res["subtotal_without_tax"]
-                        if cart_res["subtotal_without_tax"]
-                        else None
-                    ),
-                    tax=cart_res.get("tax", 0),
-                    discount=None,
-                    discount_code=None,
-                    cashback=None,
-                    cashback_transation_id=None,
-                    shipping_cost=shipping_cost if shipping_cost else None,
-                    packaging_cost=packaging_cost if packaging_cost else None,
-                    service_fee=service_fee if service_fee else None,
-                    total=cart_res["total"] if cart_res["total"] else None,
-                    subtotal=cart_res["subtotal"] if cart_res["subtotal"] else None,
-                    comments=comments if comments else None,
-                    payment_method=payment_method if payment_method else None,
-                    approved_by=approved_by,
-                    created_by=core_user.id,
-                )
-            )
-            # create delivery status
-            await self.orden_status_repo.new(
-                OrdenStatus(
-                    id=uuid.uuid4(),
-                    orden_id=orden_id,
-                    status=status,
-                    created_by=core_user.id,  # type: ignore
-                )
-            )
-
-            # create payment status
-            await self.orden_payment_repo.new(
-                OrdenPayStatus(
-                    id=uuid.uuid4(),
-                    orden_id=orden_id,
-                    status=paystatus,
-                    created_by=core_user.id,  # type: ignore
-                )
-            )
-        except Exception as e:
-            logger.error(e)
-            # if error creating delete orden
-            await self.orden_status_repo.new(
-                OrdenStatus(
-                    id=uuid.uuid4(),
-                    orden_id=orden_id,
-                    status=OrdenStatusType(
-                        DataTypeDecoder.get_orden_status_value("canceled")
-                    ),
-                    created_by=core_user.id,
-                )
-            )
-            raise GQLApiException(
-                msg="Error creating orden details",
-                error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
-            )
-
-        # construct response
-        orden_status = await self.orden_status_repo.get(orden_id)
-        orden_status["status"] = DataTypeDecoder.get_orden_status_value(
-            orden_status["status"]
-        )
-        orden["status"] = OrdenStatus(**orden_status)
-        orden_details = await self.orden_det_repo.get(ord_details_uuid)
-        if orden_details["delivery_time"]:
-            orden_details["delivery_time"] = DeliveryTimeWindow.parse(
-                orden_details["delivery_time"]
-            )
-        orden["details"] = OrdenDetails(**orden_details)
-        orden_paystatus = await self.orden_payment_repo.get(orden_id)
-        if orden_paystatus["status"]:
-            orden_paystatus["status"] = DataTypeDecoder.get_orden_paystatus_value(
-                orden_paystatus["status"]
-            )
-        orden["paystatus"] = OrdenPayStatus(**orden_paystatus)
         # branch
         _branch = await self.rest_branc_repo.get(restaurant_branch_id)
         rest_branch = RestaurantBranch(**_branch)
@@ -1010,7 +961,7 @@ class OrdenHandler(OrdenHandlerInterface):
                             "email": supp_bus_acc.email,
                             "name": sup_business.name,
                         },
-                        orden_details=OrdenDetails(**orden_details),
+                        orden_details=orden["details"],
                         branch_name=rest_branch.branch_name,
                         contact_number=(
                             supp_bus_acc.phone_number
@@ -1031,12 +982,12 @@ class OrdenHandler(OrdenHandlerInterface):
                 and orden_type == OrdenType.NORMAL
             ):
                 try:
-                    send_supplier_whatsapp_confirmation(
+                    await send_supplier_whatsapp_confirmation(
                         to_wa={
                             "phone": supp_bus_acc.phone_number,
                             "name": sup_business.name,
                         },
-                        orden_details=OrdenDetails(**orden_details),
+                        orden_details=orden["details"],
                         branch_name=rest_branch.branch_name,
                         contact_number=ALIMA_SUPPORT_PHONE,
                         delivery_address=rest_branch.full_address,
@@ -1067,7 +1018,7 @@ class OrdenHandler(OrdenHandlerInterface):
                                 ),
                                 "name": rest_branch.branch_name,
                             },
-                            orden_details=OrdenDetails(**orden_details),
+                            orden_details=orden["details"],
                             cart_products=cart_res["cart_product_res"],
                         )
                     else:
@@ -1079,7 +1030,7 @@ class OrdenHandler(OrdenHandlerInterface):
                                 "email": core_user.email,
                                 "name": f"{core_user.first_name} {core_user.last_name}",
                             },
-                            orden_details=OrdenDetails(**orden_details),
+                            orden_details=orden["details"],
                             cart_products=cart_res["cart_product_res"],
                         )
                 except Exception as e:
@@ -1322,7 +1273,7 @@ class OrdenHandler(OrdenHandlerInterface):
             and modified_details
         ):
             try:
-                send_supplier_whatsapp_confirmation(
+                await send_supplier_whatsapp_confirmation(
                     to_wa={
                         "phone": supp_bus_acc.phone_number,
                         "name": supp_bus.name,
@@ -1438,6 +1389,144 @@ class OrdenHandler(OrdenHandlerInterface):
         # return
         return orden_payment_status_gql
 
+    @staticmethod
+    def _build_cart_product(prod: Dict[Any, Any]) -> CartProductGQL:
+        """Build cart product (with supplier product) from `find_with_tax` record"""
+        cprod = CartProductGQL(**sql_to_domain(prod, CartProduct))
+        if isinstance(cprod.sell_unit, str):
+            cprod.sell_unit = UOMType(cprod.sell_unit)
+        cprod.supp_prod = SupplierProduct(**json.loads(prod["tax_json"]))  # type: ignore
+        if cprod.supp_prod:
+            if isinstance(cprod.supp_prod.sell_unit, str):
+                cprod.supp_prod.sell_unit = UOMType(cprod.supp_prod.sell_unit)
+            if isinstance(cprod.supp_prod.buy_unit, str):
+                cprod.supp_prod.buy_unit = UOMType(cprod.supp_prod.buy_unit)
+        return cprod
+
+    async def _build_ordenes(
+        self, _resp: List[Any], hydrate: Optional[Set[str]] = None
+    ) -> List[OrdenGQL]:
+        """Build ordenes from `get_orders` / `find_orders` records, hydrating
+            carts in bulk and branch / supplier info
+
+        Args:
+            _resp (List[Any]): orden records with status, paystatus & details json
+            hydrate (Optional[Set[str]]): relations to hydrate among
+                `cart`, `branch` and `supplier` (all if None)
+
+        Returns:
+            List[OrdenGQL]
+        """
+        if hydrate is None:
+            hydrate = ORDEN_RELATIONS
+        ordenes_dir = []
+        for r in _resp:
+            info_dict = dict(r)
+            orden_info = OrdenGQL(**sql_to_domain(r, Orden))
+            orden_status = json.loads(info_dict["status_json"])
+            if orden_status["status"]:
+                orden_status["status"] = DataTypeDecoder.get_orden_status_value(
+                    orden_status["status"]
+                )
+            orden_paystatus = json.loads(info_dict["paystatus_json"])
+            if orden_paystatus["status"]:
+                orden_paystatus["status"] = DataTypeDecoder.get_orden_paystatus_value(
+                    orden_paystatus["status"]
+                )
+            orden_details = json.loads(info_dict["details_json"])
+            if orden_details["delivery_time"]:
+                orden_details["delivery_time"] = DeliveryTimeWindow.parse(
+                    orden_details["delivery_time"]
+                )
+            if orden_details["payment_method"]:
+                orden_details["payment_method"] = PayMethodType(
+                    orden_details["payment_method"]
+                )
+
+            orden_info.status = OrdenStatus(**orden_status)
+            orden_info.paystatus = OrdenPayStatus(**orden_paystatus)
+            orden_info.details = OrdenDetails(**orden_details)
+            if orden_info.status.created_at:
+                orden_info.status.created_at = from_iso_format(
+                    orden_info.status.created_at  # type: ignore
+                )
+
+            if orden_info.paystatus.created_at:
+                orden_info.paystatus.created_at = from_iso_format(
+                    orden_info.paystatus.created_at  # type: ignore
+                )
+            if orden_info.details.created_at:
+                orden_info.details.created_at = from_iso_format(
+                    orden_info.details.created_at  # type: ignore
+                )
+            if orden_info.details.delivery_date:
+                orden_info.details.delivery_date = datetime.fromisoformat(
+                    orden_info.details.delivery_date  # type: ignore
+                )
+            ordenes_dir.append(orden_info)
+        # cart products - all carts in a single query
+        if "cart" in hydrate:
+            carts_idx = await self.cart_prod_repo.find_many_with_tax(
+                [o.details.cart_id for o in ordenes_dir]  # type: ignore
+            )
+            for orden_info in ordenes_dir:
+                orden_info.cart = [
+                    self._build_cart_product(prod)
+                    for prod in carts_idx.get(UUID(str(orden_info.details.cart_id)), [])  # type: ignore
+                ]
+        # branch & supplier - fetched concurrently so lookups get batched
+        if "branch" in hydrate or "supplier" in hydrate:
+            await asyncio.gather(
+                *[
+                    self._fetch_orden_parties(
+                        o, branch="branch" in hydrate, supplier="supplier" in hydrate
+                    )
+                    for o in ordenes_dir
+                ]
+            )
+        return ordenes_dir
+
+    async def _fetch_orden_parties(
+        self, orden_info: OrdenGQL, branch: bool = True, supplier: bool = True
+    ) -> OrdenGQL:
+        """Add branch and supplier info to orden
+
+        Args:
+            orden_info (OrdenGQL): orden with details
+            branch (bool): whether to add branch info
+            supplier (bool): whether to add supplier info
+
+        Returns:
+            OrdenGQL
+        """
+        # branch
+        if branch:
+            branch_dict = await self.rest_branc_repo.fetch(
+                orden_info.details.restaurant_branch_id  # type: ignore
+            )
+            orden_info.branch = RestaurantBranchGQL(**branch_dict)
+        if not supplier:
+            return orden_info
+        # supplier
+        sup_unit_dict = await self.supp_unit_repo.fetch(
+            orden_info.details.supplier_unit_id  # type: ignore
+        )
+        sup_unit = SupplierUnitGQL(**sup_unit_dict)
+        sup_business = SupplierBusiness(
+            **await self.supp_bus_repo.fetch(sup_unit_dict["supplier_business_id"])
+        )
+        supp_bus_acc = None
+        if orden_info.orden_type == OrdenType.NORMAL.value:
+            supp_bus_acc = SupplierBusinessAccount(
+                **await self.supp_bus_acc_repo.fetch(sup_business.id)
+            )
+        orden_info.supplier = OrdenSupplierGQL(
+            supplier_business=sup_business,
+            supplier_business_account=supp_bus_acc,
+            supplier_unit=sup_unit,
+        )
+        return orden_info
+
     async def search_orden(
         self,
         orden_id: Optional[UUID] = None,
@@ -1450,8 +1539,26 @@ class OrdenHandler(OrdenHandlerInterface):
         payment_method: Optional[PayMethodType] = None,
         from_date: Optional[date] = None,
         to_date: Optional[date] = None,
+        first: Optional[int] = None,
+        after: Optional[str] = None,
+        hydrate: Optional[Set[str]] = None,
+        max_first: int = ORDEN_PAGE_MAX_SIZE,
     ) -> List[OrdenGQL]:
+        """Search ordenes, newest delivery date first when paginated
+
+        Args:
+            first (Optional[int]): page size (all ordenes if None)
+            after (Optional[str]): cursor of the last orden of previous page
+            hydrate (Optional[Set[str]]): relations to hydrate among
+                `cart`, `branch` and `supplier` (all if None)
+            max_first (int): max page size
+
+        Returns:
+            List[OrdenGQL]
+        """
         # data validateion
+        if first is not None:
+            validate_page_size(first, max_first)
         if supplier_business_id:
             supplier_unit_id = (
                 await self.supp_unit_repo.search(
@@ -1461,139 +1568,110 @@ class OrdenHandler(OrdenHandlerInterface):
         # query construction
         orden_atributes = []
         orden_values_view = {}
-        orden_atributes.append(
-            "sc.status_row_num = 1 and pc.paystatus_row_num = 1 and dc.details_row_num = 1 and"
-        )
         if orden_id:
             orden_atributes.append(" ord.id=:orden_id and")
             orden_values_view["orden_id"] = orden_id
         if restaurant_branch_id:
-            orden_atributes.append(" dc.restaurant_branch_id=:restaurant_branch_id and")
+            orden_atributes.append(" oc.restaurant_branch_id=:restaurant_branch_id and")
             orden_values_view["restaurant_branch_id"] = restaurant_branch_id
         if supplier_unit_id:
-            orden_atributes.append(" dc.supplier_unit_id=:supplier_unit_id and")
+            orden_atributes.append(" oc.supplier_unit_id=:supplier_unit_id and")
             orden_values_view["supplier_unit_id"] = supplier_unit_id
         if payment_method:
-            orden_atributes.append(" dc.payment_method=:payment_method and")
+            orden_atributes.append(" oc.payment_method=:payment_method and")
             orden_values_view["payment_method"] = payment_method.value
         if orden_type:
             orden_atributes.append(" ord.orden_type=:orden_type and")
             orden_values_view["orden_type"] = orden_type.value
         if status:
-            orden_atributes.append(" sc.status=:status and")
+            orden_atributes.append(" oc.status=:status and")
             orden_values_view["status"] = DataTypeDecoder.get_orden_status_key(
                 status.value
             )
         if paystatus:
-            orden_atributes.append(" pc.status=:paystatus and")
+            orden_atributes.append(" oc.paystatus=:paystatus and")
             orden_values_view["paystatus"] = DataTypeDecoder.get_orden_paystatus_key(
                 paystatus.value
             )
         if from_date:
-            orden_atributes.append(" dc.delivery_date>=:from_date and")
+            orden_atributes.append(" oc.delivery_date>=:from_date and")
             orden_values_view["from_date"] = from_date
 
         if to_date:
-            orden_atributes.append(" dc.delivery_date<=:to_date and")
+            orden_atributes.append(" oc.delivery_date<=:to_date and")
             orden_values_view["to_date"] = to_date
 
+        if after:
+            _after_date, _after_id = decode_cursor(after, 2)
+            try:
+                orden_values_view["after_date"] = date.fromisoformat(_after_date[:10])
+                orden_values_view["after_id"] = UUID(_after_id)
+            except ValueError:
+                raise GQLApiException(
+                    msg="Invalid pagination cursor",
+                    error_code=GQLApiErrorCodeType.DATAVAL_WRONG_DATATYPE.value,
+                )
+            orden_atributes.append(
+                " (oc.delivery_date, ord.id) < (:after_date, :after_id) and"
+            )
+
         if len(orden_atributes) == 0:
             filter_values = None
         else:
             filter_values = " ".join(orden_atributes).split()
             filter_values = " ".join(filter_values[:-1])
+        if first is not None:
+            # keyset pagination
+            filter_values = (filter_values or "TRUE") + (
+                " ORDER BY oc.delivery_date DESC, ord.id DESC LIMIT :first"
+            )
+            orden_values_view["first"] = first
 
         _resp = await self.orden_repo.get_orders(filter_values, orden_values_view)
+        return await self._build_ordenes(_resp, hydrate)
 
-        ordenes_dir = []
-        for r in _resp:
-            info_dict = dict(r)
-            orden_info = OrdenGQL(**sql_to_domain(r, Orden))
-            orden_status = json.loads(info_dict["status_json"])
-            orden_status.pop("status_row_num")
-            if orden_status["status"]:
-                orden_status["status"] = DataTypeDecoder.get_orden_status_value(
-                    orden_status["status"]
-                )
-            orden_paystatus = json.loads(info_dict["paystatus_json"])
-            orden_paystatus.pop("paystatus_row_num")
-            if orden_paystatus["status"]:
-                orden_paystatus["status"] = DataTypeDecoder.get_orden_paystatus_value(
-                    orden_paystatus["status"]
-                )
-            orden_details = json.loads(info_dict["details_json"])
-            orden_details.pop("details_row_num")
-            if orden_details["delivery_time"]:
-                orden_details["delivery_time"] = DeliveryTimeWindow.parse(
-                    orden_details["delivery_time"]
-                )
-            if orden_details["payment_method"]:
-                orden_details["payment_method"] = PayMethodType(
-                    orden_details["payment_method"]
-                )
+    async def search_orden_connection(
+        self,
+        first: int,
+        after: Optional[str] = None,
+        hydrate: Optional[Set[str]] = None,
+        **filters: Any,
+    ) -> OrdenConnectionGQL:
+        """Search ordenes as a page of a relay-style connection,
+            keyed on (delivery_date, id)
 
-            orden_info.status = OrdenStatus(**orden_status)
-            orden_info.paystatus = OrdenPayStatus(**orden_paystatus)
-            orden_info.details = OrdenDetails(**orden_details)
-            if orden_info.status.created_at:
-                orden_info.status.created_at = from_iso_format(
-                    orden_info.status.created_at  # type: ignore
-                )
+        Args:
+            first (int): page size
+            after (Optional[str]): cursor of the last orden of previous page
+            hydrate (Optional[Set[str]]): relations to hydrate
+            filters: same filters as `search_orden`
 
-            if orden_info.paystatus.created_at:
-                orden_info.paystatus.created_at = from_iso_format(
-                    orden_info.paystatus.created_at  # type: ignore
-                )
-            if orden_info.details.created_at:
-                orden_info.details.created_at = from_iso_format(
-                    orden_info.details.created_at  # type: ignore
-                )
-            if orden_info.details.delivery_date:
-                orden_info.details.delivery_date = datetime.fromisoformat(
-                    orden_info.details.delivery_date  # type: ignore
-                )
-            # cart products
-            _cart = []
-            for prod in await self.cart_prod_repo.find_with_tax(
-                cart_id=orden_info.details.cart_id
-            ):
-                supp_prod = dict(prod)
-                cprod = CartProductGQL(**sql_to_domain(prod, CartProduct))
-                if isinstance(cprod.sell_unit, str):
-                    cprod.sell_unit = UOMType(cprod.sell_unit)
-                cprod.supp_prod = SupplierProduct(**json.loads(supp_prod["tax_json"]))  # type: ignore
-                if cprod.supp_prod:
-                    if isinstance(cprod.supp_prod.sell_unit, str):
-                        cprod.supp_prod.sell_unit = UOMType(cprod.supp_prod.sell_unit)
-                    if isinstance(cprod.supp_prod.buy_unit, str):
-                        cprod.supp_prod.buy_unit = UOMType(cprod.supp_prod.buy_unit)
-                _cart.append(cprod)
-            orden_info.cart = _cart
-            # branch
-            branch_dict = await self.rest_branc_repo.fetch(
-                orden_info.details.restaurant_branch_id
-            )
-            orden_info.branch = RestaurantBranchGQL(**branch_dict)
-            # supplier
-            sup_unit_dict = await self.supp_unit_repo.fetch(
-                orden_info.details.supplier_unit_id
-            )
-            sup_unit = SupplierUnitGQL(**sup_unit_dict)
-            sup_business = SupplierBusiness(
-                **await self.supp_bus_repo.fetch(sup_unit_dict["supplier_business_id"])
-            )
-            supp_bus_acc = None
-            if orden_info.orden_type == OrdenType.NORMAL.value:
-                supp_bus_acc = SupplierBusinessAccount(
-                    **await self.supp_bus_acc_repo.fetch(sup_business.id)
-                )
-            orden_info.supplier = OrdenSupplierGQL(
-                supplier_business=sup_business,
-                supplier_business_account=supp_bus_acc,
-                supplier_unit=sup_unit,
-            )
-            ordenes_dir.append(orden_info)
-        return ordenes_dir
+        Returns:
+            OrdenConnectionGQL
+        """
+        validate_page_size(first)
+        # fetch one extra orden to know if there is a next page
+        ordenes = await self.search_orden(
+            first=first + 1,
+            after=after,
+            hydrate=hydrate,
+            max_first=ORDEN_PAGE_MAX_SIZE + 1,
+            **filters,
+        )
+        edges = [
+            OrdenEdgeGQL(
+                cursor=encode_cursor(o.details.delivery_date, o.id),  # type: ignore
+                node=o,
+            )
+            for o in ordenes[:first]
+        ]
+        return OrdenConnectionGQL(
+            edges=edges,
+            page_info=OrdenPageInfoGQL(
+                has_next_page=len(ordenes) > first,
+                end_cursor=edges[-1].cursor if edges else None,
+            ),
+        )
 
     async def find_orden(
         self,
@@ -1618,40 +1696,37 @@ class OrdenHandler(OrdenHandlerInterface):
         # query construction
         orden_atributes = []
         orden_values_view = {}
-        orden_atributes.append(
-            "sc.status_row_num = 1 and pc.paystatus_row_num = 1 and dc.details_row_num = 1 and"
-        )
         if orden_id:
             orden_atributes.append(" ord.id=:orden_id and")
             orden_values_view["orden_id"] = orden_id
         if restaurant_branch_id:
-            orden_atributes.append(" dc.restaurant_branch_id=:restaurant_branch_id and")
+            orden_atributes.append(" oc.restaurant_branch_id=:restaurant_branch_id and")
             orden_values_view["restaurant_branch_id"] = restaurant_branch_id
         if supplier_unit_id:
-            orden_atributes.append(" dc.supplier_unit_id=:supplier_unit_id and")
+            orden_atributes.append(" oc.supplier_unit_id=:supplier_unit_id and")
             orden_values_view["supplier_unit_id"] = supplier_unit_id
         if payment_method:
-            orden_atributes.append(" dc.payment_method=:payment_method and")
+            orden_atributes.append(" oc.payment_method=:payment_method and")
             orden_values_view["payment_method"] = payment_method.value
         if orden_type:
             orden_atributes.append(" ord.orden_type=:orden_type and")
             orden_values_view["orden_type"] = orden_type.value
         if status:
-            orden_atributes.append(" sc.status=:status and")
+            orden_atributes.append(" oc.status=:status and")
             orden_values_view["status"] = DataTypeDecoder.get_orden_status_key(
                 status.value
             )
         if paystatus:
-            orden_atributes.append(" pc.status=:paystatus and")
+            orden_atributes.append(" oc.paystatus=:paystatus and")
             orden_values_view["paystatus"] = DataTypeDecoder.get_orden_paystatus_key(
                 paystatus.value
             )
         if from_date:
-            orden_atributes.append(" dc.delivery_date>=:from_date and")
+            orden_atributes.append(" oc.delivery_date>=:from_date and")
             orden_values_view["from_date"] = from_date
 
         if to_date:
-            orden_atributes.append(" dc.delivery_date<=:to_date and")
+            orden_atributes.append(" oc.delivery_date<=:to_date and")
             orden_values_view["to_date"] = to_date
 
         if len(orden_atributes) == 0:
@@ -1662,103 +1737,12 @@ class OrdenHandler(OrdenHandlerInterface):
 
         _resp = await self.orden_repo.find_orders(filter_values, orden_values_view)
 
-        ordenes_dir = []
-        for r in _resp:
-            info_dict = dict(r)
-            orden_info = OrdenGQL(**sql_to_domain(r, Orden))
-            orden_status = json.loads(info_dict["status_json"])
-            orden_status.pop("status_row_num")
-            if orden_status["status"]:
-                orden_status["status"] = DataTypeDecoder.get_orden_status_value(
-                    orden_status["status"]
-                )
-            orden_paystatus = json.loads(info_dict["paystatus_json"])
-            orden_paystatus.pop("paystatus_row_num")
-            if orden_paystatus["status"]:
-                orden_paystatus["status"] = DataTypeDecoder.get_orden_paystatus_value(
-                    orden_paystatus["status"]
-                )
-            orden_details = json.loads(info_dict["details_json"])
-            orden_details.pop("details_row_num")
-            if orden_details["delivery_time"]:
-                orden_details["delivery_time"] = DeliveryTimeWindow.parse(
-                    orden_details["delivery_time"]
-                )
-            if orden_details["payment_method"]:
-                orden_details["payment_method"] = PayMethodType(
-                    orden_details["payment_method"]
-                )
-
-            orden_info.status = OrdenStatus(**orden_status)
-            orden_info.paystatus = OrdenPayStatus(**orden_paystatus)
-            orden_info.details = OrdenDetails(**orden_details)
-            if orden_info.status.created_at:
-                orden_info.status.created_at = from_iso_format(
-                    orden_info.status.created_at  # type: ignore
-                )
-
-            if orden_info.paystatus.created_at:
-                orden_info.paystatus.created_at = from_iso_format(
-                    orden_info.paystatus.created_at  # type: ignore
-                )
-            if orden_info.details.created_at:
-                orden_info.details.created_at = from_iso_format(
-                    orden_info.details.created_at  # type: ignore
-                )
-            if orden_info.details.delivery_date:
-                orden_info.details.delivery_date = datetime.fromisoformat(
-                    orden_info.details.delivery_date  # type: ignore
-                )
-            # cart products
-            _cart = []
-            for prod in await self.cart_prod_repo.find_with_tax(
-                cart_id=orden_info.details.cart_id
-            ):
-                supp_prod = dict(prod)
-                cprod = CartProductGQL(**sql_to_domain(prod, CartProduct))
-                if isinstance(cprod.sell_unit, str):
-                    cprod.sell_unit = UOMType(cprod.sell_unit)
-                cprod.supp_prod = SupplierProduct(**json.loads(supp_prod["tax_json"]))  # type: ignore
-                if cprod.supp_prod:
-                    if isinstance(cprod.supp_prod.sell_unit, str):
-                        cprod.supp_prod.sell_unit = UOMType(cprod.supp_prod.sell_unit)
-                    if isinstance(cprod.supp_prod.buy_unit, str):
-                        cprod.supp_prod.buy_unit = UOMType(cprod.supp_prod.buy_unit)
-                _cart.append(cprod)
-            orden_info.cart = _cart
-            # branch
-            branch_dict = await self.rest_branc_repo.fetch(
-                orden_info.details.restaurant_branch_id
-            )
-            orden_info.branch = RestaurantBranchGQL(**branch_dict)
-            # supplier
-            sup_unit_dict = await self.supp_unit_repo.fetch(
-                orden_info.details.supplier_unit_id
-            )
-            sup_unit = SupplierUnitGQL(**sup_unit_dict)
-            sup_business = SupplierBusiness(
-                **await self.supp_bus_repo.fetch(sup_unit_dict["supplier_business_id"])
-            )
-            supp_bus_acc = None
-            if orden_info.orden_type == OrdenType.NORMAL.value:
-                supp_bus_acc = SupplierBusinessAccount(
-                    **await self.supp_bus_acc_repo.fetch(sup_business.id)
-                )
-            orden_info.supplier = OrdenSupplierGQL(
-                supplier_business=sup_business,
-                supplier_business_account=supp_bus_acc,
-                supplier_unit=sup_unit,
-            )
-            ordenes_dir.append(orden_info)
-        return ordenes_dir
+        return await self._build_ordenes(_resp)
 
     async def search_ordens_with_many(self, orden_ids: List[UUID]) -> List[OrdenGQL]:
         # query construction
         orden_atributes = []
         orden_values_view = {}
-        orden_atributes.append(
-            "sc.status_row_num = 1 and pc.paystatus_row_num = 1 and dc.details_row_num = 1 and"
-        )
         if orden_ids:
             orden_atributes.append(f" ord.id in {list_into_strtuple(orden_ids)} and")
         if len(orden_atributes) == 0:
@@ -1769,95 +1753,7 @@ class OrdenHandler(OrdenHandlerInterface):
 
         _resp = await self.orden_repo.get_orders(filter_values, orden_values_view)
 
-        ordenes_dir = []
-        for r in _resp:
-            info_dict = dict(r)
-            orden_info = OrdenGQL(**sql_to_domain(r, Orden))
-            orden_status = json.loads(info_dict["status_json"])
-            orden_status.pop("status_row_num")
-            if orden_status["status"]:
-                orden_status["status"] = DataTypeDecoder.get_orden_status_value(
-                    orden_status["status"]
-                )
-            orden_paystatus = json.loads(info_dict["paystatus_json"])
-            orden_paystatus.pop("paystatus_row_num")
-            if orden_paystatus["status"]:
-                orden_paystatus["status"] = DataTypeDecoder.get_orden_paystatus_value(
-                    orden_paystatus["status"]
-                )
-            orden_details = json.loads(info_dict["details_json"])
-            orden_details.pop("details_row_num")
-            if orden_details["delivery_time"]:
-                orden_details["delivery_time"] = DeliveryTimeWindow.parse(
-                    orden_details["delivery_time"]
-                )
-            if orden_details["payment_method"]:
-                orden_details["payment_method"] = PayMethodType(
-                    orden_details["payment_method"]
-                )
-
-            orden_info.status = OrdenStatus(**orden_status)
-            orden_info.paystatus = OrdenPayStatus(**orden_paystatus)
-            orden_info.details = OrdenDetails(**orden_details)
-            if orden_info.status.created_at:
-                orden_info.status.created_at = from_iso_format(
-                    orden_info.status.created_at  # type: ignore
-                )
-
-            if orden_info.paystatus.created_at:
-                orden_info.paystatus.created_at = from_iso_format(
-                    orden_info.paystatus.created_at  # type: ignore
-                )
-            if orden_info.details.created_at:
-                orden_info.details.created_at = from_iso_format(
-                    orden_info.details.created_at  # type: ignore
-                )
-            if orden_info.details.delivery_date:
-                orden_info.details.delivery_date = datetime.fromisoformat(
-                    orden_info.details.delivery_date  # type: ignore
-                )
-            # cart products
-            _cart = []
-            for prod in await self.cart_prod_repo.find_with_tax(
-                cart_id=orden_info.details.cart_id
-            ):
-                supp_prod = dict(prod)
-                cprod = CartProductGQL(**sql_to_domain(prod, CartProduct))
-                if isinstance(cprod.sell_unit, str):
-                    cprod.sell_unit = UOMType(cprod.sell_unit)
-                cprod.supp_prod = SupplierProduct(**json.loads(supp_prod["tax_json"]))  # type: ignore
-                if cprod.supp_prod:
-                    if isinstance(cprod.supp_prod.sell_unit, str):
-                        cprod.supp_prod.sell_unit = UOMType(cprod.supp_prod.sell_unit)
-                    if isinstance(cprod.supp_prod.buy_unit, str):
-                        cprod.supp_prod.buy_unit = UOMType(cprod.supp_prod.buy_unit)
-                _cart.append(cprod)
-            orden_info.cart = _cart
-            # branch
-            branch_dict = await self.rest_branc_repo.fetch(
-                orden_info.details.restaurant_branch_id
-            )
-            orden_info.branch = RestaurantBranchGQL(**branch_dict)
-            # supplier
-            sup_unit_dict = await self.supp_unit_repo.fetch(
-                orden_info.details.supplier_unit_id
-            )
-            sup_unit = SupplierUnitGQL(**sup_unit_dict)
-            sup_business = SupplierBusiness(
-                **await self.supp_bus_repo.fetch(sup_unit_dict["supplier_business_id"])
-            )
-            supp_bus_acc = None
-            if orden_info.orden_type == OrdenType.NORMAL.value:
-                supp_bus_acc = SupplierBusinessAccount(
-                    **await self.supp_bus_acc_repo.fetch(sup_business.id)
-                )
-            orden_info.supplier = OrdenSupplierGQL(
-                supplier_business=sup_business,
-                supplier_business_account=supp_bus_acc,
-                supplier_unit=sup_unit,
-            )
-            ordenes_dir.append(orden_info)
-        return ordenes_dir
+        return await self._build_ordenes(_resp)
 
     async def merge_ordenes_invoices(
         self, ordenes: List[OrdenGQL], invoices: List[MxInvoiceGQL]
@@ -2602,11 +2498,12 @@ class OrdenHookListener(OrdenHookListenerInterface):
                 ),
                 "source_type": webhook.source_type,
             }
-            resp_webhook = requests.post(
+            resp_webhook = await get_transport(
+                "orden_webhook", timeout=0.5, retries=0
+            ).post(
                 webhook.url,
                 data=json.dumps(json_data),
                 headers={"Content-Type": "application/json"},
-                timeout=0.5,
             )
             logger.info("Webhook sent")
             logger.info(f"Resp Code: {resp_webhook.status_code}")
@@ -91,7 +91,7 @@ from gqlapi.utils.helpers import (
 )
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException, error_code_decode
 from gqlapi.repository.user.core_user import CoreUserRepositoryInterface
-from gqlapi.models.delivery_zones import DZ_IDX
+from gqlapi.models.delivery_zones import DEFAULT_DZ_FILE, get_delivery_zone_index
 
 # logger
 logger = get_logger(get_app())
@@ -1749,7 +1749,9 @@ class RestaurantSupplierHandler(RestaurantSupplierHandlerInterface):
                 error_code=GQLApiErrorCodeType.FETCH_SQL_DB_NOT_FOUND.value,
             )
         rest_branch = RestaurantBranch(**_rb_dict)
-        assigned_dz = DZ_IDX.get(rest_branch.zip_code, None)
+        assigned_dz = get_delivery_zone_index(DEFAULT_DZ_FILE).zones.get(
+            rest_branch.zip_code, None
+        )
         if not assigned_dz:
             logger.warning("Delivery zone currently not available")
             return []
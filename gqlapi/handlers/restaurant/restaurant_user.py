@@ -527,13 +527,13 @@ class RestaurantEmployeeHandler(RestaurantEmployeeHandlerInterface):
         for i in range(pwd_length):
             pwd += "".join(secrets.choice(alphabet))
         # create firebase user and update display name
-        fb_dict = self.firebase.signup_with_email(email, pwd)
+        fb_dict = await self.firebase.signup_with_email(email, pwd)
         if "localId" not in fb_dict:
             raise GQLApiException(
                 msg="Error creating firebase user",
                 error_code=GQLApiErrorCodeType.INSERT_FIREBASE_DB_ERROR.value,
             )
-        self.firebase.update_profile(
+        await self.firebase.update_profile(
             fb_dict["idToken"], **{"displayName": f"{name} {last_name}"}
         )
         # create core user
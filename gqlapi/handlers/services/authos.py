@@ -1,8 +1,10 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
 import logging
 from types import NoneType
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from uuid import UUID, uuid4
 from gqlapi.domain.interfaces.v2.b2bcommerce.ecommerce_seller import (
     EcommerceUserRestaurantRelationRepositoryInterface,
@@ -33,9 +35,27 @@ from gqlapi.domain.interfaces.v2.authos.ecommerce_session import (
     UserSessionRepositoryInterface,
 )
 
-from gqlapi.config import AUTHOS_ALGORITHM, AUTHOS_SECRET_KEY, AUTHOS_TOKEN_TTL
+from gqlapi.config import (
+    AUTHOS_ALGORITHM,
+    AUTHOS_BCRYPT_ROUNDS,
+    AUTHOS_HASHING_WORKERS,
+    AUTHOS_SECRET_KEY,
+    AUTHOS_TOKEN_TTL,
+)
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 
+# shared password context - hashes below the configured rounds need update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=AUTHOS_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=AUTHOS_BCRYPT_ROUNDS,
+)
+# bounded pool to run bcrypt out of the event loop
+pwd_executor = ThreadPoolExecutor(
+    max_workers=AUTHOS_HASHING_WORKERS, thread_name_prefix="bcrypt"
+)
+
 
 class EcommerceJWTHandler:
     @staticmethod
@@ -91,8 +111,7 @@ class EcommerceJWTHandler:
         Returns:
             str: Hashed Password
         """
-        crypto_ctx = CryptContext(schemes=["bcrypt"])
-        return crypto_ctx.hash(password)
+        return pwd_context.hash(password)
 
     @staticmethod
     def verify_password(password: str, hashed_password: str) -> bool:
@@ -105,8 +124,39 @@ class EcommerceJWTHandler:
         Returns:
             bool: True if verified else False
         """
-        crypto_ctx = CryptContext(schemes=["bcrypt"])
-        return crypto_ctx.verify(password, hashed_password)
+        return pwd_context.verify(password, hashed_password)
+
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """Hash Password in the hashing pool
+
+        Args:
+            password (str): Password
+
+        Returns:
+            str: Hashed Password
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pwd_executor, pwd_context.hash, password)
+
+    @staticmethod
+    async def verify_and_update_password(
+        password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify Password in the hashing pool
+
+        Args:
+            password (str): Password
+            hashed_password (str): Hashed Password
+
+        Returns:
+            Tuple[bool, Optional[str]]: True if verified else False,
+                new hash if the stored one needs to be updated
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            pwd_executor, pwd_context.verify_and_update, password, hashed_password
+        )
 
 
 class AuthosTokenHandler(AuthosTokenHandlerInterface):
@@ -480,11 +530,23 @@ class EcommerceUserHandler(EcommerceUserHandlerInterface):
                 error_code=GQLApiErrorCodeType.AUTHOS_ERROR_ELEMENT_NOT_FOUND.value,
             )
         # verify password
-        if not EcommerceJWTHandler.verify_password(password, ecomm_usr.password):
+        verified, new_hash = await EcommerceJWTHandler.verify_and_update_password(
+            password, ecomm_usr.password
+        )
+        if not verified:
             raise GQLApiException(
                 msg="Password is incorrect",
                 error_code=GQLApiErrorCodeType.AUTHOS_ERROR_WRONG_PASSWORD.value,
             )
+        # rehash password with current work factor
+        if new_hash:
+            try:
+                await self.ecommerce_user_repo.set_password(
+                    ecomm_usr.id, new_hash, ref_secret_key
+                )
+            except Exception as e:
+                logging.warning("Error rehashing password")
+                logging.error(e)
         # verify token
         token_session = await self.user_session_handler.is_session_valid(
             session_token, ref_secret_key, with_expiration=False
@@ -640,7 +702,7 @@ class EcommerceUserHandler(EcommerceUserHandlerInterface):
                 error_code=GQLApiErrorCodeType.AUTHOS_ERROR_EMAIL_ALREADY_REGISTERED.value,
             )
         # encode password
-        hpswd = EcommerceJWTHandler.hash_password(password)
+        hpswd = await EcommerceJWTHandler.hash_password_async(password)
         # create new ecommerce user
         ecomm_usr = IEcommerceUser(
             id=uuid4(),
@@ -749,9 +811,11 @@ class EcommercePasswordHandler(EcommercePasswordHandlerInterface):
         self,
         pwd_restore_repo: PwdRestoreRepositoryInterface,
         ecommerce_user_repo: EcommerceUserRepositoryInterface,
+        user_session_repo: Optional[UserSessionRepositoryInterface] = None,
     ) -> None:
         self.pwd_restore_repo = pwd_restore_repo
         self.ecommerce_user_repo = ecommerce_user_repo
+        self.user_session_repo = user_session_repo
 
     async def create_restore_token(
         self,
@@ -877,10 +941,15 @@ class EcommercePasswordHandler(EcommercePasswordHandlerInterface):
                 error_code=GQLApiErrorCodeType.AUTHOS_ERROR_ELEMENT_NOT_FOUND.value,
             )
         # update password in Ref seller DB
-        upd_pass = EcommerceJWTHandler.hash_password(password)
+        upd_pass = await EcommerceJWTHandler.hash_password_async(password)
         pwd_flag = await self.ecommerce_user_repo.set_password(
             ecomm_usr.id, upd_pass, ref_secret_key
         )
+        # drop cached sessions of the user
+        if self.user_session_repo is not None:
+            self.user_session_repo.invalidate_user_sessions(
+                ecomm_usr.id, ref_secret_key
+            )
         # delete restore token
         if not await self.pwd_restore_repo.delete_pwd_restore(
             decoded_token["email"], ref_secret_key
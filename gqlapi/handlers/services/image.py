@@ -53,7 +53,7 @@ class SupplierProductImageHandler(ImageHandlerInterface):
         )
         priority = await self.repository.get_last_priority(supplier_product_id) + 1
         img_key = str(supplier_product_id) + "_" + str(_supp_image_count)
-        route = cloudinary_api.upload(
+        route = await cloudinary_api.upload(
             folder=Folders.MARKETPLACE.value,
             img_file=file_data,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.SUPPLIER_PRODUCTS.value}",
@@ -96,12 +96,12 @@ class SupplierProductImageHandler(ImageHandlerInterface):
         file_data: bytes = await image.read()  # type: ignore
         # Split the path by '/'
         img_key = supplier_product_image.image_url.split("/")[-1]
-        cloudinary_api.delete(
+        await cloudinary_api.delete(
             folder=Folders.MARKETPLACE.value,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.SUPPLIER_PRODUCTS.value}",
             img_key=img_key,
         )
-        route = cloudinary_api.upload(
+        route = await cloudinary_api.upload(
             folder=Folders.MARKETPLACE.value,
             img_file=file_data,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.SUPPLIER_PRODUCTS.value}",
@@ -134,7 +134,7 @@ class SupplierProductImageHandler(ImageHandlerInterface):
         cloudinary_api = CloudinaryApi(env=DEV_ENV)
         # Split the path by '/'
         img_key = supplier_product_image.image_url.split("/")[-1]
-        route = cloudinary_api.delete(
+        route = await cloudinary_api.delete(
             folder=Folders.MARKETPLACE.value,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.SUPPLIER_PRODUCTS.value}",
             img_key=img_key,
@@ -325,12 +325,12 @@ class SupplierBusinessHandler(SupplierBusinessHandlerInterface):
         file_data: bytes = await logo.read()  # type: ignore
         # Split the path by '/'
         img_key = str(supplier_business_id)
-        cloudinary_api.delete(
+        await cloudinary_api.delete(
             folder=Folders.MARKETPLACE.value,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
             img_key=img_key,
         )
-        route = cloudinary_api.upload(
+        route = await cloudinary_api.upload(
             folder=Folders.MARKETPLACE.value,
             img_file=file_data,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
@@ -356,7 +356,7 @@ class SupplierBusinessHandler(SupplierBusinessHandlerInterface):
         cloudinary_api = CloudinaryApi(env=DEV_ENV)
         # Split the path by '/'
         img_key = str(supplier_business_id)
-        cloudinary_api.delete(
+        await cloudinary_api.delete(
             folder=Folders.MARKETPLACE.value,
             subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
             img_key=img_key,
@@ -4,6 +4,12 @@ import ast
 from types import NoneType
 from typing import Any, Dict, List, Optional
 from uuid import UUID, uuid4
+from gqlapi.config import (
+    EFFECTIVE_PRICES_WRITE,
+    PRICE_LIST_LINKS_READ,
+    SCRIPT_JOB_ATTEMPTS,
+    SCRIPT_JOB_MAX_ATTEMPTS,
+)
 from gqlapi.repository.supplier.supplier_price_list import DEFAULT_SP_PRICE_LIST_NAME
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.lib.logger.logger.basic_logger import get_logger
@@ -35,8 +41,15 @@ from gqlapi.domain.interfaces.v2.supplier.supplier_product import (
     SupplierProductRepositoryInterface,
 )
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
+from gqlapi.handlers.supplier.supplier_unit import invalidate_catalogs
+from gqlapi.repository.scripts.script_job import ScriptJobRepository
+from gqlapi.repository.scripts.scripts_execution import ScriptExecutionRepository
 from gqlapi.utils.batch_files import verify_supplier_product_row_is_complete
 from gqlapi.utils.helpers import list_into_strtuple
+from gqlapi.utils.metrics import EFFECTIVE_PRICE_REFRESH_ERRORS
+
+# script job that refreshes the effective prices of a supplier unit
+EFFECTIVE_PRICES_SCRIPT = "run_daily_effective_prices"
 
 logger = get_logger(get_app())
 
@@ -59,6 +72,70 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
         self.supplier_product_handler = supplier_product_handler
 
     # Private Methods
+    async def _invalidate_catalogs(
+        self,
+        supplier_unit_ids: Optional[List[UUID]] = None,
+        supplier_business_id: Optional[UUID] = None,
+        price_list_name: Optional[str] = None,
+    ) -> None:
+        """Recompute effective prices (only the scopes of the changed price
+        list when `price_list_name` is given) and bump catalog version of
+        the supplier units (invalidates cached ecommerce catalogs)
+        """
+        if EFFECTIVE_PRICES_WRITE:
+            try:
+                await self.supplier_price_list_repo.refresh_effective_prices(
+                    supplier_unit_ids=supplier_unit_ids,
+                    supplier_business_id=supplier_business_id,
+                    price_list_name=price_list_name,
+                )
+            except Exception as e:
+                EFFECTIVE_PRICE_REFRESH_ERRORS.inc()
+                logger.error("Error refreshing effective prices, enqueuing refresh")
+                logger.error(e)
+                await self._enqueue_effective_prices_refresh(
+                    supplier_unit_ids, supplier_business_id
+                )
+        await invalidate_catalogs(
+            self.supplier_unit_repo,
+            supplier_unit_ids=supplier_unit_ids,
+            supplier_business_id=supplier_business_id,
+        )
+
+    async def _enqueue_effective_prices_refresh(
+        self,
+        supplier_unit_ids: Optional[List[UUID]] = None,
+        supplier_business_id: Optional[UUID] = None,
+    ) -> None:
+        """Enqueue a full effective prices refresh of each supplier unit
+        (script job), so a failed refresh is not served until the daily one
+        """
+        try:
+            _unit_ids = list(supplier_unit_ids or [])
+            if supplier_business_id:
+                _units = await self.supplier_unit_repo.find(
+                    supplier_business_id=supplier_business_id
+                )
+                _unit_ids.extend(su["id"] for su in _units)
+            _db = self.supplier_price_list_repo.db  # type: ignore
+            exec_repo = ScriptExecutionRepository(_db)
+            job_repo = ScriptJobRepository(_db)
+            for su_id in sorted(set(_unit_ids)):
+                exec_id = await exec_repo.add(EFFECTIVE_PRICES_SCRIPT, status="queued")
+                if not exec_id:
+                    raise Exception("Error creating script execution record")
+                await job_repo.enqueue(
+                    script_execution_id=exec_id,
+                    script_name=EFFECTIVE_PRICES_SCRIPT,
+                    args={"supplier_unit_id": str(su_id)},
+                    max_attempts=SCRIPT_JOB_ATTEMPTS.get(
+                        EFFECTIVE_PRICES_SCRIPT, SCRIPT_JOB_MAX_ATTEMPTS
+                    ),
+                )
+        except Exception as e:
+            logger.error("Error enqueuing effective prices refresh")
+            logger.error(e)
+
     async def _validate_input_upsert_spl(
         self,
         supplier_unit_ids: List[UUID],
@@ -82,6 +159,29 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
                     error_code=GQLApiErrorCodeType.FETCH_SQL_DB_NOT_FOUND.value,
                 )
 
+    async def _fetch_price_list_ids(
+        self, supplier_price_lists: List[Dict[str, Any]]
+    ) -> Dict[UUID, Dict[str, List[UUID]]]:
+        """Price and restaurant branch ids of each price list
+        (from link tables, or the JSON arrays until they are backfilled)
+        """
+        if PRICE_LIST_LINKS_READ:
+            return await self.supplier_price_list_repo.fetch_price_list_links(
+                [spl["id"] for spl in supplier_price_lists]
+            )
+        return {
+            spl["id"]: {
+                "supplier_product_price_ids": [
+                    UUID(p) for p in json.loads(spl["supplier_product_price_ids"])
+                ],
+                "supplier_restaurant_relation_ids": [
+                    UUID(rb)
+                    for rb in json.loads(spl["supplier_restaurant_relation_ids"] or "[]")
+                ],
+            }
+            for spl in supplier_price_lists
+        }
+
     async def fetch_supplier_product_idxs(
         self, supplier_business_id: UUID
     ) -> Dict[str, Any]:
@@ -221,12 +321,12 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
             return []
 
         # parse supplier price lists & restaurant branch ids
+        spl_ids = await self._fetch_price_list_ids(supplier_price_lists)
         parsed_price_ids = []
         parsed_rb_ids = []
-        for _spl in supplier_price_lists:
-            parsed_price_ids.extend(json.loads(_spl["supplier_product_price_ids"]))
-            _rbs = json.loads(_spl["supplier_restaurant_relation_ids"])
-            parsed_rb_ids.extend(_rbs if _rbs else [])
+        for _spl_ids in spl_ids.values():
+            parsed_price_ids.extend(_spl_ids["supplier_product_price_ids"])
+            parsed_rb_ids.extend(_spl_ids["supplier_restaurant_relation_ids"])
         # get supplier product prices
         sp_ids = []
         if parsed_price_ids:
@@ -291,10 +391,8 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
         spl_gql_list = []
         for spl in supplier_price_lists:
             # supplier product price
-            p_ids = [UUID(p) for p in json.loads(spl["supplier_product_price_ids"])]
-            rb_ids = [
-                UUID(rb) for rb in json.loads(spl["supplier_restaurant_relation_ids"])
-            ]
+            p_ids = spl_ids[spl["id"]]["supplier_product_price_ids"]
+            rb_ids = spl_ids[spl["id"]]["supplier_restaurant_relation_ids"]
             # gql obj
             spl_gql = SupplierPriceListDetails(
                 prices_details=[
@@ -365,11 +463,12 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
             return []
         # parse supplier price lists & restaurant branch ids
 
+        spl_ids = await self._fetch_price_list_ids(supplier_price_lists)
         parsed_su_ids = set()
         price_list_result=[]
         for _spl in supplier_price_lists:
             parsed_price_ids = []
-            parsed_price_ids.extend(json.loads(_spl["supplier_product_price_ids"]))
+            parsed_price_ids.extend(spl_ids[_spl["id"]]["supplier_product_price_ids"])
             _spl_dict = dict(_spl)
             # get supplier product prices
             if parsed_price_ids:
@@ -459,12 +558,7 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
             return None
         spl = dict(_spl[0])
         # parse supplier price list
-        spl["supplier_product_price_ids"] = json.loads(
-            spl["supplier_product_price_ids"]
-        )
-        spl["supplier_restaurant_relation_ids"] = json.loads(
-            spl["supplier_restaurant_relation_ids"]
-        )
+        spl.update((await self._fetch_price_list_ids([spl]))[spl["id"]])
         # return supplier price list
         return SupplierPriceList(**spl)
 
@@ -571,6 +665,7 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
                     msg="Could not create Supplier Price List",
                     error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
                 )
+        await self._invalidate_catalogs(supplier_unit_ids, price_list_name=name)
         # return feedback
         return feedbacks
 
@@ -642,6 +737,9 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
         spp_list.id = uuid4()
         # return status
         _sp_id = await self.supplier_price_list_repo.add(spp_list)
+        await self._invalidate_catalogs(
+            [spp_list.supplier_unit_id], price_list_name=spp_list.name
+        )
         return _sp_id is not None
 
     async def add_price_to_default_price_lists(
@@ -829,6 +927,7 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
                     msg="Could not create Supplier Price List",
                     error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
                 )
+        await self._invalidate_catalogs(supplier_unit_ids, price_list_name=name)
         # return feedbacks
         return feedbacks
     
@@ -896,6 +995,7 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
                     msg="Could not create Supplier Price List",
                     error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
                 )
+        await self._invalidate_catalogs(supplier_unit_ids, price_list_name=name)
         # return feedbacks
         return feedbacks
 
@@ -984,6 +1084,9 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
                 msg="Could not create Supplier Price List",
                 error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
             )
+        await self._invalidate_catalogs(
+            [price_list_obj.supplier_unit_id], price_list_name=price_list_obj.name
+        )
         # return feedbacks
         return True
 
@@ -1064,4 +1167,8 @@ class SupplierPriceListHandler(SupplierPriceListHandlerInterface):
         if await self.supplier_price_list_repo.delete(
             supplier_product_price_list.name, unit_obj.supplier_business_id
         ):
+            # scopes of the deleted list are unknown: refresh the whole units
+            await self._invalidate_catalogs(
+                supplier_business_id=unit_obj.supplier_business_id
+            )
             return True
@@ -39,8 +39,9 @@ from gqlapi.domain.models.v2.supplier import (
 from gqlapi.domain.interfaces.v2.supplier.supplier_unit import SupplierUnitRepositoryInterface
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.lib.logger.logger.basic_logger import get_logger
-from gqlapi.config import ALIMA_ADMIN_BUSINESS
+from gqlapi.config import ALIMA_ADMIN_BUSINESS, PRODUCT_SEARCH_INDEX
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
+from gqlapi.handlers.supplier.supplier_unit import invalidate_catalogs
 from gqlapi.utils.batch_files import (
     INTEGER_UOMS,
     SUPPLIER_PRODUCT_BATCH_FILE_COLS,
@@ -51,6 +52,8 @@ from gqlapi.utils.batch_files import (
 )
 from gqlapi.utils.domain_mapper import sql_to_domain
 from gqlapi.utils.helpers import list_into_strtuple
+from gqlapi.utils.product_index import product_index
+from gqlapi.repository.supplier.supplier_unit import UNIT_CATALOG_VERSIONS_QUERY
 from gqlapi.repository.user.core_user import CoreUserRepositoryInterface
 
 # logger
@@ -89,6 +92,68 @@ class SupplierProductHandler(SupplierProductHandlerInterface):
         if supplier_product_stock_repo:
             self.supplier_product_stock_repo = supplier_product_stock_repo
 
+    async def _invalidate_catalogs(
+        self,
+        supplier_business_id: UUID,
+        supplier_product_ids: Optional[List[UUID]] = None,
+    ) -> None:
+        """Bump catalog version of all the supplier business units
+        (invalidates cached ecommerce catalogs), and update the
+        product search index with the changed products (all if not given)
+        """
+        await self._update_product_index(supplier_business_id, supplier_product_ids)
+        await invalidate_catalogs(
+            self.supplier_unit_repo, supplier_business_id=supplier_business_id
+        )
+        await self._advance_product_index_versions(supplier_business_id)
+
+    def _verify_supplier_unit_repo(self) -> None:
+        """Catalog changes must invalidate the cached catalogs, verify it
+        before changing anything
+        """
+        if not hasattr(self, "supplier_unit_repo"):
+            raise GQLApiException(
+                msg="Supplier unit repo is required to change supplier products",
+                error_code=GQLApiErrorCodeType.UNEXPECTED_ERROR.value,
+            )
+
+    async def _update_product_index(
+        self,
+        supplier_business_id: UUID,
+        supplier_product_ids: Optional[List[UUID]] = None,
+    ) -> None:
+        if not PRODUCT_SEARCH_INDEX:
+            return
+        try:
+            docs = await self.supplier_product_repo.fetch_search_documents(
+                supplier_business_id, supplier_product_ids
+            )
+            if supplier_product_ids is None:
+                product_index.load(supplier_business_id, docs)
+            else:
+                product_index.upsert(supplier_business_id, docs)
+        except Exception as e:
+            logger.warning("Issues updating product search index")
+            logger.error(e)
+
+    async def _advance_product_index_versions(self, supplier_business_id: UUID) -> None:
+        """Keep the product index fresh after bumping the catalog version
+        of the supplier units (index already has the changed products)
+        """
+        if not PRODUCT_SEARCH_INDEX:
+            return
+        try:
+            _units = await self.supplier_unit_repo.raw_query(
+                UNIT_CATALOG_VERSIONS_QUERY.format(
+                    filter="WHERE su.supplier_business_id = :supplier_business_id"
+                ),
+                {"supplier_business_id": supplier_business_id},
+            )
+            product_index.advance_versions({u["id"]: u["version"] for u in _units})
+        except Exception as e:
+            logger.warning("Issues updating product search index versions")
+            logger.error(e)
+
     def validate_cols_supplier_products_file(self, df: pd.DataFrame) -> pd.DataFrame:
         # validate that it contains all needed columns
         df_columns_set = set(df.columns)
@@ -783,6 +848,7 @@ class SupplierProductHandler(SupplierProductHandlerInterface):
         -------
         List[SupplierProductsBatch]
         """
+        self._verify_supplier_unit_repo()
         # validate file
         xls = pd.ExcelFile(product_file)
         if len(xls.sheet_names) > 1:
@@ -831,6 +897,7 @@ class SupplierProductHandler(SupplierProductHandlerInterface):
             tax_codes,
             core_user_id=core_user.id,  # type: ignore
         )
+        await self._invalidate_catalogs(supplier_business["id"])
         # return data
         return feedbacks
 
@@ -1207,6 +1274,7 @@ class SupplierProductHandler(SupplierProductHandlerInterface):
         long_description: Optional[str] = None,
         mx_ieps: Optional[float] = None,
     ) -> SupplierProductDetailsGQL:
+        self._verify_supplier_unit_repo()
         # get supplier user
         core_user, supplier_business = await self.fetch_supplier_business(firebase_id)
         # verify tax id is within sat codes
@@ -1270,6 +1338,7 @@ class SupplierProductHandler(SupplierProductHandlerInterface):
             ]
             if not await self.supplier_product_repo.add_tags(s_prod.id, _tgs):
                 logger.warning("Could not add tags to supplier product")
+        await self._invalidate_catalogs(supplier_business_id, [s_prod.id])
         return SupplierProductDetailsGQL(**s_prod.__dict__)
 
     async def edit_supplier_product(
@@ -1295,6 +1364,7 @@ class SupplierProductHandler(SupplierProductHandlerInterface):
         long_description: Optional[str] = None,
         mx_ieps: Optional[float] = None,
     ) -> SupplierProductDetailsGQL:
+        self._verify_supplier_unit_repo()
         # fetch supplier product
         _sprod = await self.supplier_product_repo.fetch(supplier_product_id)
         if not _sprod:
@@ -1401,6 +1471,7 @@ class SupplierProductHandler(SupplierProductHandlerInterface):
                 ],
             ):
                 logger.warning("Could not add tags to supplier product")
+        await self._invalidate_catalogs(sup_prod.supplier_business_id, [sup_prod.id])
         return SupplierProductDetailsGQL(**sup_prod.__dict__)
 
     async def get_customer_products_to_export(
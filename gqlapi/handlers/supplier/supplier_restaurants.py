@@ -5,6 +5,12 @@ from uuid import UUID, uuid4
 import uuid
 from bson import Binary
 
+from gqlapi.config import (
+    EFFECTIVE_PRICES_READ,
+    PRICE_LIST_LINKS_READ,
+    PRODUCT_SEARCH_INDEX,
+    PRODUCT_SEARCH_MAX_RESULTS,
+)
 from gqlapi.domain.interfaces.v2.catalog.category import (
     CategoryRepositoryInterface,
     RestaurantBranchCategoryRepositoryInterface,
@@ -66,8 +72,13 @@ from gqlapi.domain.models.v2.utils import (
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 from gqlapi.repository.user.core_user import CoreUserRepositoryInterface
+from gqlapi.repository.supplier.supplier_price_list import EFFECTIVE_PRICE_IDS_QUERY
+from gqlapi.repository.supplier.supplier_product import PRODUCT_SEARCH_DOCUMENTS_QUERY
+from gqlapi.repository.supplier.supplier_unit import UNIT_CATALOG_VERSIONS_QUERY
 from gqlapi.utils.datetime import from_iso_format
 from gqlapi.utils.helpers import list_into_strtuple
+from gqlapi.utils.product_index import product_index
+from gqlapi.utils.search import product_search_filter
 from gqlapi.lib.logger.logger.basic_logger import get_logger
 
 # logger
@@ -803,6 +814,14 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
         restaurant_branch_id: UUID,
         skip_specific: bool = False,
     ) -> List[UUID]:
+        if EFFECTIVE_PRICES_READ:
+            return await self._find_effective_price_ids(
+                supplier_unit_id, restaurant_branch_id, skip_specific
+            )
+        if PRICE_LIST_LINKS_READ:
+            return await self._find_linked_price_ids(
+                supplier_unit_id, restaurant_branch_id, skip_specific
+            )
         # verify if restaurant branch has a price list assigned
         spec_pl_qry = """
             WITH last_price_list AS (
@@ -813,6 +832,7 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
                             ORDER BY last_updated DESC
                         ) row_num
                     FROM supplier_price_list
+                    WHERE supplier_unit_id = :supplier_unit_id
                 )
                 SELECT * FROM rcos WHERE row_num = 1
             ),
@@ -831,8 +851,6 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
             FROM expanded_restaurant_pls
             WHERE
                 valid_upto::date >= current_date
-            AND
-                supplier_unit_id = :supplier_unit_id
             AND
                 REPLACE(branch_id::varchar, '"', '')::UUID = :branch_id
             """
@@ -856,6 +874,7 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
                                 ORDER BY last_updated DESC
                             ) row_num
                         FROM supplier_price_list
+                        WHERE supplier_unit_id = :supplier_unit_id
                     )
                     SELECT * FROM rcos WHERE row_num = 1
                 )
@@ -868,8 +887,6 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
                     valid_upto::date >= current_date
                 AND
                     is_default = 't'
-                AND
-                    supplier_unit_id = :supplier_unit_id
                 """
             spec_pl = await self.supplier_restaurants_repo.raw_query(
                 def_pl_qry,
@@ -882,6 +899,80 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
             # get default prices
         return [UUID(p) for p in json.loads(spec_pl[0]["supplier_product_price_ids"])]
 
+    async def _find_effective_price_ids(
+        self,
+        supplier_unit_id: UUID,
+        restaurant_branch_id: UUID,
+        skip_specific: bool = False,
+    ) -> List[UUID]:
+        """Price ids the restaurant branch sees (or the default ones),
+        from the effective prices table
+        """
+        prices = []
+        if not skip_specific:
+            prices = await self.supplier_restaurants_repo.raw_query(
+                EFFECTIVE_PRICE_IDS_QUERY.format(branch_filter="= :branch_id"),
+                {
+                    "supplier_unit_id": supplier_unit_id,
+                    "branch_id": restaurant_branch_id,
+                },
+            )
+        if not prices:
+            prices = await self.supplier_restaurants_repo.raw_query(
+                EFFECTIVE_PRICE_IDS_QUERY.format(branch_filter="IS NULL"),
+                {"supplier_unit_id": supplier_unit_id},
+            )
+        return [p["supplier_product_price_id"] for p in prices]
+
+    async def _find_linked_price_ids(
+        self,
+        supplier_unit_id: UUID,
+        restaurant_branch_id: UUID,
+        skip_specific: bool = False,
+    ) -> List[UUID]:
+        """Price ids of the price list assigned to the restaurant branch
+        (or the default one), resolved from the price list link tables
+        """
+        # latest version of each price list of the unit
+        last_pl_qry = """
+            SELECT DISTINCT ON (name) id, is_default, valid_upto
+            FROM supplier_price_list
+            WHERE supplier_unit_id = :supplier_unit_id
+            ORDER BY name, last_updated DESC
+        """
+        if skip_specific:
+            pl_filter = "lpl.is_default = 't'"
+            values: Dict[str, Any] = {"supplier_unit_id": supplier_unit_id}
+        else:
+            # branch specific list, default list otherwise
+            pl_filter = """(
+                    lpl.is_default = 't'
+                    OR EXISTS (
+                        SELECT 1 FROM supplier_price_list_branch splb
+                        WHERE splb.price_list_id = lpl.id
+                        AND splb.restaurant_branch_id = :branch_id
+                    )
+                )"""
+            values = {
+                "supplier_unit_id": supplier_unit_id,
+                "branch_id": restaurant_branch_id,
+            }
+        pl_qry = f"""
+            WITH last_price_list AS ({last_pl_qry}),
+            price_list AS (
+                SELECT lpl.id FROM last_price_list lpl
+                WHERE lpl.valid_upto::date >= current_date
+                AND {pl_filter}
+                ORDER BY lpl.is_default ASC
+                LIMIT 1
+            )
+            SELECT splp.supplier_product_price_id
+            FROM supplier_price_list_price splp
+            JOIN price_list pl ON pl.id = splp.price_list_id
+            """
+        prices = await self.supplier_restaurants_repo.raw_query(pl_qry, values)
+        return [p["supplier_product_price_id"] for p in prices]
+
     async def find_business_specific_price_list_name(
         self,
         supplier_unit_id: UUID,
@@ -897,6 +988,7 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
                             ORDER BY last_updated DESC
                         ) row_num
                     FROM supplier_price_list
+                    WHERE supplier_unit_id = :supplier_unit_id
                 )
                 SELECT * FROM rcos WHERE row_num = 1
             ),
@@ -1128,136 +1220,9 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
         -------
         List[SupplierProductDetails]
         """
-        # fetch supplier restaurant relation
-        sr_rel = await self.supplier_restaurants_repo.raw_query(
-            """SELECT * FROM supplier_restaurant_relation
-                WHERE supplier_unit_id = :supplier_unit_id
-                AND restaurant_branch_id = :restaurant_branch_id
-            """,
-            {
-                "supplier_unit_id": supplier_unit_id,
-                "restaurant_branch_id": restaurant_branch_id,
-            },
-        )
-        if not sr_rel:
-            return []
-        # get specific price list ids
-        spec_pl_ids = await self.find_business_specific_price_ids(
-            supplier_unit_id, restaurant_branch_id
+        prods, _ = await self.find_ecommerce_catalog_page(
+            supplier_unit_id, restaurant_branch_id, search, page, page_size
         )
-        prods = []
-        if spec_pl_ids:
-            filter_qry = ""
-            if search:
-                filter_qry = f"""
-                    AND (
-                        unaccent(spr.description) ILIKE unaccent('%{search.replace(' ', '%')}%')
-                        OR spt.tag_value ILIKE '%{search.replace(' ', '%')}%'
-                    )
-                """
-            filter_qry += f"""
-                ORDER BY spr.description
-                LIMIT {page_size}
-                OFFSET {page_size * (page - 1)}
-            """
-            # get supplier prices
-            pr_qry = f"""
-                WITH category_tag AS (
-                    SELECT
-                        supplier_product_id,
-                        string_agg(tag_value, ',') as tag_value
-                    FROM supplier_product_tag
-                    GROUP BY supplier_product_id
-                )
-                SELECT
-                    spr.*,
-                    row_to_json(last_price.*) AS last_price_json
-                FROM supplier_product_price as last_price
-                JOIN supplier_product spr on spr.id = last_price.supplier_product_id
-                LEFT JOIN category_tag spt on spt.supplier_product_id = spr.id
-                WHERE last_price.id IN {list_into_strtuple(spec_pl_ids)}
-                {filter_qry}
-                """
-            sp_prices = await self.supplier_restaurants_repo.raw_query(pr_qry, {})
-            # get images
-            sprod_ids = [p["id"] for p in sp_prices]
-            if sprod_ids:
-                img_qry = f"""
-                    SELECT
-                        supplier_product_id,
-                        image_url
-                    FROM supplier_product_image
-                    WHERE supplier_product_id IN {list_into_strtuple(sprod_ids)}
-                    AND deleted = 'f' ORDER BY priority ASC
-                    """
-                sp_imgs = await self.supplier_restaurants_repo.raw_query(img_qry, {})
-            else:
-                sp_imgs = []
-            sp_imgs_idx: Dict[UUID, List[str]] = {}
-            for img in sp_imgs:
-                if img["supplier_product_id"] not in sp_imgs_idx:
-                    sp_imgs_idx[img["supplier_product_id"]] = []
-                sp_imgs_idx[img["supplier_product_id"]].append(img["image_url"])
-            # get tags
-            if sprod_ids:
-                tag_qry = f"""
-                    SELECT
-                        *
-                    FROM supplier_product_tag
-                    WHERE supplier_product_id IN {list_into_strtuple(sprod_ids)}
-                    """
-                sp_tags = await self.supplier_restaurants_repo.raw_query(tag_qry, {})
-            else:
-                sp_tags = []
-            sp_tags_idx: Dict[UUID, List[SupplierProductTag]] = {}
-            for tg in sp_tags:
-                if tg["supplier_product_id"] not in sp_tags_idx:
-                    sp_tags_idx[tg["supplier_product_id"]] = []
-                sp_tags_idx[tg["supplier_product_id"]].append(SupplierProductTag(**tg))
-            # get stock
-            supp_prod_stock = (
-                await self.supplier_product_stock_repo.fetch_latest_by_unit(
-                    supplier_unit_id
-                )
-            )
-            sup_prod_avail = await self.supplier_product_stock_repo.find_availability(
-                supplier_unit_id, supp_prod_stock
-            )
-            supp_prod_stock_dict: Dict[UUID, SupplierProductStockWithAvailability] = {}
-            for sps in sup_prod_avail:
-                supp_prod_stock_dict[sps.supplier_product_id] = sps
-            # format
-            for p in sp_prices:
-                # format sup prod
-                pr_dict = dict(p)
-                pr_dict["sell_unit"] = UOMType(pr_dict["sell_unit"])
-                pr_dict["buy_unit"] = UOMType(pr_dict["buy_unit"])
-                # format sup prod price
-                _prx = json.loads(p["last_price_json"])
-                _prx["id"] = UUID(_prx["id"])
-                _prx["supplier_product_id"] = UUID(_prx["supplier_product_id"])
-                _prx["created_by"] = UUID(_prx["created_by"])
-                _prx["currency"] = CurrencyType(_prx["currency"])
-                for _k in ["valid_from", "valid_upto", "created_at"]:
-                    _prx[_k] = from_iso_format(_prx[_k])
-                _imgs = sp_imgs_idx.get(pr_dict["id"], [])
-                _tags = sp_tags_idx.get(pr_dict["id"], [])
-                prods.append(
-                    SupplierProductDetails(
-                        last_price=SupplierProductPrice(**_prx),
-                        images=_imgs,
-                        **{
-                            **{
-                                k: v
-                                for k, v in pr_dict.items()
-                                if k != "last_price_json"
-                            },
-                        },
-                        tags=_tags,
-                        stock=supp_prod_stock_dict.get(pr_dict["id"], None),
-                    )
-                )
-        # build gql
         return prods
 
     async def count_ecommerce_supplier_restaurant_products(
@@ -1296,38 +1261,9 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
         spec_pl_ids = await self.find_business_specific_price_ids(
             supplier_unit_id, restaurant_branch_id
         )
-        count = 0
-        if spec_pl_ids:
-            filter_qry = ""
-            if search:
-                filter_qry = f"""
-                    AND (
-                        unaccent(spr.description) ILIKE unaccent('%{search.replace(' ', '%')}%')
-                        OR spt.tag_value ILIKE '%{search.replace(' ', '%')}%'
-                    )
-                """
-            # get supplier prices
-            pr_qry = f"""
-                WITH category_tag AS (
-                    SELECT
-                        supplier_product_id,
-                        string_agg(tag_value, ',') as tag_value
-                    FROM supplier_product_tag
-                    GROUP BY supplier_product_id
-                )
-                SELECT
-                    count(spr.id) as total
-                FROM supplier_product_price as last_price
-                JOIN supplier_product spr on spr.id = last_price.supplier_product_id
-                LEFT JOIN category_tag spt on spt.supplier_product_id = spr.id
-                WHERE last_price.id IN {list_into_strtuple(spec_pl_ids)}
-                {filter_qry}
-                """
-            sp_count = await self.supplier_restaurants_repo.raw_query(pr_qry, {})
-            if sp_count and len(sp_count) > 0:
-                count = sp_count[0]["total"]
-        # build gql
-        return count
+        return await self._count_ecommerce_products(
+            supplier_unit_id, spec_pl_ids, search
+        )
 
     async def get_ecommerce_default_supplier_products(
         self,
@@ -1349,124 +1285,9 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
         -------
         List[SupplierProductDetails]
         """
-        # get specific price list ids
-        spec_pl_ids = await self.find_business_specific_price_ids(
-            supplier_unit_id,
-            uuid4(),  # random branch id - not used
-            skip_specific=True,
+        prods, _ = await self.find_ecommerce_catalog_page(
+            supplier_unit_id, None, search, page, page_size
         )
-        prods = []
-        if spec_pl_ids:
-            # get supplier prices
-            filter_qry = ""
-            if search:
-                filter_qry = f"""
-                    AND (
-                        unaccent(spr.description) ILIKE unaccent('%{search.replace(' ', '%')}%')
-                        OR spt.tag_value ILIKE '%{search.replace(' ', '%')}%'
-                    )
-                """
-            filter_qry += f"""
-                ORDER BY spr.description
-                LIMIT {page_size}
-                OFFSET {page_size * (page - 1)}
-            """
-            pr_qry = f"""
-                WITH category_tag AS (
-                    SELECT
-                        supplier_product_id,
-                        string_agg(tag_value, ',') as tag_value
-                    FROM supplier_product_tag
-                    GROUP BY supplier_product_id
-                )
-                SELECT
-                    spr.*,
-                    row_to_json(last_price.*) AS last_price_json
-                FROM supplier_product_price as last_price
-                JOIN supplier_product spr on spr.id = last_price.supplier_product_id
-                LEFT JOIN category_tag spt on spt.supplier_product_id = spr.id
-                WHERE last_price.id IN {list_into_strtuple(spec_pl_ids)}
-                {filter_qry}
-                """
-            sp_prices = await self.supplier_restaurants_repo.raw_query(pr_qry, {})
-            # get images
-            sprod_ids = [p["id"] for p in sp_prices]
-            if sprod_ids:
-                img_qry = f"""
-                    SELECT
-                        supplier_product_id,
-                        image_url
-                    FROM supplier_product_image
-                    WHERE supplier_product_id IN {list_into_strtuple(sprod_ids)}
-                    AND deleted = 'f' ORDER BY priority ASC
-                    """
-                sp_imgs = await self.supplier_restaurants_repo.raw_query(img_qry, {})
-            else:
-                sp_imgs = []
-            sp_imgs_idx: Dict[UUID, List[str]] = {}
-            for img in sp_imgs:
-                if img["supplier_product_id"] not in sp_imgs_idx:
-                    sp_imgs_idx[img["supplier_product_id"]] = []
-                sp_imgs_idx[img["supplier_product_id"]].append(img["image_url"])
-            # get tags
-            if sprod_ids:
-                tag_qry = f"""
-                    SELECT
-                        *
-                    FROM supplier_product_tag
-                    WHERE supplier_product_id IN {list_into_strtuple(sprod_ids)}
-                    """
-                sp_tags = await self.supplier_restaurants_repo.raw_query(tag_qry, {})
-            else:
-                sp_tags = []
-            sp_tags_idx: Dict[UUID, List[SupplierProductTag]] = {}
-            for tg in sp_tags:
-                if tg["supplier_product_id"] not in sp_tags_idx:
-                    sp_tags_idx[tg["supplier_product_id"]] = []
-                sp_tags_idx[tg["supplier_product_id"]].append(SupplierProductTag(**tg))
-            # get stock
-            supp_prod_stock = (
-                await self.supplier_product_stock_repo.fetch_latest_by_unit(
-                    supplier_unit_id
-                )
-            )
-            sup_prod_avail = await self.supplier_product_stock_repo.find_availability(
-                supplier_unit_id, supp_prod_stock
-            )
-            supp_prod_stock_dict: Dict[UUID, SupplierProductStockWithAvailability] = {}
-            for sps in sup_prod_avail:
-                supp_prod_stock_dict[sps.supplier_product_id] = sps
-            for p in sp_prices:
-                # format sup prod
-                pr_dict = dict(p)
-                pr_dict["sell_unit"] = UOMType(pr_dict["sell_unit"])
-                pr_dict["buy_unit"] = UOMType(pr_dict["buy_unit"])
-                # format sup prod price
-                _prx = json.loads(p["last_price_json"])
-                _prx["id"] = UUID(_prx["id"])
-                _prx["supplier_product_id"] = UUID(_prx["supplier_product_id"])
-                _prx["created_by"] = UUID(_prx["created_by"])
-                _prx["currency"] = CurrencyType(_prx["currency"])
-                for _k in ["valid_from", "valid_upto", "created_at"]:
-                    _prx[_k] = from_iso_format(_prx[_k])
-                _imgs = sp_imgs_idx.get(pr_dict["id"], [])
-                _tags = sp_tags_idx.get(pr_dict["id"], [])
-                prods.append(
-                    SupplierProductDetails(
-                        last_price=SupplierProductPrice(**_prx),
-                        images=_imgs,
-                        **{
-                            **{
-                                k: v
-                                for k, v in pr_dict.items()
-                                if k != "last_price_json"
-                            },
-                        },
-                        tags=_tags,
-                        stock=supp_prod_stock_dict.get(pr_dict["id"], None),
-                    )
-                )
-        # build gql
         return prods
 
     async def count_ecommerce_default_supplier_products(
@@ -1493,39 +1314,285 @@ class SupplierRestaurantsHandler(SupplierRestaurantsHandlerInterface):
             uuid4(),  # random branch id - not used
             skip_specific=True,
         )
-        count = 0
-        if spec_pl_ids:
-            # get supplier prices
-            filter_qry = ""
-            if search:
-                filter_qry = f"""
-                    AND (
-                        unaccent(spr.description) ILIKE unaccent('%{search.replace(' ', '%')}%')
-                        OR spt.tag_value ILIKE '%{search.replace(' ', '%')}%'
-                    )
-                """
-            pr_qry = f"""
-                WITH category_tag AS (
-                    SELECT
-                        supplier_product_id,
-                        string_agg(tag_value, ',') as tag_value
-                    FROM supplier_product_tag
-                    GROUP BY supplier_product_id
+        return await self._count_ecommerce_products(
+            supplier_unit_id, spec_pl_ids, search
+        )
+
+    async def _search_product_index(
+        self, supplier_unit_id: UUID, search: str
+    ) -> Optional[List[UUID]]:
+        """Ids of the supplier products matching a search, best first,
+            from the in-process product index (at most
+            PRODUCT_SEARCH_MAX_RESULTS)
+            - The index of the supplier is reloaded when the unit
+                catalog version moved since it was loaded, and the
+                versions of all units of the supplier are recorded
+
+        Returns
+        -------
+        Optional[List[UUID]]
+            None if the index cannot be used
+        """
+        try:
+            _units = await self.supplier_restaurants_repo.raw_query(
+                UNIT_CATALOG_VERSIONS_QUERY.format(
+                    filter="""WHERE su.supplier_business_id = (
+                        SELECT supplier_business_id FROM supplier_unit
+                        WHERE id = :supplier_unit_id
+                    )"""
+                ),
+                {"supplier_unit_id": supplier_unit_id},
+            )
+            _unit = next((u for u in _units if u["id"] == supplier_unit_id), None)
+            if not _unit:
+                return None
+            sb_id, version = _unit["supplier_business_id"], _unit["version"]
+            index = product_index.get(sb_id)
+            if index is None or not product_index.is_fresh(supplier_unit_id, version):
+                docs = await self.supplier_restaurants_repo.raw_query(
+                    PRODUCT_SEARCH_DOCUMENTS_QUERY.format(
+                        filter="WHERE sp.supplier_business_id = :supplier_business_id"
+                    ),
+                    {"supplier_business_id": sb_id},
+                )
+                index = product_index.load(sb_id, [dict(d) for d in docs])
+                # versions were read before the documents
+                product_index.set_versions({u["id"]: u["version"] for u in _units})
+            return index.search(search, limit=PRODUCT_SEARCH_MAX_RESULTS)
+        except Exception as e:
+            logger.warning("Issues searching product index, searching in DB")
+            logger.error(e)
+            return None
+
+    async def _ecommerce_search_filter(
+        self, supplier_unit_id: UUID, search: str
+    ) -> Tuple[str, str, Dict[str, Any]]:
+        """Search over description, SKU and category tags of the catalog
+            - In-process product index when enabled, DB search otherwise
+                (candidates are already bounded by the price ids)
+
+        Returns
+        -------
+        Tuple[str, str, Dict[str, Any]]
+            (filter, order by, values)
+        """
+        if PRODUCT_SEARCH_INDEX and (search or "").strip():
+            ranked_ids = await self._search_product_index(supplier_unit_id, search)
+            if ranked_ids is not None:
+                return (
+                    "AND spr.id = ANY(CAST(:search_ids AS UUID[]))",
+                    "array_position(CAST(:search_ids AS UUID[]), spr.id), spr.id",
+                    {"search_ids": ranked_ids},
                 )
+        cond, rank, values = product_search_filter(
+            "concat_ws(' ', product_search_text(spr.description, spr.sku), lower(f_unaccent(spt.tag_value)))",
+            search,
+        )
+        if not cond:
+            return "", "spr.description, spr.id", {}
+        return f"AND {cond}", f"{rank} DESC, spr.description, spr.id", values
+
+    async def _count_ecommerce_products(
+        self,
+        supplier_unit_id: UUID,
+        spec_pl_ids: List[UUID],
+        search: str,
+    ) -> int:
+        if not spec_pl_ids:
+            return 0
+        filter_qry, _, filter_values = await self._ecommerce_search_filter(
+            supplier_unit_id, search
+        )
+        pr_qry = f"""
+            WITH category_tag AS (
                 SELECT
-                    count(spr.id) as total
-                FROM supplier_product_price as last_price
-                JOIN supplier_product spr on spr.id = last_price.supplier_product_id
-                LEFT JOIN category_tag spt on spt.supplier_product_id = spr.id
-                WHERE last_price.id IN {list_into_strtuple(spec_pl_ids)}
-                {filter_qry}
-                """
-            sp_count = await self.supplier_restaurants_repo.raw_query(pr_qry, {})
-            # get images
-            if sp_count and len(sp_count) > 0:
-                count = sp_count[0]["total"]
-        # build gql
-        return count
+                    supplier_product_id,
+                    string_agg(tag_value, ',') as tag_value
+                FROM supplier_product_tag
+                GROUP BY supplier_product_id
+            )
+            SELECT
+                count(spr.id) as total
+            FROM supplier_product_price as last_price
+            JOIN supplier_product spr on spr.id = last_price.supplier_product_id
+            LEFT JOIN category_tag spt on spt.supplier_product_id = spr.id
+            WHERE last_price.id IN {list_into_strtuple(spec_pl_ids)}
+            {filter_qry}
+            """
+        sp_count = await self.supplier_restaurants_repo.raw_query(pr_qry, filter_values)
+        if sp_count and len(sp_count) > 0:
+            return sp_count[0]["total"]
+        return 0
+
+    async def find_ecommerce_catalog_page(
+        self,
+        supplier_unit_id: UUID,
+        restaurant_branch_id: Optional[UUID],
+        search: str,
+        page: int,
+        page_size: int,
+    ) -> Tuple[List[SupplierProductDetails], int]:
+        """Find a page of the ecommerce catalog and its total results
+            - The effective price list (branch specific, or default
+                when no restaurant branch is given) is resolved once
+                and used for both the page and the total
+
+        Parameters
+        ----------
+        supplier_unit_id : UUID
+        restaurant_branch_id : Optional[UUID]
+        search : str
+        page : int
+        page_size : int
+
+        Returns
+        -------
+        Tuple[List[SupplierProductDetails], int]
+            (products, total results)
+        """
+        if restaurant_branch_id is not None:
+            # fetch supplier restaurant relation
+            sr_rel = await self.supplier_restaurants_repo.raw_query(
+                """SELECT * FROM supplier_restaurant_relation
+                    WHERE supplier_unit_id = :supplier_unit_id
+                    AND restaurant_branch_id = :restaurant_branch_id
+                """,
+                {
+                    "supplier_unit_id": supplier_unit_id,
+                    "restaurant_branch_id": restaurant_branch_id,
+                },
+            )
+            if not sr_rel:
+                return [], 0
+            spec_pl_ids = await self.find_business_specific_price_ids(
+                supplier_unit_id, restaurant_branch_id
+            )
+        else:
+            spec_pl_ids = await self.find_business_specific_price_ids(
+                supplier_unit_id,
+                uuid4(),  # random branch id - not used
+                skip_specific=True,
+            )
+        if not spec_pl_ids:
+            return [], 0
+        filter_qry, order_by, filter_values = await self._ecommerce_search_filter(
+            supplier_unit_id, search
+        )
+        # page and total results in a single pass
+        pr_qry = f"""
+            WITH category_tag AS (
+                SELECT
+                    supplier_product_id,
+                    string_agg(tag_value, ',') as tag_value
+                FROM supplier_product_tag
+                GROUP BY supplier_product_id
+            )
+            SELECT
+                spr.*,
+                row_to_json(last_price.*) AS last_price_json,
+                COUNT(*) OVER () AS total_results
+            FROM supplier_product_price as last_price
+            JOIN supplier_product spr on spr.id = last_price.supplier_product_id
+            LEFT JOIN category_tag spt on spt.supplier_product_id = spr.id
+            WHERE last_price.id IN {list_into_strtuple(spec_pl_ids)}
+            {filter_qry}
+            ORDER BY {order_by}
+            LIMIT {page_size}
+            OFFSET {page_size * (page - 1)}
+            """
+        sp_prices = [
+            dict(p)
+            for p in await self.supplier_restaurants_repo.raw_query(
+                pr_qry, filter_values
+            )
+        ]
+        if sp_prices:
+            total = sp_prices[0]["total_results"]
+        elif page > 1:
+            # page out of range, total is not returned with the rows
+            total = await self._count_ecommerce_products(
+                supplier_unit_id, spec_pl_ids, search
+            )
+        else:
+            total = 0
+        prods = await self._build_ecommerce_products(supplier_unit_id, sp_prices)
+        return prods, total
+
+    async def _build_ecommerce_products(
+        self,
+        supplier_unit_id: UUID,
+        sp_prices: List[Dict[str, Any]],
+    ) -> List[SupplierProductDetails]:
+        # get images
+        sprod_ids = [p["id"] for p in sp_prices]
+        if not sprod_ids:
+            return []
+        img_qry = f"""
+            SELECT
+                supplier_product_id,
+                image_url
+            FROM supplier_product_image
+            WHERE supplier_product_id IN {list_into_strtuple(sprod_ids)}
+            AND deleted = 'f' ORDER BY priority ASC
+            """
+        sp_imgs = await self.supplier_restaurants_repo.raw_query(img_qry, {})
+        sp_imgs_idx: Dict[UUID, List[str]] = {}
+        for img in sp_imgs:
+            if img["supplier_product_id"] not in sp_imgs_idx:
+                sp_imgs_idx[img["supplier_product_id"]] = []
+            sp_imgs_idx[img["supplier_product_id"]].append(img["image_url"])
+        # get tags
+        tag_qry = f"""
+            SELECT
+                *
+            FROM supplier_product_tag
+            WHERE supplier_product_id IN {list_into_strtuple(sprod_ids)}
+            """
+        sp_tags = await self.supplier_restaurants_repo.raw_query(tag_qry, {})
+        sp_tags_idx: Dict[UUID, List[SupplierProductTag]] = {}
+        for tg in sp_tags:
+            if tg["supplier_product_id"] not in sp_tags_idx:
+                sp_tags_idx[tg["supplier_product_id"]] = []
+            sp_tags_idx[tg["supplier_product_id"]].append(SupplierProductTag(**tg))
+        # get stock
+        supp_prod_stock = await self.supplier_product_stock_repo.fetch_latest_by_unit(
+            supplier_unit_id
+        )
+        sup_prod_avail = await self.supplier_product_stock_repo.find_availability(
+            supplier_unit_id, supp_prod_stock
+        )
+        supp_prod_stock_dict: Dict[UUID, SupplierProductStockWithAvailability] = {}
+        for sps in sup_prod_avail:
+            supp_prod_stock_dict[sps.supplier_product_id] = sps
+        # format
+        prods = []
+        for p in sp_prices:
+            # format sup prod
+            pr_dict = {
+                k: v
+                for k, v in p.items()
+                if k not in ("last_price_json", "total_results")
+            }
+            pr_dict["sell_unit"] = UOMType(pr_dict["sell_unit"])
+            pr_dict["buy_unit"] = UOMType(pr_dict["buy_unit"])
+            # format sup prod price
+            _prx = json.loads(p["last_price_json"])
+            _prx["id"] = UUID(_prx["id"])
+            _prx["supplier_product_id"] = UUID(_prx["supplier_product_id"])
+            _prx["created_by"] = UUID(_prx["created_by"])
+            _prx["currency"] = CurrencyType(_prx["currency"])
+            for _k in ["valid_from", "valid_upto", "created_at"]:
+                _prx[_k] = from_iso_format(_prx[_k])
+            prods.append(
+                SupplierProductDetails(
+                    last_price=SupplierProductPrice(**_prx),
+                    images=sp_imgs_idx.get(pr_dict["id"], []),
+                    **pr_dict,
+                    tags=sp_tags_idx.get(pr_dict["id"], []),
+                    stock=supp_prod_stock_dict.get(pr_dict["id"], None),
+                )
+            )
+        return prods
 
     async def get_ecommerce_categories(
         self,
@@ -34,10 +34,33 @@ from gqlapi.domain.models.v2.supplier import (
 )
 from gqlapi.domain.models.v2.utils import PayMethodType, SellingOption, ServiceDay
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
+from gqlapi.lib.environ.environ.environ import get_app
+from gqlapi.lib.logger.logger.basic_logger import get_logger
 from gqlapi.repository.user.core_user import CoreUserRepositoryInterface
 from gqlapi.repository.user.employee import default_unit_perms
 from gqlapi.utils.domain_mapper import domain_to_dict
 
+logger = get_logger(get_app())
+
+
+async def invalidate_catalogs(
+    supplier_unit_repo: SupplierUnitRepositoryInterface,
+    supplier_unit_ids: Optional[List[UUID]] = None,
+    supplier_business_id: Optional[UUID] = None,
+) -> None:
+    """Bump catalog version of the supplier units (or all units of a
+        supplier business) to invalidate cached ecommerce catalogs.
+        Errors are logged, they never fail the catalog change.
+    """
+    try:
+        await supplier_unit_repo.bump_catalog_version(
+            supplier_unit_ids=supplier_unit_ids,
+            supplier_business_id=supplier_business_id,
+        )
+    except Exception as e:
+        logger.warning("Issues invalidating ecommerce catalogs")
+        logger.error(e)
+
 
 class SupplierUnitHandler(SupplierUnitHandlerInterface):
     def __init__(
@@ -1,13 +1,13 @@
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.config import CLOUDINARY_BASE_URL
 from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.lib.clients.clients.http.transport import get_transport, run_blocking
 import os
 from typing import Any, Dict, List
 from enum import Enum
 import cloudinary
 import cloudinary.uploader
 import cloudinary.api
-import requests
 import strawberry
 
 logger = get_logger(get_app())
@@ -54,17 +54,21 @@ class CloudinaryApi:
 
     def __init__(self, env) -> None:
         self.base_folder = "PROD" if env.lower() == "prod" else "STG"
+        self.http = get_transport("cloudinary", timeout=(5.0, 60.0))
 
-    def upload(
+    async def upload(
         self, img_file: bytes | Any, folder: str, subfolder: str, img_key: str
     ) -> Dict[Any, Any]:
         try:
-            cloudinary.uploader.destroy(
-                f"{folder}-{self.base_folder}/{subfolder}/{img_key}", invalidate=True
+            await run_blocking(
+                cloudinary.uploader.destroy,
+                f"{folder}-{self.base_folder}/{subfolder}/{img_key}",
+                invalidate=True,
             )
 
             route = f"{folder}-{self.base_folder}/{subfolder}/{img_key}"
-            upload_result = cloudinary.uploader.upload(
+            upload_result = await run_blocking(
+                cloudinary.uploader.upload,
                 img_file,
                 folder=f"{folder}-{self.base_folder}/{subfolder}/",
                 public_id=img_key,
@@ -82,10 +86,12 @@ class CloudinaryApi:
             logger.error(e)
             return {"status": "error", "msg": str(e)}
 
-    def delete(self, folder: str, subfolder: str, img_key: str) -> Dict[Any, Any]:
+    async def delete(self, folder: str, subfolder: str, img_key: str) -> Dict[Any, Any]:
         try:
-            cloudinary.uploader.destroy(
-                f"{folder}-{self.base_folder}/{subfolder}/{img_key}", invalidate=True
+            await run_blocking(
+                cloudinary.uploader.destroy,
+                f"{folder}-{self.base_folder}/{subfolder}/{img_key}",
+                invalidate=True,
             )
             return {"status": "ok", "msg": "ok"}
         except Exception as e:
@@ -105,7 +111,7 @@ class CloudinaryApi:
 
     def download_images(self, image_urls: List, download_path: str):
         for url in image_urls:
-            response = requests.get(url)
+            response = self.http.request_sync("GET", url)
             if response.status_code == 200:
                 with open(
                     os.path.join(download_path, url.split("/")[-1]), "wb"
@@ -9,11 +9,11 @@ from typing import Any, Dict, List, Optional
 from uuid import UUID
 from gqlapi.domain.models.v2.utils import InvoiceType
 
-import requests
 import strawberry
 from strawberry import type as strawberry_type
 
 from gqlapi.domain.models.v2.core import MxSatInvoicingCertificateInfo
+from gqlapi.lib.clients.clients.http.transport import get_transport
 from gqlapi.utils.domain_mapper import domain_to_dict
 
 logger = get_logger(get_app())
@@ -306,6 +306,8 @@ class FacturamaClientApi:
             ).decode("ascii"),
             "content-type": "application/json",
         }
+        # invoice stamping can take a while
+        self.http = get_transport("facturama", timeout=(5.0, 60.0))
         self.url_base = (
             "https://api.facturama.mx/{endpoint}"
             if env.lower() == "prod"
@@ -317,7 +319,7 @@ class FacturamaClientApi:
         # address = domain_to_dict(client.Address)
         data = domain_to_dict(client)
         data["Address"] = domain_to_dict(client.Address)
-        fact_resp = requests.post(url=url, headers=self.headers, json=data)
+        fact_resp = await self.http.post(url, headers=self.headers, json=data)
         if fact_resp.status_code == 201:
             return {
                 "status": "ok",
@@ -342,7 +344,7 @@ class FacturamaClientApi:
             url = self.url_base.format(
                 endpoint=FacturamaEndpoints.GET_CLIENT.value + str(page)
             )
-            fact_resp = requests.get(url=url, headers=self.headers)
+            fact_resp = await self.http.get(url, headers=self.headers)
             if fact_resp.status_code == 200 and fact_resp.json():
                 for client in fact_resp.json():
                     if client["Id"] == id:
@@ -375,7 +377,7 @@ class FacturamaClientApi:
             "PrivateKeyPassword": mx_sat_invoice_certificate.sat_pass_code,
         }
 
-        fact_resp = requests.post(url=url, headers=self.headers, json=data)
+        fact_resp = await self.http.post(url, headers=self.headers, json=data)
         if fact_resp.status_code == 200:
             return {"status": "ok", "status_code": fact_resp.status_code}
         return {
@@ -400,7 +402,7 @@ class FacturamaClientApi:
             "PrivateKey": key_fact_data["content"],
             "PrivateKeyPassword": mx_sat_invoice_certificate.sat_pass_code,
         }
-        fact_resp = requests.put(url=url, headers=self.headers, json=data)
+        fact_resp = await self.http.put(url, headers=self.headers, json=data)
         if fact_resp.status_code == 200:
             return {
                 "status": "ok",
@@ -423,7 +425,7 @@ class FacturamaClientApi:
     async def get_csd(self, rfc) -> Dict[Any, Any]:
         url = self.url_base.format(endpoint=FacturamaEndpoints.GET_CSE.value + rfc)
 
-        fact_resp = requests.get(url=url, headers=self.headers)
+        fact_resp = await self.http.get(url, headers=self.headers)
         if fact_resp.status_code == 404:
             return {
                 "status": "error",
@@ -470,7 +472,7 @@ class FacturamaClientApi:
                 invoice.GlobalInformation,
                 skip=["Email", "Id", "TaxResidence", "NumRegIdTrib"],
             )
-        fact_resp = requests.post(url=url, headers=self.headers, json=data)
+        fact_resp = await self.http.post(url, headers=self.headers, json=data)
         if fact_resp.status_code == 201:
             _rmp = fact_resp.json()
             _rmp["Result"] = json.dumps(_rmp)
@@ -503,7 +505,7 @@ class FacturamaClientApi:
                 "msg": fact_resp.content.decode("utf-8"),
             }
 
-    def new_internal_invoice(self, invoice: FacturamaInternalInvoice) -> Dict[Any, Any]:
+    async def new_internal_invoice(self, invoice: FacturamaInternalInvoice) -> Dict[Any, Any]:
         url = self.url_base.format(endpoint=FacturamaEndpoints.POST_INTERNAL_CFDI.value)
         data = domain_to_dict(invoice)
         data["Receiver"] = domain_to_dict(
@@ -525,7 +527,7 @@ class FacturamaClientApi:
             data["GlobalInformation"] = domain_to_dict(
                 invoice.GlobalInformation,
             )
-        fact_resp = requests.post(url=url, headers=self.headers, json=data)
+        fact_resp = await self.http.post(url, headers=self.headers, json=data)
         if fact_resp.status_code == 201:
             _rmp = fact_resp.json()
             _rmp["Result"] = json.dumps(_rmp)
@@ -566,7 +568,7 @@ class FacturamaClientApi:
         )
         if uuid_replacement:
             url += "&uuidReplacement=" + uuid_replacement
-        fact_resp = requests.delete(url=url, headers=self.headers)
+        fact_resp = await self.http.delete(url, headers=self.headers)
 
         if fact_resp.status_code == 200:
             _resp = fact_resp.content.decode("utf-8")
@@ -594,7 +596,7 @@ class FacturamaClientApi:
         url = self.url_base.format(
             endpoint=FacturamaEndpoints.GET_XML_INTERNAL_INVOICE.value.format(id=id)
         )
-        fact_resp = requests.get(url=url, headers=self.headers)
+        fact_resp = await self.http.get(url, headers=self.headers)
         if fact_resp.status_code == 200:
             xmldata = json.loads(fact_resp.content)
             xml_file = base64.b64decode(xmldata["Content"])
@@ -615,7 +617,7 @@ class FacturamaClientApi:
         url = self.url_base.format(
             endpoint=FacturamaEndpoints.GET_PDF_INTERNAL_INVOICE.value.format(id=id)
         )
-        fact_resp = requests.get(url=url, headers=self.headers)
+        fact_resp = await self.http.get(url, headers=self.headers)
         if fact_resp.status_code == 200:
             xmldata = json.loads(fact_resp.content)
             xml_file = base64.b64decode(xmldata["Content"])
@@ -636,7 +638,7 @@ class FacturamaClientApi:
         url = self.url_base.format(
             endpoint=FacturamaEndpoints.GET_3RD_PARTY_XML_INVOICE.value.format(id=id)
         )
-        fact_resp = requests.get(url=url, headers=self.headers)
+        fact_resp = await self.http.get(url, headers=self.headers)
 
         if fact_resp.status_code == 200:
             xmldata = json.loads(fact_resp.content)
@@ -658,7 +660,7 @@ class FacturamaClientApi:
         url = self.url_base.format(
             endpoint=FacturamaEndpoints.GET_3RD_PARTY_PDF_INVOICE.value.format(id=id)
         )
-        fact_resp = requests.get(url=url, headers=self.headers)
+        fact_resp = await self.http.get(url, headers=self.headers)
         if fact_resp.status_code == 200:
             pdfdata = json.loads(fact_resp.content)
             pdf_file = base64.b64decode(pdfdata["Content"])
@@ -677,11 +679,11 @@ class FacturamaClientApi:
     def get_3rd_party_invoice(self):
         pass
 
-    def get_internal_invoice(self, id: str) -> Dict[Any, Any]:
+    async def get_internal_invoice(self, id: str) -> Dict[Any, Any]:
         url = self.url_base.format(
             endpoint=FacturamaEndpoints.GET_3RD_PARTY_CFDI_JSON.value.format(id=id)
         )
-        fact_resp = requests.get(url=url, headers=self.headers)
+        fact_resp = await self.http.get(url, headers=self.headers)
         if fact_resp.status_code == 200:
             _resp = fact_resp.content.decode("utf-8")
             if _resp != "null":
@@ -715,7 +717,7 @@ class FacturamaClientApi:
         )
         if uuid_replacement:
             url += "&uuidReplacement=" + uuid_replacement
-        fact_resp = requests.delete(url=url, headers=self.headers)
+        fact_resp = await self.http.delete(url, headers=self.headers)
 
         if fact_resp.status_code == 200:
             _resp = fact_resp.content.decode("utf-8")
@@ -754,7 +756,7 @@ class FacturamaClientApi:
         ]
         data["Complemento"].Payments = [domain_to_dict(data["Complemento"].Payments[0])]
         data["Complemento"] = domain_to_dict(data["Complemento"])
-        fact_resp = requests.post(url=url, headers=self.headers, json=data)
+        fact_resp = await self.http.post(url, headers=self.headers, json=data)
         if fact_resp.status_code == 201:
             _rmp = fact_resp.json()
             _rmp["Result"] = json.dumps(_rmp)
@@ -803,7 +805,7 @@ class FacturamaClientApi:
         ]
         data["Complemento"].Payments = [domain_to_dict(data["Complemento"].Payments[0])]
         data["Complemento"] = domain_to_dict(data["Complemento"])
-        fact_resp = requests.post(url=url, headers=self.headers, json=data)
+        fact_resp = await self.http.post(url, headers=self.headers, json=data)
         if fact_resp.status_code == 201:
             _rmp = fact_resp.json()
             _rmp["Result"] = json.dumps(_rmp)
@@ -2,7 +2,7 @@ import json
 import logging
 from typing import Dict
 
-import requests
+from gqlapi.lib.clients.clients.http.transport import get_transport
 
 
 class FirebaseAuthApi:
@@ -12,8 +12,9 @@ class FirebaseAuthApi:
 
     def __init__(self, api_key: str) -> None:
         self.api_key = api_key
+        self.http = get_transport("firebase_auth", timeout=(5.0, 15.0))
 
-    def signup_with_email(self, email: str, password: str) -> Dict[str, str]:
+    async def signup_with_email(self, email: str, password: str) -> Dict[str, str]:
         """Sign Up with email
 
         Parameters
@@ -32,7 +33,7 @@ class FirebaseAuthApi:
             {"email": email, "password": password, "returnSecureToken": True}
         )
         _headers = {"Content-Type": "application/json"}
-        _resp = requests.request(
+        _resp = await self.http.request(
             "POST",
             "/".join([self._url, "accounts:signUp?key=" + self.api_key]),
             headers=_headers,
@@ -41,7 +42,7 @@ class FirebaseAuthApi:
         logging.debug(f"Firebase signup user: {_resp.status_code}")
         return _resp.json()
 
-    def signin_with_email(self, email: str, password: str) -> Dict[str, str]:
+    async def signin_with_email(self, email: str, password: str) -> Dict[str, str]:
         """Sign In with email
 
         Parameters
@@ -60,7 +61,7 @@ class FirebaseAuthApi:
             {"email": email, "password": password, "returnSecureToken": True}
         )
         _headers = {"Content-Type": "application/json"}
-        _resp = requests.request(
+        _resp = await self.http.request(
             "POST",
             "/".join([self._url, "accounts:signInWithPassword?key=" + self.api_key]),
             headers=_headers,
@@ -69,7 +70,7 @@ class FirebaseAuthApi:
         logging.debug(f"Firebase sign in user: {_resp.status_code}")
         return _resp.json()
 
-    def delete(self, id_token: str) -> Dict[str, str]:
+    async def delete(self, id_token: str) -> Dict[str, str]:
         """Delete User
 
         Parameters
@@ -84,7 +85,7 @@ class FirebaseAuthApi:
         """
         _payload = json.dumps({"idToken": id_token})
         _headers = {"Content-Type": "application/json"}
-        _resp = requests.request(
+        _resp = await self.http.request(
             "POST",
             "/".join([self._url, "accounts:delete?key=" + self.api_key]),
             headers=_headers,
@@ -93,7 +94,7 @@ class FirebaseAuthApi:
         logging.debug(f"Firebase delete user: {_resp.status_code}")
         return _resp.json()
 
-    def update_profile(self, id_token: str, **kwargs) -> Dict[str, str]:
+    async def update_profile(self, id_token: str, **kwargs) -> Dict[str, str]:
         """Update Firebase User Profile
 
         Parameters
@@ -115,7 +116,7 @@ class FirebaseAuthApi:
                 continue
             _payload[k] = v
         _headers = {"Content-Type": "application/json"}
-        _resp = requests.request(
+        _resp = await self.http.request(
             "POST",
             "/".join([self._url, "accounts:update?key=" + self.api_key]),
             headers=_headers,
@@ -124,7 +125,7 @@ class FirebaseAuthApi:
         logging.debug(f"Firebase update profile: {_resp.status_code}")
         return _resp.json()
 
-    def send_reset_password_email(self, email: str) -> Dict[str, str]:
+    async def send_reset_password_email(self, email: str) -> Dict[str, str]:
         """Send Reset Password Email
 
         Parameters
@@ -139,7 +140,7 @@ class FirebaseAuthApi:
         """
         _payload = {"email": email, "requestType": "PASSWORD_RESET"}
         _headers = {"Content-Type": "application/json"}
-        _resp = requests.request(
+        _resp = await self.http.request(
             "POST",
             "/".join([self._url, "accounts:sendOobCode?key=" + self.api_key]),
             headers=_headers,
@@ -2,9 +2,9 @@ from abc import ABC
 from enum import Enum
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.lib.clients.clients.http.transport import get_transport
 from typing import Any, Dict, List, Literal, Optional
 
-import requests
 from strawberry import type as strawberry_type
 
 
@@ -48,13 +48,14 @@ class GoDaddyClientApi:
             "Authorization": "sso-key " + godaddy_key + ":" + godaddy_secret,
             "content-type": "application/json",
         }
+        self.http = get_transport("godaddy")
         self.url_base = (
             "https://api.godaddy.com/{endpoint}"
             if env.lower() == "prod"
             else "https://api.ote-godaddy.com/{endpoint}"
         )
 
-    def find_record(
+    async def find_record(
         self,
         record_name: str,
         type: Literal["A", "AAAA", "CNAME", "MX", "NS", "SOA", "SRV", "TXT"],
@@ -65,7 +66,7 @@ class GoDaddyClientApi:
                     domain=self.godaddy_domain, type=type, name=record_name
                 )
             )
-            fact_resp = requests.get(url=url, headers=self.headers)
+            fact_resp = await self.http.get(url, headers=self.headers)
             if fact_resp.status_code == 200:
                 return GoDaddyResponse(
                     status="ok",
@@ -86,7 +87,7 @@ class GoDaddyClientApi:
                 msg=str(e),
             )
 
-    def new_cname_record(
+    async def new_cname_record(
         self, ecommerce_name: str, data_record: str
     ) -> GoDaddyResponse:
         """_summary_
@@ -115,7 +116,7 @@ class GoDaddyClientApi:
                     "type": "CNAME",
                 }
             ]
-            fact_resp = requests.patch(url=url, headers=self.headers, json=data)
+            fact_resp = await self.http.patch(url, headers=self.headers, json=data)
             if fact_resp.status_code == 200:
                 return GoDaddyResponse(
                     status="ok",
@@ -0,0 +1,210 @@
+"""Shared HTTP transport for outbound integrations.
+
+Requests run on a bounded thread pool so they never block the event loop,
+re-using a pooled keep-alive session per host, with per-client timeouts,
+retries with exponential backoff and a per-client concurrency limit.
+
+Usage:
+    http = get_transport("facturama", timeout=(5.0, 60.0))
+    resp = await http.post(url, headers=headers, json=data)
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# shared worker pool for all outbound requests
+HTTP_MAX_WORKERS = 32
+_executor = ThreadPoolExecutor(max_workers=HTTP_MAX_WORKERS, thread_name_prefix="http")
+
+# methods safe to retry after the request may have reached the server
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking SDK call (i.e. cloudinary) on the shared worker pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+class AsyncHttpTransport:
+    """Pooled HTTP transport of an outbound integration
+
+    Parameters
+    ----------
+    name : str
+        Integration name (for logging)
+    timeout : float | Tuple[float, float]
+        Connect / read timeout in seconds
+    retries : int
+        Max retries on connection errors and retryable statuses
+    backoff : float
+        Base backoff in seconds (doubles on every retry)
+    max_concurrency : int
+        Max in-flight requests of this integration
+    pool_maxsize : int
+        Max keep-alive connections per host
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float | Tuple[float, float] = (5.0, 30.0),
+        retries: int = 2,
+        backoff: float = 0.5,
+        max_concurrency: int = 10,
+        pool_maxsize: int = 10,
+    ) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self.pool_maxsize = pool_maxsize
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._sync_limit = threading.BoundedSemaphore(max_concurrency)
+        # one semaphore per event loop
+        self._limits: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _session(self, url: str) -> requests.Session:
+        """Keep-alive session of the url host"""
+        _url = urlsplit(url)
+        host = f"{_url.scheme}://{_url.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount(host, adapter)
+                self._sessions[host] = session
+        return session
+
+    def _limit(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._limits.get(loop)
+        if sem is None:
+            sem = asyncio.Semaphore(self.max_concurrency)
+            self._limits[loop] = sem
+        return sem
+
+    def _should_retry(
+        self,
+        method: str,
+        attempt: int,
+        resp: Optional[requests.Response] = None,
+        exc: Optional[Exception] = None,
+    ) -> bool:
+        if attempt >= self.retries:
+            return False
+        if exc is not None:
+            # connect errors never reached the server
+            if isinstance(exc, requests.exceptions.ConnectTimeout):
+                return True
+            return method in IDEMPOTENT_METHODS and isinstance(
+                exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+            )
+        if resp is not None and resp.status_code in RETRY_STATUSES:
+            return method in IDEMPOTENT_METHODS or resp.status_code == 429
+        return False
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self._session(url).request(method, url, **kwargs)
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request without blocking the event loop
+
+        Raises
+        ------
+        requests.exceptions.RequestException
+            if the request fails after all retries
+        """
+        _method = method.upper()
+        loop = asyncio.get_running_loop()
+        async with self._limit():
+            attempt = 0
+            while True:
+                try:
+                    resp = await loop.run_in_executor(
+                        _executor, partial(self._send, _method, url, **kwargs)
+                    )
+                    if not self._should_retry(_method, attempt, resp=resp):
+                        return resp
+                    logging.warning(
+                        f"[{self.name}] {_method} {url} returned {resp.status_code}, retrying"
+                    )
+                except requests.exceptions.RequestException as e:
+                    if not self._should_retry(_method, attempt, exc=e):
+                        raise e
+                    logging.warning(f"[{self.name}] {_method} {url} failed ({e}), retrying")
+                await asyncio.sleep(self.backoff * (2**attempt))
+                attempt += 1
+
+    def request_sync(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Blocking version of `request` for scripts and sync callers"""
+        _method = method.upper()
+        with self._sync_limit:
+            attempt = 0
+            while True:
+                try:
+                    resp = self._send(_method, url, **kwargs)
+                    if not self._should_retry(_method, attempt, resp=resp):
+                        return resp
+                except requests.exceptions.RequestException as e:
+                    if not self._should_retry(_method, attempt, exc=e):
+                        raise e
+                time.sleep(self.backoff * (2**attempt))
+                attempt += 1
+
+    async def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_transports: Dict[str, AsyncHttpTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(name: str, **kwargs: Any) -> AsyncHttpTransport:
+    """Shared transport of an integration (created on first use with `kwargs`)"""
+    with _transports_lock:
+        transport = _transports.get(name)
+        if transport is None:
+            transport = AsyncHttpTransport(name, **kwargs)
+            _transports[name] = transport
+    return transport
+
+
+def close_transports() -> None:
+    """Close all pooled connections (i.e. on app shutdown)"""
+    with _transports_lock:
+        for transport in _transports.values():
+            transport.close()
@@ -1,4 +1,3 @@
-import requests
 import pickle
 
 from typing import Dict, List
@@ -10,6 +9,7 @@ from gqlapi.lib.environ.environ.environ import Environment
 from gqlapi.domain.models.v1.pricing import Price, PriceRule
 from gqlapi.domain.interfaces.v1.pricing_interface import PricingServiceInterface
 from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.lib.clients.clients.http.transport import get_transport
 
 
 logger = get_logger(__name__)
@@ -29,6 +29,7 @@ class PricingClient(PricingServiceInterface):
 
     def __init__(self, env=None):
         self.env = env
+        self.http = get_transport("pricing", timeout=timeouts.get(env, 30.0))
 
     def get_batch_prices(self, customer_segment_id: int, product_ids: List[UUID]) -> Dict[UUID, Price]:
         if customer_segment_id == '':
@@ -43,7 +44,7 @@ class PricingClient(PricingServiceInterface):
             ",".join([str(s) for s in product_ids])
         )
 
-        resp = requests.get(url)
+        resp = self.http.request_sync("GET", url)
         if resp.status_code != 200:
             raise Exception("Error in the request")
 
@@ -56,7 +57,7 @@ class PricingClient(PricingServiceInterface):
             GET_PRICE_RULES_ENDPOINT,
         )
 
-        resp = requests.get(url)
+        resp = self.http.request_sync("GET", url)
         if resp.status_code != 200:
             raise Exception("Error in the request")
 
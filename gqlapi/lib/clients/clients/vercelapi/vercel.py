@@ -5,9 +5,9 @@ import json
 import unicodedata
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.lib.clients.clients.http.transport import get_transport
 from typing import Any, Dict, List, Literal, Optional
 
-import requests
 from strawberry import type as strawberry_type
 
 from gqlapi.utils.domain_mapper import domain_to_dict
@@ -100,20 +100,21 @@ class VercelClientApi:
             "Authorization": "Bearer " + vercel_token,
             "content-type": "application/json",
         }
+        self.http = get_transport("vercel")
         self.url_base = (
             "https://api.vercel.com/{endpoint}"
             if env.lower() == "prod"
             else "https://api.vercel.com/{endpoint}"
         )
 
-    def find_project(self, project_name: str) -> VercelResponse:
+    async def find_project(self, project_name: str) -> VercelResponse:
         try:
             url = self.url_base.format(
                 endpoint=VercelEndpoints.FIND_PROJECTS.value.format(
                     idOrName=project_name, teamId=self.team_id
                 )
             )
-            fact_resp = requests.get(url=url, headers=self.headers)
+            fact_resp = await self.http.get(url, headers=self.headers)
             if fact_resp.status_code == 200:
                 return VercelResponse(
                     status="ok",
@@ -134,7 +135,7 @@ class VercelClientApi:
                 msg=str(e),
             )
 
-    def new_domain(
+    async def new_domain(
         self,
         project_name: str,
         domain_url: str,
@@ -156,7 +157,7 @@ class VercelClientApi:
                 data["redirect"] = redirect
             if redirect_status_code:
                 data["redirectStatusCode"] = redirect_status_code
-            fact_resp = requests.post(url=url, headers=self.headers, json=data)
+            fact_resp = await self.http.post(url, headers=self.headers, json=data)
             if fact_resp.status_code == 200:
                 return VercelResponse(
                     status="ok",
@@ -177,7 +178,7 @@ class VercelClientApi:
                 msg=str(e),
             )
 
-    def new_project(
+    async def new_project(
         self,
         project_name: str,
         root_directory: str = "apps/commerce-template",
@@ -225,7 +226,7 @@ class VercelClientApi:
                 data["environmentVariables"] = [
                     domain_to_dict(env) for env in environment_variables
                 ]
-            fact_resp = requests.post(url=url, headers=self.headers, json=data)
+            fact_resp = await self.http.post(url, headers=self.headers, json=data)
             if fact_resp.status_code == 200:
                 return VercelResponse(
                     status="ok",
@@ -246,7 +247,7 @@ class VercelClientApi:
                 msg=str(e),
             )
 
-    def new_deployment(
+    async def new_deployment(
         self,
         project_name: str,
         repo_id: str,
@@ -265,7 +266,7 @@ class VercelClientApi:
                 "projectSettings": {"framework": framework},
             }
 
-            fact_resp = requests.post(url=url, headers=self.headers, json=data)
+            fact_resp = await self.http.post(url, headers=self.headers, json=data)
             if fact_resp.status_code == 200:
                 return VercelResponse(
                     status="ok",
@@ -285,7 +286,7 @@ class VercelClientApi:
                 msg=str(e),
             )
 
-    def retrieve_the_environment_variables_of_a_project_by_id_or_name(
+    async def retrieve_the_environment_variables_of_a_project_by_id_or_name(
         self, project_name: str
     ) -> VercelResponse:
         try:
@@ -294,7 +295,7 @@ class VercelClientApi:
                     idOrName=project_name
                 )
             )
-            fact_resp = requests.get(url=url, headers=self.headers)
+            fact_resp = await self.http.get(url, headers=self.headers)
             if fact_resp.status_code == 200:
                 return VercelResponse(
                     status="ok",
@@ -315,7 +316,7 @@ class VercelClientApi:
                 msg=str(e),
             )
 
-    def retrieve_decrypted_the_environment_variables_of_a_project_by_id_or_name(
+    async def retrieve_decrypted_the_environment_variables_of_a_project_by_id_or_name(
         self, project_name: str, env_id: str
     ) -> VercelResponse:
         try:
@@ -324,7 +325,7 @@ class VercelClientApi:
                     idOrName=project_name, id=env_id
                 )
             )
-            fact_resp = requests.get(url=url, headers=self.headers)
+            fact_resp = await self.http.get(url, headers=self.headers)
             if fact_resp.status_code == 200:
                 return VercelResponse(
                     status="ok",
@@ -346,7 +347,7 @@ class VercelClientApi:
             )
 
     # NOT TESTED
-    def find_domain(
+    async def find_domain(
         self,
         project_name: str,
         git_branch: Optional[str] = None,
@@ -383,7 +384,7 @@ class VercelClientApi:
             url += f"&verified={str(verified)}"
         if teamId:
             url += f"&teamId={teamId}"
-        fact_resp = requests.get(url=url, headers=self.headers)
+        fact_resp = await self.http.get(url, headers=self.headers)
         if fact_resp.status_code == 200:
             return VercelResponse(
                 status="ok",
@@ -3,7 +3,7 @@ import logging
 from types import NoneType
 from typing import Any, Dict, List
 
-import requests
+from gqlapi.lib.clients.clients.http.transport import get_transport
 
 
 class HilosSender:
@@ -12,6 +12,7 @@ class HilosSender:
 
     def __init__(self, token: str) -> None:
         self.api_token = token
+        self.http = get_transport("hilos", timeout=(5.0, 10.0))
 
     def _get_phone(self, phone: str) -> str:
         """Get phone number in correct format
@@ -32,7 +33,7 @@ class HilosSender:
             return f"+{phone}"
         return phone
 
-    def verify_template(self, template_id: str) -> bool:
+    async def verify_template(self, template_id: str) -> bool:
         """Verify if template exists and has the correct number of variables
 
         Parameters
@@ -49,7 +50,7 @@ class HilosSender:
         payload = {}
         headers = {"Authorization": f"Token {self.api_token}"}
         try:
-            response = requests.request("GET", url, headers=headers, data=payload, timeout=10)
+            response = await self.http.request("GET", url, headers=headers, data=payload)
             if response.status_code != 200:
                 logging.error(f"Error verifying template {template_id}")
                 logging.warning(str(response.content))
@@ -64,7 +65,7 @@ class HilosSender:
             logging.warning(str(e))
             return False
 
-    def send_message(
+    async def send_message(
         self, phone: str, template_id: str, template_vars: List[Any] = []
     ) -> Dict[str, str] | NoneType:
         """Send WhatsApp message from HCM template
@@ -84,7 +85,7 @@ class HilosSender:
             Response from Hilos API ({"id": "...", "conversation": "..."})
         """
         # verify template
-        if not self.verify_template(template_id):
+        if not await self.verify_template(template_id):
             return None
         # send message
         url = f"{self.template_url}/{template_id}/send"
@@ -94,7 +95,7 @@ class HilosSender:
             "Authorization": f"Token {self.api_token}",
             "Content-Type": "application/json",
         }
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = await self.http.request("POST", url, headers=headers, data=payload)
         if response.status_code != 201:
             logging.error(f"Error sending message to {phone}")
             logging.warning(str(response.content))
@@ -10,8 +10,8 @@ from gqlapi.domain.models.v2.utils import PayMethodType
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.config import APP_TZ
 from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.lib.clients.clients.http.transport import get_transport
 from typing import Any, Dict, Optional
-import requests
 from datetime import datetime
 from strawberry import type as strawberry_type
 import unicodedata
@@ -415,6 +415,7 @@ def build_save_orden_string(
 class ScorpionClientApi:
     def __init__(self, env) -> None:
         self.headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        self.http = get_transport("scorpion")
         self.url_base = (
             "http://20.97.8.26/dev_scorpion_bdu_services/{endpoint}"
             if env.lower() == "prod"
@@ -425,7 +426,7 @@ class ScorpionClientApi:
         try:
             url = self.url_base.format(endpoint=ScorpionEndpoints.TOKEN.value)
             payload = build_token_string(token=token)
-            scrp_resp = requests.request(
+            scrp_resp = await self.http.request(
                 "POST", url, headers=self.headers, data=payload
             )
             logger.debug(scrp_resp.status_code)
@@ -473,7 +474,7 @@ class ScorpionClientApi:
             payload = build_save_orden_string(
                 token, orden=orden, consecutive=consecutive, zone_info=zone_info
             )
-            scrp_resp = requests.request("PUT", url, headers=self.headers, data=payload)
+            scrp_resp = await self.http.request("PUT", url, headers=self.headers, data=payload)
             logger.info(scrp_resp.status_code)
             logger.info(scrp_resp.content)
             if scrp_resp.status_code == 200:
@@ -511,7 +512,7 @@ class ScorpionClientApi:
         try:
             url = self.url_base.format(endpoint=ScorpionEndpoints.GET_ORDENES.value)
             payload = build_get_orden_string(token, number_orden)
-            scrp_resp = requests.request(
+            scrp_resp = await self.http.request(
                 "POST", url, headers=self.headers, data=payload
             )
             logger.info(scrp_resp.status_code)
@@ -558,7 +559,7 @@ class ScorpionClientApi:
         try:
             url = self.url_base.format(endpoint=ScorpionEndpoints.GET_STATUS.value)
             payload = build_get_orden_status_string(token, orden_number)
-            scrp_resp = requests.request(
+            scrp_resp = await self.http.request(
                 "POST", url, headers=self.headers, data=payload
             )
             logger.info(scrp_resp.status_code)
@@ -6,6 +6,7 @@ from gqlapi.handlers.services.authos import (
     EcommerceUserHandler,
 )
 from gqlapi.lib.clients.clients.firebaseapi.firebase_auth import FirebaseAuthApi
+from gqlapi.lib.clients.clients.http.transport import close_transports
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.repository.services.authos import (
     AuthosEcommerceUserRepository,
@@ -23,11 +24,13 @@ from gqlapi.db import (
     db_startup,
     db_shutdown,
     database as sql_database,
+    read_router as sql_read_router,
     authos_database as authos_sql_database,
 )
 from gqlapi.mongo import mongo_db
 from gqlapi.auth import initialize_firebase, AlimaAuthBackend
 from gqlapi.repository.user.firebase import FirebaseTokenRepository
+from gqlapi.utils.product_index import product_index_startup
 
 # application vars
 app_name = get_app()
@@ -60,12 +63,15 @@ def main():
         firebase_app=initialize_firebase(config.FIREBASE_SERVICE_ACCOUNT),
         firebase_rest_api=FirebaseAuthApi(config.FIREBASE_SECRET_KEY),
         sql_database=sql_database,
+        read_router=sql_read_router,
         authos_database=authos_sql_database,
         mongo_database=mongo_db,  # type: ignore (safe)
         on_startup=db_startup,
         on_shutdown=db_shutdown,
         debug=config.TESTING,
     )
+    gql.add_on_start_event(product_index_startup)  # after db startup
+    gql.add_on_shutdown_event(close_transports)  # outbound http pools
     gql.attach_routes([("/", version_endp)])  # Version default server
     # Uvicorn server
     server = StarletteServer(gql, __version__, gql.logger)
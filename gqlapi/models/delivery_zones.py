@@ -1,52 +1,109 @@
-from typing import Dict, Literal, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import os
+import time
+from types import MappingProxyType
+from typing import Dict, Literal, Mapping, Tuple
 import unicodedata
 import json
-from gqlapi import config
 
+DZ_DIR = os.path.dirname(os.path.abspath(__file__))
 # done: to load production ready delivery zones
-with open(
-    f"{config.__file__.replace('config.py', '') }models/delivery_zones.json", "r"
-) as f:
-    delivery_zones = json.load(f)
-
-DZ_IDX: Dict[str, str] = {}
-for dz in delivery_zones:
-    _ser_dz_name = str(dz["zoneName"]).lower().replace(" ", "_").replace("/", "")
+DEFAULT_DZ_FILE = "delivery_zones.json"
+# seconds between file modification checks
+DZ_RELOAD_CHECK_INTERVAL = 30.0
+
+# Additional Delivery zones
+registered_dzs = {
+    "oh6rbfads0q": "scorpion_dzs.json",  # Scorpion
+}
+
+
+def normalize_zone_name(zone_name: str) -> str:
+    """Serialize delivery zone name: lower snake case without accents"""
+    _ser_dz_name = str(zone_name).lower().replace(" ", "_").replace("/", "")
     # normalize without accents
-    _ser_dz_name = (
+    return (
         unicodedata.normalize("NFKD", _ser_dz_name)
         .encode("ASCII", "ignore")
         .decode("utf-8")
     )
-    for z in dz["zipCode"]:
-        DZ_IDX[z] = _ser_dz_name
 
-# Additional Delivery zones
-registered_dzs = {
-    "oh6rbfads0q": "scorpion_dzs.json",  # Scorpion
-}
 
+@lru_cache(maxsize=4096)
+def normalize_unit_name(unit_name: str) -> str:
+    """Serialize supplier unit name to match custom delivery zone names"""
+    return "".join(
+        [
+            c
+            for c in unicodedata.normalize("NFKD", unit_name.lower().replace(" ", "_"))
+            if not unicodedata.combining(c)
+        ]
+    )
+
+
+@dataclass(frozen=True)
+class DeliveryZoneIndex:
+    """Precompiled (read-only) zip code -> delivery zone name index"""
 
-def get_delivery_zone(additional_zn: str) -> Tuple[Dict[str, str], Literal['default', 'custom']]:
+    filename: str
+    mtime: float
+    zones: Mapping[str, str]
+
+
+def load_delivery_zones(filename: str) -> DeliveryZoneIndex:
+    """Read and compile a delivery zones file"""
+    path = os.path.join(DZ_DIR, filename)
+    mtime = os.path.getmtime(path)
+    with open(path, "r") as f:
+        delivery_zones = json.load(f)
+    dz_idx: Dict[str, str] = {}
+    for dz in delivery_zones:
+        _ser_dz_name = normalize_zone_name(dz["zoneName"])
+        for z in dz["zipCode"]:
+            dz_idx[z] = _ser_dz_name
+    return DeliveryZoneIndex(
+        filename=filename, mtime=mtime, zones=MappingProxyType(dz_idx)
+    )
+
+
+# compiled indexes by file and last time their mtime was checked
+_DZ_INDEXES: Dict[str, DeliveryZoneIndex] = {}
+_DZ_CHECKED_AT: Dict[str, float] = {}
+
+
+def get_delivery_zone_index(filename: str) -> DeliveryZoneIndex:
+    """Get compiled index of a delivery zones file,
+    reloaded when the file modification time changes
+    """
+    now = time.monotonic()
+    dz_index = _DZ_INDEXES.get(filename)
+    if dz_index and now - _DZ_CHECKED_AT.get(filename, 0.0) < DZ_RELOAD_CHECK_INTERVAL:
+        return dz_index
+    _DZ_CHECKED_AT[filename] = now
+    try:
+        if dz_index and os.path.getmtime(os.path.join(DZ_DIR, filename)) == dz_index.mtime:
+            return dz_index
+        _DZ_INDEXES[filename] = load_delivery_zones(filename)
+    except Exception as e:
+        if not dz_index:
+            raise e
+        # keep serving the last valid index
+        logging.warning(f"Issues reloading delivery zones: {filename}")
+        logging.error(e)
+    return _DZ_INDEXES[filename]
+
+
+# default delivery zones (compiled at import time)
+DZ_IDX: Mapping[str, str] = get_delivery_zone_index(DEFAULT_DZ_FILE).zones
+
+
+def get_delivery_zone(
+    additional_zn: str,
+) -> Tuple[Mapping[str, str], Literal["default", "custom"]]:
     # if its not in the registered delivery zones
     if additional_zn not in registered_dzs:
         # return the default delivery zones
-        return DZ_IDX, 'default'
-    local_dz_file = registered_dzs[additional_zn]
-    # read file and return the delivery zones
-    with open(
-        f"{config.__file__.replace('config.py', '') }models/{local_dz_file}", "r"
-    ) as f:
-        loc_delivery_zones = json.load(f)
-    local_dz_idx = {}
-    for dz in loc_delivery_zones:
-        _ser_dz_name = str(dz["zoneName"]).lower().replace(" ", "_").replace("/", "")
-        # normalize without accents
-        _ser_dz_name = (
-            unicodedata.normalize("NFKD", _ser_dz_name)
-            .encode("ASCII", "ignore")
-            .decode("utf-8")
-        )
-        for z in dz["zipCode"]:
-            local_dz_idx[z] = _ser_dz_name
-    return local_dz_idx, 'custom'
+        return get_delivery_zone_index(DEFAULT_DZ_FILE).zones, "default"
+    return get_delivery_zone_index(registered_dzs[additional_zn]).zones, "custom"
@@ -4,12 +4,16 @@ from typing import Any, Dict, List, Sequence, Optional, Tuple
 from uuid import UUID
 from bson import Binary
 
+from strawberry.dataloader import DataLoader
 from strawberry.types import Info as StrawberryInfo
+from databases import Database
 from databases.interfaces import Record as SQLRecord
+from graphql import OperationType
 
 from gqlapi.lib.future.future.deprecation import deprecated
 from gqlapi.domain.interfaces.v2.user.core_user import CoreRepositoryInterface
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
+from gqlapi.utils.metrics import timed_mongo
 from pymongo.results import DeleteResult, UpdateResult
 
 from motor.motor_asyncio import AsyncIOMotorClient
@@ -30,6 +34,41 @@ class CoreRepository(CoreRepositoryInterface):
                 error_code=GQLApiErrorCodeType.CONNECTION_SQL_DB_ERROR.value,
             )
         self.db = _db
+        # mutations are pinned to primary to read their own writes
+        if not self._is_read_only_operation(info):
+            self._read_db = _db
+            self._loaders = None
+        else:
+            self._read_db = getattr(info.context["db"], "sql_read", None) or _db
+            # request-scoped batching loaders (only for read-only operations)
+            self._loaders = getattr(info.context["db"], "loaders", None)
+
+    @staticmethod
+    def _is_read_only_operation(info: StrawberryInfo) -> bool:
+        try:
+            return info.operation.operation == OperationType.QUERY
+        except Exception:
+            # scripts and injected contexts have no operation
+            return False
+
+    @property
+    def read_db(self) -> Database:
+        """SQL connection for read-only queries (read replica if available)"""
+        return getattr(self, "_read_db", None) or self.db
+
+    def pin_primary(self) -> None:
+        """Route all subsequent reads of this repository to the primary"""
+        self._read_db = self.db
+        self._loaders = None
+
+    def _record_loader(
+        self, core_element_tablename: str, id_key: str, cols: str
+    ) -> Optional[DataLoader]:
+        """Batching loader for full-record lookups by key, if available"""
+        _loaders = getattr(self, "_loaders", None)
+        if _loaders is None or cols != "*":
+            return None
+        return _loaders.get(core_element_tablename, id_key)
 
     @deprecated("Use add() instead", "gqlapi.repository")
     async def new(
@@ -207,10 +246,14 @@ class CoreRepository(CoreRepositoryInterface):
                 if isinstance(core_columns, list)
                 else core_columns
             )
-            query = (
-                f"""SELECT {cols} FROM {core_element_tablename} WHERE {id_key}=:id """
-            )
-            core_el = await self.db.fetch_one(query=query, values={"id": id})
+            loader = self._record_loader(core_element_tablename, id_key, cols)
+            if loader is not None:
+                core_el = await loader.load(id)
+            else:
+                query = f"""SELECT {cols} FROM {core_element_tablename} WHERE {id_key}=:id """
+                core_el = await self.read_db.fetch_one(
+                    query=query, values={"id": id}
+                )
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -262,8 +305,14 @@ class CoreRepository(CoreRepositoryInterface):
                 if isinstance(core_columns, list)
                 else core_columns
             )
-            query = f"""SELECT {cols} FROM {core_element_tablename} WHERE {id_key}=:validator """
-            core_el = await self.db.fetch_one(query=query, values={"validator": id})
+            loader = self._record_loader(core_element_tablename, id_key, cols)
+            if loader is not None:
+                core_el = await loader.load(id)
+            else:
+                query = f"""SELECT {cols} FROM {core_element_tablename} WHERE {id_key}=:validator """
+                core_el = await self.read_db.fetch_one(
+                    query=query, values={"validator": id}
+                )
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -318,7 +367,7 @@ class CoreRepository(CoreRepositoryInterface):
             ( SELECT {cols}, ROW_NUMBER() OVER (PARTITION BY {partition_key} ORDER BY {order_key} {order_filter}) row_num
             FROM {core_element_tablename}) SELECT * FROM rcos WHERE row_num = 1 and {filter_values}"""
             query = query[:-3]
-            core_el = await self.db.fetch_one(query=query, values=values)
+            core_el = await self.read_db.fetch_one(query=query, values=values)
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -377,7 +426,7 @@ class CoreRepository(CoreRepositoryInterface):
             ( SELECT {cols}, ROW_NUMBER() OVER (PARTITION BY {partition_key} ORDER BY {order_key} {order_filter}) row_num
             FROM {core_element_tablename}) SELECT * FROM rcos WHERE row_num = 1 and {filter_values}"""
             query = query[:-3]
-            core_el = await self.db.fetch_one(query=query, values=values)
+            core_el = await self.read_db.fetch_one(query=query, values=values)
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -549,7 +598,7 @@ class CoreRepository(CoreRepositoryInterface):
             query = f"""{partition} SELECT {cols} FROM {core_element_tablename}"""
             if filter_values:
                 query += f""" WHERE {filter_values}"""
-            core_el = await self.db.fetch_all(query=query, values=values)
+            core_el = await self.read_db.fetch_all(query=query, values=values)
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -604,7 +653,7 @@ class CoreRepository(CoreRepositoryInterface):
             query = f"""{partition} SELECT {cols} FROM {core_element_tablename}"""
             if filter_values:
                 query += f""" WHERE {filter_values}"""
-            core_el = await self.db.fetch_all(query=query, values=values)
+            core_el = await self.read_db.fetch_all(query=query, values=values)
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -650,7 +699,7 @@ class CoreRepository(CoreRepositoryInterface):
             query = (
                 f"""SELECT {cols} FROM {core_element_tablename} WHERE {id_key}=:id """
             )
-            core_el = await self.db.fetch_one(query=query, values={"id": id})
+            core_el = await self.read_db.fetch_one(query=query, values={"id": id})
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -702,7 +751,7 @@ class CoreRepository(CoreRepositoryInterface):
             query = (
                 f"""SELECT {cols} FROM {core_element_tablename} WHERE {id_key}=:id """
             )
-            core_el = await self.db.fetch_one(query=query, values={"id": id})
+            core_el = await self.read_db.fetch_one(query=query, values={"id": id})
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -750,7 +799,7 @@ class CoreRepository(CoreRepositoryInterface):
             query = f"""SELECT {cols} FROM {core_element_tablename}"""
             if filter_values:
                 query += f""" WHERE {filter_values}"""
-            core_el = await self.db.fetch_all(query=query, values=values)
+            core_el = await self.read_db.fetch_all(query=query, values=values)
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -818,7 +867,7 @@ class CoreRepository(CoreRepositoryInterface):
         GQLApiException
         """
         try:
-            res = await self.db.fetch_all(query=query, values=vals)
+            res = await self.read_db.fetch_all(query=query, values=vals)
         except Exception as e:
             logging.error(e)
             logging.warning("Issues executing raw query")
@@ -832,6 +881,7 @@ class CoreRepository(CoreRepositoryInterface):
 class CoreDataOrchestationRepository(CoreRepository):
     def __init__(self, sql_db) -> None:  # type: ignore
         self.db = sql_db
+        self._read_db = sql_db
 
 
 class CoreMongoRepository(CoreRepositoryInterface):
@@ -846,8 +896,30 @@ class CoreMongoRepository(CoreRepositoryInterface):
                 error_code=GQLApiErrorCodeType.CONNECTION_SQL_DB_ERROR.value,
             )
         self.db = _db
+        # request-scoped batching loaders (only for read-only operations)
+        self._loaders = (
+            getattr(info.context["db"], "loaders", None)
+            if CoreRepository._is_read_only_operation(info)
+            else None
+        )
+
+    def _record_loader(
+        self, core_element_collection: str, query: Any
+    ) -> Tuple[Optional[DataLoader], Any]:
+        """Batching loader for single-key uuid lookups, if available"""
+        _loaders = getattr(self, "_loaders", None)
+        if _loaders is None or not isinstance(query, dict) or len(query) != 1:
+            return None, None
+        key, val = next(iter(query.items()))
+        if not isinstance(val, Binary):
+            return None, None
+        loader = _loaders.get(core_element_collection, key)
+        if loader is None:
+            return None, None
+        return loader, Binary.as_uuid(val)
 
     @deprecated("Use add() instead", "gqlapi.repository")
+    @timed_mongo
     async def new(
         self,
         core_element_collection: str,
@@ -908,6 +980,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         logging.debug(f"Create new {core_element_name}")
         return True
 
+    @timed_mongo
     async def add(
         self,
         core_element_collection: str,
@@ -963,6 +1036,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         return tuple(core_values.values())  # type: ignore (safe)
 
     @deprecated("Use fetch() instead", "gqlapi.repository")
+    @timed_mongo
     async def get(
         self, core_element_name: str, core_element_collection: str, query: Any
     ) -> Dict[Any, Any]:
@@ -1009,6 +1083,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         logging.debug(f"Query successfully - {core_element_name}")
         return result
 
+    @timed_mongo
     async def fetch(
         self, core_element_name: str, core_element_collection: str, query: Any
     ) -> MongoRecord:
@@ -1029,10 +1104,16 @@ class CoreMongoRepository(CoreRepositoryInterface):
         """
         # get core element
         try:
-            collection = self.db[core_element_collection]
-            result = await collection.find_one(query)
-            if result:
-                result.pop("_id")
+            loader, key = self._record_loader(core_element_collection, query)
+            if loader is not None:
+                result = await loader.load(key)
+                # copy, cached documents are shared within the request
+                result = dict(result) if result else None
+            else:
+                collection = self.db[core_element_collection]
+                result = await collection.find_one(query)
+                if result:
+                    result.pop("_id")
         except Exception as e:
             logging.error(e)
             logging.warning(f"Issues fetch {core_element_name}")
@@ -1046,6 +1127,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         logging.debug(f"Query successfully - {core_element_name}")
         return result
 
+    @timed_mongo
     async def fetch_many(
         self, core_element_name: str, core_element_collection: str, query: Any
     ) -> List[Dict[Any, Any]]:
@@ -1087,6 +1169,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         return documents
 
     @deprecated("Use edit() instead", "gqlapi.repository")
+    @timed_mongo
     async def update(
         self,
         core_element_collection: str,
@@ -1152,6 +1235,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
             )
         logging.info(f"Update {core_element_name}")
 
+    @timed_mongo
     async def edit(
         self,
         core_element_collection: str,
@@ -1205,6 +1289,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         logging.info(f"Update {core_element_name}")
         return True
 
+    @timed_mongo
     async def update_one(
         self,
         core_element_collection: str,
@@ -1259,6 +1344,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         return updated_info
 
     @deprecated("Use exists() instead", "gqlapi.repository")
+    @timed_mongo
     async def exist(
         self,
         core_element_collection: str,
@@ -1306,6 +1392,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
             )
         logging.debug(f"{core_element_name} validation")
 
+    @timed_mongo
     async def exists(
         self,
         core_element_collection: str,
@@ -1344,6 +1431,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         return True if result else False
 
     @deprecated("Use find() instead", "gqlapi.repository")
+    @timed_mongo
     async def search(
         self,
         core_element_collection: str,
@@ -1392,6 +1480,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         logging.debug(f"Query successfully - {core_element_name}")
         return my_data_as_list
 
+    @timed_mongo
     async def find(
         self,
         core_element_collection: str,
@@ -1435,6 +1524,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
         logging.warning("Not implemented")
         raise NotImplementedError
 
+    @timed_mongo
     async def upsert_list_element(
         self,
         core_element_collection: str,
@@ -1503,6 +1593,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
             )
         return True
 
+    @timed_mongo
     async def delete(
         self,
         core_element_collection: str,
@@ -1546,6 +1637,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
 
         return True
 
+    @timed_mongo
     async def delete_many(
         self,
         core_element_collection: str,
@@ -1589,6 +1681,7 @@ class CoreMongoRepository(CoreRepositoryInterface):
 
         return resp
 
+    @timed_mongo
     async def raw_query(
         self, collection: str, query: Dict[str, Any], **kwargs
     ) -> List[MongoRecord]:
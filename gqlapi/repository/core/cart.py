@@ -7,10 +7,16 @@ from gqlapi.domain.interfaces.v2.orden.cart import (
     CartRepositoryInterface,
 )
 from gqlapi.domain.models.v2.core import Cart, CartProduct
+from gqlapi.domain.models.v2.utils import UOMType
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
+from gqlapi.lib.environ.environ.environ import get_app
+from gqlapi.lib.logger.logger.basic_logger import get_logger
 from gqlapi.repository import CoreRepository
 from gqlapi.utils.domain_mapper import domain_to_dict, sql_to_domain
 
+# logger
+logger = get_logger(get_app())
+
 
 class CartRepository(CoreRepository, CartRepositoryInterface):
     async def new(
@@ -261,6 +267,88 @@ class CartProductRepository(CoreRepository, CartProductRepositoryInterface):
             return []
         return [dict(r) for r in prods]
 
+    async def add_many_with_tax(
+        self, cart_products: List[CartProduct]
+    ) -> List[Dict[Any, Any]]:
+        """Create many cart products with a single multi-row insert
+
+        Args:
+            cart_products (List[CartProduct]): Cart Product objects
+
+        Raises:
+            GQLApiException
+
+        Returns:
+            List[Dict[Any, Any]]: created cart products with
+                supplier product (`tax_json`) info
+        """
+        if not cart_products:
+            return []
+        # column arrays to unnest
+        values: Dict[str, List[Any]] = {
+            "cart_ids": [],
+            "supplier_product_ids": [],
+            "supplier_product_price_ids": [],
+            "quantities": [],
+            "unit_prices": [],
+            "subtotals": [],
+            "comments": [],
+            "sell_units": [],
+            "created_bys": [],
+        }
+        for cp in cart_products:
+            values["cart_ids"].append(cp.cart_id)
+            values["supplier_product_ids"].append(cp.supplier_product_id)
+            values["supplier_product_price_ids"].append(cp.supplier_product_price_id)
+            values["quantities"].append(cp.quantity)
+            values["unit_prices"].append(cp.unit_price)
+            values["subtotals"].append(cp.subtotal)
+            values["comments"].append(cp.comments)
+            values["sell_units"].append(
+                cp.sell_unit.value if isinstance(cp.sell_unit, UOMType) else cp.sell_unit
+            )
+            values["created_bys"].append(cp.created_by)
+        try:
+            _resp = await self.db.fetch_all(
+                query="""WITH ins AS (
+                    INSERT INTO cart_product
+                        (cart_id,
+                        supplier_product_id,
+                        supplier_product_price_id,
+                        quantity,
+                        unit_price,
+                        subtotal,
+                        comments,
+                        sell_unit,
+                        created_by
+                        )
+                    SELECT * FROM unnest(
+                        CAST(:cart_ids AS UUID[]),
+                        CAST(:supplier_product_ids AS UUID[]),
+                        CAST(:supplier_product_price_ids AS UUID[]),
+                        CAST(:quantities AS DOUBLE PRECISION[]),
+                        CAST(:unit_prices AS DOUBLE PRECISION[]),
+                        CAST(:subtotals AS DOUBLE PRECISION[]),
+                        CAST(:comments AS VARCHAR[]),
+                        CAST(:sell_units AS VARCHAR[]),
+                        CAST(:created_bys AS UUID[])
+                    )
+                    RETURNING *
+                )
+                SELECT ins.*, row_to_json(sp.*) AS tax_json
+                FROM ins
+                JOIN supplier_product sp ON ins.supplier_product_id = sp.id
+                """,
+                values=values,
+            )
+        except Exception as e:
+            logger.error(e)
+            raise GQLApiException(
+                msg="Error creating Cart Products",
+                error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
+            )
+        return [dict(r) for r in _resp]
+
     async def search_with_tax(self, cart_id: Optional[UUID] = None) -> Sequence:
         cart_atributes = []
         cart_values_view = {}
@@ -319,3 +407,35 @@ class CartProductRepository(CoreRepository, CartProductRepositoryInterface):
         if not _resp:
             return []
         return [dict(r) for r in _resp]
+
+    async def find_many_with_tax(
+        self, cart_ids: List[UUID]
+    ) -> Dict[UUID, List[Dict[Any, Any]]]:
+        """Find cart products (with supplier product tax info) of many carts
+            in a single query
+
+        Args:
+            cart_ids (List[UUID]): cart ids
+
+        Returns:
+            Dict[UUID, List[Dict[Any, Any]]]: cart products indexed by cart id
+        """
+        _ids = [c_id if isinstance(c_id, UUID) else UUID(str(c_id)) for c_id in cart_ids]
+        _carts: Dict[UUID, List[Dict[Any, Any]]] = {c_id: [] for c_id in _ids}
+        if not _ids:
+            return _carts
+        _resp = await super().find(
+            core_element_name="Cart",
+            core_element_tablename="""
+                cart_product cp
+                    JOIN supplier_product sp ON cp.supplier_product_id = sp.id""",
+            filter_values="cp.cart_id = ANY(:cart_ids)",
+            core_columns=[
+                "cp.*",
+                "row_to_json(sp.*) AS tax_json",
+            ],
+            values={"cart_ids": list(set(_ids))},
+        )
+        for r in _resp:
+            _carts.setdefault(r["cart_id"], []).append(dict(r))
+        return _carts
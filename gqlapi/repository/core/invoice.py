@@ -18,6 +18,7 @@ from gqlapi.domain.models.v2.core import (
     MxSatInvoicingCertificateInfo,
 )
 from gqlapi.domain.models.v2.supplier import InvoicingOptions
+from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 from gqlapi.domain.models.v2.utils import (
     DataTypeDecoder,
     ExecutionStatusType,
@@ -30,6 +31,7 @@ from gqlapi.domain.models.v2.utils import (
 )
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.repository import CoreMongoRepository, CoreRepository
+from gqlapi.utils.blob_store import blob_store_enabled, get_blob_store
 from gqlapi.utils.domain_mapper import domain_to_dict, sql_to_domain
 from gqlapi.utils.helpers import list_into_strtuple
 from gqlapi.lib.logger.logger.basic_logger import get_logger
@@ -37,8 +39,54 @@ from gqlapi.lib.logger.logger.basic_logger import get_logger
 # logger
 logger = get_logger(get_app())
 
+MX_INVOICE_FILE_TYPES = ("pdf", "xml")
+# mx_invoice columns without the inline files (pdf_file, xml_file),
+#   files are only read (blob store, or inline fallback) when requested
+MX_INVOICE_COLUMNS = [
+    "mxi.id",
+    "mxi.supplier_business_id",
+    "mxi.restaurant_branch_id",
+    "mxi.sat_invoice_uuid",
+    "mxi.invoice_number",
+    "mxi.invoice_provider",
+    "mxi.invoice_provider_id",
+    "mxi.pdf_blob_key",
+    "mxi.xml_blob_key",
+    "mxi.total",
+    "mxi.status",
+    "mxi.result",
+    "mxi.cancel_result",
+    "mxi.payment_method",
+    "mxi.created_by",
+    "mxi.created_at",
+    "mxi.last_updated",
+]
+
 
 class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
+    async def _store_files(self, cvals: Dict[str, Any]) -> None:
+        """Copy PDF and XML files of an invoice to the blob store (when
+            configured), adding their keys to the values to insert.
+            Files are also kept inline, as fallback source.
+
+        Parameters
+        ----------
+        cvals : Dict[str, Any]
+            Mx Invoice values
+        """
+        if not blob_store_enabled():
+            return
+        blob_store = get_blob_store()
+        for file_type in MX_INVOICE_FILE_TYPES:
+            _file = cvals.get(f"{file_type}_file")
+            if not _file:
+                continue
+            try:
+                cvals[f"{file_type}_blob_key"] = await blob_store.put(_file)
+            except Exception as e:
+                logger.warning("Could not store Mx Invoice file in blob store")
+                logger.error(e)
+
     async def new(
         self, mx_invoice: MxInvoice, orden_details_id: uuid.UUID
     ) -> Dict[str, Any]:
@@ -54,6 +102,7 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 mx_invoice.status.value
             )
             cvals["sat_invoice_uuid"] = UUID(cvals["sat_invoice_uuid"])
+            await self._store_files(cvals)
             await super().new(
                 core_element_name="Mx Invoice",
                 core_element_tablename="mx_invoice",
@@ -68,6 +117,8 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                         invoice_provider,
                         pdf_file,
                         xml_file,
+                        pdf_blob_key,
+                        xml_blob_key,
                         total,
                         status,
                         created_by
@@ -81,6 +132,8 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                         :invoice_provider,
                         :pdf_file,
                         :xml_file,
+                        :pdf_blob_key,
+                        :xml_blob_key,
                         :total,
                         :status,
                         :created_by
@@ -198,6 +251,7 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 cvals["payment_method"] = cvals["payment_method"].value
             if not isinstance(cvals["sat_invoice_uuid"], uuid.UUID):
                 cvals["sat_invoice_uuid"] = UUID(cvals["sat_invoice_uuid"])
+            await self._store_files(cvals)
             await super().add(
                 core_element_name="Mx Invoice",
                 core_element_tablename="mx_invoice",
@@ -212,6 +266,8 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                         invoice_provider,
                         pdf_file,
                         xml_file,
+                        pdf_blob_key,
+                        xml_blob_key,
                         total,
                         status,
                         created_by,
@@ -227,6 +283,8 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                         :invoice_provider,
                         :pdf_file,
                         :xml_file,
+                        :pdf_blob_key,
+                        :xml_blob_key,
                         :total,
                         :status,
                         :created_by,
@@ -278,6 +336,7 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 cvals["payment_method"] = cvals["payment_method"].value
             if not isinstance(cvals["sat_invoice_uuid"], uuid.UUID):
                 cvals["sat_invoice_uuid"] = UUID(cvals["sat_invoice_uuid"])
+            await self._store_files(cvals)
             await super().add(
                 core_element_name="Mx Invoice",
                 core_element_tablename="mx_invoice",
@@ -292,6 +351,8 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                         invoice_provider,
                         pdf_file,
                         xml_file,
+                        pdf_blob_key,
+                        xml_blob_key,
                         total,
                         status,
                         created_by,
@@ -307,6 +368,8 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                         :invoice_provider,
                         :pdf_file,
                         :xml_file,
+                        :pdf_blob_key,
+                        :xml_blob_key,
                         :total,
                         :status,
                         :created_by,
@@ -437,7 +500,7 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 JOIN orden_details od
                 ON od.id = mxio.orden_details_id
             """,
-            core_columns="mxi.*",
+            core_columns=MX_INVOICE_COLUMNS,
             id_key="orden_id",
             id=orden_id,
         )
@@ -465,7 +528,7 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 JOIN orden_details od
                 ON od.id = mxio.orden_details_id
             """,
-            core_columns="mxi.*",
+            core_columns=MX_INVOICE_COLUMNS,
             id_key="orden_details_id",
             id=orden_details_id,
         )
@@ -586,8 +649,7 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 JOIN orden o
                 ON o.id = od.orden_id
             """,
-            core_columns=[
-                "mxi.*",
+            core_columns=MX_INVOICE_COLUMNS + [
                 "od.orden_id",
                 "mxio.id as mx_invoice_orden_id",
                 "mxio.orden_details_id",
@@ -596,9 +658,6 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 "mxio.last_updated as mxio_last_updated",
                 "od.supplier_unit_id",
                 "su.supplier_business_id",
-                "mxi.pdf_file",
-                "mxi.xml_file",
-                "mxi.payment_method",
                 "o.orden_number",
             ],
             filter_values=f" od.orden_id IN {list_into_strtuple(orden_ids)}",
@@ -646,8 +705,8 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 "rbmii.legal_name",
                 "mi.total",
                 "mi.status",
-                "mi.xml_file",
-                "mi.pdf_file",
+                "mi.xml_blob_key",
+                "mi.pdf_blob_key",
                 "mi.invoice_number",
                 "mi.created_at",
                 "mi.created_by",
@@ -727,8 +786,7 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 JOIN restaurant_business rbu
                     ON rbu.id = rb.restaurant_business_id
             """,
-            core_columns=[
-                "mxi.*",
+            core_columns=MX_INVOICE_COLUMNS + [
                 "od.orden_id",
                 "mxio.id as mx_invoice_orden_id",
                 "mxio.orden_details_id",
@@ -737,8 +795,6 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
                 "mxio.last_updated as mxio_last_updated",
                 "od.supplier_unit_id",
                 "su.supplier_business_id",
-                "mxi.pdf_file",
-                "mxi.xml_file",
             ],
             filter_values=filters_str,
             values=values,
@@ -772,6 +828,82 @@ class MxInvoiceRepository(CoreRepository, MxInvoiceRepositoryInterface):
             return dict(_invassoc)
         return {}
 
+    async def fetch_file(
+        self, mx_invoice_id: UUID, file_type: str, blob_key: Optional[str] = None
+    ) -> bytes | NoneType:
+        """Get PDF or XML file of a Mx Invoice, from the blob store or
+            from the legacy inline column if it has not been migrated yet
+
+        Parameters
+        ----------
+        mx_invoice_id : UUID
+        file_type : str
+            "pdf" | "xml"
+        blob_key : Optional[str]
+            Blob key if already known, to skip the DB lookup
+
+        Returns
+        -------
+        bytes | NoneType
+        """
+        if file_type not in MX_INVOICE_FILE_TYPES:
+            raise GQLApiException(
+                msg=f"Invalid invoice file type: {file_type}",
+                error_code=GQLApiErrorCodeType.DATAVAL_WRONG_DATATYPE.value,
+            )
+        _inv = None
+        if not blob_key:
+            _inv = await super().fetch(
+                id=mx_invoice_id,
+                core_element_name="Mx Invoice",
+                core_element_tablename="mx_invoice",
+                core_columns=[f"{file_type}_blob_key", f"{file_type}_file"],
+            )
+            if not _inv:
+                return None
+            blob_key = _inv[f"{file_type}_blob_key"]
+        if blob_key and blob_store_enabled():
+            _file = await get_blob_store().get(blob_key)
+            if _file is not None:
+                return _file
+            logger.warning(f"Mx Invoice file not found in blob store: {blob_key}")
+        # not in blob store: inline files are the fallback source
+        if _inv is None:
+            _inv = await super().fetch(
+                id=mx_invoice_id,
+                core_element_name="Mx Invoice",
+                core_element_tablename="mx_invoice",
+                core_columns=[f"{file_type}_file"],
+            )
+        return _inv[f"{file_type}_file"] if _inv else None
+
+    async def fetch_file_info(self, mx_invoice_id: UUID) -> Dict[str, Any]:
+        """Get Mx Invoice with its file keys and restaurant business,
+            to validate access to its files
+
+        Parameters
+        ----------
+        mx_invoice_id : UUID
+
+        Returns
+        -------
+        Dict[str, Any]
+        """
+        _inv = await super().fetch(
+            id=mx_invoice_id,
+            id_key="mxi.id",
+            core_element_name="Mx Invoice",
+            core_element_tablename="""
+                mx_invoice mxi
+                JOIN restaurant_branch rb
+                ON rb.id = mxi.restaurant_branch_id
+            """,
+            core_columns=MX_INVOICE_COLUMNS + ["rb.restaurant_business_id"],
+        )
+        if not _inv:
+            return {}
+        return dict(_inv)
+
     async def find(self) -> List[MxInvoice]:
         invoices = await super().find(
             core_element_name="Mx Invoice",
@@ -37,6 +37,92 @@ from gqlapi.utils.helpers import list_into_strtuple
 # logger
 logger = get_logger(get_app())
 
+# orden joined with its current status (sc), paystatus (pc) & details (dc),
+#   filters can use the indexed orden_current (oc) columns
+ORDEN_CURRENT_TABLES = """
+    orden ord
+    JOIN orden_current oc ON ord.id = oc.orden_id
+    JOIN orden_status sc ON sc.id = oc.orden_status_id
+    JOIN orden_paystatus pc ON pc.id = oc.orden_paystatus_id
+    JOIN orden_details dc ON dc.id = oc.orden_details_id
+"""
+
+# orden_current projection upserts (latest status, paystatus & details per orden)
+ORDEN_CURRENT_STATUS_UPSERT = """
+    INSERT INTO orden_current (orden_id, orden_status_id, status)
+    VALUES (:orden_id, :orden_status_id, :status)
+    ON CONFLICT (orden_id) DO UPDATE SET
+        orden_status_id = EXCLUDED.orden_status_id,
+        status = EXCLUDED.status,
+        last_updated = NOW()
+"""
+ORDEN_CURRENT_PAYSTATUS_UPSERT = """
+    INSERT INTO orden_current (orden_id, orden_paystatus_id, paystatus)
+    VALUES (:orden_id, :orden_paystatus_id, :paystatus)
+    ON CONFLICT (orden_id) DO UPDATE SET
+        orden_paystatus_id = EXCLUDED.orden_paystatus_id,
+        paystatus = EXCLUDED.paystatus,
+        last_updated = NOW()
+"""
+ORDEN_CURRENT_DETAILS_UPSERT = """
+    INSERT INTO orden_current (
+        orden_id, orden_details_id, details_version,
+        restaurant_branch_id, supplier_unit_id, delivery_date, payment_method)
+    VALUES (
+        :orden_id, :orden_details_id, :details_version,
+        :restaurant_branch_id, :supplier_unit_id, :delivery_date, :payment_method)
+    ON CONFLICT (orden_id) DO UPDATE SET
+        orden_details_id = EXCLUDED.orden_details_id,
+        details_version = EXCLUDED.details_version,
+        restaurant_branch_id = EXCLUDED.restaurant_branch_id,
+        supplier_unit_id = EXCLUDED.supplier_unit_id,
+        delivery_date = EXCLUDED.delivery_date,
+        payment_method = EXCLUDED.payment_method,
+        last_updated = NOW()
+    WHERE COALESCE(orden_current.details_version, 0) <= COALESCE(EXCLUDED.details_version, 0)
+"""
+
+# current status & cart of an orden, used to keep the stock ledger in sync
+ORDEN_CURRENT_STOCK_STATE = """
+    SELECT oc.status, oc.details_version, dc.cart_id, dc.supplier_unit_id
+    FROM orden_current oc
+    LEFT JOIN orden_details dc ON dc.id = oc.orden_details_id
+    WHERE oc.orden_id = :orden_id
+"""
+# (de)allocate the quantities of an orden cart in the stock ledger,
+#   only carts created after the last stock count are accounted for
+STOCK_LEDGER_CART_UPDATE = """
+    UPDATE supplier_product_stock_ledger spl
+    SET availability = spl.availability + CAST(:sign AS DOUBLE PRECISION) * cps.quantity,
+        last_updated = NOW()
+    FROM (
+        SELECT supplier_product_id, SUM(quantity) AS quantity, MIN(created_at) AS created_at
+        FROM cart_product
+        WHERE cart_id = :cart_id
+        GROUP BY supplier_product_id
+    ) cps
+    WHERE spl.supplier_unit_id = :supplier_unit_id
+        AND spl.supplier_product_id = cps.supplier_product_id
+        AND spl.stock_created_at <= cps.created_at
+"""
+
+
+async def _update_stock_ledger(
+    repo: CoreRepository, supplier_unit_id: UUID, cart_id: UUID, sold: bool
+) -> None:
+    """Decrement (sold) or increment (released) the stock availability
+    of the products of a cart
+    """
+    await repo._query(
+        query=STOCK_LEDGER_CART_UPDATE,
+        values={
+            "sign": -1.0 if sold else 1.0,
+            "cart_id": cart_id,
+            "supplier_unit_id": supplier_unit_id,
+        },
+        core_element_name="Supplier Product Stock Ledger",
+    )
+
 
 class OrdenRepository(CoreRepository, OrdenRepositoryInterface):
     async def new(
@@ -244,22 +330,7 @@ class OrdenRepository(CoreRepository, OrdenRepositoryInterface):
     ) -> Sequence:  # type: ignore
         _resp = await super().search(
             core_element_name="Ordenes",
-            partition="""WITH
-            status_cos AS
-                ( SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY created_at DESC) status_row_num
-                FROM orden_status),
-            paystatus_cos AS
-                ( SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY created_at DESC) paystatus_row_num
-                FROM orden_paystatus),
-            details_cos AS
-                ( SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY version DESC) details_row_num
-                FROM orden_details)""",
-            core_element_tablename="""
-            orden ord
-            JOIN status_cos sc ON ord.id = sc.orden_id
-            JOIN paystatus_cos pc ON ord.id = pc.orden_id
-            JOIN details_cos dc ON ord.id = dc.orden_id
-            """,
+            core_element_tablename=ORDEN_CURRENT_TABLES,
             filter_values=filter_values,
             core_columns=[
                 "ord.*",
@@ -276,22 +347,7 @@ class OrdenRepository(CoreRepository, OrdenRepositoryInterface):
     ) -> Sequence:  # type: ignore
         _resp = await super().find(
             core_element_name="Ordenes",
-            partition="""WITH
-            status_cos AS
-                ( SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY created_at DESC) status_row_num
-                FROM orden_status),
-            paystatus_cos AS
-                ( SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY created_at DESC) paystatus_row_num
-                FROM orden_paystatus),
-            details_cos AS
-                ( SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY version DESC) details_row_num
-                FROM orden_details)""",
-            core_element_tablename="""
-            orden ord
-            JOIN status_cos sc ON ord.id = sc.orden_id
-            JOIN paystatus_cos pc ON ord.id = pc.orden_id
-            JOIN details_cos dc ON ord.id = dc.orden_id
-            """,
+            core_element_tablename=ORDEN_CURRENT_TABLES,
             filter_values=filter_values,
             core_columns=[
                 "ord.*",
@@ -303,6 +359,49 @@ class OrdenRepository(CoreRepository, OrdenRepositoryInterface):
         )
         return _resp
 
+    async def next_orden_number(self, supplier_business_id: UUID) -> int:
+        """Allocate next orden number of a supplier business.
+            The counter row is incremented atomically (and kept locked until
+            the surrounding transaction ends), so concurrent ordenes never
+            get the same number.
+
+        Args:
+            supplier_business_id (UUID): unique supplier business id
+
+        Returns:
+            int: allocated orden number
+        """
+        try:
+            _num = await self.db.fetch_val(
+                query="""UPDATE orden_number_counter
+                    SET last_number = last_number + 1, last_updated = NOW()
+                    WHERE supplier_business_id = :supplier_business_id
+                    RETURNING last_number""",
+                values={"supplier_business_id": supplier_business_id},
+            )
+            if _num is None:
+                # first orden since counter was introduced: seed it with existing ordenes
+                _num = await self.db.fetch_val(
+                    query="""INSERT INTO orden_number_counter (supplier_business_id, last_number)
+                        SELECT :supplier_business_id, COUNT(DISTINCT od.orden_id) + 1
+                        FROM orden_details od
+                        JOIN supplier_unit su ON od.supplier_unit_id = su.id
+                        WHERE su.supplier_business_id = :supplier_business_id
+                        ON CONFLICT (supplier_business_id) DO UPDATE
+                        SET last_number = orden_number_counter.last_number + 1,
+                            last_updated = NOW()
+                        RETURNING last_number""",
+                    values={"supplier_business_id": supplier_business_id},
+                )
+        except Exception as e:
+            logger.error(e)
+            raise GQLApiException(
+                msg="Error allocating orden number",
+                error_code=GQLApiErrorCodeType.INSERT_SQL_DB_ERROR.value,
+            )
+        return int(_num)
+
+    @deprecated("Use next_orden_number() instead", "gqlapi.repository")
     async def count_by_supplier_business(self, supplier_business_id: UUID) -> int:
         """Validate orden exists
 
@@ -394,6 +493,31 @@ class OrdenRepository(CoreRepository, OrdenRepositoryInterface):
 
 
 class OrdenStatusRepository(CoreRepository, OrdenStatusRepositoryInterface):
+    async def _project_status(self, core_vals: Dict[str, Any]) -> None:
+        """Update orden_current projection with new orden status,
+        releases / re-allocates the orden stock when it is (un)canceled
+        """
+        _prev = await self.db.fetch_one(
+            query=ORDEN_CURRENT_STOCK_STATE,
+            values={"orden_id": core_vals["orden_id"]},
+        )
+        if _prev and _prev["cart_id"] and _prev["supplier_unit_id"]:
+            was_canceled = _prev["status"] == "canceled"
+            is_canceled = core_vals["status"] == "canceled"
+            if was_canceled != is_canceled:
+                await _update_stock_ledger(
+                    self, _prev["supplier_unit_id"], _prev["cart_id"], sold=was_canceled
+                )
+        await self._query(
+            query=ORDEN_CURRENT_STATUS_UPSERT,
+            values={
+                "orden_id": core_vals["orden_id"],
+                "orden_status_id": core_vals["id"],
+                "status": core_vals["status"],
+            },
+            core_element_name="Orden Current Status",
+        )
+
     async def new(
         self,
         orden_status: OrdenStatus,
@@ -413,25 +537,27 @@ class OrdenStatusRepository(CoreRepository, OrdenStatusRepositoryInterface):
         )
         # call super method from new
 
-        await super().new(
-            core_element_tablename="orden_status",
-            core_element_name="Orden Status",
-            # validate_by="id",
-            # validate_against=core_user_vals["id"],
-            core_query="""INSERT INTO orden_status
-                (id,
-                orden_id,
-                status,
-                created_by
-                )
-                    VALUES
-                    (:id,
-                    :orden_id,
-                    :status,
-                    :created_by)
-                """,
-            core_values=core_vals,
-        )
+        async with self.db.transaction():
+            await super().new(
+                core_element_tablename="orden_status",
+                core_element_name="Orden Status",
+                # validate_by="id",
+                # validate_against=core_user_vals["id"],
+                core_query="""INSERT INTO orden_status
+                    (id,
+                    orden_id,
+                    status,
+                    created_by
+                    )
+                        VALUES
+                        (:id,
+                        :orden_id,
+                        :status,
+                        :created_by)
+                    """,
+                core_values=core_vals,
+            )
+            await self._project_status(core_vals)
         return True
 
     async def add(
@@ -453,25 +579,27 @@ class OrdenStatusRepository(CoreRepository, OrdenStatusRepositoryInterface):
         )
         # call super method from new
 
-        _id = await super().add(
-            core_element_tablename="orden_status",
-            core_element_name="Orden Status",
-            # validate_by="id",
-            # validate_against=core_user_vals["id"],
-            core_query="""INSERT INTO orden_status
-                (id,
-                orden_id,
-                status,
-                created_by
-                )
-                    VALUES
-                    (:id,
-                    :orden_id,
-                    :status,
-                    :created_by)
-                """,
-            core_values=core_vals,
-        )
+        async with self.db.transaction():
+            _id = await super().add(
+                core_element_tablename="orden_status",
+                core_element_name="Orden Status",
+                # validate_by="id",
+                # validate_against=core_user_vals["id"],
+                core_query="""INSERT INTO orden_status
+                    (id,
+                    orden_id,
+                    status,
+                    created_by
+                    )
+                        VALUES
+                        (:id,
+                        :orden_id,
+                        :status,
+                        :created_by)
+                    """,
+                core_values=core_vals,
+            )
+            await self._project_status(core_vals)
         if _id and isinstance(_id, UUID):
             return _id
         return None
@@ -648,6 +776,18 @@ class OrdenStatusRepository(CoreRepository, OrdenStatusRepositoryInterface):
 class OrdenPaymentStatusRepository(
     CoreRepository, OrdenPaymentStatusRepositoryInterface
 ):
+    async def _project_paystatus(self, core_vals: Dict[str, Any]) -> None:
+        """Update orden_current projection with new orden paystatus"""
+        await self._query(
+            query=ORDEN_CURRENT_PAYSTATUS_UPSERT,
+            values={
+                "orden_id": core_vals["orden_id"],
+                "orden_paystatus_id": core_vals["id"],
+                "paystatus": core_vals["status"],
+            },
+            core_element_name="Orden Current Paystatus",
+        )
+
     @deprecated("Use add() instead", "gqlapi.repository")
     async def new(
         self,
@@ -669,25 +809,27 @@ class OrdenPaymentStatusRepository(
             )
         # call super method from new
 
-        await super().new(
-            core_element_tablename="orden_paystatus",
-            core_element_name="Orden Paystatus",
-            # validate_by="id",
-            # validate_against=core_user_vals["id"],
-            core_query="""INSERT INTO orden_paystatus
-                (id,
-                orden_id,
-                status,
-                created_by
-                )
-                    VALUES
-                    (:id,
-                    :orden_id,
-                    :status,
-                    :created_by)
-                """,
-            core_values=core_vals,
-        )
+        async with self.db.transaction():
+            await super().new(
+                core_element_tablename="orden_paystatus",
+                core_element_name="Orden Paystatus",
+                # validate_by="id",
+                # validate_against=core_user_vals["id"],
+                core_query="""INSERT INTO orden_paystatus
+                    (id,
+                    orden_id,
+                    status,
+                    created_by
+                    )
+                        VALUES
+                        (:id,
+                        :orden_id,
+                        :status,
+                        :created_by)
+                    """,
+                core_values=core_vals,
+            )
+            await self._project_paystatus(core_vals)
         return True
 
     async def add(
@@ -710,25 +852,27 @@ class OrdenPaymentStatusRepository(
             )
         # call super method from new
 
-        validation = await super().add(
-            core_element_tablename="orden_paystatus",
-            core_element_name="Orden Paystatus",
-            # validate_by="id",
-            # validate_against=core_user_vals["id"],
-            core_query="""INSERT INTO orden_paystatus
-                (id,
-                orden_id,
-                status,
-                created_by
-                )
-                    VALUES
-                    (:id,
-                    :orden_id,
-                    :status,
-                    :created_by)
-                """,
-            core_values=core_vals,
-        )
+        async with self.db.transaction():
+            validation = await super().add(
+                core_element_tablename="orden_paystatus",
+                core_element_name="Orden Paystatus",
+                # validate_by="id",
+                # validate_against=core_user_vals["id"],
+                core_query="""INSERT INTO orden_paystatus
+                    (id,
+                    orden_id,
+                    status,
+                    created_by
+                    )
+                        VALUES
+                        (:id,
+                        :orden_id,
+                        :status,
+                        :created_by)
+                    """,
+                core_values=core_vals,
+            )
+            await self._project_paystatus(core_vals)
         if not validation:
             return False
         return True
@@ -1188,6 +1332,44 @@ class OrdenPaymentStatusRepository(
 
 
 class OrdenDetailsRepository(CoreRepository, OrdenDetailsRepositoryInterface):
+    async def _project_details(self, core_vals: Dict[str, Any]) -> None:
+        """Update orden_current projection with new orden details version,
+        moves the orden stock allocation to the new cart if it changed
+        """
+        _prev = await self.db.fetch_one(
+            query=ORDEN_CURRENT_STOCK_STATE,
+            values={"orden_id": core_vals["orden_id"]},
+        )
+        if not _prev or (
+            _prev["status"] != "canceled"
+            and (_prev["details_version"] or 0) <= (core_vals["version"] or 0)
+            and (
+                _prev["cart_id"] != core_vals["cart_id"]
+                or _prev["supplier_unit_id"] != core_vals["supplier_unit_id"]
+            )
+        ):
+            if _prev and _prev["cart_id"] and _prev["supplier_unit_id"]:
+                await _update_stock_ledger(
+                    self, _prev["supplier_unit_id"], _prev["cart_id"], sold=False
+                )
+            if core_vals["cart_id"] and core_vals["supplier_unit_id"]:
+                await _update_stock_ledger(
+                    self, core_vals["supplier_unit_id"], core_vals["cart_id"], sold=True
+                )
+        await self._query(
+            query=ORDEN_CURRENT_DETAILS_UPSERT,
+            values={
+                "orden_id": core_vals["orden_id"],
+                "orden_details_id": core_vals["id"],
+                "details_version": core_vals["version"],
+                "restaurant_branch_id": core_vals["restaurant_branch_id"],
+                "supplier_unit_id": core_vals["supplier_unit_id"],
+                "delivery_date": core_vals["delivery_date"],
+                "payment_method": core_vals["payment_method"],
+            },
+            core_element_name="Orden Current Details",
+        )
+
     async def new(
         self,
         orden_details: OrdenDetails,
@@ -1212,65 +1394,67 @@ class OrdenDetailsRepository(CoreRepository, OrdenDetailsRepositoryInterface):
             core_vals["delivery_type"] = core_vals["delivery_type"].value
         # call super method from new
 
-        await super().new(
-            core_element_tablename="orden_details",
-            core_element_name="Orden Details",
-            # validate_by="id",
-            # validate_against=core_user_vals["id"],
-            core_query="""INSERT INTO orden_details
-                (id,
-                orden_id,
-                version,
-                restaurant_branch_id,
-                supplier_unit_id,
-                cart_id,
-                delivery_date,
-                delivery_time,
-                delivery_type,
-                subtotal_without_tax,
-                tax,
-                subtotal,
-                discount,
-                discount_code,
-                cashback,
-                cashback_transation_id,
-                shipping_cost,
-                packaging_cost,
-                service_fee,
-                total,
-                comments,
-                payment_method,
-                created_by,
-                approved_by
-                )
-                    VALUES
-                    (:id,
-                    :orden_id,
-                    :version,
-                    :restaurant_branch_id,
-                    :supplier_unit_id,
-                    :cart_id,
-                    :delivery_date,
-                    :delivery_time,
-                    :delivery_type,
-                    :subtotal_without_tax,
-                    :tax,
-                    :subtotal,
-                    :discount,
-                    :discount_code,
-                    :cashback,
-                    :cashback_transation_id,
-                    :shipping_cost,
-                    :packaging_cost,
-                    :service_fee,
-                    :total,
-                    :comments,
-                    :payment_method,
-                    :created_by,
-                    :approved_by)
-                    """,
-            core_values=core_vals,
-        )
+        async with self.db.transaction():
+            await super().new(
+                core_element_tablename="orden_details",
+                core_element_name="Orden Details",
+                # validate_by="id",
+                # validate_against=core_user_vals["id"],
+                core_query="""INSERT INTO orden_details
+                    (id,
+                    orden_id,
+                    version,
+                    restaurant_branch_id,
+                    supplier_unit_id,
+                    cart_id,
+                    delivery_date,
+                    delivery_time,
+                    delivery_type,
+                    subtotal_without_tax,
+                    tax,
+                    subtotal,
+                    discount,
+                    discount_code,
+                    cashback,
+                    cashback_transation_id,
+                    shipping_cost,
+                    packaging_cost,
+                    service_fee,
+                    total,
+                    comments,
+                    payment_method,
+                    created_by,
+                    approved_by
+                    )
+                        VALUES
+                        (:id,
+                        :orden_id,
+                        :version,
+                        :restaurant_branch_id,
+                        :supplier_unit_id,
+                        :cart_id,
+                        :delivery_date,
+                        :delivery_time,
+                        :delivery_type,
+                        :subtotal_without_tax,
+                        :tax,
+                        :subtotal,
+                        :discount,
+                        :discount_code,
+                        :cashback,
+                        :cashback_transation_id,
+                        :shipping_cost,
+                        :packaging_cost,
+                        :service_fee,
+                        :total,
+                        :comments,
+                        :payment_method,
+                        :created_by,
+                        :approved_by)
+                        """,
+                core_values=core_vals,
+            )
+            await self._project_details(core_vals)
 
         return core_vals["id"]
 
@@ -1298,65 +1482,67 @@ class OrdenDetailsRepository(CoreRepository, OrdenDetailsRepositoryInterface):
             core_vals["delivery_type"] = core_vals["delivery_type"].value
         # call super method from new
 
-        validation = await super().add(
-            core_element_tablename="orden_details",
-            core_element_name="Orden Details",
-            # validate_by="id",
-            # validate_against=core_user_vals["id"],
-            core_query="""INSERT INTO orden_details
-                (id,
-                orden_id,
-                version,
-                restaurant_branch_id,
-                supplier_unit_id,
-                cart_id,
-                delivery_date,
-                delivery_time,
-                delivery_type,
-                subtotal_without_tax,
-                tax,
-                subtotal,
-                discount,
-                discount_code,
-                cashback,
-                cashback_transation_id,
-                shipping_cost,
-                packaging_cost,
-                service_fee,
-                total,
-                comments,
-                payment_method,
-                created_by,
-                approved_by
-                )
-                    VALUES
-                    (:id,
-                    :orden_id,
-                    :version,
-                    :restaurant_branch_id,
-                    :supplier_unit_id,
-                    :cart_id,
-                    :delivery_date,
-                    :delivery_time,
-                    :delivery_type,
-                    :subtotal_without_tax,
-                    :tax,
-                    :subtotal,
-                    :discount,
-                    :discount_code,
-                    :cashback,
-                    :cashback_transation_id,
-                    :shipping_cost,
-                    :packaging_cost,
-                    :service_fee,
-                    :total,
-                    :comments,
-                    :payment_method,
-                    :created_by,
-                    :approved_by)
-                    """,
-            core_values=core_vals,
-        )
+        async with self.db.transaction():
+            validation = await super().add(
+                core_element_tablename="orden_details",
+                core_element_name="Orden Details",
+                # validate_by="id",
+                # validate_against=core_user_vals["id"],
+                core_query="""INSERT INTO orden_details
+                    (id,
+                    orden_id,
+                    version,
+                    restaurant_branch_id,
+                    supplier_unit_id,
+                    cart_id,
+                    delivery_date,
+                    delivery_time,
+                    delivery_type,
+                    subtotal_without_tax,
+                    tax,
+                    subtotal,
+                    discount,
+                    discount_code,
+                    cashback,
+                    cashback_transation_id,
+                    shipping_cost,
+                    packaging_cost,
+                    service_fee,
+                    total,
+                    comments,
+                    payment_method,
+                    created_by,
+                    approved_by
+                    )
+                        VALUES
+                        (:id,
+                        :orden_id,
+                        :version,
+                        :restaurant_branch_id,
+                        :supplier_unit_id,
+                        :cart_id,
+                        :delivery_date,
+                        :delivery_time,
+                        :delivery_type,
+                        :subtotal_without_tax,
+                        :tax,
+                        :subtotal,
+                        :discount,
+                        :discount_code,
+                        :cashback,
+                        :cashback_transation_id,
+                        :shipping_cost,
+                        :packaging_cost,
+                        :service_fee,
+                        :total,
+                        :comments,
+                        :payment_method,
+                        :created_by,
+                        :approved_by)
+                        """,
+                core_values=core_vals,
+            )
+            await self._project_details(core_vals)
         if not validation:
             return None
         return core_vals["id"]
@@ -11,6 +11,7 @@ from gqlapi.lib.future.future.deprecation import deprecated
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 from gqlapi.repository import CoreRepository
 from gqlapi.utils.domain_mapper import domain_to_dict, sql_to_domain
+from gqlapi.utils.search import escape_like, product_search_filter
 
 
 class ProductRepository(CoreRepository, ProductRepositoryInterface):
@@ -232,13 +233,12 @@ class ProductRepository(CoreRepository, ProductRepositoryInterface):
     ) -> List[Product]:
         product_atributes = []
         product_values_view = {}
-        if search:
-            product_atributes.append(
-                " exists (select 1 from unnest(keywords) keys where keys ILIKE :search ) and"
-            )
-            product_values_view["search"] = (
-                "%" + "".join(filter(str.isalnum, search.lower())) + "%"
-            )
+        search_cond, search_rank, search_values = product_search_filter(
+            "product_search_text(name, sku, keywords)", search or ""
+        )
+        if search_cond:
+            product_atributes.append(f" {search_cond} and")
+            product_values_view.update(search_values)
         if name:
             product_atributes.append(" name=:name and")
             product_values_view["name"] = name
@@ -264,6 +264,8 @@ class ProductRepository(CoreRepository, ProductRepositoryInterface):
         # adds offset & limit
         _offset = (current_page - 1) * page_size
         _limit = page_size
+        if search_rank:
+            filter_values = filter_values + f" ORDER BY {search_rank} DESC, name"
         filter_values = filter_values + f" OFFSET {_offset} LIMIT {_limit}"
 
         _resp = await super().find(
@@ -525,9 +527,9 @@ class ProductFamilyRepository(CoreRepository, ProductFamilyRepositoryInterface):
         """
         # map query vars
         _search = (
-            f"""AND (
-                UPPER(sat_description) ILIKE UPPER('%{search}%')
-                OR UPPER(sat_code) ILIKE UPPER('%{search}%'))"""
+            """AND (
+                sat_description ILIKE :search
+                OR sat_code ILIKE :search)"""
             if search is not None
             else ""
         )
@@ -546,5 +548,8 @@ class ProductFamilyRepository(CoreRepository, ProductFamilyRepositoryInterface):
             ORDER BY 2 DESC
             OFFSET {_offset} LIMIT {_limit}
         """
-        _resp = await super().raw_query(query=qry, vals={})
+        _resp = await super().raw_query(
+            query=qry,
+            vals={"search": f"%{escape_like(search)}%"} if search is not None else {},
+        )
         return [dict(r) for r in _resp]
@@ -0,0 +1,92 @@
+import logging
+from functools import partial
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from bson import Binary
+from databases import Database
+from pymongo.database import Database as MongoDatabase
+from strawberry.dataloader import DataLoader
+
+# tables batched by primary key:  table -> id column
+SQL_LOADER_TABLES: Dict[str, str] = {
+    "restaurant_branch": "id",
+    "supplier_unit": "id",
+    "supplier_business": "id",
+}
+
+# collections batched by uuid key: collection -> key field
+MONGO_LOADER_COLLECTIONS: Dict[str, str] = {
+    "supplier_business_account": "supplier_business_id",
+}
+
+
+async def _load_sql_records(
+    db: Database, tablename: str, id_key: str, ids: List[UUID | str]
+) -> List[Any]:
+    """Fetch all records of a table with one `= ANY(:ids)` query,
+    returned in the same order as `ids` (None if not found)
+    """
+    _ids = [i if isinstance(i, UUID) else UUID(str(i)) for i in ids]
+    rows = await db.fetch_all(
+        query=f"SELECT * FROM {tablename} WHERE {id_key} = ANY(:ids)",
+        values={"ids": _ids},
+    )
+    idx = {str(r[id_key]): r for r in rows}
+    return [idx.get(str(i)) for i in ids]
+
+
+async def _load_mongo_records(
+    db: MongoDatabase, collection: str, key: str, ids: List[UUID | str]
+) -> List[Any]:
+    """Fetch all documents of a collection with one `$in` query,
+    returned in the same order as `ids` (None if not found)
+    """
+    _ids = [i if isinstance(i, UUID) else UUID(str(i)) for i in ids]
+    cursor = db[collection].find({key: {"$in": [Binary.from_uuid(i) for i in _ids]}})
+    idx = {}
+    async for doc in cursor:
+        doc.pop("_id", None)
+        idx[str(Binary.as_uuid(doc[key]))] = doc
+    return [idx.get(str(i)) for i in ids]
+
+
+class RecordLoaders:
+    """Request-scoped batching loaders for single-record lookups.
+
+    Every `load()` issued within the same event loop tick is collected and
+    resolved with a single query per table / collection. Results are
+    cached for the lifetime of the request.
+    """
+
+    def __init__(
+        self, sql: Optional[Database] = None, mongo: Optional[MongoDatabase] = None
+    ) -> None:
+        self._loaders: Dict[str, DataLoader] = {}
+        if sql is not None:
+            for tablename, id_key in SQL_LOADER_TABLES.items():
+                self._loaders[tablename] = DataLoader(
+                    load_fn=partial(_load_sql_records, sql, tablename, id_key),
+                    cache_key_fn=str,
+                )
+        if mongo is not None:
+            for collection, key in MONGO_LOADER_COLLECTIONS.items():
+                self._loaders[collection] = DataLoader(
+                    load_fn=partial(_load_mongo_records, mongo, collection, key),
+                    cache_key_fn=str,
+                )
+
+    def get(self, name: str, key: str = "id") -> Optional[DataLoader]:
+        """Get loader for a table / collection if it is batched by `key`"""
+        if name in SQL_LOADER_TABLES and SQL_LOADER_TABLES[name] != key:
+            return None
+        if name in MONGO_LOADER_COLLECTIONS and MONGO_LOADER_COLLECTIONS[name] != key:
+            return None
+        return self._loaders.get(name)
+
+    def clear(self, name: str, id: UUID | str) -> None:
+        """Drop a cached record, i.e. after it has been modified"""
+        if name in self._loaders:
+            self._loaders[name].clear(id)
+        else:
+            logging.debug(f"No loader registered for {name}")
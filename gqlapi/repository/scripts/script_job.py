@@ -0,0 +1,257 @@
+import json
+import logging
+from types import NoneType
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+import uuid
+
+from gqlapi.domain.interfaces.v2.scripts.scrips_execution import (
+    ScriptJobRepositoryInterface,
+)
+from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
+from gqlapi.repository import CoreDataOrchestationRepository
+
+# serializes claims so concurrency limits per script are never exceeded
+SCRIPT_JOB_CLAIM_LOCK = 7319001
+
+
+class ScriptJobRepository(CoreDataOrchestationRepository, ScriptJobRepositoryInterface):
+    """Postgres backed queue of script jobs
+
+    Jobs are claimed with `FOR UPDATE SKIP LOCKED` and kept for a visibility
+    timeout (extended with heartbeats), after it expires they are reclaimed
+    by another worker until `max_attempts` is reached.
+    """
+
+    async def enqueue(
+        self,
+        script_execution_id: UUID,
+        script_name: str,
+        args: Optional[Dict[str, Any]] = None,
+        max_attempts: int = 1,
+    ) -> UUID | NoneType:
+        """Enqueue Script Job
+
+        Args:
+            script_execution_id (UUID): script execution record of the job
+            script_name (str): name of script
+            args (Optional[Dict[str, Any]], optional): script kwargs. Defaults to None.
+            max_attempts (int, optional): max executions. Defaults to 1.
+
+        Returns:
+            UUID: unique script job id
+        """
+        _id = uuid.uuid4()
+        await super()._query(
+            query="""INSERT INTO script_job
+                    (id, script_execution_id, script_name, args, max_attempts)
+                VALUES
+                    (:id, :script_execution_id, :script_name, :args, :max_attempts)
+            """,
+            values={
+                "id": _id,
+                "script_execution_id": script_execution_id,
+                "script_name": script_name,
+                "args": json.dumps(args) if args is not None else None,
+                "max_attempts": max_attempts,
+            },
+            core_element_name="Script Job",
+        )
+        return _id
+
+    async def claim(
+        self,
+        worker_id: str,
+        visibility_timeout: float,
+        limits: Dict[str, int],
+        default_limit: int = 1,
+    ) -> Dict[str, Any] | NoneType:
+        """Claim next available Script Job
+            - queued jobs whose backoff passed or running jobs whose
+              visibility timeout expired (worker died)
+            - skipping scripts that reached their concurrency limit
+
+        Args:
+            worker_id (str): claiming worker
+            visibility_timeout (float): seconds the job is kept by the worker
+            limits (Dict[str, int]): max running jobs by script name
+            default_limit (int, optional): max running jobs of other scripts. Defaults to 1.
+
+        Raises:
+            GQLApiException
+
+        Returns:
+            Dict[str, Any] | NoneType: claimed job
+        """
+        try:
+            async with self.db.transaction():
+                await self.db.execute(
+                    query="SELECT pg_advisory_xact_lock(:lock_id)",
+                    values={"lock_id": SCRIPT_JOB_CLAIM_LOCK},
+                )
+                job = await self.db.fetch_one(
+                    query="""
+                    WITH running AS (
+                        SELECT script_name, COUNT(*) AS num
+                        FROM script_job
+                        WHERE status = 'running' AND locked_until > NOW()
+                        GROUP BY script_name
+                    ),
+                    next_job AS (
+                        SELECT sj.id
+                        FROM script_job sj
+                        LEFT JOIN running r ON r.script_name = sj.script_name
+                        WHERE (
+                            (sj.status = 'queued' AND sj.available_at <= NOW())
+                            OR (sj.status = 'running' AND sj.locked_until <= NOW())
+                        )
+                        AND sj.attempts < sj.max_attempts
+                        AND COALESCE(r.num, 0) < COALESCE(
+                            (CAST(:limits AS json) ->> sj.script_name)::int,
+                            :default_limit
+                        )
+                        ORDER BY sj.available_at
+                        LIMIT 1
+                        FOR UPDATE OF sj SKIP LOCKED
+                    )
+                    UPDATE script_job
+                    SET status = 'running',
+                        attempts = script_job.attempts + 1,
+                        locked_by = :worker_id,
+                        locked_until = NOW() + make_interval(
+                            secs => CAST(:visibility_timeout AS double precision)
+                        ),
+                        last_updated = NOW()
+                    FROM next_job
+                    WHERE script_job.id = next_job.id
+                    RETURNING script_job.*
+                    """,
+                    values={
+                        "limits": json.dumps(limits),
+                        "default_limit": default_limit,
+                        "worker_id": worker_id,
+                        "visibility_timeout": visibility_timeout,
+                    },
+                )
+        except Exception as e:
+            logging.error(e)
+            raise GQLApiException(
+                msg="Error claiming Script Job",
+                error_code=GQLApiErrorCodeType.EXECUTE_SQL_DB_ERROR.value,
+            )
+        if not job:
+            return None
+        job_dict = dict(job)
+        if isinstance(job_dict["args"], str):
+            job_dict["args"] = json.loads(job_dict["args"])
+        return job_dict
+
+    async def _update_owned(
+        self, id: UUID, worker_id: str, set_query: str, values: Dict[str, Any]
+    ) -> bool:
+        """Update a job only if it is still owned by the worker"""
+        try:
+            _id = await self.db.fetch_val(
+                query=f"""UPDATE script_job
+                    SET {set_query}, last_updated = NOW()
+                    WHERE id = :id AND locked_by = :worker_id AND status = 'running'
+                    RETURNING id
+                """,
+                values={"id": id, "worker_id": worker_id, **values},
+            )
+        except Exception as e:
+            logging.error(e)
+            raise GQLApiException(
+                msg="Error updating Script Job",
+                error_code=GQLApiErrorCodeType.UPDATE_SQL_DB_ERROR.value,
+            )
+        return _id is not None
+
+    async def heartbeat(
+        self, id: UUID, worker_id: str, visibility_timeout: float
+    ) -> bool:
+        """Extend visibility timeout of a running job
+
+        Returns:
+            bool: False if the job is no longer owned by the worker
+        """
+        return await self._update_owned(
+            id,
+            worker_id,
+            """locked_until = NOW() + make_interval(
+                secs => CAST(:visibility_timeout AS double precision)
+            )""",
+            {"visibility_timeout": visibility_timeout},
+        )
+
+    async def complete(self, id: UUID, worker_id: str) -> bool:
+        """Set job as finished"""
+        return await self._update_owned(
+            id, worker_id, "status = 'finished', locked_until = NULL", {}
+        )
+
+    async def fail(
+        self,
+        id: UUID,
+        worker_id: str,
+        error: str,
+        retry_in: Optional[float] = None,
+    ) -> bool:
+        """Set job as failed
+
+        Args:
+            id (UUID): unique script job id
+            worker_id (str): owner worker
+            error (str): error message
+            retry_in (Optional[float], optional): seconds to requeue the job after,
+                None to set it as error. Defaults to None.
+
+        Returns:
+            bool: False if the job is no longer owned by the worker
+        """
+        if retry_in is None:
+            return await self._update_owned(
+                id,
+                worker_id,
+                "status = 'error', locked_until = NULL, last_error = :error",
+                {"error": error},
+            )
+        return await self._update_owned(
+            id,
+            worker_id,
+            """status = 'queued', locked_by = NULL, locked_until = NULL,
+                last_error = :error,
+                available_at = NOW() + make_interval(
+                    secs => CAST(:retry_in AS double precision)
+                )""",
+            {"error": error, "retry_in": retry_in},
+        )
+
+    async def fail_expired(self) -> List[Dict[str, Any]]:
+        """Set as error running jobs whose visibility timeout expired
+            without attempts left
+
+        Returns:
+            List[Dict[str, Any]]: failed jobs
+        """
+        try:
+            jobs = await self.db.fetch_all(
+                query="""UPDATE script_job
+                    SET status = 'error',
+                        locked_until = NULL,
+                        last_error = 'Visibility timeout expired',
+                        last_updated = NOW()
+                    WHERE status = 'running'
+                    AND locked_until <= NOW()
+                    AND attempts >= max_attempts
+                    RETURNING id, script_execution_id, script_name
+                """,
+                values={},
+            )
+        except Exception as e:
+            logging.error(e)
+            raise GQLApiException(
+                msg="Error updating Script Job",
+                error_code=GQLApiErrorCodeType.UPDATE_SQL_DB_ERROR.value,
+            )
+        return [dict(j) for j in jobs]
@@ -1,3 +1,4 @@
+import copy
 from datetime import datetime
 from types import NoneType
 from uuid import UUID
@@ -12,15 +13,28 @@ from gqlapi.domain.interfaces.v2.authos.ecommerce_user import (
 )
 from gqlapi.domain.interfaces.v2.authos.ecommerce_session import UserSessionRepositoryInterface
 from gqlapi.domain.models.v2.authos import IEcommerceUser, IPwdRestore, IUserSession
-from gqlapi.config import DATABASE_AUTHOS_URL
+from gqlapi.config import (
+    AUTHOS_SESSION_CACHE_SIZE,
+    AUTHOS_SESSION_CACHE_TTL,
+    DATABASE_AUTHOS_URL,
+)
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 from gqlapi.utils.domain_mapper import domain_to_dict, sql_to_domain
 from gqlapi.repository import CoreRepository
+from gqlapi.utils.cache import TTLCache
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.lib.logger.logger.basic_logger import get_logger
 
 logger = get_logger(get_app())
 
+# sessions by (ref_secret_key, session_token) and users by (ref_secret_key, id),
+#   writes through this module invalidate the local process, the TTL bounds
+#   how long other workers can serve a stale entry
+session_cache = TTLCache(maxsize=AUTHOS_SESSION_CACHE_SIZE, ttl=AUTHOS_SESSION_CACHE_TTL)
+ecommerce_user_cache = TTLCache(
+    maxsize=AUTHOS_SESSION_CACHE_SIZE, ttl=AUTHOS_SESSION_CACHE_TTL
+)
+
 
 class UserSessionRepository(CoreRepository, UserSessionRepositoryInterface):
     def __init__(self, info: StrawberryInfo) -> None:
@@ -67,21 +81,28 @@ class UserSessionRepository(CoreRepository, UserSessionRepositoryInterface):
         Returns:
             IUserSession | NoneType: Session token
         """
-        _sess = await super().raw_query(
-            query=f"""
-                SELECT *
-                FROM user_session_{ref_secret_key}
-                WHERE session_token = :session_token
-                AND expiration >= :expires_after
-            """,
-            vals={
-                "session_token": session_token,
-                "expires_after": expires_after,
-            },
-        )
-        if not _sess:
+        _key = (ref_secret_key, session_token)
+        u_sess = session_cache.get(_key)
+        if u_sess is None:
+            _sess = await super().raw_query(
+                query=f"""
+                    SELECT *
+                    FROM user_session_{ref_secret_key}
+                    WHERE session_token = :session_token
+                    AND expiration >= :expires_after
+                """,
+                vals={
+                    "session_token": session_token,
+                    "expires_after": expires_after,
+                },
+            )
+            if not _sess:
+                return None
+            u_sess = IUserSession(**sql_to_domain(_sess[0], IUserSession))
+            session_cache.set(_key, u_sess)
+        if u_sess.expiration < expires_after:
             return None
-        return IUserSession(**sql_to_domain(_sess[0], IUserSession))
+        return copy.copy(u_sess)
 
     async def create_session(self, session: IUserSession, ref_secret_key: str) -> bool:
         """Create Ecommerce session
@@ -120,6 +141,7 @@ class UserSessionRepository(CoreRepository, UserSessionRepositoryInterface):
             validate_by="session_token",
             validate_against=sess_dict["session_token"],
         )
+        session_cache.pop((ref_secret_key, sess_dict["session_token"]))
         return True if fback else False
 
     async def update_session(self, session: IUserSession, ref_secret_key: str) -> bool:
@@ -153,6 +175,7 @@ class UserSessionRepository(CoreRepository, UserSessionRepositoryInterface):
             """,
             core_values=sess_dict,
         )
+        session_cache.pop((ref_secret_key, sess_dict["session_token"]))
         return fback
 
     async def clear_session(self, session_token: str, ref_secret_key: str) -> bool:
@@ -187,8 +210,28 @@ class UserSessionRepository(CoreRepository, UserSessionRepositoryInterface):
             """,
             core_values=sess_dict,
         )
+        session_cache.pop((ref_secret_key, session_token))
         return fback
 
+    def invalidate_user_sessions(self, ecommerce_user_id: UUID, ref_secret_key: str) -> int:
+        """Drop cached sessions of an ecommerce user (i.e. on password reset)
+
+        Args:
+            ecommerce_user_id (UUID): Ecommerce User ID
+            ref_secret_key (str): Reference seller secret key
+
+        Returns:
+            int: Number of dropped sessions
+        """
+        _keys = [
+            k
+            for k, u_sess in session_cache.items()
+            if k[0] == ref_secret_key and u_sess.ecommerce_user_id == ecommerce_user_id
+        ]
+        for k in _keys:
+            session_cache.pop(k)
+        return len(_keys)
+
 
 class EcommerceUserRepository(CoreRepository, EcommerceUserRepositoryInterface):
     def __init__(self, info: StrawberryInfo) -> None:
@@ -238,6 +281,7 @@ class EcommerceUserRepository(CoreRepository, EcommerceUserRepositoryInterface):
             """,
             core_values={"id": ecommerce_user_id, "password": password},
         )
+        ecommerce_user_cache.pop((ref_secret_key, ecommerce_user_id))
         return flag
 
     async def fetch(
@@ -245,18 +289,23 @@ class EcommerceUserRepository(CoreRepository, EcommerceUserRepositoryInterface):
         id: UUID,
         ref_secret_key: str,
     ) -> EcommerceUser | NoneType:
-        resp = await super().fetch(
-            core_element_name="Ecommerce User",
-            core_element_tablename=f"ecommerce_user_{ref_secret_key}",
-            id_key="id",
-            id=id,
-            core_columns=["*"],
-        )
-        if not resp:
-            return None
-        return EcommerceUser(
-            **sql_to_domain(resp, IEcommerceUser), ref_secret_key=ref_secret_key
-        )
+        _key = (ref_secret_key, id)
+        e_user = ecommerce_user_cache.get(_key)
+        if e_user is None:
+            resp = await super().fetch(
+                core_element_name="Ecommerce User",
+                core_element_tablename=f"ecommerce_user_{ref_secret_key}",
+                id_key="id",
+                id=id,
+                core_columns=["*"],
+            )
+            if not resp:
+                return None
+            e_user = EcommerceUser(
+                **sql_to_domain(resp, IEcommerceUser), ref_secret_key=ref_secret_key
+            )
+            ecommerce_user_cache.set(_key, e_user)
+        return copy.copy(e_user)
 
     async def fetch_by_email(
         self,
@@ -339,6 +388,7 @@ class EcommerceUserRepository(CoreRepository, EcommerceUserRepositoryInterface):
             """,
             core_values=vals,
         )
+        ecommerce_user_cache.pop((ref_secret_key, ecommerce_user.id))
         return flag
 
     async def delete(self, id: UUID, ref_secret_key: str) -> bool:
@@ -351,6 +401,7 @@ class EcommerceUserRepository(CoreRepository, EcommerceUserRepositoryInterface):
                 values={"id": id},
                 core_element_name="Ecommerce User",
             )
+            ecommerce_user_cache.pop((ref_secret_key, id))
             return True
         except Exception as e:
             logger.error(e)
@@ -2,6 +2,7 @@ import json
 from types import NoneType
 from typing import Any, Dict, List, Optional
 from uuid import UUID
+from gqlapi.config import PRICE_LIST_LINKS_READ, PRICE_LIST_LINKS_WRITE
 from gqlapi.lib.environ.environ.environ import get_app
 from gqlapi.lib.logger.logger.basic_logger import get_logger
 
@@ -15,6 +16,206 @@ from gqlapi.utils.domain_mapper import domain_to_dict
 
 DEFAULT_SP_PRICE_LIST_NAME: str = "Lista General de Precios"
 
+# link rows of a price list, from its JSON arrays (prices missing in
+#  supplier_product_price are skipped)
+ADD_PRICE_LIST_PRICES_QUERY = """
+    INSERT INTO supplier_price_list_price (price_list_id, supplier_product_price_id)
+    SELECT CAST(:id AS UUID), spp.id
+    FROM json_array_elements_text(CAST(:supplier_product_price_ids AS JSON)) AS pl(price_id)
+    JOIN supplier_product_price spp ON spp.id = pl.price_id::UUID
+    ON CONFLICT DO NOTHING
+    """
+ADD_PRICE_LIST_BRANCHES_QUERY = """
+    INSERT INTO supplier_price_list_branch (price_list_id, restaurant_branch_id)
+    SELECT DISTINCT CAST(:id AS UUID), pl.branch_id::UUID
+    FROM json_array_elements_text(CAST(:supplier_restaurant_relation_ids AS JSON)) AS pl(branch_id)
+    ON CONFLICT DO NOTHING
+    """
+
+
+def expanded_prices_cte() -> str:
+    """`expanded_cleaned_prices_pls` CTE: a row per price of `last_price_list`"""
+    if PRICE_LIST_LINKS_READ:
+        return """
+            -- Prices from Last Price Lists
+                expanded_cleaned_prices_pls AS (
+                    SELECT
+                        lpl.supplier_unit_id, lpl.name,
+                        splp.supplier_product_price_id as supplier_price_id,
+                        lpl.valid_upto
+                    FROM last_price_list lpl
+                    JOIN supplier_price_list_price splp ON splp.price_list_id = lpl.id
+            )"""
+    return """
+            -- Expanded prices from Last Price Lists
+                expanded_prices_pls AS (
+                    SELECT
+                        supplier_unit_id, name,
+                        json_array_elements(supplier_product_price_ids) as supplier_price_id,
+                        valid_upto
+                    FROM last_price_list
+            ),
+            -- Expanded and cleaned prces from Last Price Lists
+                expanded_cleaned_prices_pls AS (
+                    SELECT
+                        supplier_unit_id, name,
+                        REPLACE(supplier_price_id::varchar, '"', '')::UUID as supplier_price_id,
+                        valid_upto
+                    FROM expanded_prices_pls
+            )"""
+
+
+def _price_list_links_sql(price_lists: str) -> Dict[str, str]:
+    """Price and branch rows of the `price_lists` relation
+    (link tables, or its JSON arrays until they are backfilled)
+    """
+    if PRICE_LIST_LINKS_READ:
+        return {
+            "prices": f"""SELECT splp.price_list_id, splp.supplier_product_price_id
+                FROM supplier_price_list_price splp
+                JOIN {price_lists} pls ON pls.id = splp.price_list_id""",
+            "branches": f"""SELECT splb.price_list_id, splb.restaurant_branch_id
+                FROM supplier_price_list_branch splb
+                JOIN {price_lists} pls ON pls.id = splb.price_list_id""",
+        }
+    return {
+        "prices": f"""SELECT pls.id AS price_list_id,
+                    pl.price_id::UUID AS supplier_product_price_id
+                FROM {price_lists} pls
+                CROSS JOIN LATERAL json_array_elements_text(
+                    pls.supplier_product_price_ids
+                ) AS pl(price_id)""",
+        "branches": f"""SELECT pls.id AS price_list_id,
+                    pl.branch_id::UUID AS restaurant_branch_id
+                FROM {price_lists} pls
+                CROSS JOIN LATERAL json_array_elements_text(
+                    pls.supplier_restaurant_relation_ids
+                ) AS pl(branch_id)""",
+    }
+
+
+def price_list_scopes_query() -> str:
+    """Scopes (supplier unit, restaurant branch) whose effective prices a
+    price list can set: branches of any version of the list `:name` in the
+    units of `:supplier_unit_ids`, and the default scope (NULL branch) of
+    the units where it is default.
+    """
+    links = _price_list_links_sql("named_price_list")
+    return f"""
+        WITH named_price_list AS (
+            SELECT id, supplier_unit_id, is_default,
+                supplier_product_price_ids, supplier_restaurant_relation_ids
+            FROM supplier_price_list
+            WHERE supplier_unit_id = ANY(CAST(:supplier_unit_ids AS UUID[]))
+            AND name = :name
+        ),
+        price_list_branches AS ({links["branches"]})
+        SELECT npl.supplier_unit_id, plb.restaurant_branch_id
+        FROM named_price_list npl
+        JOIN price_list_branches plb ON plb.price_list_id = npl.id
+        UNION
+        SELECT supplier_unit_id, NULL::UUID AS restaurant_branch_id
+        FROM named_price_list
+        WHERE is_default = 't'
+        """
+
+
+# effective prices of the scopes in `:scope_unit_ids` / `:scope_branch_ids`
+#   (pairs, NULL branch: default scope)
+DELETE_SCOPED_EFFECTIVE_PRICES_QUERY = """
+    DELETE FROM effective_price ep
+    USING unnest(
+        CAST(:scope_unit_ids AS UUID[]), CAST(:scope_branch_ids AS UUID[])
+    ) AS cs(supplier_unit_id, restaurant_branch_id)
+    WHERE ep.supplier_unit_id = cs.supplier_unit_id
+    AND (
+        ep.restaurant_branch_id = cs.restaurant_branch_id
+        OR (ep.restaurant_branch_id IS NULL AND cs.restaurant_branch_id IS NULL)
+    )
+    """
+
+
+def refresh_effective_prices_query(scoped: bool = False) -> str:
+    """Effective prices of the supplier units in `:supplier_unit_ids`: the
+    latest valid price list assigned to each restaurant branch, and the
+    default price list (`restaurant_branch_id` NULL) for the rest.
+
+    When `scoped`, only of the scopes in `:scope_unit_ids` /
+    `:scope_branch_ids` (see `DELETE_SCOPED_EFFECTIVE_PRICES_QUERY`).
+    """
+    links = _price_list_links_sql("valid_price_list")
+    scope_branch_filter, scope_join = "", ""
+    if scoped:
+        scope_branch_filter = (
+            "WHERE plb.restaurant_branch_id = ANY(CAST(:scope_branch_ids AS UUID[]))"
+        )
+        scope_join = """JOIN unnest(
+            CAST(:scope_unit_ids AS UUID[]), CAST(:scope_branch_ids AS UUID[])
+        ) AS cs(supplier_unit_id, restaurant_branch_id)
+            ON cs.supplier_unit_id = sc.supplier_unit_id
+            AND cs.restaurant_branch_id IS NOT DISTINCT FROM sc.restaurant_branch_id"""
+    return f"""
+        WITH valid_price_list AS (
+            SELECT * FROM (
+                SELECT DISTINCT ON (supplier_unit_id, name)
+                    id, supplier_unit_id, is_default, valid_upto, last_updated,
+                    supplier_product_price_ids, supplier_restaurant_relation_ids
+                FROM supplier_price_list
+                WHERE supplier_unit_id = ANY(CAST(:supplier_unit_ids AS UUID[]))
+                ORDER BY supplier_unit_id, name, last_updated DESC
+            ) last_price_list
+            WHERE valid_upto::date >= current_date
+        ),
+        price_list_branches AS ({links["branches"]}),
+        price_list_prices AS ({links["prices"]}),
+        scopes AS (
+            (
+                SELECT DISTINCT ON (vpl.supplier_unit_id, plb.restaurant_branch_id)
+                    vpl.supplier_unit_id, plb.restaurant_branch_id,
+                    vpl.id AS price_list_id, vpl.valid_upto
+                FROM valid_price_list vpl
+                JOIN price_list_branches plb ON plb.price_list_id = vpl.id
+                {scope_branch_filter}
+                ORDER BY vpl.supplier_unit_id, plb.restaurant_branch_id,
+                    vpl.last_updated DESC
+            )
+            UNION ALL
+            (
+                SELECT DISTINCT ON (supplier_unit_id)
+                    supplier_unit_id, NULL::UUID AS restaurant_branch_id,
+                    id AS price_list_id, valid_upto
+                FROM valid_price_list
+                WHERE is_default = 't'
+                ORDER BY supplier_unit_id, last_updated DESC
+            )
+        )
+        INSERT INTO effective_price (
+            supplier_unit_id, restaurant_branch_id, supplier_product_id,
+            supplier_product_price_id, price_list_id, valid_upto
+        )
+        SELECT DISTINCT ON (
+            sc.supplier_unit_id, sc.restaurant_branch_id, spp.supplier_product_id
+        )
+            sc.supplier_unit_id, sc.restaurant_branch_id, spp.supplier_product_id,
+            spp.id, sc.price_list_id, sc.valid_upto
+        FROM scopes sc
+        {scope_join}
+        JOIN price_list_prices plp ON plp.price_list_id = sc.price_list_id
+        JOIN supplier_product_price spp ON spp.id = plp.supplier_product_price_id
+        ORDER BY sc.supplier_unit_id, sc.restaurant_branch_id,
+            spp.supplier_product_id, spp.created_at DESC
+        """
+
+
+# price ids a restaurant branch sees (`restaurant_branch_id` NULL: default list)
+EFFECTIVE_PRICE_IDS_QUERY = """
+    SELECT supplier_product_price_id
+    FROM effective_price
+    WHERE supplier_unit_id = :supplier_unit_id
+    AND restaurant_branch_id {branch_filter}
+    AND valid_upto::date >= current_date
+    """
+
 logger = get_logger(get_app())
 
 
@@ -51,35 +252,177 @@ class SupplierPriceListRepository(CoreRepository, SupplierPriceListRepositoryInt
         """
         # cast to dict
         vals_dict = self._serialize_supplier_price_list(supplier_price_list)
-        # call super method
-        _id = await super().add(
-            core_element_tablename="supplier_price_list",
-            core_element_name="Supplier Price List",
-            core_query="""
-                INSERT INTO supplier_price_list (
-                    id, supplier_unit_id, name,
-                    supplier_restaurant_relation_ids,
-                    supplier_product_price_ids,
-                    is_default,
-                    valid_from,
-                    valid_upto,
-                    created_by
-                ) VALUES (
-                    :id, :supplier_unit_id, :name,
-                    :supplier_restaurant_relation_ids,
-                    :supplier_product_price_ids,
-                    :is_default,
-                    :valid_from,
-                    :valid_upto,
-                    :created_by
-                )
-                """,
-            core_values=vals_dict,
-        )
-        if not _id:
-            return None
+        async with self.db.transaction():
+            # call super method
+            _id = await super().add(
+                core_element_tablename="supplier_price_list",
+                core_element_name="Supplier Price List",
+                core_query="""
+                    INSERT INTO supplier_price_list (
+                        id, supplier_unit_id, name,
+                        supplier_restaurant_relation_ids,
+                        supplier_product_price_ids,
+                        is_default,
+                        valid_from,
+                        valid_upto,
+                        created_by
+                    ) VALUES (
+                        :id, :supplier_unit_id, :name,
+                        :supplier_restaurant_relation_ids,
+                        :supplier_product_price_ids,
+                        :is_default,
+                        :valid_from,
+                        :valid_upto,
+                        :created_by
+                    )
+                    """,
+                core_values=vals_dict,
+            )
+            if not _id:
+                return None
+            # dual write: link tables along with the JSON arrays
+            if PRICE_LIST_LINKS_WRITE:
+                await self._add_links(vals_dict)
         return supplier_price_list.id
 
+    async def _add_links(self, vals_dict: Dict[str, Any]) -> None:
+        await super().execute(
+            query=ADD_PRICE_LIST_PRICES_QUERY,
+            values={
+                "id": vals_dict["id"],
+                "supplier_product_price_ids": vals_dict["supplier_product_price_ids"],
+            },
+            core_element_name="Supplier Price List Prices",
+        )
+        await super().execute(
+            query=ADD_PRICE_LIST_BRANCHES_QUERY,
+            values={
+                "id": vals_dict["id"],
+                "supplier_restaurant_relation_ids": vals_dict[
+                    "supplier_restaurant_relation_ids"
+                ],
+            },
+            core_element_name="Supplier Price List Branches",
+        )
+
+    async def fetch_price_list_links(
+        self, supplier_price_list_ids: List[UUID]
+    ) -> Dict[UUID, Dict[str, List[UUID]]]:
+        """Fetch price and restaurant branch ids of price lists from the link tables
+
+        Parameters
+        ----------
+        supplier_price_list_ids : List[UUID]
+
+        Returns
+        -------
+        Dict[UUID, Dict[str, List[UUID]]]
+            {price_list_id: {
+                "supplier_product_price_ids": [...],
+                "supplier_restaurant_relation_ids": [...]
+            }}
+        """
+        links: Dict[UUID, Dict[str, List[UUID]]] = {
+            _id: {"supplier_product_price_ids": [], "supplier_restaurant_relation_ids": []}
+            for _id in supplier_price_list_ids
+        }
+        if not supplier_price_list_ids:
+            return links
+        _prices = await self.raw_query(
+            """SELECT price_list_id, supplier_product_price_id
+                FROM supplier_price_list_price
+                WHERE price_list_id = ANY(:ids)
+            """,
+            {"ids": supplier_price_list_ids},
+        )
+        for _p in _prices:
+            links[_p["price_list_id"]]["supplier_product_price_ids"].append(
+                _p["supplier_product_price_id"]
+            )
+        _branches = await self.raw_query(
+            """SELECT price_list_id, restaurant_branch_id
+                FROM supplier_price_list_branch
+                WHERE price_list_id = ANY(:ids)
+            """,
+            {"ids": supplier_price_list_ids},
+        )
+        for _b in _branches:
+            links[_b["price_list_id"]]["supplier_restaurant_relation_ids"].append(
+                _b["restaurant_branch_id"]
+            )
+        return links
+
+    async def refresh_effective_prices(
+        self,
+        supplier_unit_ids: Optional[List[UUID]] = None,
+        supplier_business_id: Optional[UUID] = None,
+        price_list_name: Optional[str] = None,
+    ) -> None:
+        """Recompute effective prices of the given supplier units
+            (or all units of a supplier business)
+            - With `price_list_name`, only the scopes that price list can
+                set (its branches, and the default scope if it is default)
+
+        Parameters
+        ----------
+        supplier_unit_ids : Optional[List[UUID]], optional
+        supplier_business_id : Optional[UUID], optional
+        price_list_name : Optional[str], optional
+        """
+        _unit_ids = list(supplier_unit_ids or [])
+        if supplier_business_id:
+            _units = await super().raw_query(
+                "SELECT id FROM supplier_unit WHERE supplier_business_id = :supplier_business_id",
+                {"supplier_business_id": supplier_business_id},
+            )
+            _unit_ids.extend(u["id"] for u in _units)
+        if not _unit_ids:
+            return
+        _unit_ids = sorted(set(_unit_ids))
+        async with self.db.transaction():
+            # serialize refreshes of the same units (sorted, to avoid deadlocks)
+            await self.db.fetch_all(
+                query="""SELECT pg_advisory_xact_lock(hashtext(su_id::text))
+                    FROM unnest(CAST(:supplier_unit_ids AS UUID[])) AS su(su_id)
+                    ORDER BY su_id
+                """,
+                values={"supplier_unit_ids": _unit_ids},
+            )
+            if price_list_name is None:
+                await super().execute(
+                    query="""DELETE FROM effective_price
+                        WHERE supplier_unit_id = ANY(CAST(:supplier_unit_ids AS UUID[]))
+                    """,
+                    values={"supplier_unit_ids": _unit_ids},
+                    core_element_name="Effective Price",
+                )
+                await super().execute(
+                    query=refresh_effective_prices_query(),
+                    values={"supplier_unit_ids": _unit_ids},
+                    core_element_name="Effective Price",
+                )
+                return
+            _scopes = await self.db.fetch_all(
+                query=price_list_scopes_query(),
+                values={"supplier_unit_ids": _unit_ids, "name": price_list_name},
+            )
+            if not _scopes:
+                return
+            _scope_vals = {
+                "scope_unit_ids": [sc["supplier_unit_id"] for sc in _scopes],
+                "scope_branch_ids": [sc["restaurant_branch_id"] for sc in _scopes],
+            }
+            await super().execute(
+                query=DELETE_SCOPED_EFFECTIVE_PRICES_QUERY,
+                values=_scope_vals,
+                core_element_name="Effective Price",
+            )
+            await super().execute(
+                query=refresh_effective_prices_query(scoped=True),
+                values={"supplier_unit_ids": _unit_ids, **_scope_vals},
+                core_element_name="Effective Price",
+            )
+
     async def exists(
         self,
         supplier_price_list_id: Optional[UUID] = None,
@@ -159,22 +502,7 @@ class SupplierPriceListRepository(CoreRepository, SupplierPriceListRepositoryInt
                 SELECT * FROM rcos WHERE row_num = 1
                 AND id = '{supplier_product_price_list_id}'
             ),
-            -- Expanded prices from Last Price Lists
-                expanded_prices_pls AS (
-                    SELECT
-                        supplier_unit_id, name,
-                        json_array_elements(supplier_product_price_ids) as supplier_price_id,
-                        valid_upto
-                    FROM last_price_list
-            ),
-            -- Expanded and cleaned prces from Last Price Lists
-                expanded_cleaned_prices_pls AS (
-                    SELECT
-                        supplier_unit_id, name,
-                        REPLACE(supplier_price_id::varchar, '"', '')::UUID as supplier_price_id,
-                        valid_upto
-                    FROM expanded_prices_pls
-            ),
+            {expanded_prices_cte()},
             -- Price Lists Price
                 pls_prices AS (
                     SELECT
@@ -299,22 +627,7 @@ class SupplierPriceListRepository(CoreRepository, SupplierPriceListRepositoryInt
                     FROM supplier_unit WHERE supplier_business_id = '{supplier_business_id}'
                     AND deleted = 'f'
             ),
-            -- Expanded prices from Last Price Lists
-                expanded_prices_pls AS (
-                    SELECT
-                        supplier_unit_id, name,
-                        json_array_elements(supplier_product_price_ids) as supplier_price_id,
-                        valid_upto
-                    FROM last_price_list
-            ),
-            -- Expanded and cleaned prces from Last Price Lists
-                expanded_cleaned_prices_pls AS (
-                    SELECT
-                        supplier_unit_id, name,
-                        REPLACE(supplier_price_id::varchar, '"', '')::UUID as supplier_price_id,
-                        valid_upto
-                    FROM expanded_prices_pls
-            ),
+            {expanded_prices_cte()},
             -- Price Lists Price
                 pls_prices AS (
                     SELECT
@@ -19,8 +19,37 @@ from gqlapi.domain.models.v2.utils import UOMType
 from gqlapi.lib.future.future.deprecation import deprecated
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 from gqlapi.repository import CoreRepository
+from gqlapi.repository.supplier.supplier_unit import CATALOG_VERSION_BUMP
 from gqlapi.utils.domain_mapper import domain_to_dict, sql_to_domain
 from gqlapi.utils.helpers import list_into_strtuple
+from gqlapi.utils.search import product_search_filter
+
+# availability ledger is reset on every new stock count and then
+#   maintained by orden creation / edition / cancelation
+STOCK_LEDGER_RESET = """
+    INSERT INTO supplier_product_stock_ledger (
+        supplier_unit_id, supplier_product_id, supplier_product_stock_id,
+        stock_created_at, availability)
+    VALUES (
+        :supplier_unit_id, :supplier_product_id, :supplier_product_stock_id,
+        NOW(), :stock)
+    ON CONFLICT (supplier_unit_id, supplier_product_id) DO UPDATE SET
+        supplier_product_stock_id = EXCLUDED.supplier_product_stock_id,
+        stock_created_at = EXCLUDED.stock_created_at,
+        availability = EXCLUDED.availability,
+        last_updated = NOW()
+"""
+
+# product search index documents: description, SKU and tags of each product
+PRODUCT_SEARCH_DOCUMENTS_QUERY = """
+    SELECT
+        sp.id, sp.supplier_business_id, sp.description, sp.sku,
+        string_agg(spt.tag_value, ' ') AS tags
+    FROM supplier_product sp
+    LEFT JOIN supplier_product_tag spt ON spt.supplier_product_id = sp.id
+    {filter}
+    GROUP BY sp.id
+"""
 
 
 class SupplierProductRepository(CoreRepository, SupplierProductRepositoryInterface):
@@ -744,15 +773,16 @@ class SupplierProductRepository(CoreRepository, SupplierProductRepositoryInterfa
         # build query filters
         filters = [" sp.supplier_business_id = :supplier_business_id "]
         values: Dict[str, Any] = {"supplier_business_id": supplier_business_id}
-        if receiver:
-            filters.append(
-                """ (sp.sku ILIKE :receiver
-                    OR sp.description ILIKE :receiver)
-                """
-            )
-            values["receiver"] = "%" + receiver + "%"
+        search_cond, search_rank, search_values = product_search_filter(
+            "product_search_text(sp.description, sp.sku)", receiver or "", "receiver"
+        )
+        if search_cond:
+            filters.append(search_cond)
+            values.update(search_values)
         filters_str = " AND ".join(filters)
-        filters_str += " ORDER BY 3 "
+        filters_str += (
+            f" ORDER BY {search_rank} DESC, 3 " if search_rank else " ORDER BY 3 "
+        )
         # query
         _prods = await super().find(
             core_element_name="Products",
@@ -807,6 +837,33 @@ class SupplierProductRepository(CoreRepository, SupplierProductRepositoryInterfa
         else:
             return []
 
+    async def fetch_search_documents(
+        self,
+        supplier_business_id: UUID,
+        supplier_product_ids: Optional[List[UUID]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get product search index documents of a supplier business
+
+        Parameters
+        ----------
+        supplier_business_id : UUID
+        supplier_product_ids : Optional[List[UUID]], optional
+            only these products
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+        """
+        _filter = "WHERE sp.supplier_business_id = :supplier_business_id"
+        values: Dict[str, Any] = {"supplier_business_id": supplier_business_id}
+        if supplier_product_ids is not None:
+            _filter += " AND sp.id = ANY(CAST(:supplier_product_ids AS UUID[]))"
+            values["supplier_product_ids"] = list(supplier_product_ids)
+        docs = await self.raw_query(
+            PRODUCT_SEARCH_DOCUMENTS_QUERY.format(filter=_filter), values
+        )
+        return [dict(d) for d in docs]
+
 
 class SupplierProductPriceRepository(
     CoreRepository, SupplierProductPriceRepositoryInterface
@@ -1015,6 +1072,35 @@ class SupplierProductStockRepository(
         """
         # cast to dict
         core_vals = domain_to_dict(supp_prod_stock, skip=["created_at"])
+        async with self.db.transaction():
+            _id = await self._add_stock(core_vals)
+            if _id and core_vals["supplier_unit_id"]:
+                # reset stock ledger to the new count
+                await self._query(
+                    query=STOCK_LEDGER_RESET,
+                    values={
+                        "supplier_unit_id": core_vals["supplier_unit_id"],
+                        "supplier_product_id": core_vals["supplier_product_id"],
+                        "supplier_product_stock_id": core_vals["id"],
+                        "stock": core_vals["stock"],
+                    },
+                    core_element_name="Supplier Product Stock Ledger",
+                )
+        if _id and core_vals["supplier_unit_id"]:
+            # invalidate cached ecommerce catalogs, after commit and
+            #   best effort: it must not fail the stock update
+            try:
+                await self._query(
+                    query=CATALOG_VERSION_BUMP,
+                    values={"supplier_unit_ids": [core_vals["supplier_unit_id"]]},
+                    core_element_name="Supplier Unit Catalog Version",
+                )
+            except Exception as e:
+                logging.warning("Issues invalidating ecommerce catalogs")
+                logging.error(e)
+        return _id
+
+    async def _add_stock(self, core_vals: Dict[str, Any]) -> UUID | NoneType:
         if await super().add(
             core_element_tablename="supplier_product_stock",
             core_element_name="Supplier Product Stock",
@@ -1127,77 +1213,30 @@ class SupplierProductStockRepository(
         """
         if len(stock_products) == 0:
             return []
-        min_purchase_date = min(
-            [stock.created_at for stock in stock_products if stock.created_at]
-        )
-        sup_prods = list_into_strtuple(
-            [stock.supplier_product_id for stock in stock_products]
-        )
-        # query - fetch sold products since last inventory update
-        sold_prods = await super().find(
-            core_element_name="Product Stock Availability",
-            partition="""
-            WITH orden_details_view as (
-                    WITH last_orden_status AS (
-                        WITH rcos AS (
-                            SELECT
-                                orden_id,
-                                status,
-                                ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY created_at DESC) as row_num
-                            FROM orden_status
-                            WHERE created_at >= (NOW() - INTERVAL '2 months')
-                    )
-                        SELECT * FROM rcos WHERE row_num = 1
-                    ),
-                    last_orden_version AS (
-                        WITH last_upd AS (
-                            SELECT
-                                orden_id,
-                                id as orden_details_id,
-                                ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY created_at DESC) row_num
-                            FROM orden_details
-                            WHERE supplier_unit_id = :supplier_unit_id
-                            AND created_at >= (NOW() - INTERVAL '2 months')
-                        )
-                        SELECT * FROM last_upd WHERE row_num = 1
-                    )
-                    SELECT
-                        orden_details.*,
-                        los.status
-                    FROM last_orden_version lov
-                    JOIN orden_details ON orden_details.id = lov.orden_details_id
-                    JOIN last_orden_status los ON los.orden_id = lov.orden_id
-            )
-            """,
-            core_element_tablename="""
-                cart_product cp
-                JOIN orden_details_view odv ON odv.cart_id = cp.cart_id
-            """,
-            core_columns=["cp.supplier_product_id", "cp.created_at", "cp.quantity"],
-            filter_values=f"""
-                odv.status <> 'canceled'
-                AND odv.supplier_unit_id = :supplier_unit_id
-                AND cp.supplier_product_id IN {sup_prods}
-                AND cp.created_at >= :min_purchase_date
+        # query - current availability from stock ledger
+        ledger = await super().find(
+            core_element_name="Supplier Product Stock Ledger",
+            core_element_tablename="supplier_product_stock_ledger",
+            core_columns=["supplier_product_stock_id", "availability"],
+            filter_values="""
+                supplier_unit_id = :supplier_unit_id
+                AND supplier_product_id = ANY(:supplier_product_ids)
             """,
             values={
                 "supplier_unit_id": supplier_unit_id,
-                "min_purchase_date": min_purchase_date,
+                "supplier_product_ids": [
+                    stock.supplier_product_id for stock in stock_products
+                ],
             },
         )
+        ledger_idx = {
+            str(lg["supplier_product_stock_id"]): lg["availability"] for lg in ledger
+        }
         # build availability
         sps_avail: List[SupplierProductStockWithAvailability] = []
         for sprod in stock_products:
-            # compute sold qty given specific product stock update
-            sold_qty = 0.0
-            for sp in sold_prods:
-                if (
-                    sp["supplier_product_id"] == sprod.supplier_product_id
-                    and sp["created_at"] >= sprod.created_at
-                ):
-                    sold_qty += float(sp["quantity"])
-            # compute availability
-            avail = sprod.stock - sold_qty
+            # ledger not yet built for this stock count - nothing sold
+            avail = ledger_idx.get(str(sprod.id), sprod.stock)
             sps_avail.append(
                 SupplierProductStockWithAvailability(
                     **sprod.__dict__,
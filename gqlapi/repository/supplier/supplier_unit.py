@@ -20,6 +20,31 @@ from gqlapi.lib.future.future.deprecation import deprecated
 from gqlapi.repository import CoreMongoRepository, CoreRepository
 from gqlapi.utils.domain_mapper import domain_to_dict, sql_to_domain
 
+# catalog version bumps - invalidate cached ecommerce catalogs of the units
+CATALOG_VERSION_BUMP = """
+    INSERT INTO supplier_unit_catalog_version (supplier_unit_id)
+    SELECT unnest(CAST(:supplier_unit_ids AS UUID[]))
+    ON CONFLICT (supplier_unit_id) DO UPDATE SET
+        version = supplier_unit_catalog_version.version + 1,
+        last_updated = NOW()
+"""
+CATALOG_VERSION_BUMP_BY_BUSINESS = """
+    INSERT INTO supplier_unit_catalog_version (supplier_unit_id)
+    SELECT id FROM supplier_unit WHERE supplier_business_id = :supplier_business_id
+    ON CONFLICT (supplier_unit_id) DO UPDATE SET
+        version = supplier_unit_catalog_version.version + 1,
+        last_updated = NOW()
+"""
+
+# supplier business and catalog version of supplier units
+UNIT_CATALOG_VERSIONS_QUERY = """
+    SELECT
+        su.id, su.supplier_business_id, COALESCE(cv.version, 0) AS version
+    FROM supplier_unit su
+    LEFT JOIN supplier_unit_catalog_version cv ON cv.supplier_unit_id = su.id
+    {filter}
+"""
+
 
 class SupplierUnitRepository(CoreRepository, SupplierUnitRepositoryInterface):
     @deprecated("Use add() instead", "gqlapi.repository")
@@ -511,6 +536,51 @@ class SupplierUnitRepository(CoreRepository, SupplierUnitRepositoryInterface):
             return 0
         return len(_data)
 
+    async def fetch_catalog_version(self, supplier_unit_id: UUID) -> int:
+        """Get current catalog version of a supplier unit
+
+        Parameters
+        ----------
+        supplier_unit_id : UUID
+
+        Returns
+        -------
+        int
+            0 if the catalog has never been modified
+        """
+        _version = await self.read_db.fetch_val(
+            query="""SELECT version FROM supplier_unit_catalog_version
+                WHERE supplier_unit_id = :supplier_unit_id""",
+            values={"supplier_unit_id": supplier_unit_id},
+        )
+        return _version or 0
+
+    async def bump_catalog_version(
+        self,
+        supplier_unit_ids: Optional[List[UUID]] = None,
+        supplier_business_id: Optional[UUID] = None,
+    ) -> None:
+        """Increment catalog version of the given supplier units
+            (or all units of a supplier business)
+
+        Parameters
+        ----------
+        supplier_unit_ids : Optional[List[UUID]], optional
+        supplier_business_id : Optional[UUID], optional
+        """
+        if supplier_unit_ids:
+            await self._query(
+                query=CATALOG_VERSION_BUMP,
+                values={"supplier_unit_ids": list(supplier_unit_ids)},
+                core_element_name="Supplier Unit Catalog Version",
+            )
+        if supplier_business_id:
+            await self._query(
+                query=CATALOG_VERSION_BUMP_BY_BUSINESS,
+                values={"supplier_business_id": supplier_business_id},
+                core_element_name="Supplier Unit Catalog Version",
+            )
+
 
 class SupplierUnitDeliveryRepository(
     CoreMongoRepository, SupplierUnitDeliveryRepositoryInterface
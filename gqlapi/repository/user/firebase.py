@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 import uuid
 from firebase_admin import App as FirebaseApp
 from firebase_admin.auth import Client as FirebaseAuthClient
+from firebase_admin._token_gen import ID_TOKEN_CERT_URI
 from gqlapi.domain.interfaces.v2.user import FirebaseTokenRepositoryInterface
 from gqlapi.domain.models.v2.core import CoreUser
 
@@ -35,6 +36,9 @@ class MockTokenRepository(FirebaseTokenRepositoryInterface):
             )
         }
 
+    def refresh_public_certs(self) -> None:
+        return None
+
 
 class FirebaseTokenRepository(FirebaseTokenRepositoryInterface):
     def __init__(self, fire_app: FirebaseApp) -> None:
@@ -70,3 +74,9 @@ class FirebaseTokenRepository(FirebaseTokenRepositoryInterface):
                 firebase_id=token_verif['uid'],
             )
         }
+
+    def refresh_public_certs(self) -> None:
+        """ Fetch Google public certs used to verify tokens,
+            kept in the verifier's http cache until they expire
+        """
+        self.fb_client._token_verifier.request(ID_TOKEN_CERT_URI)
@@ -804,7 +804,7 @@ async def create_supplier_billing_invoice(
         Items=items,
         GlobalInformation=global_information,
     )
-    internal_invoice_create = facturma_api.new_internal_invoice(
+    internal_invoice_create = await facturma_api.new_internal_invoice(
         invoice=internal_invoice
     )
     if internal_invoice_create.get("status") != "ok":
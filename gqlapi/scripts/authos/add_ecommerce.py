@@ -227,14 +227,14 @@ async def create_new_ecomm(
                 )
             )
     # create new project in vercel
-    find_record = vercel_api.find_project(ecomm_project)
+    find_record = await vercel_api.find_project(ecomm_project)
     if find_record.status == "error" and find_record.status_code == 404:
         logger.info("Project not found, creating new project")
     if find_record.status == "ok":
         logger.error("Project already exists")
         return False
 
-    find_gd_record = go_daddy_api.find_record(ecomm_url.split(".")[0], "CNAME")
+    find_gd_record = await go_daddy_api.find_record(ecomm_url.split(".")[0], "CNAME")
     if find_gd_record.status == "error" and find_gd_record.status_code == 404:
         logger.info("CNAME record not found, creating new record")
     if find_gd_record.status == "ok" and find_gd_record.result:
@@ -242,14 +242,14 @@ async def create_new_ecomm(
         return False
 
     # create new domain in godaddy
-    domain_resp_gd = go_daddy_api.new_cname_record(
+    domain_resp_gd = await go_daddy_api.new_cname_record(
         ecomm_url.split(".")[0], "cname.vercel-dns.com."
     )
     if domain_resp_gd.status == "error":
         logger.warning("ISSUES CREATING GODADDY DOMAIN!!")
         logger.error(domain_resp_gd.msg)
 
-    project_resp = vercel_api.new_project(
+    project_resp = await vercel_api.new_project(
         project_name=ecomm_project,
         root_directory="apps/commerce-template",
         framework="nextjs",
@@ -263,11 +263,11 @@ async def create_new_ecomm(
         logger.error(project_resp.msg)
         return False
     # create new domain in vercel
-    domain_resp = vercel_api.new_domain(ecomm_project, ecomm_url)
+    domain_resp = await vercel_api.new_domain(ecomm_project, ecomm_url)
     if domain_resp.status == "error":
         logger.error(domain_resp.msg)
         return False
-    project_created = vercel_api.find_project(ecomm_project)
+    project_created = await vercel_api.find_project(ecomm_project)
     if project_created.status == "error":
         logger.error(project_created.msg)
         return False
@@ -279,7 +279,7 @@ async def create_new_ecomm(
     if not project_created_json["link"] or not project_created_json["link"]["repoId"]:
         logger.error("Error to create project")
         return False
-    deployment = vercel_api.new_deployment(
+    deployment = await vercel_api.new_deployment(
         project_name=ecomm_project,
         repo_id=project_created_json["link"]["repoId"],
         github_branch="main",
@@ -132,7 +132,7 @@ async def generate_new_business_name(
     return None, None
 
 
-def create_image_in_cloudinary(
+async def create_image_in_cloudinary(
     path: str,
     image_type: str,
     supplier_business_id: str,
@@ -140,12 +140,12 @@ def create_image_in_cloudinary(
 ) -> bool:
     img_file = path
     img_key = supplier_business_id + "_" + image_type
-    cloudinary_api.delete(
+    await cloudinary_api.delete(
         folder=Folders.MARKETPLACE.value,
         subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
         img_key=img_key,
     )
-    _data = cloudinary_api.upload(
+    _data = await cloudinary_api.upload(
         folder=Folders.MARKETPLACE.value,
         img_file=img_file,
         subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
@@ -244,7 +244,7 @@ async def edit_ecomm_seller_params(
     if logo or banner or icon:
         cloudinary_api = CloudinaryApi(env=DEV_ENV)
         if logo:
-            if not create_image_in_cloudinary(
+            if not await create_image_in_cloudinary(
                 logo, "logo", str(supplier_seller.supplier_business_id), cloudinary_api
             ):
                 logger.error(
@@ -252,7 +252,7 @@ async def edit_ecomm_seller_params(
                 )
                 return False
         if banner:
-            if not create_image_in_cloudinary(
+            if not await create_image_in_cloudinary(
                 banner,
                 "banner",
                 str(supplier_seller.supplier_business_id),
@@ -263,7 +263,7 @@ async def edit_ecomm_seller_params(
                 )
                 return False
         if icon:
-            if not create_image_in_cloudinary(
+            if not await create_image_in_cloudinary(
                 icon, "icon", str(supplier_seller.supplier_business_id), cloudinary_api
             ):
                 logger.error(
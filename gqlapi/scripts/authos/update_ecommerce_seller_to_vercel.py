@@ -126,7 +126,7 @@ async def fill_ecomm_seller(
             continue
         print(project_name)
         env_vars = (
-            vercel_api.retrieve_the_environment_variables_of_a_project_by_id_or_name(
+            await vercel_api.retrieve_the_environment_variables_of_a_project_by_id_or_name(
                 project_name
             )
         )
@@ -145,8 +145,10 @@ async def fill_ecomm_seller(
         env_vars_json = json.loads(env_vars.result)
         for env_var in env_vars_json["envs"]:
             if env_var["key"] in EcommerceEnvVars.__annotations__.keys():
-                decryped_value = vercel_api.retrieve_decrypted_the_environment_variables_of_a_project_by_id_or_name(
-                    project_name=project_name, env_id=env_var["id"]
+                decryped_value = await (
+                    vercel_api.retrieve_decrypted_the_environment_variables_of_a_project_by_id_or_name(
+                        project_name=project_name, env_id=env_var["id"]
+                    )
                 )
                 if not decryped_value:
                     logger.error(
@@ -0,0 +1,257 @@
+"""Worker of the data orchestration script jobs queue.
+
+Claims jobs enqueued by the `/data_orch` endpoint (`script_job` table) and
+executes them outside of the API workers:
+
+1. Claims next available job (FOR UPDATE SKIP LOCKED), respecting the
+   concurrency limit of each script
+2. Keeps the job visible to it with heartbeats while the script runs
+3. Sets the job as finished, or requeues it with backoff until it runs out
+   of attempts, and updates the script execution record with the result
+   (back to queued, with the attempt error, when requeued)
+
+Jobs run once unless enqueued with more attempts: only idempotent scripts
+should be (see `SCRIPT_JOB_ATTEMPTS`).
+
+It runs as its own long running process, deployed next to the API from
+the same image (see README).
+
+Usage:
+    poetry run python -m gqlapi.scripts.automation.script_job_worker --help
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import socket
+from typing import Any, Dict, Set
+from uuid import UUID
+
+from gqlapi.config import (
+    SCRIPT_JOB_DEFAULT_LIMIT,
+    SCRIPT_JOB_LIMITS,
+    SCRIPT_JOB_POLL_INTERVAL,
+    SCRIPT_JOB_RETRY_BACKOFF,
+    SCRIPT_JOB_VISIBILITY_TIMEOUT,
+    SCRIPT_JOB_WORKER_CONCURRENCY,
+)
+from gqlapi.db import db_shutdown, db_startup, database as SQLDatabase
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.mongo import mongo_db as MongoDatabase
+from gqlapi.repository.scripts.script_job import ScriptJobRepository
+from gqlapi.repository.scripts.scripts_execution import ScriptExecutionRepository
+from gqlapi.utils.automation import InjectedStrawberryInfo
+from gqlapi.scripts.personalized.supplier.load_orden_payment_to_stripe import (
+    new_orden_la_casa_del_queso,
+)
+from gqlapi.scripts.services.get_error_mails_of_sendgrid import (
+    send_mail_of_error_when_sending_emails_from_sendgrid,
+)
+from gqlapi.scripts.personalized.supplier.send_consolidated_to_provider import (
+    send_supplier_consolidated_to_provider,
+)
+from gqlapi.scripts.automation.run_daily_3rd_party_invoices import (
+    run_daily_3rd_party_invoices,
+)
+from gqlapi.scripts.billing.create_daily_alima_invoice_v2 import (
+    send_create_supplier_billing_invoice_v2,
+)
+from gqlapi.scripts.billing.create_daily_alima_invoice_v3 import (
+    send_create_supplier_billing_invoices_v3,
+)
+from gqlapi.scripts.billing.send_reminder_alima_billing import (
+    send_reminders as send_billing_reminders,
+)
+from gqlapi.scripts.monitor.invoice_execution import invoice_monitor
+from gqlapi.scripts.monitor.script_execution import scripts_monitor
+from gqlapi.scripts.orden.convert_orden_confirm import confirm_orden_status
+from gqlapi.scripts.product.expiration_list_warning import (
+    send_warning as send_expiration_list_warning,
+)
+from gqlapi.scripts.core.refresh_effective_prices import refresh_effective_prices
+from gqlapi.scripts.tests.get_scorpion_orden_status import update_orden_scorpion
+from gqlapi.scripts.tests.new_orden_scorpion import new_orden_scorpion
+
+logger = get_logger(
+    "scripts.automation.script_job_worker", logging.INFO, Environment(get_env())
+)
+
+scripts_map = {
+    # Automation
+    "confirm_orden_status": confirm_orden_status,
+    "send_billing_alima_reminder": send_billing_reminders,
+    "expiration_supplier_product_list_warning": send_expiration_list_warning,
+    # Daily executions
+    "run_daily_3rd_party_invoices": run_daily_3rd_party_invoices,
+    "run_daily_alima_invoices_v2": send_create_supplier_billing_invoice_v2,
+    "run_daily_alima_invoices_v3": send_create_supplier_billing_invoices_v3,
+    "run_daily_effective_prices": refresh_effective_prices,
+    # Monitors
+    "invoice_monitor": invoice_monitor,
+    "script_monitor": scripts_monitor,
+    # 3rd party integrations
+    "run_scorpion_status_check": update_orden_scorpion,
+    "new_orden_scorpion": new_orden_scorpion,
+    # supplier personalization
+    "send_bruma_consolidated_to_provider": send_supplier_consolidated_to_provider,
+    "new_orden_la_casa_del_queso": new_orden_la_casa_del_queso,
+    "send_report_of_error_mails": send_mail_of_error_when_sending_emails_from_sendgrid,
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run script jobs worker.")
+    parser.add_argument(
+        "--concurrency",
+        help="Max jobs running at the same time in this worker",
+        type=int,
+        default=SCRIPT_JOB_WORKER_CONCURRENCY,
+        required=False,
+    )
+    parser.add_argument(
+        "--burst",
+        help="Exit once there are no more available jobs",
+        action="store_true",
+    )
+    return parser.parse_args()
+
+
+class ScriptJobWorker:
+    def __init__(
+        self,
+        job_repo: ScriptJobRepository,
+        exec_repo: ScriptExecutionRepository,
+        concurrency: int = SCRIPT_JOB_WORKER_CONCURRENCY,
+        visibility_timeout: float = SCRIPT_JOB_VISIBILITY_TIMEOUT,
+    ) -> None:
+        self.job_repo = job_repo
+        self.exec_repo = exec_repo
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Set[asyncio.Task] = set()
+
+    async def _heartbeat(self, job_id: UUID) -> None:
+        """Extend job visibility while its script runs"""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                if not await self.job_repo.heartbeat(
+                    job_id, self.worker_id, self.visibility_timeout
+                ):
+                    logger.warning(f"Script job {job_id} is no longer owned by worker")
+                    return
+            except Exception as e:
+                logger.warning(f"Error sending heartbeat of script job: {job_id}")
+                logger.error(e)
+
+    async def execute(self, job: Dict[str, Any]) -> None:
+        """Run script of a claimed job and store its result"""
+        exec_id = job["script_execution_id"]
+        heartbeat = asyncio.create_task(self._heartbeat(job["id"]))
+        try:
+            await self.exec_repo.edit(id=exec_id, status="running")
+            _info = InjectedStrawberryInfo(db=SQLDatabase, mongo=MongoDatabase)
+            result_data = await scripts_map[job["script_name"]](
+                _info, **(job["args"] or {})
+            )
+            result = {"status": "ok", "data": result_data}
+        except Exception as e:
+            logger.warning(f"Error executing script job: {job['id']}")
+            logger.error(e)
+            result = {"status": "error", "error": str(e)}
+        finally:
+            heartbeat.cancel()
+        try:
+            if result["status"] == "ok":
+                await self.job_repo.complete(job["id"], self.worker_id)
+            elif job["attempts"] < job["max_attempts"]:
+                # requeue with exponential backoff
+                await self.job_repo.fail(
+                    job["id"],
+                    self.worker_id,
+                    result["error"],
+                    retry_in=SCRIPT_JOB_RETRY_BACKOFF * (2 ** (job["attempts"] - 1)),
+                )
+                await self.exec_repo.edit(
+                    id=exec_id,
+                    status="queued",
+                    data=json.dumps({**result, "attempts": job["attempts"]}),
+                )
+                return
+            else:
+                await self.job_repo.fail(job["id"], self.worker_id, result["error"])
+            await self.exec_repo.edit(
+                id=exec_id,
+                status="finished" if result["status"] == "ok" else "error",
+                script_end=datetime.datetime.utcnow(),
+                data=json.dumps(result),
+            )
+        except Exception as e:
+            logger.warning(f"Error al actualizar registro en DB: {exec_id}")
+            logger.error(e)
+
+    async def fail_expired(self) -> None:
+        """Set as error jobs whose worker died without attempts left"""
+        for job in await self.job_repo.fail_expired():
+            logger.warning(f"Script job {job['id']} ({job['script_name']}) expired")
+            await self.exec_repo.edit(
+                id=job["script_execution_id"],
+                status="error",
+                script_end=datetime.datetime.utcnow(),
+                data=json.dumps(
+                    {"status": "error", "error": "Visibility timeout expired"}
+                ),
+            )
+
+    async def run(self, burst: bool = False) -> None:
+        logger.info(f"Script job worker {self.worker_id} started")
+        while True:
+            try:
+                await self.fail_expired()
+                job = None
+                if len(self._running) < self.concurrency:
+                    job = await self.job_repo.claim(
+                        self.worker_id,
+                        self.visibility_timeout,
+                        SCRIPT_JOB_LIMITS,
+                        SCRIPT_JOB_DEFAULT_LIMIT,
+                    )
+                if job:
+                    logger.info(f"Running script job {job['id']}: {job['script_name']}")
+                    task = asyncio.create_task(self.execute(job))
+                    self._running.add(task)
+                    task.add_done_callback(self._running.discard)
+                    continue
+                if burst and not self._running:
+                    break
+            except Exception as e:
+                logger.warning("Error claiming script jobs")
+                logger.error(e)
+            await asyncio.sleep(SCRIPT_JOB_POLL_INTERVAL)
+        logger.info(f"Script job worker {self.worker_id} finished")
+
+
+async def main():
+    args = parse_args()
+    try:
+        await db_startup()
+        worker = ScriptJobWorker(
+            ScriptJobRepository(SQLDatabase),
+            ScriptExecutionRepository(SQLDatabase),
+            concurrency=args.concurrency,
+        )
+        await worker.run(burst=args.burst)
+    except Exception as e:
+        logger.error("Error running script job worker")
+        logger.error(e)
+    finally:
+        await db_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
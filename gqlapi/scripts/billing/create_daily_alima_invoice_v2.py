@@ -1044,7 +1044,7 @@ async def create_supplier_billing_invoice_v2(
             Items=items,
             GlobalInformation=global_information,
         )
-        internal_invoice_create = facturma_api.new_internal_invoice(
+        internal_invoice_create = await facturma_api.new_internal_invoice(
             invoice=internal_invoice
         )
         if internal_invoice_create.get("status") != "ok":
@@ -1337,7 +1337,7 @@ async def create_supplier_anual_billing_invoice_v2(
             PaymentMethod="PPD",
             Items=items,
         )
-        internal_invoice_create = facturma_api.new_internal_invoice(
+        internal_invoice_create = await facturma_api.new_internal_invoice(
             invoice=internal_invoice
         )
         if internal_invoice_create.get("status") != "ok":
@@ -0,0 +1,52 @@
+"""Create the `supplier_unit_catalog_version` table of an existing database
+(see schema.sql).
+
+Catalog changes (products, prices, stock) bump the version of the
+supplier units to invalidate cached ecommerce catalogs, so run it before
+deploying. Versions start at 1 on the first bump of each unit. It can be
+re-run safely.
+
+How to run:
+    poetry run python -m gqlapi.scripts.core.migrate_catalog_version
+"""
+
+import asyncio
+import logging
+
+from gqlapi.db import database as SQLDatabase, db_startup, db_shutdown
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+
+logger = get_logger(
+    "scripts.migrate_catalog_version", logging.INFO, Environment(get_env())
+)
+
+CREATE_CATALOG_VERSION = """
+    CREATE TABLE IF NOT EXISTS supplier_unit_catalog_version (
+        supplier_unit_id UUID PRIMARY KEY REFERENCES supplier_unit(id),
+        version BIGINT DEFAULT 1 NOT NULL,
+        last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+    )
+"""
+
+
+async def migrate_catalog_version() -> None:
+    logger.info("Creating supplier unit catalog version table ...")
+    await SQLDatabase.execute(query=CREATE_CATALOG_VERSION)
+
+
+async def main():
+    try:
+        await db_startup()
+        logger.info("Starting catalog version migration ...")
+        await migrate_catalog_version()
+        logger.info("Finished catalog version migration")
+    except Exception as e:
+        logger.error("Error migrating catalog version")
+        logger.error(e)
+    finally:
+        await db_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
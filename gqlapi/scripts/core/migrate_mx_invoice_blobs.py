@@ -0,0 +1,177 @@
+"""Copy Mx Invoice PDF and XML files of the `mx_invoice` table into the
+blob store (`BLOB_STORE_PATH`).
+
+1. Adds `pdf_blob_key` and `xml_blob_key` columns if missing
+2. For each batch of invoices without blob keys, stores their files in
+   the blob store and sets their keys. Inline files are kept as the
+   fallback source.
+3. With `--clear_inline` (once the blob store is verified): clears the
+   inline BYTEA columns of invoices whose blobs are read back and match
+   their key, and optionally vacuums the table (`--vacuum`)
+
+Refuses to run unless `BLOB_STORE_PATH` is an absolute path of a mounted
+persistent volume: the container filesystem is lost on every deploy.
+
+It can be stopped and re-run safely: blobs are content addressed and only
+pending invoices are processed.
+
+How to run:
+    poetry run python -m gqlapi.scripts.core.migrate_mx_invoice_blobs --help
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict
+
+from gqlapi.db import database as SQLDatabase, db_startup, db_shutdown
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.repository.core.invoice import MX_INVOICE_FILE_TYPES
+from gqlapi.utils.blob_store import (
+    BlobStoreNotConfigured,
+    blob_key,
+    blob_store_enabled,
+    get_blob_store,
+)
+
+logger = get_logger(
+    "scripts.migrate_mx_invoice_blobs", logging.INFO, Environment(get_env())
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Move Mx Invoice files into the blob store."
+    )
+    parser.add_argument(
+        "--batch_size",
+        help="Invoices moved per batch",
+        type=int,
+        default=100,
+        required=False,
+    )
+    parser.add_argument(
+        "--clear_inline",
+        help="Clear inline files whose blobs are verified (not reversible)",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--vacuum",
+        help="Vacuum mx_invoice table once finished (with --clear_inline)",
+        action="store_true",
+    )
+    return parser.parse_args()
+
+
+async def migrate_invoice_files(
+    invoice: Dict[str, Any], clear_inline: bool = False
+) -> None:
+    """Store files of an invoice in the blob store and update its keys.
+    Inline files are only cleared once their blob is read back and matches
+    """
+    blob_store = get_blob_store()
+    values: Dict[str, Any] = {"id": invoice["id"]}
+    set_query = []
+    for file_type in MX_INVOICE_FILE_TYPES:
+        _file = invoice[f"{file_type}_file"]
+        if _file is None:
+            continue
+        _key = invoice[f"{file_type}_blob_key"]
+        if not _key:
+            _key = await blob_store.put(bytes(_file))
+            values[f"{file_type}_blob_key"] = _key
+            set_query.append(f"{file_type}_blob_key = :{file_type}_blob_key")
+        if not clear_inline:
+            continue
+        _blob = await blob_store.get(_key)
+        if _blob is None or blob_key(_blob) != _key or _blob != bytes(_file):
+            raise Exception(f"Blob does not match inline file: {_key}")
+        set_query.append(f"{file_type}_file = NULL")
+    if not set_query:
+        return
+    await SQLDatabase.execute(
+        query=f"""UPDATE mx_invoice
+            SET {', '.join(set_query)}
+            WHERE id = :id
+        """,
+        values=values,
+    )
+
+
+async def migrate_mx_invoice_blobs(
+    batch_size: int = 100, clear_inline: bool = False, vacuum: bool = False
+) -> Dict[str, Any]:
+    if not blob_store_enabled():
+        raise BlobStoreNotConfigured(
+            "BLOB_STORE_PATH must be an absolute path of a persistent volume"
+        )
+    logger.info("Adding blob key columns to mx_invoice ...")
+    await SQLDatabase.execute(
+        query="""ALTER TABLE mx_invoice
+            ADD COLUMN IF NOT EXISTS pdf_blob_key VARCHAR,
+            ADD COLUMN IF NOT EXISTS xml_blob_key VARCHAR
+        """
+    )
+    pending_filter = (
+        "pdf_file IS NOT NULL OR xml_file IS NOT NULL"
+        if clear_inline
+        else """(pdf_file IS NOT NULL AND pdf_blob_key IS NULL)
+        OR (xml_file IS NOT NULL AND xml_blob_key IS NULL)"""
+    )
+    migrated, errors = 0, 0
+    last_id = None
+    while True:
+        # keyset pagination, so each batch only reads pending rows
+        invoices = await SQLDatabase.fetch_all(
+            query=f"""SELECT id, pdf_file, xml_file, pdf_blob_key, xml_blob_key
+                FROM mx_invoice
+                WHERE ({pending_filter})
+                {"AND id > :last_id" if last_id else ""}
+                ORDER BY id
+                LIMIT :batch_size
+            """,
+            values=(
+                {"batch_size": batch_size, "last_id": last_id}
+                if last_id
+                else {"batch_size": batch_size}
+            ),
+        )
+        if not invoices:
+            break
+        for inv in invoices:
+            try:
+                await migrate_invoice_files(dict(inv), clear_inline)
+                migrated += 1
+            except Exception as e:
+                logger.warning(f"Error migrating files of Mx Invoice: {inv['id']}")
+                logger.error(e)
+                errors += 1
+        last_id = invoices[-1]["id"]
+        logger.info(f"Migrated {migrated} invoices ({errors} errors) ...")
+    if vacuum and clear_inline:
+        logger.info("Vacuuming mx_invoice ...")
+        await SQLDatabase.execute(query="VACUUM (ANALYZE) mx_invoice")
+    return {"migrated": migrated, "errors": errors}
+
+
+async def main():
+    args = parse_args()
+    try:
+        await db_startup()
+        logger.info("Starting Mx Invoice files migration ...")
+        resp = await migrate_mx_invoice_blobs(
+            batch_size=args.batch_size,
+            clear_inline=args.clear_inline,
+            vacuum=args.vacuum,
+        )
+        logger.info(f"Finished Mx Invoice files migration: {resp}")
+    except Exception as e:
+        logger.error("Error migrating Mx Invoice files")
+        logger.error(e)
+    finally:
+        await db_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""Create the `orden_number_counter` table of an existing database
+(see schema.sql).
+
+Orden creation allocates orden numbers from this table, so run it before
+deploying. Counters are seeded lazily, from the existing ordenes of each
+supplier business, on their first new orden. It can be re-run safely.
+
+How to run:
+    poetry run python -m gqlapi.scripts.core.migrate_orden_number_counter
+"""
+
+import asyncio
+import logging
+
+from gqlapi.db import database as SQLDatabase, db_startup, db_shutdown
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+
+logger = get_logger(
+    "scripts.migrate_orden_number_counter", logging.INFO, Environment(get_env())
+)
+
+CREATE_ORDEN_NUMBER_COUNTER = """
+    CREATE TABLE IF NOT EXISTS orden_number_counter (
+        supplier_business_id UUID PRIMARY KEY REFERENCES supplier_business(id),
+        last_number BIGINT NOT NULL DEFAULT 0,
+        last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+    )
+"""
+
+
+async def migrate_orden_number_counter() -> None:
+    logger.info("Creating orden number counter table ...")
+    await SQLDatabase.execute(query=CREATE_ORDEN_NUMBER_COUNTER)
+
+
+async def main():
+    try:
+        await db_startup()
+        logger.info("Starting orden number counter migration ...")
+        await migrate_orden_number_counter()
+        logger.info("Finished orden number counter migration")
+    except Exception as e:
+        logger.error("Error migrating orden number counter")
+        logger.error(e)
+    finally:
+        await db_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,187 @@
+"""Backfill the supplier price list link tables from the JSON arrays of
+`supplier_price_list` (`supplier_product_price_ids` and
+`supplier_restaurant_relation_ids`).
+
+Rollout:
+1. Deploy with `PRICE_LIST_LINKS_WRITE` on (default), so new price lists
+   are written to both the JSON arrays and the link tables
+2. Run this script: creates the link tables if missing and backfills
+   every existing price list
+3. Verify (`--verify`) and turn `PRICE_LIST_LINKS_READ` on
+
+It can be stopped and re-run safely: links are inserted with
+`ON CONFLICT DO NOTHING`. Prices missing in `supplier_product_price`
+and malformed ids are skipped.
+
+How to run:
+    poetry run python -m gqlapi.scripts.core.migrate_price_list_links --help
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict, List
+from uuid import UUID
+
+from gqlapi.db import database as SQLDatabase, db_startup, db_shutdown
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+
+logger = get_logger(
+    "scripts.migrate_price_list_links", logging.INFO, Environment(get_env())
+)
+
+UUID_REGEX = (
+    "^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"
+)
+
+CREATE_LINK_TABLES = [
+    """CREATE INDEX IF NOT EXISTS supplier_price_list_unit_name_idx
+        ON supplier_price_list (supplier_unit_id, name, last_updated DESC)
+    """,
+    """CREATE TABLE IF NOT EXISTS supplier_price_list_price (
+        price_list_id UUID REFERENCES supplier_price_list(id) ON DELETE CASCADE NOT NULL,
+        supplier_product_price_id UUID REFERENCES supplier_product_price(id) NOT NULL,
+        PRIMARY KEY (price_list_id, supplier_product_price_id)
+    )
+    """,
+    """CREATE TABLE IF NOT EXISTS supplier_price_list_branch (
+        price_list_id UUID REFERENCES supplier_price_list(id) ON DELETE CASCADE NOT NULL,
+        restaurant_branch_id UUID NOT NULL,
+        PRIMARY KEY (price_list_id, restaurant_branch_id)
+    )
+    """,
+    """CREATE INDEX IF NOT EXISTS supplier_price_list_branch_branch_idx
+        ON supplier_price_list_branch (restaurant_branch_id)
+    """,
+]
+
+BACKFILL_PRICES = f"""
+    INSERT INTO supplier_price_list_price (price_list_id, supplier_product_price_id)
+    SELECT spl.id, spp.id
+    FROM supplier_price_list spl
+    CROSS JOIN LATERAL json_array_elements_text(spl.supplier_product_price_ids) AS pl(price_id)
+    JOIN supplier_product_price spp ON spp.id = (
+        CASE WHEN pl.price_id ~ '{UUID_REGEX}' THEN pl.price_id::UUID END
+    )
+    WHERE spl.id = ANY(:ids)
+    ON CONFLICT DO NOTHING
+    """
+
+BACKFILL_BRANCHES = f"""
+    INSERT INTO supplier_price_list_branch (price_list_id, restaurant_branch_id)
+    SELECT DISTINCT spl.id, pl.branch_id::UUID
+    FROM supplier_price_list spl
+    CROSS JOIN LATERAL json_array_elements_text(spl.supplier_restaurant_relation_ids) AS pl(branch_id)
+    WHERE spl.id = ANY(:ids)
+    AND pl.branch_id ~ '{UUID_REGEX}'
+    ON CONFLICT DO NOTHING
+    """
+
+# price lists whose link rows do not match their JSON arrays
+VERIFY_LINKS = f"""
+    WITH json_prices AS (
+        SELECT spl.id, count(DISTINCT spp.id) AS n
+        FROM supplier_price_list spl
+        CROSS JOIN LATERAL json_array_elements_text(spl.supplier_product_price_ids) AS pl(price_id)
+        JOIN supplier_product_price spp ON spp.id = (
+            CASE WHEN pl.price_id ~ '{UUID_REGEX}' THEN pl.price_id::UUID END
+        )
+        GROUP BY spl.id
+    ), link_prices AS (
+        SELECT price_list_id AS id, count(*) AS n
+        FROM supplier_price_list_price
+        GROUP BY price_list_id
+    )
+    SELECT count(*) AS mismatches
+    FROM json_prices jp
+    FULL OUTER JOIN link_prices lp ON lp.id = jp.id
+    WHERE COALESCE(jp.n, 0) <> COALESCE(lp.n, 0)
+    """
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Backfill supplier price list link tables."
+    )
+    parser.add_argument(
+        "--batch_size",
+        help="Price lists backfilled per batch",
+        type=int,
+        default=500,
+        required=False,
+    )
+    parser.add_argument(
+        "--verify",
+        help="Compare link rows against the JSON arrays once finished",
+        action="store_true",
+    )
+    return parser.parse_args()
+
+
+async def backfill_links(ids: List[UUID]) -> None:
+    """Insert link rows of a batch of price lists (in a single transaction)"""
+    async with SQLDatabase.transaction():
+        await SQLDatabase.execute(query=BACKFILL_PRICES, values={"ids": ids})
+        await SQLDatabase.execute(query=BACKFILL_BRANCHES, values={"ids": ids})
+
+
+async def migrate_price_list_links(
+    batch_size: int = 500, verify: bool = False
+) -> Dict[str, Any]:
+    logger.info("Creating supplier price list link tables ...")
+    for _qry in CREATE_LINK_TABLES:
+        await SQLDatabase.execute(query=_qry)
+    migrated, errors = 0, 0
+    last_id = None
+    while True:
+        # keyset pagination over price lists
+        price_lists = await SQLDatabase.fetch_all(
+            query=f"""SELECT id FROM supplier_price_list
+                {"WHERE id > :last_id" if last_id else ""}
+                ORDER BY id
+                LIMIT :batch_size
+            """,
+            values=(
+                {"batch_size": batch_size, "last_id": last_id}
+                if last_id
+                else {"batch_size": batch_size}
+            ),
+        )
+        if not price_lists:
+            break
+        ids = [pl["id"] for pl in price_lists]
+        try:
+            await backfill_links(ids)
+            migrated += len(ids)
+        except Exception as e:
+            logger.warning(f"Error backfilling price lists after: {last_id}")
+            logger.error(e)
+            errors += len(ids)
+        last_id = ids[-1]
+        logger.info(f"Backfilled {migrated} price lists ({errors} errors) ...")
+    resp: Dict[str, Any] = {"migrated": migrated, "errors": errors}
+    if verify:
+        logger.info("Verifying price list links ...")
+        resp["mismatches"] = await SQLDatabase.fetch_val(query=VERIFY_LINKS)
+    return resp
+
+
+async def main():
+    args = parse_args()
+    try:
+        await db_startup()
+        logger.info("Starting price list links backfill ...")
+        resp = await migrate_price_list_links(
+            batch_size=args.batch_size, verify=args.verify
+        )
+        logger.info(f"Finished price list links backfill: {resp}")
+    except Exception as e:
+        logger.error("Error backfilling price list links")
+        logger.error(e)
+    finally:
+        await db_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Create the product search functions and trigram indexes of an existing
+database (`f_unaccent`, `product_search_text` and the `*_search_trgm_idx`
+indexes of schema.sql).
+
+Run it before deploying the search queries that use them. Indexes are
+built concurrently, so tables stay writable; it can be re-run safely:
+indexes left INVALID by a failed concurrent build are dropped and rebuilt.
+
+How to run:
+    poetry run python -m gqlapi.scripts.core.migrate_product_search
+"""
+
+import asyncio
+import logging
+from typing import List
+
+from gqlapi.db import database as SQLDatabase, db_startup, db_shutdown
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+
+logger = get_logger(
+    "scripts.migrate_product_search", logging.INFO, Environment(get_env())
+)
+
+CREATE_SEARCH_FUNCTIONS = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """CREATE OR REPLACE FUNCTION f_unaccent(TEXT) RETURNS TEXT AS $$
+        SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    """,
+    """CREATE OR REPLACE FUNCTION product_search_text(
+        description TEXT, sku TEXT, keywords TEXT[] DEFAULT NULL
+    ) RETURNS TEXT AS $$
+        SELECT lower(f_unaccent(concat_ws(' ', description, sku, array_to_string(keywords, ' '))))
+    $$ LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    """,
+]
+
+# index name -> create statement
+CREATE_SEARCH_INDEXES = {
+    "product_search_trgm_idx": """CREATE INDEX CONCURRENTLY IF NOT EXISTS product_search_trgm_idx
+        ON product USING gin (product_search_text(name, sku, keywords) gin_trgm_ops)
+    """,
+    "supplier_product_search_trgm_idx": """CREATE INDEX CONCURRENTLY IF NOT EXISTS supplier_product_search_trgm_idx
+        ON supplier_product USING gin (product_search_text(description, sku) gin_trgm_ops)
+    """,
+}
+
+# indexes left invalid by a failed (or interrupted) concurrent build
+INVALID_INDEXES_QUERY = """
+    SELECT c.relname AS name
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE NOT i.indisvalid
+    AND c.relname = ANY(CAST(:names AS VARCHAR[]))
+"""
+
+
+async def invalid_indexes(names: List[str]) -> List[str]:
+    _rows = await SQLDatabase.fetch_all(
+        query=INVALID_INDEXES_QUERY, values={"names": names}
+    )
+    return [r["name"] for r in _rows]
+
+
+async def migrate_product_search() -> None:
+    logger.info("Creating product search functions ...")
+    for _qry in CREATE_SEARCH_FUNCTIONS:
+        await SQLDatabase.execute(query=_qry)
+    # IF NOT EXISTS skips invalid indexes: rebuild them
+    for _name in await invalid_indexes(list(CREATE_SEARCH_INDEXES)):
+        logger.warning(f"Dropping invalid index: {_name} ...")
+        await SQLDatabase.execute(query=f"DROP INDEX CONCURRENTLY IF EXISTS {_name}")
+    for _name, _qry in CREATE_SEARCH_INDEXES.items():
+        logger.info(f"Creating index: {_name} ...")
+        await SQLDatabase.execute(query=_qry)
+    _invalid = await invalid_indexes(list(CREATE_SEARCH_INDEXES))
+    if _invalid:
+        raise Exception(f"Indexes are still invalid, re-run it: {', '.join(_invalid)}")
+
+
+async def main():
+    try:
+        await db_startup()
+        logger.info("Starting product search migration ...")
+        await migrate_product_search()
+        logger.info("Finished product search migration")
+    except Exception as e:
+        logger.error("Error migrating product search")
+        logger.error(e)
+    finally:
+        await db_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""Create the `script_job` queue table of an existing database
+(see schema.sql).
+
+The `/data_orch` endpoint enqueues script jobs in this table and the
+`script_job_worker` process runs them, so run it before deploying both.
+It can be re-run safely.
+
+How to run:
+    poetry run python -m gqlapi.scripts.core.migrate_script_job
+"""
+
+import asyncio
+import logging
+
+from gqlapi.db import database as SQLDatabase, db_startup, db_shutdown
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+
+logger = get_logger("scripts.migrate_script_job", logging.INFO, Environment(get_env()))
+
+CREATE_SCRIPT_JOB = [
+    """CREATE TABLE IF NOT EXISTS script_job (
+        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        script_execution_id UUID NOT NULL REFERENCES script_execution(id),
+        script_name VARCHAR NOT NULL,
+        args json,
+        status VARCHAR NOT NULL DEFAULT 'queued',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL DEFAULT 1,
+        available_at TIMESTAMP DEFAULT NOW() NOT NULL,
+        locked_by VARCHAR,
+        locked_until TIMESTAMP,
+        last_error VARCHAR,
+        created_at TIMESTAMP DEFAULT NOW() NOT NULL,
+        last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+    )
+    """,
+    """CREATE INDEX IF NOT EXISTS script_job_pending_idx ON script_job (available_at)
+        WHERE status IN ('queued', 'running')
+    """,
+]
+
+
+async def migrate_script_job() -> None:
+    logger.info("Creating script job table ...")
+    for _qry in CREATE_SCRIPT_JOB:
+        await SQLDatabase.execute(query=_qry)
+
+
+async def main():
+    try:
+        await db_startup()
+        logger.info("Starting script job migration ...")
+        await migrate_script_job()
+        logger.info("Finished script job migration")
+    except Exception as e:
+        logger.error("Error migrating script job")
+        logger.error(e)
+    finally:
+        await db_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
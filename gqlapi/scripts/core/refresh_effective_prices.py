@@ -0,0 +1,114 @@
+"""Recompute the `effective_price` table of all supplier units.
+
+Price list changes refresh the effective prices they can set. This
+script builds the table for the first time, and should also run daily
+(`run_daily_effective_prices` script job), so branches whose assigned
+price list expired get the next valid one.
+
+Once it has run, turn `EFFECTIVE_PRICES_READ` on.
+
+How to run:
+    poetry run python -m gqlapi.scripts.core.refresh_effective_prices --help
+"""
+
+import argparse
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from gqlapi.db import database as SQLDatabase, db_startup, db_shutdown
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.repository.supplier.supplier_price_list import SupplierPriceListRepository
+from gqlapi.utils.automation import InjectedStrawberryInfo
+
+logger = get_logger(
+    "scripts.refresh_effective_prices", logging.INFO, Environment(get_env())
+)
+
+CREATE_EFFECTIVE_PRICE_TABLE = [
+    """CREATE TABLE IF NOT EXISTS effective_price (
+        supplier_unit_id UUID REFERENCES supplier_unit(id) NOT NULL,
+        restaurant_branch_id UUID,
+        supplier_product_id UUID REFERENCES supplier_product(id) NOT NULL,
+        supplier_product_price_id UUID REFERENCES supplier_product_price(id) NOT NULL,
+        price_list_id UUID NOT NULL,
+        valid_upto TIMESTAMP NOT NULL,
+        last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+    )
+    """,
+    """CREATE INDEX IF NOT EXISTS effective_price_unit_branch_idx
+        ON effective_price (supplier_unit_id, restaurant_branch_id)
+    """,
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recompute effective prices.")
+    parser.add_argument(
+        "--supplier_unit_id",
+        help="Only refresh this supplier unit",
+        type=str,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--batch_size",
+        help="Supplier units refreshed per transaction",
+        type=int,
+        default=20,
+        required=False,
+    )
+    return parser.parse_args()
+
+
+async def refresh_effective_prices(
+    info: InjectedStrawberryInfo,
+    supplier_unit_id: Optional[str] = None,
+    batch_size: int = 20,
+) -> Dict[str, Any]:
+    _db = info.context["db"].sql
+    for _qry in CREATE_EFFECTIVE_PRICE_TABLE:
+        await _db.execute(query=_qry)
+    if supplier_unit_id:
+        unit_ids = [UUID(supplier_unit_id)]
+    else:
+        units = await _db.fetch_all(
+            query="SELECT id FROM supplier_unit WHERE deleted = 'f' ORDER BY id"
+        )
+        unit_ids = [u["id"] for u in units]
+    spl_repo = SupplierPriceListRepository(info)  # type: ignore
+    refreshed, errors = 0, 0
+    for i in range(0, len(unit_ids), batch_size):
+        _batch = unit_ids[i : i + batch_size]  # noqa: E203
+        try:
+            await spl_repo.refresh_effective_prices(supplier_unit_ids=_batch)
+            refreshed += len(_batch)
+        except Exception as e:
+            logger.warning(f"Error refreshing effective prices of units: {_batch}")
+            logger.error(e)
+            errors += len(_batch)
+        logger.info(f"Refreshed {refreshed} supplier units ({errors} errors) ...")
+    return {"refreshed": refreshed, "errors": errors}
+
+
+async def main():
+    args = parse_args()
+    try:
+        await db_startup()
+        logger.info("Starting effective prices refresh ...")
+        info = InjectedStrawberryInfo(db=SQLDatabase, mongo=None)
+        resp = await refresh_effective_prices(
+            info, supplier_unit_id=args.supplier_unit_id, batch_size=args.batch_size
+        )
+        logger.info(f"Finished effective prices refresh: {resp}")
+    except Exception as e:
+        logger.error("Error refreshing effective prices")
+        logger.error(e)
+    finally:
+        await db_shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
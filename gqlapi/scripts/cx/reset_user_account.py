@@ -261,6 +261,11 @@ async def delete_restaurant_supplier_relation(
 
 
 async def delete_orden(db: Database, orden_id: uuid.UUID):
+    # projection first: it references orden status, paystatus & details
+    await db.execute(
+        "DELETE FROM orden_current WHERE orden_id = :orden_id",
+        {"orden_id": orden_id},
+    )
     await db.execute(
         "DELETE FROM orden_status WHERE orden_id = :orden_id",
         {"orden_id": orden_id},
@@ -329,6 +334,18 @@ async def delete_supplier_unit(db: Database, supplier_unit_id: uuid.UUID):
         "DELETE FROM supplier_unit_category WHERE supplier_unit_id = :supplier_unit_id",
         {"supplier_unit_id": supplier_unit_id},
     )
+    await db.execute(
+        "DELETE FROM supplier_product_stock_ledger WHERE supplier_unit_id = :supplier_unit_id",
+        {"supplier_unit_id": supplier_unit_id},
+    )
+    await db.execute(
+        "DELETE FROM supplier_unit_catalog_version WHERE supplier_unit_id = :supplier_unit_id",
+        {"supplier_unit_id": supplier_unit_id},
+    )
+    await db.execute(
+        "DELETE FROM effective_price WHERE supplier_unit_id = :supplier_unit_id",
+        {"supplier_unit_id": supplier_unit_id},
+    )
     await db.execute(
         "DELETE FROM supplier_unit WHERE id = :supplier_unit_id",
         {"supplier_unit_id": supplier_unit_id},
@@ -340,6 +357,10 @@ async def delete_supplier_business(db: Database, supplier_business_id: uuid.UUID
         "DELETE FROM supplier_user_permission WHERE supplier_business_id = :supplier_business_id",
         {"supplier_business_id": supplier_business_id},
     )
+    await db.execute(
+        "DELETE FROM orden_number_counter WHERE supplier_business_id = :supplier_business_id",
+        {"supplier_business_id": supplier_business_id},
+    )
     await db.execute(
         "DELETE FROM supplier_business WHERE id = :supplier_business_id",
         {"supplier_business_id": supplier_business_id},
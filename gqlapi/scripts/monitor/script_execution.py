@@ -25,7 +25,7 @@ async def get_scripts_failed(db: Database) -> List:
     scripts_failed = await db.fetch_all(
         """SELECT * FROM script_execution
             WHERE created_at > (NOW() -  interval '24 hours')
-            and status IN ('error', 'running')"""
+            and status IN ('error', 'running', 'queued')"""
     )
     scripts_failed_list = []
     for sf in scripts_failed:
@@ -0,0 +1,126 @@
+"""Creates (if needed) and backfills the `orden_current` projection table
+    with the latest status, paystatus and details of every orden.
+
+    Safe to re-run: existing rows are overwritten with the latest versions.
+
+How to run (file path as example):
+        poetry run python -m gqlapi.scripts.orden.build_orden_current
+"""
+
+import asyncio
+import logging
+from databases import Database
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.db import db_shutdown, db_startup, database as SQLDatabase
+from gqlapi.utils.automation import InjectedStrawberryInfo
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+
+logger = get_logger("scripts.build_orden_current", logging.INFO, Environment(get_env()))
+
+creation_queries = [
+    """
+    CREATE TABLE IF NOT EXISTS orden_current (
+        orden_id UUID PRIMARY KEY REFERENCES orden(id),
+        orden_status_id UUID REFERENCES orden_status(id),
+        status VARCHAR,
+        orden_paystatus_id UUID REFERENCES orden_paystatus(id),
+        paystatus VARCHAR,
+        orden_details_id UUID REFERENCES orden_details(id),
+        details_version INTEGER,
+        restaurant_branch_id UUID REFERENCES restaurant_branch(id),
+        supplier_unit_id UUID REFERENCES supplier_unit(id),
+        delivery_date DATE,
+        payment_method VARCHAR,
+        last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+    );
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS orden_current_supplier_unit_idx
+        ON orden_current (supplier_unit_id, delivery_date);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS orden_current_restaurant_branch_idx
+        ON orden_current (restaurant_branch_id, delivery_date);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS orden_current_status_idx ON orden_current (status);
+    """,
+]
+
+backfill_query = """
+    WITH status_cos AS (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY created_at DESC) row_num
+        FROM orden_status),
+    paystatus_cos AS (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY created_at DESC) row_num
+        FROM orden_paystatus),
+    details_cos AS (
+        SELECT *, ROW_NUMBER() OVER (PARTITION BY orden_id ORDER BY version DESC) row_num
+        FROM orden_details)
+    INSERT INTO orden_current (
+        orden_id, orden_status_id, status, orden_paystatus_id, paystatus,
+        orden_details_id, details_version, restaurant_branch_id, supplier_unit_id,
+        delivery_date, payment_method)
+    SELECT ord.id, sc.id, sc.status, pc.id, pc.status,
+        dc.id, dc.version, dc.restaurant_branch_id, dc.supplier_unit_id,
+        dc.delivery_date, dc.payment_method
+    FROM orden ord
+    LEFT JOIN status_cos sc ON ord.id = sc.orden_id AND sc.row_num = 1
+    LEFT JOIN paystatus_cos pc ON ord.id = pc.orden_id AND pc.row_num = 1
+    LEFT JOIN details_cos dc ON ord.id = dc.orden_id AND dc.row_num = 1
+    ON CONFLICT (orden_id) DO UPDATE SET
+        orden_status_id = EXCLUDED.orden_status_id,
+        status = EXCLUDED.status,
+        orden_paystatus_id = EXCLUDED.orden_paystatus_id,
+        paystatus = EXCLUDED.paystatus,
+        orden_details_id = EXCLUDED.orden_details_id,
+        details_version = EXCLUDED.details_version,
+        restaurant_branch_id = EXCLUDED.restaurant_branch_id,
+        supplier_unit_id = EXCLUDED.supplier_unit_id,
+        delivery_date = EXCLUDED.delivery_date,
+        payment_method = EXCLUDED.payment_method,
+        last_updated = NOW()
+"""
+
+
+async def build_orden_current(info: InjectedStrawberryInfo) -> bool:
+    logger.info("Starting orden current projection build...")
+    _db: Database = info.context["db"].sql
+    try:
+        async with _db.transaction():
+            for qry in creation_queries:
+                await _db.execute(qry)
+            await _db.execute(backfill_query)
+        count = await _db.fetch_val("SELECT COUNT(*) FROM orden_current")
+        logger.info(f"Orden current projection has {count} ordenes")
+        return True
+    except Exception as e:
+        logger.error(e)
+        return False
+
+
+async def build_orden_current_wrapper() -> bool:
+    info = InjectedStrawberryInfo(
+        db=SQLDatabase,
+        mongo=None,
+    )
+    return await build_orden_current(info)
+
+
+async def main():
+    try:
+        await db_startup()
+        logger.info("Starting routine to build orden current projection ...")
+
+        resp = await build_orden_current_wrapper()
+        if resp:
+            logger.info("Finished routine to build orden current projection")
+        else:
+            logger.info("Error to build orden current projection")
+        await db_shutdown()
+    except Exception as e:
+        logger.error(e)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
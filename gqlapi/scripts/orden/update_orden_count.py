@@ -67,6 +67,16 @@ async def update_orden_count_by_supplier_business(
         if not flag:
             print("Issues updating supplier business: ", sbid)
             return False
+        # keep orden number counter in sync
+        await db.execute(
+            """
+            INSERT INTO orden_number_counter (supplier_business_id, last_number)
+            VALUES (:supplier_business_id, :last_number)
+            ON CONFLICT (supplier_business_id) DO UPDATE
+            SET last_number = EXCLUDED.last_number, last_updated = NOW()
+            """,
+            {"supplier_business_id": sbid, "last_number": count - 1},
+        )
     return True
 
 
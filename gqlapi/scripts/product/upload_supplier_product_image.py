@@ -68,7 +68,7 @@ async def upload_supplier_product_images(img_dir, prods: List[Dict[Any, Any]]):
 
             img_fname = row["supplier_product_id"]
             img_file = img_dir.joinpath(row["image_name"])
-            _data = cloudinary_api.upload(
+            _data = await cloudinary_api.upload(
                 folder=Folders.MARKETPLACE.value,
                 img_file=img_file,
                 subfolder=f"{Folders.SUPPLIER.value}/{Folders.SUPPLIER_PRODUCTS.value}",
@@ -0,0 +1,109 @@
+"""Creates (if needed) and backfills the `supplier_product_stock_ledger` table
+    with the availability of the latest stock count of every supplier product,
+    discounting the products sold in non-canceled ordenes since that count.
+
+    Requires the `orden_current` projection (gqlapi.scripts.orden.build_orden_current).
+    Safe to re-run: existing rows are overwritten.
+
+How to run (file path as example):
+        poetry run python -m gqlapi.scripts.supplier.build_stock_ledger
+"""
+
+import asyncio
+import logging
+from databases import Database
+from gqlapi.lib.environ.environ.environ import Environment, get_env
+from gqlapi.db import db_shutdown, db_startup, database as SQLDatabase
+from gqlapi.utils.automation import InjectedStrawberryInfo
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+
+logger = get_logger("scripts.build_stock_ledger", logging.INFO, Environment(get_env()))
+
+creation_queries = [
+    """
+    CREATE TABLE IF NOT EXISTS supplier_product_stock_ledger (
+        supplier_unit_id UUID REFERENCES supplier_unit(id) NOT NULL,
+        supplier_product_id UUID REFERENCES supplier_product(id) NOT NULL,
+        supplier_product_stock_id UUID REFERENCES supplier_product_stock(id) NOT NULL,
+        stock_created_at TIMESTAMP NOT NULL,
+        availability DOUBLE PRECISION NOT NULL,
+        last_updated TIMESTAMP DEFAULT NOW() NOT NULL,
+        PRIMARY KEY (supplier_unit_id, supplier_product_id)
+    );
+    """,
+]
+
+backfill_query = """
+    WITH last_stock AS (
+        SELECT DISTINCT ON (supplier_unit_id, supplier_product_id) *
+        FROM supplier_product_stock
+        WHERE supplier_unit_id IS NOT NULL
+        ORDER BY supplier_unit_id, supplier_product_id, created_at DESC
+    ),
+    sold AS (
+        SELECT ls.id AS supplier_product_stock_id, SUM(cp.quantity) AS quantity
+        FROM last_stock ls
+        JOIN orden_current oc ON oc.supplier_unit_id = ls.supplier_unit_id
+        JOIN orden_details dc ON dc.id = oc.orden_details_id
+        JOIN cart_product cp ON cp.cart_id = dc.cart_id
+            AND cp.supplier_product_id = ls.supplier_product_id
+        WHERE oc.status <> 'canceled'
+            AND cp.created_at >= ls.created_at
+        GROUP BY ls.id
+    )
+    INSERT INTO supplier_product_stock_ledger (
+        supplier_unit_id, supplier_product_id, supplier_product_stock_id,
+        stock_created_at, availability)
+    SELECT ls.supplier_unit_id, ls.supplier_product_id, ls.id,
+        ls.created_at, ls.stock - COALESCE(sold.quantity, 0)
+    FROM last_stock ls
+    LEFT JOIN sold ON sold.supplier_product_stock_id = ls.id
+    ON CONFLICT (supplier_unit_id, supplier_product_id) DO UPDATE SET
+        supplier_product_stock_id = EXCLUDED.supplier_product_stock_id,
+        stock_created_at = EXCLUDED.stock_created_at,
+        availability = EXCLUDED.availability,
+        last_updated = NOW()
+"""
+
+
+async def build_stock_ledger(info: InjectedStrawberryInfo) -> bool:
+    logger.info("Starting supplier product stock ledger build...")
+    _db: Database = info.context["db"].sql
+    try:
+        async with _db.transaction():
+            for qry in creation_queries:
+                await _db.execute(qry)
+            await _db.execute(backfill_query)
+        count = await _db.fetch_val("SELECT COUNT(*) FROM supplier_product_stock_ledger")
+        logger.info(f"Supplier product stock ledger has {count} products")
+        return True
+    except Exception as e:
+        logger.error(e)
+        return False
+
+
+async def build_stock_ledger_wrapper() -> bool:
+    info = InjectedStrawberryInfo(
+        db=SQLDatabase,
+        mongo=None,
+    )
+    return await build_stock_ledger(info)
+
+
+async def main():
+    try:
+        await db_startup()
+        logger.info("Starting routine to build supplier product stock ledger ...")
+
+        resp = await build_stock_ledger_wrapper()
+        if resp:
+            logger.info("Finished routine to build supplier product stock ledger")
+        else:
+            logger.info("Error to build supplier product stock ledger")
+        await db_shutdown()
+    except Exception as e:
+        logger.error(e)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -49,7 +49,7 @@ async def upload_supplier_images(img_dir, data: List[Dict[Any, Any]]):
             logger.info(f"Uploading image for: {row['supplier_product_id']}")
             img_fname = row["supplier_product_id"]
             img_file = img_dir.joinpath(row["image_name"])
-            _data = cloudinary_api.upload(
+            _data = await cloudinary_api.upload(
                 folder=Folders.MARKETPLACE.value,
                 img_file=img_file,
                 subfolder=f"{Folders.SUPPLIER.value}/{Folders.PROFILE.value}",
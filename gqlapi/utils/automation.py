@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import Any, Optional
 from databases import Database
 from pymongo.database import Database as MongoDatabase
 from gqlapi.lib.clients.clients.firebaseapi.firebase_auth import FirebaseAuthApi
@@ -7,9 +7,11 @@ from gqlapi.lib.clients.clients.firebaseapi.firebase_auth import FirebaseAuthApi
 
 class DataContext:
     sql: Optional[Database]
+    sql_read: Optional[Database]
     mongo: Optional[MongoDatabase]
     firebase: Optional[FirebaseAuthApi]
     authos: Optional[Database]
+    loaders: Optional[Any]
 
 
 class InjectedStrawberryInfo:
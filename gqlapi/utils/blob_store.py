@@ -0,0 +1,148 @@
+from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+import os
+from types import NoneType
+from typing import AsyncIterator, Optional
+import uuid
+
+from gqlapi.config import BLOB_STORE_CHUNK_SIZE, BLOB_STORE_PATH
+
+
+def blob_key(data: bytes) -> str:
+    """Content address of a blob (sha256 hex digest)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """Content addressed store of immutable blobs.
+
+    Blobs are stored under the sha256 of their content, so storing the same
+    file twice is a no-op and keys can be cached forever.
+    """
+
+    @abstractmethod
+    async def put(self, data: bytes) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | NoneType:
+        raise NotImplementedError
+
+    @abstractmethod
+    def stream(
+        self, key: str, chunk_size: int = BLOB_STORE_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store in the local filesystem, sharded by key prefix
+    (`<root>/ab/cd/abcd...`). Writes are atomic (temp file + rename)
+    and file IO runs in a thread so the event loop is never blocked.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+            raise ValueError(f"Invalid blob key: {key}")
+        return os.path.join(self.root, key[:2], key[2:4], key)
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _read(self, key: str) -> bytes | NoneType:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    async def put(self, data: bytes) -> str:
+        """Store blob
+
+        Args:
+            data (bytes): blob content
+
+        Returns:
+            str: blob key
+        """
+        key = blob_key(data)
+        await asyncio.to_thread(self._write, key, data)
+        return key
+
+    async def get(self, key: str) -> bytes | NoneType:
+        """Get blob content, None if not found"""
+        return await asyncio.to_thread(self._read, key)
+
+    async def stream(
+        self, key: str, chunk_size: int = BLOB_STORE_CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream blob content in chunks
+
+        Raises:
+            FileNotFoundError: blob does not exist
+        """
+        f = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(f.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            f.close()
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self._path(key))
+
+
+class BlobStoreNotConfigured(Exception):
+    pass
+
+
+def blob_store_enabled(path: str = BLOB_STORE_PATH) -> bool:
+    """Whether the blob store can be used: `BLOB_STORE_PATH` must be an
+    absolute path to an existing directory (a mounted persistent volume).
+    Never a relative path, which would land in the ephemeral container
+    filesystem and lose the files on the next deploy.
+    """
+    return bool(path) and os.path.isabs(path) and os.path.isdir(path)
+
+
+_blob_store: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Blob store of the process (local filesystem at `BLOB_STORE_PATH`)
+
+    Raises:
+        BlobStoreNotConfigured: `BLOB_STORE_PATH` is not a persistent volume
+    """
+    global _blob_store
+    if not blob_store_enabled():
+        raise BlobStoreNotConfigured(
+            f"BLOB_STORE_PATH must be an absolute path of a persistent volume: '{BLOB_STORE_PATH}'"
+        )
+    if _blob_store is None:
+        _blob_store = LocalBlobStore(BLOB_STORE_PATH)
+    return _blob_store
@@ -0,0 +1,68 @@
+from collections import OrderedDict
+import time
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+
+class TTLCache:
+    """In-process LRU cache with per-entry expiration.
+
+    Entries expire after `ttl` seconds (or the ttl given on `set`) and the
+    least recently used entries are evicted once `maxsize` is reached.
+    Not shared between processes: use versioned keys to invalidate
+    entries across workers.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value, `default` if missing or expired"""
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value, evicting the least recently used entries if full"""
+        _ttl = self.ttl if ttl is None else ttl
+        if _ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + _ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Non expired (key, value) pairs"""
+        now = time.monotonic()
+        return [(k, v) for k, (expires_at, v) in self._data.items() if expires_at >= now]
+
+    def pop(self, key: Hashable) -> Any:
+        """Drop a cached value, returns it if it was cached"""
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop all entries whose key matches the predicate"""
+        keys = [k for k in self._data if predicate(k)]
+        for k in keys:
+            del self._data[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -2,11 +2,13 @@ import json
 import base64
 import logging
 import secrets
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Set
 from uuid import UUID
 import string
 import unicodedata
 
+from strawberry.types.nodes import FragmentSpread, InlineFragment
+
 from gqlapi.domain.models.v2.utils import UOMType
 from gqlapi.errors import GQLApiErrorCodeType, GQLApiException
 
@@ -70,6 +72,83 @@ def list_into_strtuple(lis: List[UUID] | List[str]) -> str:
     return str(_t)
 
 
+def encode_cursor(*keys: Any) -> str:
+    """Encodes keyset pagination keys into an opaque cursor
+
+    Parameters
+    ----------
+    keys : Any
+        Sort keys of the last returned element (i.e. delivery_date, id)
+
+    Returns
+    -------
+    str
+        Base64 encoded cursor
+    """
+    raw = "|".join([k.isoformat() if hasattr(k, "isoformat") else str(k) for k in keys])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8")
+
+
+def decode_cursor(cursor: str, n_keys: int) -> List[str]:
+    """Decodes a cursor generated with `encode_cursor`
+
+    Parameters
+    ----------
+    cursor : str
+        Base64 encoded cursor
+    n_keys : int
+        Number of expected keys
+
+    Returns
+    -------
+    List[str]
+        Sort keys as strings
+
+    Raises
+    ------
+    GQLApiException
+        If the cursor is not valid
+    """
+    try:
+        keys = base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8").split("|")
+    except Exception:
+        keys = []
+    if len(keys) != n_keys:
+        raise GQLApiException(
+            msg="Invalid pagination cursor",
+            error_code=GQLApiErrorCodeType.DATAVAL_WRONG_DATATYPE.value,
+        )
+    return keys
+
+
+def selected_field_names(selections: List[Any], path: List[str] = []) -> Set[str]:
+    """Get the names of the fields selected in a GraphQL query,
+        following fragments and an optional path of nested fields
+
+    Parameters
+    ----------
+    selections : List[Any]
+        Selections of a strawberry field, i.e. `info.selected_fields[0].selections`
+    path : List[str]
+        Nested field names to go through (i.e. ["edges", "node"])
+
+    Returns
+    -------
+    Set[str]
+        Selected field names
+    """
+    names: Set[str] = set()
+    for sel in selections:
+        if isinstance(sel, (FragmentSpread, InlineFragment)):
+            names |= selected_field_names(sel.selections, path)
+        elif path:
+            if sel.name == path[0]:
+                names |= selected_field_names(sel.selections, path[1:])
+        else:
+            names.add(sel.name)
+    return names
+
+
 def phone_format(phone_number: str) -> str:
     """Formats a phone number to a 10 digit string
 
@@ -0,0 +1,400 @@
+from contextvars import ContextVar
+import functools
+import logging
+import re
+import sys
+import time
+from types import FrameType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from gqlapi.config import GRAPHQL_METRICS_OPERATIONS, QUERY_SLOW_LOG_MS
+
+# seconds
+QUERY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _fmt_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = [
+        n
+        + '="'
+        + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        + '"'
+        for n, v in zip(names, values)
+    ]
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """Base in-process metric, rendered in Prometheus text format.
+
+    Values are kept per process: every worker exposes its own.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Iterable[str] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_fmt_labels(self.label_names, k)} {v}"
+            for k, v in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """Gauge read from a callback at render time"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.callback = callback
+
+    def samples(self) -> List[str]:
+        values = self.callback() if self.callback else {}
+        return [
+            f"{self.name}{_fmt_labels(self.label_names, k)} {v}"
+            for k, v in values.items()
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Iterable[str] = (),
+        buckets: Tuple[float, ...] = QUERY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        data = self._values.get(key)
+        if data is None:
+            data = [0.0] * (len(self.buckets) + 2)
+            self._values[key] = data
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                data[i] += 1
+                break
+        else:
+            data[len(self.buckets)] += 1
+        data[-1] += value
+
+    def count(self, **labels: Any) -> int:
+        data = self._values.get(self._key(labels))
+        return int(sum(data[:-1])) if data else 0
+
+    def samples(self) -> List[str]:
+        lines = []
+        names = self.label_names + ("le",)
+        for key, data in self._values.items():
+            cumulative = 0.0
+            for i, bound in enumerate(self.buckets + (float("inf"),)):
+                cumulative += data[i]
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(
+                    f"{self.name}_bucket{_fmt_labels(names, key + (le,))} {cumulative:g}"
+                )
+            _labels = _fmt_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{_labels} {data[-1]}")
+            lines.append(f"{self.name}_count{_labels} {cumulative:g}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Any:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+DB_QUERY_SECONDS: Histogram = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Duration of DB queries by repository class and method",
+        labels=("db", "repository", "method"),
+    )
+)
+DB_SLOW_QUERIES: Counter = registry.register(
+    Counter(
+        "db_slow_queries_total",
+        "Queries slower than the slow query threshold",
+        labels=("db", "repository", "method"),
+    )
+)
+DB_QUERY_ERRORS: Counter = registry.register(
+    Counter(
+        "db_query_errors_total",
+        "Failed DB queries by repository class and method",
+        labels=("db", "repository", "method"),
+    )
+)
+DB_POOL_WAIT_SECONDS: Histogram = registry.register(
+    Histogram(
+        "db_pool_wait_seconds",
+        "Time waiting to acquire a connection from the SQL pool",
+        labels=("db",),
+    )
+)
+EFFECTIVE_PRICE_REFRESH_ERRORS: Counter = registry.register(
+    Counter(
+        "effective_price_refresh_errors_total",
+        "Failed effective price refreshes on price list changes",
+    )
+)
+GRAPHQL_OPERATION_QUERIES: Histogram = registry.register(
+    Histogram(
+        "graphql_operation_db_queries",
+        "DB queries issued per GraphQL operation",
+        labels=("operation",),
+        buckets=COUNT_BUCKETS,
+    )
+)
+GRAPHQL_OPERATION_DB_SECONDS: Histogram = registry.register(
+    Histogram(
+        "graphql_operation_db_seconds",
+        "Total DB time per GraphQL operation",
+        labels=("operation",),
+    )
+)
+GRAPHQL_PHASE_SECONDS: Histogram = registry.register(
+    Histogram(
+        "graphql_phase_duration_seconds",
+        "Duration of GraphQL operation phases (parse, validate, execute, total)",
+        labels=("operation", "phase"),
+    )
+)
+GRAPHQL_RESOLVER_SECONDS: Histogram = registry.register(
+    Histogram(
+        "graphql_resolver_duration_seconds",
+        "Duration of GraphQL field resolvers (sampled operations only)",
+        labels=("field",),
+    )
+)
+
+
+# operation label values: client operation names are only used when known
+#   (allowlisted or named after a schema root field), the rest are bucketed
+#   as "other" to keep the label cardinality bounded
+_known_operations: Dict[str, str] = {}
+
+
+def register_operations(names: Iterable[str]) -> None:
+    """Operation names used as-is in the `operation` metric label"""
+    for name in names:
+        if name:
+            _known_operations[name.lower()] = name
+
+
+def operation_label(operation_name: Optional[str]) -> str:
+    if not operation_name:
+        return "anonymous"
+    return _known_operations.get(operation_name.lower(), "other")
+
+
+register_operations(n.strip() for n in GRAPHQL_METRICS_OPERATIONS.split(","))
+
+
+class QueryStats:
+    """DB queries issued while serving a request"""
+
+    def __init__(self, operation: Optional[str] = None) -> None:
+        self.operation = operation
+        self.queries = 0
+        self.db_time = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.queries += 1
+        self.db_time += elapsed
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_query_stats(operation: Optional[str] = None) -> QueryStats:
+    """Start counting the queries of the current request (and its tasks)"""
+    stats = QueryStats(operation)
+    _query_stats.set(stats)
+    return stats
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _query_stats.get()
+
+
+def query_caller(
+    frame: Optional[FrameType] = None, repo: Any = None, method: str = "unknown"
+) -> Tuple[str, str]:
+    """Repository class and method that issued the current query.
+
+    Walks up the call stack (from `frame`, or the caller) to the first
+    repository instance and returns its outermost method, so queries run
+    through base `CoreRepository` helpers (`_query`, `fetch`, ...) are
+    tagged with the public method that called them. `repo` and `method`
+    preset the repository when called from the repository itself.
+    """
+    _frame = frame or sys._getframe(1)
+    for _ in range(20):
+        if _frame is None:
+            break
+        _self = _frame.f_locals.get("self")
+        if repo is None:
+            if _self is not None and type(_self).__module__.startswith(
+                "gqlapi.repository"
+            ):
+                repo, method = _self, _frame.f_code.co_name
+        elif _self is repo:
+            method = _frame.f_code.co_name
+        else:
+            break
+        _frame = _frame.f_back
+    if repo is None:
+        return "unknown", method
+    return type(repo).__name__, method
+
+
+def observe_query(
+    db: str,
+    repository: str,
+    method: str,
+    elapsed: float,
+    statement: Optional[Callable[[], str]] = None,
+    slow_query_ms: float = QUERY_SLOW_LOG_MS,
+) -> None:
+    """Record a query duration, and log it if slower than `slow_query_ms`"""
+    DB_QUERY_SECONDS.observe(elapsed, db=db, repository=repository, method=method)
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(elapsed)
+    if slow_query_ms > 0 and elapsed * 1000 >= slow_query_ms:
+        DB_SLOW_QUERIES.inc(db=db, repository=repository, method=method)
+        logging.warning(
+            f"Slow query ({elapsed * 1000:.0f}ms) [{db}] {repository}.{method}"
+            + (f": {statement()}" if statement else "")
+        )
+
+
+_in_mongo_query: ContextVar[bool] = ContextVar("in_mongo_query", default=False)
+
+
+def timed_mongo(func: Callable) -> Callable:
+    """Times a Mongo repository method (nested repository calls count once)"""
+
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        if _in_mongo_query.get():
+            return await func(self, *args, **kwargs)
+        repository, method = query_caller(sys._getframe(1), self, func.__name__)
+        token = _in_mongo_query.set(True)
+        start = time.perf_counter()
+        try:
+            return await func(self, *args, **kwargs)
+        except Exception:
+            DB_QUERY_ERRORS.inc(db="mongo", repository=repository, method=method)
+            raise
+        finally:
+            _in_mongo_query.reset(token)
+            observe_query(
+                "mongo",
+                repository,
+                method,
+                time.perf_counter() - start,
+                statement=lambda: f"{func.__name__} {_mongo_args(args, kwargs)}",
+            )
+
+    return wrapper
+
+
+def _mongo_args(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any], limit: int = 4000
+) -> str:
+    _args = ", ".join(
+        [_redacted(a) for a in args]
+        + [f"{k}={_redacted(v)}" for k, v in kwargs.items()]
+    )
+    return _args if len(_args) <= limit else _args[:limit] + " ..."
+
+
+def _redacted(value: Any) -> str:
+    """Type of a query parameter, logged instead of its value"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, dict):
+        # keep document structure (mongo filters / updates)
+        return "{" + ", ".join(f"{k!r}: {_redacted(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, (list, tuple, set)):
+        return f"<{type(value).__name__}[{len(value)}]>"
+    return f"<{type(value).__name__}>"
+
+
+def bind_sql(
+    query: Any, values: Optional[Dict[str, Any]] = None, limit: int = 4000
+) -> str:
+    """Query with its `:named` parameters replaced by their types
+    (for logging only: parameter values are never logged)
+    """
+    sql = " ".join(str(query).split())
+    if values:
+        sql = re.sub(
+            r"(?<![:\w]):(\w+)",
+            lambda m: _redacted(values[m.group(1)])
+            if m.group(1) in values
+            else m.group(0),
+            sql,
+        )
+    return sql if len(sql) <= limit else sql[:limit] + " ..."
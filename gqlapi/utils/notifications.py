@@ -622,7 +622,7 @@ def cart_to_whatsapp_format(
     }
 
 
-def send_supplier_whatsapp_confirmation(
+async def send_supplier_whatsapp_confirmation(
     to_wa: Dict[str, str],
     orden_details: OrdenDetails,
     branch_name: str,
@@ -673,7 +673,7 @@ def send_supplier_whatsapp_confirmation(
             f"={str(orden_details.orden_id)}",
         ]
     # call api
-    resp = wa_sender.send_message(
+    resp = await wa_sender.send_message(
         to_wa["phone"],
         template_id,
         template_vars,
@@ -868,7 +868,7 @@ async def send_ecommerce_restaurant_email_confirmation(
     )
 
 
-def send_supplier_whatsapp_invoice_reminder(
+async def send_supplier_whatsapp_invoice_reminder(
     to_wa: Dict[str, str],
     orden_details: OrdenDetails,
     branch_name: str,
@@ -898,7 +898,7 @@ def send_supplier_whatsapp_invoice_reminder(
             f"={str(orden_details.orden_id)}",
         ]
         # call api
-        resp = wa_sender.send_message(
+        resp = await wa_sender.send_message(
             to_wa["phone"],
             template_id,
             template_vars,
@@ -0,0 +1,281 @@
+from bisect import bisect_left
+import re
+import time
+import unicodedata
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+from uuid import UUID
+
+from gqlapi.config import PRODUCT_SEARCH_INDEX, PRODUCT_SEARCH_INDEX_MAX_AGE
+from gqlapi.db import database as SQLDatabase
+from gqlapi.lib.environ.environ.environ import get_app
+from gqlapi.lib.logger.logger.basic_logger import get_logger
+from gqlapi.repository.supplier.supplier_product import PRODUCT_SEARCH_DOCUMENTS_QUERY
+from gqlapi.repository.supplier.supplier_unit import UNIT_CATALOG_VERSIONS_QUERY
+
+logger = get_logger(get_app())
+
+# min term length to tolerate 1 typo / 2 typos
+TYPO_MIN_LENGTH = 4
+TWO_TYPOS_MIN_LENGTH = 8
+# term match scores
+EXACT_SCORE = 3
+PREFIX_SCORE = 2
+TYPO_SCORE = 1
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase text without accents nor punctuation"""
+    _text = unicodedata.normalize("NFKD", text.lower())
+    _text = "".join(c for c in _text if not unicodedata.combining(c))
+    return re.sub(r"[\W_]+", " ", _text).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    return normalize_text(text).split()
+
+
+def within_distance(a: str, b: str, max_dist: int) -> bool:
+    """Whether `a` and `b` are at most `max_dist` edits apart
+    (insertions, deletions, substitutions and transpositions)
+    """
+    if abs(len(a) - len(b)) > max_dist:
+        return False
+    prev2: Optional[List[int]] = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cur[j] = min(
+                prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a[i - 1] != b[j - 1])
+            )
+            if (
+                prev2 is not None
+                and j > 1
+                and a[i - 1] == b[j - 2]
+                and a[i - 2] == b[j - 1]
+            ):
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > max_dist:
+            return False
+        prev2, prev = prev, cur
+    return prev[-1] <= max_dist
+
+
+class ProductSearchIndex:
+    """In-memory inverted index of the products of a supplier business.
+
+    Every search word must match a word of the product (description, SKU,
+    tags) exactly, as a prefix, or with typos (1 from 4 letters, 2 from 8,
+    first letter must match). Results are ranked by match quality and
+    then by description.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[UUID, Tuple[str, ...]] = {}
+        self._names: Dict[UUID, str] = {}
+        self._postings: Dict[str, Set[UUID]] = {}
+        self._vocab: List[str] = []
+        self._vocab_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, product_id: UUID) -> bool:
+        return product_id in self._docs
+
+    def upsert(self, product_id: UUID, text: str, name: str = "") -> None:
+        self.remove(product_id)
+        tokens = tuple(dict.fromkeys(tokenize(text)))
+        self._docs[product_id] = tokens
+        self._names[product_id] = normalize_text(name)
+        for token in tokens:
+            if token not in self._postings:
+                self._postings[token] = set()
+                self._vocab_dirty = True
+            self._postings[token].add(product_id)
+
+    def remove(self, product_id: UUID) -> None:
+        tokens = self._docs.pop(product_id, ())
+        self._names.pop(product_id, None)
+        for token in tokens:
+            _ids = self._postings[token]
+            _ids.discard(product_id)
+            if not _ids:
+                del self._postings[token]
+                self._vocab_dirty = True
+
+    def _sorted_vocab(self) -> List[str]:
+        if self._vocab_dirty:
+            self._vocab = sorted(self._postings)
+            self._vocab_dirty = False
+        return self._vocab
+
+    def _term_matches(self, term: str) -> Dict[str, int]:
+        """Indexed words matching a search term, with their score"""
+        vocab = self._sorted_vocab()
+        matches: Dict[str, int] = {}
+        # prefix matches are contiguous in the sorted vocabulary
+        i = bisect_left(vocab, term)
+        while i < len(vocab) and vocab[i].startswith(term):
+            matches[vocab[i]] = EXACT_SCORE if vocab[i] == term else PREFIX_SCORE
+            i += 1
+        if len(term) < TYPO_MIN_LENGTH:
+            return matches
+        max_dist = 2 if len(term) >= TWO_TYPOS_MIN_LENGTH else 1
+        i = bisect_left(vocab, term[0])
+        while i < len(vocab) and vocab[i][0] == term[0]:
+            token = vocab[i]
+            if token not in matches and (
+                within_distance(term, token[: len(term)], max_dist)
+                or within_distance(term, token, max_dist)
+            ):
+                matches[token] = TYPO_SCORE
+            i += 1
+        return matches
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[UUID]:
+        """Ids of the products matching all words of the query, best first"""
+        scores: Optional[Dict[UUID, int]] = None
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores: Dict[UUID, int] = {}
+            for token, score in self._term_matches(term).items():
+                for pid in self._postings[token]:
+                    if score > term_scores.get(pid, 0):
+                        term_scores[pid] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    pid: s + term_scores[pid]
+                    for pid, s in scores.items()
+                    if pid in term_scores
+                }
+            if not scores:
+                return []
+        if not scores:
+            return []
+        ranked = sorted(
+            scores, key=lambda pid: (-scores[pid], self._names[pid], str(pid))  # type: ignore
+        )
+        return ranked[:limit] if limit else ranked
+
+
+def document_text(document: Mapping[str, Any]) -> str:
+    return " ".join(document.get(k) or "" for k in ("description", "sku", "tags"))
+
+
+class ProductIndexRegistry:
+    """Product search indexes of every supplier business (per process).
+
+    Indexes track the catalog version of the supplier units they were
+    loaded for: catalog changes made in other processes are picked up
+    by reloading the index once the unit version moves. As a backstop
+    for changes that missed a version bump, indexes older than `max_age`
+    seconds are dropped (and reloaded by the next search).
+    """
+
+    def __init__(self, max_age: Optional[float] = None) -> None:
+        self.max_age = max_age
+        self._indexes: Dict[UUID, ProductSearchIndex] = {}
+        self._loaded_at: Dict[UUID, float] = {}
+        self._unit_versions: Dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def get(self, supplier_business_id: UUID) -> Optional[ProductSearchIndex]:
+        if (
+            self.max_age
+            and supplier_business_id in self._indexes
+            and time.monotonic() - self._loaded_at[supplier_business_id] > self.max_age
+        ):
+            del self._indexes[supplier_business_id]
+        return self._indexes.get(supplier_business_id)
+
+    def load(
+        self, supplier_business_id: UUID, documents: Iterable[Mapping[str, Any]]
+    ) -> ProductSearchIndex:
+        """Replace the index of a supplier business"""
+        index = ProductSearchIndex()
+        for doc in documents:
+            index.upsert(doc["id"], document_text(doc), doc["description"])
+        self._indexes[supplier_business_id] = index
+        self._loaded_at[supplier_business_id] = time.monotonic()
+        return index
+
+    def load_snapshot(
+        self,
+        documents: Iterable[Mapping[str, Any]],
+        unit_versions: Mapping[UUID, int],
+    ) -> None:
+        """Replace all indexes (documents of every supplier business)"""
+        by_business: Dict[UUID, List[Mapping[str, Any]]] = {}
+        for doc in documents:
+            by_business.setdefault(doc["supplier_business_id"], []).append(doc)
+        self._indexes = {}
+        self._loaded_at = {}
+        for sb_id, docs in by_business.items():
+            self.load(sb_id, docs)
+        self._unit_versions = dict(unit_versions)
+        logger.info(
+            f"Loaded product search index: {len(self._indexes)} suppliers,"
+            + f" {sum(len(idx) for idx in self._indexes.values())} products"
+        )
+
+    def upsert(
+        self, supplier_business_id: UUID, documents: Iterable[Mapping[str, Any]]
+    ) -> None:
+        """Add or update products of a supplier business"""
+        if supplier_business_id not in self._indexes:
+            self._indexes[supplier_business_id] = ProductSearchIndex()
+            self._loaded_at[supplier_business_id] = time.monotonic()
+        index = self._indexes[supplier_business_id]
+        for doc in documents:
+            index.upsert(doc["id"], document_text(doc), doc["description"])
+
+    def is_fresh(self, supplier_unit_id: UUID, version: int) -> bool:
+        return self._unit_versions.get(supplier_unit_id) == version
+
+    def set_version(self, supplier_unit_id: UUID, version: int) -> None:
+        self._unit_versions[supplier_unit_id] = version
+
+    def set_versions(self, unit_versions: Mapping[UUID, int]) -> None:
+        self._unit_versions.update(unit_versions)
+
+    def advance_versions(self, unit_versions: Mapping[UUID, int]) -> None:
+        """Record unit versions after a catalog bump of this process, whose
+        changes are already in the index: only units that were fresh just
+        before it (a single bump since) are kept fresh
+        """
+        for su_id, version in unit_versions.items():
+            if self._unit_versions.get(su_id) == version - 1:
+                self._unit_versions[su_id] = version
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self._loaded_at.clear()
+        self._unit_versions.clear()
+
+
+# storefront product search
+product_index = ProductIndexRegistry(max_age=PRODUCT_SEARCH_INDEX_MAX_AGE)
+
+
+async def product_index_startup() -> None:
+    """Load the product search index snapshot (app startup event)"""
+    if not PRODUCT_SEARCH_INDEX:
+        return
+    try:
+        # versions first: changes made while loading are reloaded later
+        versions = await SQLDatabase.fetch_all(
+            query=UNIT_CATALOG_VERSIONS_QUERY.format(filter="")
+        )
+        docs = await SQLDatabase.fetch_all(
+            query=PRODUCT_SEARCH_DOCUMENTS_QUERY.format(filter="")
+        )
+        product_index.load_snapshot(
+            [dict(d) for d in docs], {v["id"]: v["version"] for v in versions}
+        )
+    except Exception as e:
+        logger.warning("Issues loading product search index")
+        logger.error(e)
@@ -0,0 +1,61 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+# at most this many words of a search are matched
+MAX_SEARCH_TERMS = 8
+
+
+def escape_like(text: str) -> str:
+    """Text with LIKE wildcards (and the escape character) escaped"""
+    return re.sub(r"([\\%_])", r"\\\1", text)
+
+
+def search_terms(search: str) -> List[str]:
+    """Words of a search, with LIKE wildcards escaped"""
+    terms = []
+    for word in search.lower().split():
+        word = escape_like(word)
+        if word and word not in terms:
+            terms.append(word)
+    return terms[:MAX_SEARCH_TERMS]
+
+
+def product_search_filter(
+    search_expr: str, search: str, param: str = "search"
+) -> Tuple[str, str, Dict[str, Any]]:
+    """Parameterized product search over a `product_search_text(...)`
+        expression (see schema.sql), served by its trigram index.
+
+    Every word must be contained in the search text (accent and case
+    insensitive), and matches are ranked by word similarity.
+
+    Parameters
+    ----------
+    search_expr : str
+        SQL expression to search in, e.g. `product_search_text(sp.description, sp.sku)`
+    search : str
+        User search
+    param : str, optional
+        Prefix of the bound parameters
+
+    Returns
+    -------
+    Tuple[str, str, Dict[str, Any]]
+        (condition, rank expression, values). Empty when there is nothing
+        to search.
+    """
+    terms = search_terms(search or "")
+    if not terms:
+        return "", "", {}
+    conditions = []
+    values: Dict[str, Any] = {
+        param: " ".join(search.lower().split()[:MAX_SEARCH_TERMS])
+    }
+    for i, term in enumerate(terms):
+        conditions.append(f"{search_expr} LIKE '%' || f_unaccent(:{param}_{i}) || '%'")
+        values[f"{param}_{i}"] = term
+    return (
+        "(" + " AND ".join(conditions) + ")",
+        f"word_similarity(f_unaccent(:{param}), {search_expr})",
+        values,
+    )
@@ -1,6 +1,17 @@
 -- CREATE DATABASE alima_marketplace;
 CREATE EXTENSION pgcrypto;
 CREATE EXTENSION unaccent;
+CREATE EXTENSION pg_trgm;
+
+-- immutable unaccent, so it can be used in indexes
+CREATE FUNCTION f_unaccent(TEXT) RETURNS TEXT AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+-- lowercase unaccented search text of a product (see gqlapi.utils.search)
+CREATE FUNCTION product_search_text(description TEXT, sku TEXT, keywords TEXT[] DEFAULT NULL) RETURNS TEXT AS $$
+    SELECT lower(f_unaccent(concat_ws(' ', description, sku, array_to_string(keywords, ' '))))
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
 
 /*
 * 
@@ -82,6 +93,8 @@ CREATE TABLE product (
     last_updated TIMESTAMP DEFAULT NOW() NOT NULL
 );
 
+CREATE INDEX product_search_trgm_idx ON product USING gin (product_search_text(name, sku, keywords) gin_trgm_ops);
+
 CREATE TABLE restaurant_business (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     name VARCHAR NOT NULL,
@@ -446,6 +459,8 @@ CREATE TABLE supplier_product (
   last_updated TIMESTAMP DEFAULT NOW() NOT NULL
 );
 
+CREATE INDEX supplier_product_search_trgm_idx ON supplier_product USING gin (product_search_text(description, sku) gin_trgm_ops);
+
 CREATE TABLE supplier_product_tag (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   supplier_product_id UUID REFERENCES supplier_product(id) NOT NULL,
@@ -466,6 +481,26 @@ CREATE TABLE supplier_product_stock (
   created_at TIMESTAMP DEFAULT NOW() NOT NULL
 );
 
+-- current availability per supplier unit product: reset on every new stock
+--  count and decremented / incremented as ordenes are created, edited or canceled
+CREATE TABLE supplier_product_stock_ledger (
+  supplier_unit_id UUID REFERENCES supplier_unit(id) NOT NULL,
+  supplier_product_id UUID REFERENCES supplier_product(id) NOT NULL,
+  supplier_product_stock_id UUID REFERENCES supplier_product_stock(id) NOT NULL,
+  stock_created_at TIMESTAMP NOT NULL,
+  availability DOUBLE PRECISION NOT NULL,
+  last_updated TIMESTAMP DEFAULT NOW() NOT NULL,
+  PRIMARY KEY (supplier_unit_id, supplier_product_id)
+);
+
+-- catalog version per supplier unit, bumped on every product, price list or
+--  stock change to invalidate cached ecommerce catalogs
+CREATE TABLE supplier_unit_catalog_version (
+  supplier_unit_id UUID PRIMARY KEY REFERENCES supplier_unit(id),
+  version BIGINT DEFAULT 1 NOT NULL,
+  last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+);
+
 CREATE TABLE supplier_product_price (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   supplier_product_id UUID REFERENCES supplier_product(id) NOT NULL,
@@ -491,6 +526,39 @@ CREATE TABLE supplier_price_list (
   last_updated TIMESTAMP DEFAULT NOW() NOT NULL
 );
 
+-- latest version of each price list (by name) of a unit
+CREATE INDEX supplier_price_list_unit_name_idx ON supplier_price_list (supplier_unit_id, name, last_updated DESC);
+
+-- supplier_price_list.supplier_product_price_ids as rows
+CREATE TABLE supplier_price_list_price (
+  price_list_id UUID REFERENCES supplier_price_list(id) ON DELETE CASCADE NOT NULL,
+  supplier_product_price_id UUID REFERENCES supplier_product_price(id) NOT NULL,
+  PRIMARY KEY (price_list_id, supplier_product_price_id)
+);
+
+-- supplier_price_list.supplier_restaurant_relation_ids (restaurant branch ids) as rows
+CREATE TABLE supplier_price_list_branch (
+  price_list_id UUID REFERENCES supplier_price_list(id) ON DELETE CASCADE NOT NULL,
+  restaurant_branch_id UUID NOT NULL,
+  PRIMARY KEY (price_list_id, restaurant_branch_id)
+);
+
+CREATE INDEX supplier_price_list_branch_branch_idx ON supplier_price_list_branch (restaurant_branch_id);
+
+-- price of each product a restaurant branch gets from a supplier unit, refreshed
+--   on price list changes (restaurant_branch_id NULL: default price list)
+CREATE TABLE effective_price (
+  supplier_unit_id UUID REFERENCES supplier_unit(id) NOT NULL,
+  restaurant_branch_id UUID,
+  supplier_product_id UUID REFERENCES supplier_product(id) NOT NULL,
+  supplier_product_price_id UUID REFERENCES supplier_product_price(id) NOT NULL,
+  price_list_id UUID NOT NULL,
+  valid_upto TIMESTAMP NOT NULL,
+  last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX effective_price_unit_branch_idx ON effective_price (supplier_unit_id, restaurant_branch_id);
+
 CREATE TABLE supplier_product_image (
   id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
   supplier_product_id UUID REFERENCES supplier_product(id) NOT NULL,
@@ -630,6 +698,34 @@ CREATE TABLE orden_paystatus (
     created_at TIMESTAMP DEFAULT NOW() NOT NULL
 );
 
+-- current state projection of append-only orden_status, orden_paystatus & orden_details
+-- (maintained by the repositories in the same transaction as each insert)
+CREATE TABLE orden_current (
+    orden_id UUID PRIMARY KEY REFERENCES orden(id),
+    orden_status_id UUID REFERENCES orden_status(id),
+    status VARCHAR,
+    orden_paystatus_id UUID REFERENCES orden_paystatus(id),
+    paystatus VARCHAR,
+    orden_details_id UUID REFERENCES orden_details(id),
+    details_version INTEGER,
+    restaurant_branch_id UUID REFERENCES restaurant_branch(id),
+    supplier_unit_id UUID REFERENCES supplier_unit(id),
+    delivery_date DATE,
+    payment_method VARCHAR,
+    last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX orden_current_supplier_unit_idx ON orden_current (supplier_unit_id, delivery_date);
+CREATE INDEX orden_current_restaurant_branch_idx ON orden_current (restaurant_branch_id, delivery_date);
+CREATE INDEX orden_current_status_idx ON orden_current (status);
+
+-- last orden number allocated per supplier business (row locked on each allocation)
+CREATE TABLE orden_number_counter (
+    supplier_business_id UUID PRIMARY KEY REFERENCES supplier_business(id),
+    last_number BIGINT NOT NULL DEFAULT 0,
+    last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+);
+
 CREATE TABLE payment_receipt (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     payment_value DOUBLE PRECISION NOT NULL,
@@ -649,8 +745,10 @@ CREATE TABLE mx_invoice (
     invoice_number VARCHAR NOT NULL,
     invoice_provider VARCHAR,
     invoice_provider_id VARCHAR,
-    pdf_file BYTEA, -- byte array for binary data
-    xml_file BYTEA, -- byte array for binary data
+    pdf_file BYTEA, -- [deprecated] legacy inline file, moved to blob store
+    xml_file BYTEA, -- [deprecated] legacy inline file, moved to blob store
+    pdf_blob_key VARCHAR, -- sha256 key of file in blob store
+    xml_blob_key VARCHAR, -- sha256 key of file in blob store
     total DOUBLE PRECISION NOT NULL,
     status VARCHAR NOT NULL,  -- invoice status type
     result VARCHAR,
@@ -842,6 +940,25 @@ CREATE TABLE script_execution (
     data json
 );
 
+CREATE TABLE script_job (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    script_execution_id UUID NOT NULL REFERENCES script_execution(id),
+    script_name VARCHAR NOT NULL,
+    args json,
+    status VARCHAR NOT NULL DEFAULT 'queued',  -- queued, running, finished, error
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 1,
+    available_at TIMESTAMP DEFAULT NOW() NOT NULL,  -- not claimed before (retry backoff)
+    locked_by VARCHAR,  -- worker id
+    locked_until TIMESTAMP,  -- visibility timeout, reclaimed after it
+    last_error VARCHAR,
+    created_at TIMESTAMP DEFAULT NOW() NOT NULL,
+    last_updated TIMESTAMP DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX script_job_pending_idx ON script_job (available_at)
+    WHERE status IN ('queued', 'running');
+
 /**
 *
 *   B2B Ecommerce
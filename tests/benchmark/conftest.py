@@ -0,0 +1,245 @@
+"""Benchmark suite of the hot handler paths.
+
+Benchmarks only run with `--bench`:
+
+    poetry run pytest tests/benchmark --bench
+
+- CPU benchmarks (optimizer, batch file validation) always run.
+- DB benchmarks drive the real handlers against a local Postgres and Mongo
+  loaded with the benchmark dataset (`gqlapi.scripts.core.seed_benchmark_dataset`),
+  set with `BENCH_DATABASE_URL`, `BENCH_MONGO_URI` and `BENCH_MONGO_DB`;
+  they are skipped otherwise.
+
+Each benchmark is compared against its median in `baselines.json` and fails
+if it is slower than `--bench-threshold` (default 25%). Run with
+`--bench-save` to record new baselines (only of the benchmarks that ran).
+
+Raw timings are machine-specific: the stored ones come from the host in
+the `machine` entry (Python 3.11.7). To compare across hosts, every run
+times a fixed CPU calibration workload, stored with each baseline, and
+baseline medians are scaled by the ratio of the current calibration to
+theirs. DB baselines also depend on the dataset: record them with
+`--bench-save` on a host with the seeded benchmark databases, e.g.
+
+    poetry run pytest tests/benchmark/test_bench_handlers.py --bench --bench-save
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+BENCH_DATABASE_URL = os.getenv("BENCH_DATABASE_URL", "")
+BENCH_MONGO_URI = os.getenv("BENCH_MONGO_URI", "")
+BENCH_MONGO_DB = os.getenv("BENCH_MONGO_DB", "alima_bench")
+
+_results: Dict[str, Dict[str, Any]] = {}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--bench", action="store_true", default=False, help="Run benchmarks"
+    )
+    group.addoption(
+        "--bench-save",
+        action="store_true",
+        default=False,
+        help="Store results as new baselines",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown over baseline median (0.25 = 25%%)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--bench", False):
+        return
+    skip_bench = pytest.mark.skip(reason="Benchmarks only run with --bench")
+    bench_dir = os.path.dirname(__file__)
+    for item in items:
+        if str(item.fspath).startswith(bench_dir):
+            item.add_marker(skip_bench)
+
+
+def calibration_workload() -> int:
+    """Fixed pure-Python workload (sorting, hashing, dicts) that stands
+    for the CPU speed of the host
+    """
+    words = sorted(str(i * 7919 % 100_003) for i in range(100_000))
+    counts: Dict[int, int] = {}
+    for w in words:
+        counts[hash(w) % 1_000] = counts.get(hash(w) % 1_000, 0) + 1
+    return len(counts)
+
+
+def calibrate(rounds: int = 7) -> float:
+    """Median time of the calibration workload"""
+    calibration_workload()
+    timings: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        calibration_workload()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def scaled_median(baseline: Dict[str, Any], calibration: float) -> float:
+    """Baseline median scaled to the speed of the current host"""
+    if not baseline.get("calibration"):
+        return baseline["median"]
+    return baseline["median"] * calibration / baseline["calibration"]
+
+
+def load_baselines() -> Dict[str, Any]:
+    if not os.path.exists(BASELINES_PATH):
+        return {"machine": {}, "benchmarks": {}}
+    with open(BASELINES_PATH) as f:
+        return json.load(f)
+
+
+class Benchmark:
+    """Times a function (sync or async) over several rounds after warmup,
+    and checks its median against the stored baseline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loop: asyncio.AbstractEventLoop,
+        baseline: Dict[str, Any] | None,
+        threshold: float,
+        save: bool,
+        calibration: float,
+    ) -> None:
+        self.name = name
+        self.loop = loop
+        self.baseline = baseline
+        self.threshold = threshold
+        self.save = save
+        self.calibration = calibration
+
+    def _run(self, func: Callable, *args, **kwargs) -> Any:
+        if inspect.iscoroutinefunction(func):
+            return self.loop.run_until_complete(func(*args, **kwargs))
+        return func(*args, **kwargs)
+
+    def __call__(
+        self, func: Callable, *args, rounds: int = 10, warmup: int = 2, **kwargs
+    ) -> Any:
+        result = None
+        for _ in range(warmup):
+            result = self._run(func, *args, **kwargs)
+        timings: List[float] = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            result = self._run(func, *args, **kwargs)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        stats = {
+            "median": statistics.median(timings),
+            "p95": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            "min": timings[0],
+            "rounds": rounds,
+            "calibration": self.calibration,
+        }
+        _results[self.name] = stats
+        if self.baseline and not self.save:
+            base = scaled_median(self.baseline, self.calibration)
+            limit = base * (1 + self.threshold)
+            assert stats["median"] <= limit, (
+                f"{self.name} regressed: median {stats['median'] * 1000:.2f}ms"
+                f" > {limit * 1000:.2f}ms (baseline"
+                f" {base * 1000:.2f}ms + {self.threshold:.0%})"
+            )
+        return result
+
+
+@pytest.fixture(scope="session")
+def bench_loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def bench_calibration() -> float:
+    return calibrate()
+
+
+@pytest.fixture
+def bench(request, bench_loop, bench_calibration) -> Benchmark:
+    baselines = load_baselines()["benchmarks"]
+    return Benchmark(
+        request.node.name,
+        bench_loop,
+        baselines.get(request.node.name),
+        request.config.getoption("--bench-threshold", 0.25),
+        request.config.getoption("--bench-save", False),
+        bench_calibration,
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_info(bench_loop):
+    """Injected context connected to the benchmark databases"""
+    if not BENCH_DATABASE_URL or not BENCH_MONGO_URI:
+        pytest.skip("BENCH_DATABASE_URL and BENCH_MONGO_URI are not set")
+    from databases import Database
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from gqlapi.utils.automation import InjectedStrawberryInfo
+
+    sql_db = Database(BENCH_DATABASE_URL)
+    bench_loop.run_until_complete(sql_db.connect())
+
+    async def _mongo():
+        # motor binds its client to the running loop
+        return AsyncIOMotorClient(BENCH_MONGO_URI)[BENCH_MONGO_DB]
+
+    mongo_db = bench_loop.run_until_complete(_mongo())
+    yield InjectedStrawberryInfo(db=sql_db, mongo=mongo_db)
+    bench_loop.run_until_complete(sql_db.disconnect())
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not _results:
+        return
+    baselines = load_baselines()
+    terminalreporter.section("benchmarks")
+    for name, stats in sorted(_results.items()):
+        base = baselines["benchmarks"].get(name)
+        delta = (
+            f"{(stats['median'] / scaled_median(base, stats['calibration']) - 1):+.1%}"
+            if base
+            else "no baseline"
+        )
+        terminalreporter.write_line(
+            f"{name:<60} median {stats['median'] * 1000:9.2f}ms"
+            f"  p95 {stats['p95'] * 1000:9.2f}ms  ({delta})"
+        )
+    if config.getoption("--bench-save", False):
+        baselines["machine"] = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        }
+        baselines["benchmarks"].update(
+            {
+                name: {k: round(v, 6) for k, v in stats.items()}
+                for name, stats in _results.items()
+            }
+        )
+        with open(BASELINES_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        terminalreporter.write_line(f"Baselines saved at {BASELINES_PATH}")
@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta
+from io import BytesIO
+import random
+from typing import List, Tuple
+from uuid import UUID, uuid4
+
+import pandas as pd
+
+from gqlapi.domain.interfaces.v2.orden.cart import CartProductGQL
+from gqlapi.domain.interfaces.v2.orden.orden import OrdenGQL
+from gqlapi.domain.interfaces.v2.restaurant.restaurant_suppliers import (
+    RestaurantSupplierCreationGQL,
+    SupplierProductCreation,
+)
+from gqlapi.domain.models.v2.core import OrdenDetails
+from gqlapi.domain.models.v2.supplier import (
+    SupplierBusiness,
+    SupplierBusinessAccount,
+    SupplierProduct,
+    SupplierProductPrice,
+)
+from gqlapi.domain.models.v2.utils import (
+    CurrencyType,
+    NotificationChannelType,
+    OrdenType,
+    UOMType,
+)
+
+# fixed seed so every run benchmarks the same inputs
+SEED = 20240501
+SELL_UNITS = [UOMType.KG, UOMType.UNIT, UOMType.PACK, UOMType.LITER]
+
+
+def _supplier_product(
+    supplier_business_id: UUID, description: str, sell_unit: UOMType, user_id: UUID
+) -> SupplierProduct:
+    return SupplierProduct(
+        id=uuid4(),
+        supplier_business_id=supplier_business_id,
+        sku=description[:12],
+        description=description,
+        tax_id="50202201",
+        sell_unit=sell_unit,
+        tax_unit="KGM",
+        tax=0.16,
+        conversion_factor=1.0,
+        buy_unit=sell_unit,
+        unit_multiple=1.0,
+        min_quantity=1.0,
+        is_active=True,
+        created_by=user_id,
+    )
+
+
+def build_preorden_inputs(
+    n_suppliers: int = 20,
+    n_products: int = 2000,
+    n_preordenes: int = 10,
+    cart_size: int = 40,
+) -> Tuple[List[OrdenGQL], List[RestaurantSupplierCreationGQL]]:
+    """Draft ordenes and restaurant suppliers, where each catalog product
+    is offered by a random subset of suppliers at different prices
+    """
+    rnd = random.Random(SEED)
+    user_id = uuid4()
+    now = datetime.utcnow()
+    catalog = [
+        (f"Producto {i} {rnd.choice(['rojo', 'verde', 'fresco'])}", rnd.choice(SELL_UNITS))
+        for i in range(n_products)
+    ]
+    suppliers = []
+    for s in range(n_suppliers):
+        sb = SupplierBusiness(
+            id=uuid4(),
+            name=f"Proveedor {s}",
+            country="México",
+            active=True,
+            notification_preference=NotificationChannelType.EMAIL,
+        )
+        products = []
+        for desc, unit in rnd.sample(catalog, k=n_products // 2):
+            sp = _supplier_product(sb.id, desc, unit, user_id)  # type: ignore
+            products.append(
+                SupplierProductCreation(
+                    product=sp,
+                    price=SupplierProductPrice(
+                        id=uuid4(),
+                        supplier_product_id=sp.id,
+                        price=round(rnd.uniform(10, 500), 2),
+                        currency=CurrencyType.MXN,
+                        valid_from=now,
+                        valid_upto=now + timedelta(days=30),
+                        created_by=user_id,
+                    ),
+                )
+            )
+        suppliers.append(
+            RestaurantSupplierCreationGQL(
+                supplier_business=sb,
+                supplier_business_account=SupplierBusinessAccount(
+                    supplier_business_id=sb.id  # type: ignore
+                ),
+                products=products,
+            )
+        )
+    alima_id = uuid4()
+    preordenes = []
+    for o in range(n_preordenes):
+        orden_id = uuid4()
+        cart = []
+        for desc, unit in rnd.sample(catalog, k=cart_size):
+            sp = _supplier_product(alima_id, desc, unit, user_id)
+            qty = float(rnd.randint(1, 20))
+            cart.append(
+                CartProductGQL(
+                    supplier_product_id=sp.id,
+                    quantity=qty,
+                    sell_unit=unit,
+                    unit_price=100.0,
+                    subtotal=qty * 100.0,
+                    supp_prod=sp,
+                )
+            )
+        preordenes.append(
+            OrdenGQL(
+                id=orden_id,
+                orden_type=OrdenType.DRAFT,
+                orden_number=str(o),
+                created_by=user_id,
+                details=OrdenDetails(
+                    id=uuid4(),
+                    orden_id=orden_id,
+                    version=1,
+                    restaurant_branch_id=uuid4(),
+                    supplier_unit_id=uuid4(),
+                    cart_id=uuid4(),
+                    created_by=user_id,
+                ),
+                cart=cart,
+            )
+        )
+    return preordenes, suppliers
+
+
+def build_supplier_products_file(n_rows: int = 2000) -> bytes:
+    """Supplier products batch file (xlsx) as uploaded by suppliers"""
+    rnd = random.Random(SEED)
+    rows = []
+    for i in range(n_rows):
+        unit = rnd.choice(SELL_UNITS).value
+        rows.append(
+            {
+                "sku": str(100000 + i),
+                "description": f"Producto {i} {rnd.choice(['rojo', 'verde', 'fresco'])}",
+                "sell_unit": unit,
+                "conversion_factor": 1,
+                "buy_unit": unit,
+                "unit_multiple": 1,
+                "min_quantity": 1,
+                "estimated_weight": round(rnd.uniform(0.1, 5), 2),
+                "max_daily_stock": "",
+                "product_price": round(rnd.uniform(10, 500), 2),
+                "sat_product_code": "50202201",
+                "tax_iva_percent": rnd.choice([0, 16]),
+                "ieps_percent": rnd.choice(["", 8]),
+                "long_description": "",
+            }
+        )
+    buff = BytesIO()
+    pd.DataFrame(rows).to_excel(buff, index=False, sheet_name="Sheet1")
+    return buff.getvalue()
@@ -0,0 +1,194 @@
+from typing import Any, Dict
+
+import pytest
+
+from gqlapi.handlers.core.invoice import MxInvoiceHandler
+from gqlapi.handlers.core.orden import OrdenHandler
+from gqlapi.handlers.supplier.supplier_price_list import SupplierPriceListHandler
+from gqlapi.handlers.supplier.supplier_product import SupplierProductHandler
+from gqlapi.handlers.supplier.supplier_restaurants import SupplierRestaurantsHandler
+from gqlapi.repository.core.cart import CartProductRepository
+from gqlapi.repository.core.category import (
+    CategoryRepository,
+    RestaurantBranchCategoryRepository,
+)
+from gqlapi.repository.core.invoice import MxInvoiceRepository
+from gqlapi.repository.core.orden import (
+    OrdenDetailsRepository,
+    OrdenPaymentStatusRepository,
+    OrdenRepository,
+    OrdenStatusRepository,
+)
+from gqlapi.repository.core.product import ProductRepository
+from gqlapi.repository.restaurant.restaurant_branch import RestaurantBranchRepository
+from gqlapi.repository.restaurant.restaurant_business import (
+    RestaurantBusinessAccountRepository,
+    RestaurantBusinessRepository,
+)
+from gqlapi.repository.supplier.supplier_business import (
+    SupplierBusinessAccountRepository,
+    SupplierBusinessRepository,
+)
+from gqlapi.repository.supplier.supplier_price_list import SupplierPriceListRepository
+from gqlapi.repository.supplier.supplier_product import (
+    SupplierProductPriceRepository,
+    SupplierProductRepository,
+    SupplierProductStockRepository,
+)
+from gqlapi.repository.supplier.supplier_restaurants import (
+    SupplierRestaurantsRepository,
+)
+from gqlapi.repository.supplier.supplier_unit import SupplierUnitRepository
+from gqlapi.repository.supplier.supplier_user import (
+    SupplierUserPermissionRepository,
+    SupplierUserRepository,
+)
+from gqlapi.repository.user.core_user import CoreUserRepository
+from .fixtures import build_supplier_products_file
+
+
+@pytest.fixture(scope="module")
+def bench_inputs(bench_info, bench_loop) -> Dict[str, Any]:
+    """Largest entities of the benchmark dataset, so each benchmark
+    hits the worst case of its path
+    """
+    db = bench_info.context["db"].sql
+
+    async def _fetch() -> Dict[str, Any]:
+        top_unit = await db.fetch_one(
+            """SELECT su.id, su.supplier_business_id
+            FROM supplier_unit su
+            JOIN supplier_product sp ON sp.supplier_business_id = su.supplier_business_id
+            GROUP BY su.id, su.supplier_business_id
+            ORDER BY COUNT(*) DESC
+            LIMIT 1
+            """
+        )
+        supplier_user = await db.fetch_one(
+            """SELECT cu.firebase_id
+            FROM supplier_user_permission sup
+            JOIN supplier_user su ON su.id = sup.supplier_user_id
+            JOIN core_user cu ON cu.id = su.core_user_id
+            WHERE sup.supplier_business_id = :supplier_business_id
+            LIMIT 1
+            """,
+            {"supplier_business_id": top_unit["supplier_business_id"]},
+        )
+        invoiced = await db.fetch_all(
+            """SELECT DISTINCT od.orden_id
+            FROM mx_invoice_orden mio
+            JOIN orden_details od ON od.id = mio.orden_details_id
+            LIMIT 100
+            """
+        )
+        return {
+            "supplier_unit_id": top_unit["id"],
+            "supplier_business_id": top_unit["supplier_business_id"],
+            "firebase_id": supplier_user["firebase_id"] if supplier_user else None,
+            "invoiced_orden_ids": [r["orden_id"] for r in invoiced],
+        }
+
+    return bench_loop.run_until_complete(_fetch())
+
+
+def test_bench_search_orden(bench, bench_info, bench_inputs):
+    info = bench_info
+    _handler = OrdenHandler(
+        orden_repo=OrdenRepository(info),  # type: ignore
+        orden_det_repo=OrdenDetailsRepository(info),  # type: ignore
+        orden_status_repo=OrdenStatusRepository(info),  # type: ignore
+        orden_payment_repo=OrdenPaymentStatusRepository(info),  # type: ignore
+        cart_prod_repo=CartProductRepository(info),  # type: ignore
+        supp_bus_repo=SupplierBusinessRepository(info),  # type: ignore
+        supp_unit_repo=SupplierUnitRepository(info),  # type: ignore
+        supp_bus_acc_repo=SupplierBusinessAccountRepository(info),  # type: ignore
+        rest_branc_repo=RestaurantBranchRepository(info),  # type: ignore
+    )
+    ordenes = bench(
+        _handler.search_orden,
+        supplier_unit_id=bench_inputs["supplier_unit_id"],
+        first=100,
+    )
+    assert len(ordenes) > 0
+
+
+@pytest.mark.parametrize("search", ["", "producto"])
+def test_bench_ecommerce_default_supplier_products(
+    bench, bench_info, bench_inputs, search
+):
+    info = bench_info
+    _handler = SupplierRestaurantsHandler(
+        supplier_restaurants_repo=SupplierRestaurantsRepository(info),  # type: ignore
+        supplier_unit_repo=SupplierUnitRepository(info),  # type: ignore
+        supplier_user_repo=SupplierUserRepository(info),  # type: ignore
+        supplier_user_permission_repo=SupplierUserPermissionRepository(info),  # type: ignore
+        restaurant_branch_repo=RestaurantBranchRepository(info),  # type: ignore
+        core_user_repo=CoreUserRepository(info),  # type: ignore
+        restaurant_business_repo=RestaurantBusinessRepository(info),  # type: ignore
+        restaurant_business_account_repo=RestaurantBusinessAccountRepository(info),  # type: ignore
+        category_repo=CategoryRepository(info),  # type: ignore
+        restaurant_branch_category_repo=RestaurantBranchCategoryRepository(info),  # type: ignore
+        product_repo=ProductRepository(info),  # type: ignore
+        supplier_product_repo=SupplierProductRepository(info),  # type: ignore
+        supplier_product_price_repo=SupplierProductPriceRepository(info),  # type: ignore
+        supplier_product_stock_repo=SupplierProductStockRepository(info),  # type: ignore
+    )
+    prods = bench(
+        _handler.get_ecommerce_default_supplier_products,
+        supplier_unit_id=bench_inputs["supplier_unit_id"],
+        search=search,
+        page=1,
+        page_size=20,
+    )
+    assert len(prods) > 0
+
+
+def test_bench_fetch_invoices(bench, bench_info, bench_inputs):
+    if not bench_inputs["invoiced_orden_ids"]:
+        pytest.skip("Benchmark dataset has no invoices")
+    info = bench_info
+    _handler = MxInvoiceHandler(
+        mx_invoice_repository=MxInvoiceRepository(info),  # type: ignore
+        orden_details_repo=OrdenDetailsRepository(info),  # type: ignore
+        core_user_repo=CoreUserRepository(info),  # type: ignore
+        supplier_unit_repo=SupplierUnitRepository(info),  # type: ignore
+        supplier_business_repo=SupplierBusinessRepository(info),  # type: ignore
+        restaurant_branch_repo=RestaurantBranchRepository(info),  # type: ignore
+    )
+    invoices = bench(_handler.fetch_invoices, bench_inputs["invoiced_orden_ids"])
+    assert len(invoices) > 0
+
+
+def test_bench_upsert_supplier_products_file(bench, bench_info, bench_inputs):
+    if not bench_inputs["firebase_id"]:
+        pytest.skip("Benchmark dataset has no supplier users")
+    info = bench_info
+    _handler = SupplierProductHandler(
+        supplier_business_repo=SupplierBusinessRepository(info),  # type: ignore
+        core_user_repo=CoreUserRepository(info),  # type: ignore
+        supplier_user_repo=SupplierUserRepository(info),  # type: ignore
+        supplier_user_permission_repo=SupplierUserPermissionRepository(info),  # type: ignore
+        product_repo=ProductRepository(info),  # type: ignore
+        category_repo=CategoryRepository(info),  # type: ignore
+        supplier_product_repo=SupplierProductRepository(info),  # type: ignore
+        supplier_product_price_repo=SupplierProductPriceRepository(info),  # type: ignore
+        supplier_unit_repo=SupplierUnitRepository(info),  # type: ignore
+    )
+    _handler.supplier_price_list_handler = SupplierPriceListHandler(
+        supplier_price_list_repo=SupplierPriceListRepository(info),  # type: ignore
+        supplier_unit_repo=SupplierUnitRepository(info),  # type: ignore
+        restaurant_branch_repo=RestaurantBranchRepository(info),  # type: ignore
+        supplier_product_repo=SupplierProductRepository(info),  # type: ignore
+        supplier_product_price_repo=SupplierProductPriceRepository(info),  # type: ignore
+        supplier_product_handler=_handler,
+    )
+    product_file = build_supplier_products_file(500)
+    # same skus every round: first round inserts, the rest update
+    feedback = bench(
+        _handler.upsert_supplier_products_file,
+        bench_inputs["firebase_id"],
+        product_file,
+        rounds=3,
+        warmup=1,
+    )
+    assert all(f.status for f in feedback)
@@ -0,0 +1,36 @@
+import copy
+from io import BytesIO
+
+import pandas as pd
+
+from gqlapi.handlers.supplier.supplier_product import SupplierProductHandler
+from gqlapi.models.preorden_optimizer import PreOrdenOptimizer
+from .fixtures import build_preorden_inputs, build_supplier_products_file
+
+
+def test_bench_preorden_optimizer(bench):
+    preordenes, suppliers = build_preorden_inputs()
+
+    def _optimize():
+        # optimizer mutates the cart products of the preordenes
+        return PreOrdenOptimizer(copy.deepcopy(preordenes), suppliers).optimize()
+
+    tmp_ordenes = bench(_optimize, rounds=5, warmup=1)
+    assert len(tmp_ordenes) > 0
+
+
+def test_bench_supplier_products_file_validation(bench):
+    product_file = build_supplier_products_file()
+    _handler = SupplierProductHandler(
+        None, None, None, None, None, None, None, None  # type: ignore (not used)
+    )
+
+    def _parse_and_validate():
+        xls = pd.ExcelFile(BytesIO(product_file))
+        df = pd.read_excel(
+            xls, "Sheet1", dtype={"sat_product_code": str, "sku": str}
+        )
+        return _handler.validate_cols_supplier_products_file(df)
+
+    data = bench(_parse_and_validate, rounds=5, warmup=1)
+    assert len(data) == 2000
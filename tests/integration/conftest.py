@@ -0,0 +1,11 @@
+import asyncio
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Single event loop for the session scoped async fixtures"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
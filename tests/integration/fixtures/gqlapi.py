@@ -1,6 +1,6 @@
 import json
 import logging
-import pytest
+import pytest_asyncio
 from typing import Any, Dict, Optional
 from gqlapi import __version__  # noqa
 from gqlapi.repository.user.firebase import FirebaseTokenRepository, FirebaseApp  # noqa
@@ -30,13 +30,15 @@ def fixture_gql_api(
     return resp_js
 
 
-@pytest.fixture(scope="session")
-def test_ficture_firebase_signup_ok_delete_ok(
+@pytest_asyncio.fixture(scope="session")
+async def test_ficture_firebase_signup_ok_delete_ok(
     setup_fb_auth: Dict[str, FirebaseAuthApi]  # noqa
 ):
     _fb = setup_fb_auth["firebase"]
     # create user
-    usr_creds = _fb.signup_with_email(mock_fb_user["email"], mock_fb_user["password"])
+    usr_creds = await _fb.signup_with_email(
+        mock_fb_user["email"], mock_fb_user["password"]
+    )
     logging.info(usr_creds)
     logging.debug("Signed up user in firebase")
     # assert data type
@@ -46,18 +48,18 @@ def test_ficture_firebase_signup_ok_delete_ok(
     # yield values
     yield setup_fb_auth
     logging.debug("Closing Firebase Sign up process")
-    fback = _fb.delete(usr_creds["idToken"])
+    fback = await _fb.delete(usr_creds["idToken"])
     logging.debug(fback)
     assert "Delete" in fback["kind"]
 
 
-@pytest.fixture(scope="session")
-def test_ficture_firebase_signin_ok(
+@pytest_asyncio.fixture(scope="session")
+async def test_ficture_firebase_signin_ok(
     test_ficture_firebase_signup_ok_delete_ok: Dict[str, FirebaseAuthApi]
 ):  # noqa
     try:
         _fb = test_ficture_firebase_signup_ok_delete_ok["firebase"]
-        usr_creds = _fb.signin_with_email(
+        usr_creds = await _fb.signin_with_email(
             mock_fb_user["email"], mock_fb_user["password"]
         )
         logging.debug("Signed in user in firebase")
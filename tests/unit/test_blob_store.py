@@ -0,0 +1,34 @@
+import asyncio
+
+from gqlapi.utils.blob_store import LocalBlobStore, blob_key, blob_store_enabled
+
+
+async def _collect(store: LocalBlobStore, key: str) -> bytes:
+    return b"".join([chunk async for chunk in store.stream(key, chunk_size=4)])
+
+
+def test_local_blob_store_put_get(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    key = asyncio.run(store.put(b"<cfdi:Comprobante/>"))
+    assert key == blob_key(b"<cfdi:Comprobante/>")
+    # content addressed: same content, same key
+    assert asyncio.run(store.put(b"<cfdi:Comprobante/>")) == key
+    assert asyncio.run(store.exists(key))
+    assert asyncio.run(store.get(key)) == b"<cfdi:Comprobante/>"
+    assert asyncio.run(_collect(store, key)) == b"<cfdi:Comprobante/>"
+
+
+def test_local_blob_store_missing(tmp_path):
+    store = LocalBlobStore(str(tmp_path))
+    key = blob_key(b"missing")
+    assert not asyncio.run(store.exists(key))
+    assert asyncio.run(store.get(key)) is None
+
+
+def test_blob_store_requires_persistent_path(tmp_path):
+    assert blob_store_enabled(str(tmp_path))
+    # relative paths land in the (ephemeral) container filesystem
+    assert not blob_store_enabled("./.blobs")
+    assert not blob_store_enabled("")
+    # volume not mounted
+    assert not blob_store_enabled(str(tmp_path / "missing"))
@@ -0,0 +1,55 @@
+import asyncio
+
+from gqlapi.db import ReadReplicaRouter
+
+
+class MockDatabase:
+    def __init__(self, url: str, lag: float = 0.0, connected: bool = True):
+        self.url = url
+        self.lag = lag
+        self.is_connected = connected
+        self.lag_checks = 0
+
+    async def fetch_val(self, query: str):
+        self.lag_checks += 1
+        if self.lag < 0:
+            raise ConnectionError("replica down")
+        return self.lag
+
+
+def test_read_router_uses_replica_when_in_sync():
+    primary = MockDatabase("postgres://primary/db")
+    replica = MockDatabase("postgres://replica/db", lag=0.5)
+    router = ReadReplicaRouter(primary, replica, max_lag=5.0)  # type: ignore
+    assert asyncio.run(router.get()) is replica
+
+
+def test_read_router_falls_back_on_lag_or_errors():
+    primary = MockDatabase("postgres://primary/db")
+    lagging = MockDatabase("postgres://replica/db", lag=30.0)
+    router = ReadReplicaRouter(primary, lagging, max_lag=5.0)  # type: ignore
+    assert asyncio.run(router.get()) is primary
+    broken = MockDatabase("postgres://replica/db", lag=-1)
+    router = ReadReplicaRouter(primary, broken, max_lag=5.0)  # type: ignore
+    assert asyncio.run(router.get()) is primary
+
+
+def test_read_router_without_replica_uses_primary():
+    primary = MockDatabase("postgres://primary/db")
+    same = MockDatabase("postgres://primary/db")
+    router = ReadReplicaRouter(primary, same)  # type: ignore
+    assert asyncio.run(router.get()) is primary
+    assert same.lag_checks == 0
+
+
+def test_read_router_throttles_lag_checks():
+    primary = MockDatabase("postgres://primary/db")
+    replica = MockDatabase("postgres://replica/db")
+    router = ReadReplicaRouter(primary, replica, check_interval=60.0)  # type: ignore
+
+    async def _run():
+        for _ in range(5):
+            await router.get()
+
+    asyncio.run(_run())
+    assert replica.lag_checks == 1
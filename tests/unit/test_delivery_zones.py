@@ -0,0 +1,28 @@
+import json
+import os
+
+from gqlapi.models import delivery_zones as dzs
+
+
+def _write_zones(path, zone_name: str, mtime: float):
+    with open(path, "w") as f:
+        json.dump([{"zoneName": zone_name, "zipCode": ["01000"]}], f)
+    os.utime(path, (mtime, mtime))
+
+
+def test_delivery_zone_index_hot_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(dzs, "DZ_DIR", str(tmp_path))
+    monkeypatch.setattr(dzs, "DZ_RELOAD_CHECK_INTERVAL", 0.0)
+    _write_zones(tmp_path / "test_dzs.json", "Álvaro Obregón", 1000)
+    idx = dzs.get_delivery_zone_index("test_dzs.json")
+    assert idx.zones["01000"] == "alvaro_obregon"
+    # same mtime: compiled index is reused
+    assert dzs.get_delivery_zone_index("test_dzs.json") is idx
+    # file changed: index is recompiled
+    _write_zones(tmp_path / "test_dzs.json", "Coyoacán", 2000)
+    assert dzs.get_delivery_zone_index("test_dzs.json").zones["01000"] == "coyoacan"
+
+
+def test_normalize_unit_name():
+    assert dzs.normalize_unit_name("Calle 7") == "calle_7"
+    assert dzs.normalize_unit_name("Bodega Azcapotzalco Ñ") == "bodega_azcapotzalco_n"
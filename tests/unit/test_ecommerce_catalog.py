@@ -0,0 +1,242 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from gqlapi.errors import GQLApiException
+
+from gqlapi.handlers.supplier import supplier_product, supplier_restaurants
+from gqlapi.handlers.supplier.supplier_product import SupplierProductHandler
+from gqlapi.handlers.supplier.supplier_restaurants import SupplierRestaurantsHandler
+from gqlapi.utils.product_index import ProductIndexRegistry
+
+SUPPLIER_UNIT_ID = uuid4()
+USER_ID = uuid4()
+
+
+def _product_row(description: str, total: int):
+    prod_id = uuid4()
+    return {
+        "id": prod_id,
+        "supplier_business_id": uuid4(),
+        "sku": description,
+        "description": description,
+        "tax_id": "50202300",
+        "sell_unit": "kg",
+        "tax_unit": "H87",
+        "tax": 0.16,
+        "conversion_factor": 1.0,
+        "buy_unit": "kg",
+        "unit_multiple": 1.0,
+        "min_quantity": 1.0,
+        "is_active": True,
+        "created_by": USER_ID,
+        "last_price_json": json.dumps(
+            {
+                "id": str(uuid4()),
+                "supplier_product_id": str(prod_id),
+                "price": 10.5,
+                "currency": "MXN",
+                "valid_from": "2024-01-01T00:00:00",
+                "valid_upto": "2099-01-01T00:00:00",
+                "created_by": str(USER_ID),
+                "created_at": "2024-01-01T00:00:00",
+            }
+        ),
+        "total_results": total,
+    }
+
+
+class CatalogRepository:
+    """Answers catalog queries by statement, recording them"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def raw_query(self, query, vals):
+        self.queries.append((query, vals))
+        if "FROM supplier_price_list" in query:
+            return [{"supplier_product_price_ids": json.dumps([str(uuid4())])}]
+        if "COUNT(*) OVER ()" in query:
+            return self.rows
+        if "count(spr.id) as total" in query:
+            return [{"total": 42}]
+        return []
+
+
+class StockRepository:
+    async def fetch_latest_by_unit(self, supplier_unit_id):
+        return []
+
+    async def find_availability(self, supplier_unit_id, stock):
+        return []
+
+
+def _handler(repo):
+    return SupplierRestaurantsHandler(
+        supplier_restaurants_repo=repo,  # type: ignore
+        supplier_unit_repo=None,  # type: ignore
+        supplier_user_repo=None,  # type: ignore
+        supplier_user_permission_repo=None,  # type: ignore
+        restaurant_branch_repo=None,  # type: ignore
+        supplier_product_stock_repo=StockRepository(),  # type: ignore
+    )
+
+
+def _price_list_queries(repo):
+    return [q for q, _ in repo.queries if "FROM supplier_price_list" in q]
+
+
+def test_catalog_page_resolves_price_list_once():
+    repo = CatalogRepository([_product_row("Aguacate", 42), _product_row("Ajo", 42)])
+    prods, total = asyncio.run(
+        _handler(repo).find_ecommerce_catalog_page(
+            SUPPLIER_UNIT_ID, None, "agua cate", page=1, page_size=2
+        )
+    )
+    assert total == 42
+    assert [p.description for p in prods] == ["Aguacate", "Ajo"]
+    assert prods[0].last_price and prods[0].last_price.price == 10.5
+    assert len(_price_list_queries(repo)) == 1
+    # search is bound, not interpolated
+    page_qry, page_vals = [(q, v) for q, v in repo.queries if "OVER ()" in q][0]
+    assert page_vals == {"search": "agua cate", "search_0": "agua", "search_1": "cate"}
+    assert "agua" not in page_qry
+    assert "word_similarity(f_unaccent(:search)" in page_qry
+
+
+def test_catalog_page_out_of_range_counts():
+    repo = CatalogRepository([])
+    prods, total = asyncio.run(
+        _handler(repo).find_ecommerce_catalog_page(
+            SUPPLIER_UNIT_ID, None, "", page=10, page_size=20
+        )
+    )
+    assert prods == [] and total == 42
+    assert len(_price_list_queries(repo)) == 1
+
+
+class IndexRepository:
+    """Answers unit catalog versions and product search documents"""
+
+    def __init__(self, sb_id, unit_versions, docs):
+        self.sb_id = sb_id
+        self.unit_versions = unit_versions
+        self.docs = docs
+        self.doc_queries = 0
+
+    async def raw_query(self, query, vals):
+        if "supplier_unit_catalog_version" in query:
+            return [
+                {"id": su_id, "supplier_business_id": self.sb_id, "version": v}
+                for su_id, v in self.unit_versions.items()
+            ]
+        self.doc_queries += 1
+        return self.docs
+
+
+def test_product_index_search_freshness_and_cap(monkeypatch):
+    monkeypatch.setattr(supplier_restaurants, "product_index", ProductIndexRegistry())
+    monkeypatch.setattr(supplier_restaurants, "PRODUCT_SEARCH_MAX_RESULTS", 2)
+    sb_id, other_unit_id = uuid4(), uuid4()
+    docs = [
+        {"id": uuid4(), "description": f"Agua {i}", "sku": f"AG-{i}", "tags": None}
+        for i in range(5)
+    ]
+    repo = IndexRepository(sb_id, {SUPPLIER_UNIT_ID: 3, other_unit_id: 5}, docs)
+    handler = _handler(repo)
+    # results are capped
+    ids = asyncio.run(handler._search_product_index(SUPPLIER_UNIT_ID, "agua"))
+    assert ids == [d["id"] for d in docs[:2]] and repo.doc_queries == 1
+    # versions of every unit of the supplier were recorded on load
+    asyncio.run(handler._search_product_index(other_unit_id, "agua"))
+    assert repo.doc_queries == 1
+    # catalog bumped by another process: reloaded once
+    repo.unit_versions = {SUPPLIER_UNIT_ID: 4, other_unit_id: 6}
+    asyncio.run(handler._search_product_index(other_unit_id, "agua"))
+    asyncio.run(handler._search_product_index(SUPPLIER_UNIT_ID, "agua"))
+    assert repo.doc_queries == 2
+
+
+class ProductRepository:
+    """Supplier product rows (by id) and their search documents"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetch(self, supplier_product_id):
+        return dict(self.rows[supplier_product_id])
+
+    async def find(self, **kwargs):
+        return []
+
+    async def edit(self, sup_prod):
+        self.rows[sup_prod.id].update(sup_prod.__dict__)
+        return True
+
+    async def fetch_search_documents(self, supplier_business_id, supplier_product_ids):
+        return [
+            {**self.rows[sp_id], "tags": None} for sp_id in supplier_product_ids or []
+        ]
+
+
+class UnitVersionsRepository:
+    """Catalog versions of the supplier units of one supplier business"""
+
+    def __init__(self, sb_id, unit_versions):
+        self.sb_id = sb_id
+        self.unit_versions = unit_versions
+
+    async def bump_catalog_version(
+        self, supplier_unit_ids=None, supplier_business_id=None
+    ):
+        for su_id in self.unit_versions:
+            self.unit_versions[su_id] += 1
+
+    async def raw_query(self, query, vals):
+        return [
+            {"id": su_id, "supplier_business_id": self.sb_id, "version": v}
+            for su_id, v in self.unit_versions.items()
+        ]
+
+
+def test_product_edit_bumps_catalog_version(monkeypatch):
+    registry, other_process = ProductIndexRegistry(), ProductIndexRegistry()
+    monkeypatch.setattr(supplier_product, "product_index", registry)
+    monkeypatch.setattr(supplier_product, "PRODUCT_SEARCH_INDEX", True)
+    row = {
+        k: v
+        for k, v in _product_row("Papa blanca", 1).items()
+        if k not in ("last_price_json", "total_results")
+    }
+    sb_id, prod_id = row["supplier_business_id"], row["id"]
+    unit_repo = UnitVersionsRepository(sb_id, {SUPPLIER_UNIT_ID: 3})
+    for _registry in (registry, other_process):
+        _registry.load(sb_id, [row])
+        _registry.set_versions({SUPPLIER_UNIT_ID: 3})
+    handler = SupplierProductHandler(
+        None, None, None, None, None, None, None, None  # type: ignore (not used)
+    )
+    handler.supplier_product_repo = ProductRepository({prod_id: row})  # type: ignore
+    handler.supplier_unit_repo = unit_repo  # type: ignore
+    asyncio.run(
+        handler.edit_supplier_product(
+            "firebase-id", prod_id, description="Papa cambray"
+        )
+    )
+    assert unit_repo.unit_versions[SUPPLIER_UNIT_ID] == 4
+    # this process index has the edit and stays fresh
+    assert registry.is_fresh(SUPPLIER_UNIT_ID, 4)
+    assert registry.get(sb_id).search("cambray") == [prod_id]  # type: ignore
+    # other processes reload it on their next search
+    assert not other_process.is_fresh(SUPPLIER_UNIT_ID, 4)
+
+
+def test_product_edit_requires_supplier_unit_repo():
+    handler = SupplierProductHandler(
+        None, None, None, None, None, None, None, None  # type: ignore (not used)
+    )
+    with pytest.raises(GQLApiException):
+        asyncio.run(handler.edit_supplier_product("firebase-id", uuid4()))
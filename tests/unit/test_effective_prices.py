@@ -0,0 +1,253 @@
+import asyncio
+from contextlib import asynccontextmanager
+import json
+import re
+from types import SimpleNamespace
+from uuid import uuid4
+
+from gqlapi.handlers.supplier import supplier_price_list as price_list_handler
+from gqlapi.handlers.supplier import supplier_restaurants
+from gqlapi.handlers.supplier.supplier_price_list import SupplierPriceListHandler
+from gqlapi.handlers.supplier.supplier_restaurants import SupplierRestaurantsHandler
+from gqlapi.repository.supplier import supplier_price_list
+from gqlapi.repository.supplier.supplier_price_list import (
+    DELETE_SCOPED_EFFECTIVE_PRICES_QUERY,
+    SupplierPriceListRepository,
+    price_list_scopes_query,
+    refresh_effective_prices_query,
+)
+from gqlapi.utils.metrics import EFFECTIVE_PRICE_REFRESH_ERRORS
+
+
+class RefreshDatabase:
+    """Records the statements of an effective prices refresh"""
+
+    def __init__(self, business_unit_ids=None, scopes=None):
+        self.business_unit_ids = business_unit_ids or []
+        self.scopes = scopes or []
+        self.statements = []
+        self.in_transaction = False
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        yield
+        self.in_transaction = False
+
+    async def fetch_all(self, query, values=None):
+        if "FROM supplier_unit WHERE" in query:
+            return [{"id": su_id} for su_id in self.business_unit_ids]
+        self.statements.append((" ".join(query.split()), values, self.in_transaction))
+        if "named_price_list" in query:
+            return self.scopes
+        return []
+
+    async def execute(self, query, values=None):
+        self.statements.append((" ".join(query.split()), values, self.in_transaction))
+
+
+def _repo(db):
+    info = SimpleNamespace(context={"db": SimpleNamespace(sql=db)})
+    return SupplierPriceListRepository(info)  # type: ignore
+
+
+def test_refresh_effective_prices_query(monkeypatch):
+    for links_read, source in [
+        (True, "supplier_price_list_price"),
+        (False, "json_array_elements_text"),
+    ]:
+        monkeypatch.setattr(supplier_price_list, "PRICE_LIST_LINKS_READ", links_read)
+        qry = " ".join(refresh_effective_prices_query().split())
+        assert source in qry
+        # only the units are bound, and only valid price lists are used
+        assert re.findall(r"(?<![:\w]):(\w+)", qry) == ["supplier_unit_ids"]
+        assert "WHERE valid_upto::date >= current_date" in qry
+        # branch specific lists, and the default one (NULL branch)
+        assert "NULL::UUID AS restaurant_branch_id" in qry
+        assert "WHERE is_default = 't'" in qry
+        assert qry.startswith("WITH valid_price_list AS")
+        assert "INSERT INTO effective_price" in qry
+
+
+def test_refresh_effective_prices_values():
+    unit_a, unit_b, unit_c = sorted([uuid4(), uuid4(), uuid4()])
+    db = RefreshDatabase(business_unit_ids=[unit_c, unit_a])
+    asyncio.run(
+        _repo(db).refresh_effective_prices(
+            supplier_unit_ids=[unit_b, unit_a], supplier_business_id=uuid4()
+        )
+    )
+    (lock, delete, insert) = [qry for qry, _, _ in db.statements]
+    assert "pg_advisory_xact_lock" in lock and "ORDER BY su_id" in lock
+    assert delete.startswith("DELETE FROM effective_price")
+    assert insert == " ".join(refresh_effective_prices_query().split())
+    # units of the business are added, deduplicated and sorted (lock order)
+    units = [unit_a, unit_b, unit_c]
+    assert all(vals == {"supplier_unit_ids": units} for _, vals, _ in db.statements)
+    # replaced atomically
+    assert all(in_tx for _, _, in_tx in db.statements)
+
+
+def test_refresh_effective_prices_without_units():
+    db = RefreshDatabase()
+    asyncio.run(_repo(db).refresh_effective_prices(supplier_unit_ids=[]))
+    assert db.statements == []
+
+
+def _bound_params(qry):
+    return re.findall(r"(?<![:\w]):(\w+)", " ".join(qry.split()))
+
+
+def test_scoped_refresh_queries():
+    assert set(_bound_params(price_list_scopes_query())) == {
+        "supplier_unit_ids",
+        "name",
+    }
+    scope_params = {"scope_unit_ids", "scope_branch_ids"}
+    assert set(_bound_params(DELETE_SCOPED_EFFECTIVE_PRICES_QUERY)) == scope_params
+    qry = refresh_effective_prices_query(scoped=True)
+    assert set(_bound_params(qry)) == {"supplier_unit_ids", *scope_params}
+    # default scope (NULL branch) is matched too
+    assert "IS NOT DISTINCT FROM sc.restaurant_branch_id" in qry
+
+
+def test_refresh_effective_prices_of_price_list():
+    unit_id, branch_id = uuid4(), uuid4()
+    db = RefreshDatabase(
+        scopes=[
+            {"supplier_unit_id": unit_id, "restaurant_branch_id": branch_id},
+            {"supplier_unit_id": unit_id, "restaurant_branch_id": None},
+        ]
+    )
+    asyncio.run(
+        _repo(db).refresh_effective_prices(
+            supplier_unit_ids=[unit_id], price_list_name="Mayoreo"
+        )
+    )
+    (lock, scopes, delete, insert) = [qry for qry, _, _ in db.statements]
+    assert "pg_advisory_xact_lock" in lock
+    assert scopes == " ".join(price_list_scopes_query().split())
+    assert db.statements[1][1] == {"supplier_unit_ids": [unit_id], "name": "Mayoreo"}
+    # only the scopes of the price list are replaced
+    scope_vals = {
+        "scope_unit_ids": [unit_id, unit_id],
+        "scope_branch_ids": [branch_id, None],
+    }
+    assert delete == " ".join(DELETE_SCOPED_EFFECTIVE_PRICES_QUERY.split())
+    assert db.statements[2][1] == scope_vals
+    assert insert == " ".join(refresh_effective_prices_query(scoped=True).split())
+    assert db.statements[3][1] == {"supplier_unit_ids": [unit_id], **scope_vals}
+    assert all(in_tx for _, _, in_tx in db.statements)
+    # price list without scopes: nothing to replace
+    db = RefreshDatabase()
+    asyncio.run(
+        _repo(db).refresh_effective_prices(
+            supplier_unit_ids=[unit_id], price_list_name="Mayoreo"
+        )
+    )
+    assert len(db.statements) == 2
+
+
+class FailingPriceListRepository:
+    db = None
+
+    async def refresh_effective_prices(self, **kwargs):
+        raise Exception("Refresh failed")
+
+
+class BumpUnitRepository:
+    async def bump_catalog_version(self, **kwargs):
+        pass
+
+
+class FakeExecRepo:
+    def __init__(self, db):
+        pass
+
+    async def add(self, script_name, status):
+        return uuid4()
+
+
+def test_failed_refresh_enqueues_unit_refresh(monkeypatch):
+    jobs = []
+
+    class FakeJobRepo:
+        def __init__(self, db):
+            pass
+
+        async def enqueue(self, **kwargs):
+            jobs.append(kwargs)
+
+    monkeypatch.setattr(price_list_handler, "EFFECTIVE_PRICES_WRITE", True)
+    monkeypatch.setattr(price_list_handler, "ScriptExecutionRepository", FakeExecRepo)
+    monkeypatch.setattr(price_list_handler, "ScriptJobRepository", FakeJobRepo)
+    handler = SupplierPriceListHandler(
+        supplier_price_list_repo=FailingPriceListRepository(),  # type: ignore
+        supplier_unit_repo=BumpUnitRepository(),  # type: ignore
+        restaurant_branch_repo=None,  # type: ignore
+        supplier_product_repo=None,  # type: ignore
+        supplier_product_price_repo=None,  # type: ignore
+        supplier_product_handler=None,  # type: ignore
+    )
+    errors = EFFECTIVE_PRICE_REFRESH_ERRORS.get()
+    unit_id = uuid4()
+    asyncio.run(handler._invalidate_catalogs([unit_id], price_list_name="Mayoreo"))
+    assert EFFECTIVE_PRICE_REFRESH_ERRORS.get() == errors + 1
+    assert [(j["script_name"], j["args"]) for j in jobs] == [
+        ("run_daily_effective_prices", {"supplier_unit_id": str(unit_id)})
+    ]
+
+
+class PriceRepository:
+    """Answers effective prices (branch and default) and price list queries"""
+
+    def __init__(self, branch_prices, default_prices):
+        self.branch_prices = branch_prices
+        self.default_prices = default_prices
+        self.queries = []
+
+    async def raw_query(self, query, vals):
+        self.queries.append((query, vals))
+        if "FROM effective_price" in query:
+            prices = (
+                self.branch_prices
+                if "restaurant_branch_id = :branch_id" in query
+                else self.default_prices
+            )
+            return [{"supplier_product_price_id": p} for p in prices]
+        if "FROM supplier_price_list" in query:
+            return [{"supplier_product_price_ids": json.dumps([str(uuid4())])}]
+        return []
+
+
+def _find_price_ids(repo, **kwargs):
+    handler = SupplierRestaurantsHandler(
+        supplier_restaurants_repo=repo,  # type: ignore
+        supplier_unit_repo=None,  # type: ignore
+        supplier_user_repo=None,  # type: ignore
+        supplier_user_permission_repo=None,  # type: ignore
+        restaurant_branch_repo=None,  # type: ignore
+    )
+    return asyncio.run(
+        handler.find_business_specific_price_ids(uuid4(), uuid4(), **kwargs)
+    )
+
+
+def test_effective_prices_read_switch(monkeypatch):
+    branch_ids, default_ids = [uuid4(), uuid4()], [uuid4()]
+    monkeypatch.setattr(supplier_restaurants, "EFFECTIVE_PRICES_READ", True)
+    # branch specific prices
+    repo = PriceRepository(branch_ids, default_ids)
+    assert _find_price_ids(repo) == branch_ids
+    assert all("FROM effective_price" in q for q, _ in repo.queries)
+    # default prices when the branch has none, or specific ones are skipped
+    assert _find_price_ids(PriceRepository([], default_ids)) == default_ids
+    repo = PriceRepository(branch_ids, default_ids)
+    assert _find_price_ids(repo, skip_specific=True) == default_ids
+    assert len(repo.queries) == 1 and "IS NULL" in repo.queries[0][0]
+    # switched off: price lists are read instead
+    monkeypatch.setattr(supplier_restaurants, "EFFECTIVE_PRICES_READ", False)
+    monkeypatch.setattr(supplier_restaurants, "PRICE_LIST_LINKS_READ", False)
+    repo = PriceRepository(branch_ids, default_ids)
+    assert len(_find_price_ids(repo)) == 1
+    assert not any("FROM effective_price" in q for q, _ in repo.queries)
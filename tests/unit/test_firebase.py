@@ -1,6 +1,8 @@
+import asyncio
+
 from firebase_admin import App as FirebaseApp
 
-from gqlapi.auth import initialize_firebase
+from gqlapi.auth import AlimaAuthBackend, initialize_firebase
 from gqlapi.config import FIREBASE_SERVICE_ACCOUNT
 from gqlapi.repository.user.firebase import MockTokenRepository
 
@@ -24,3 +26,12 @@ def test_firebase_token_verif_handler_with_mock_ok():
     mock_repo = MockTokenRepository()
     _creds = mock_repo.verify_token(mock_token)
     assert ('token' in _creds and _creds['token'] == mock_token)
+
+
+def test_firebase_token_verif_cached_with_mock_ok():
+    mock_token = 'osdfipdfjdspfij'
+    backend = AlimaAuthBackend(MockTokenRepository(), None)  # type: ignore
+    _creds = asyncio.run(backend.verify_token(mock_token))
+    _cached = asyncio.run(backend.verify_token(mock_token))
+    assert _cached['info'].firebase_id == _creds['info'].firebase_id
+    assert backend.token_cache.hits == 1 and backend.token_cache.misses == 1
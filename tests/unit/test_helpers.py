@@ -0,0 +1,50 @@
+from datetime import date
+from typing import List, Set
+from uuid import uuid4
+
+import pytest
+import strawberry
+from strawberry.types import Info
+
+from gqlapi.errors import GQLApiException
+from gqlapi.utils.helpers import decode_cursor, encode_cursor, selected_field_names
+
+
+def test_cursor_roundtrip():
+    _id = uuid4()
+    cursor = encode_cursor(date(2024, 5, 1), _id)
+    assert decode_cursor(cursor, 2) == ["2024-05-01", str(_id)]
+
+
+def test_cursor_invalid():
+    with pytest.raises(GQLApiException):
+        decode_cursor("not-a-cursor", 2)
+
+
+def test_selected_field_names():
+    selected: List[Set[str]] = []
+
+    @strawberry.type
+    class Item:
+        id: int
+        name: str
+
+    @strawberry.type
+    class Edge:
+        node: Item
+
+    @strawberry.type
+    class Query:
+        @strawberry.field
+        def items(self, info: Info) -> List[Edge]:
+            selected.append(
+                selected_field_names(info.selected_fields[0].selections, ["node"])
+            )
+            return []
+
+    schema = strawberry.Schema(query=Query)
+    res = schema.execute_sync(
+        "{ items { node { id ...ItemName } } } fragment ItemName on Item { name }"
+    )
+    assert res.errors is None
+    assert selected[0] == {"id", "name"}
@@ -0,0 +1,137 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+import requests
+
+from gqlapi.lib.clients.clients.http import transport
+from gqlapi.lib.clients.clients.http.transport import AsyncHttpTransport
+
+URL = "https://api.example.com/v1/resource"
+
+
+def _response(status_code: int) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status_code
+    return resp
+
+
+class FakeSend:
+    """Answers requests in order (responses or exceptions to raise)"""
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.calls = []
+
+    def __call__(self, method, url, **kwargs):
+        self.calls.append(method)
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return _response(answer)
+
+
+def _transport(monkeypatch, answers, **kwargs):
+    delays = []
+    _sleep = asyncio.sleep
+
+    async def _record_sleep(delay):
+        delays.append(delay)
+        await _sleep(0)
+
+    monkeypatch.setattr(transport.asyncio, "sleep", _record_sleep)
+    http = AsyncHttpTransport("test", backoff=0.5, **kwargs)
+    send = FakeSend(answers)
+    monkeypatch.setattr(http, "_send", send)
+    return http, send, delays
+
+
+def test_retries_5xx_with_backoff(monkeypatch):
+    http, send, delays = _transport(monkeypatch, [503, 502, 200], retries=2)
+    resp = asyncio.run(http.get(URL))
+    assert resp.status_code == 200 and len(send.calls) == 3
+    # exponential backoff
+    assert delays == [0.5, 1.0]
+    # retries exhausted: last response is returned
+    http, send, _ = _transport(monkeypatch, [503, 503, 503], retries=2)
+    assert asyncio.run(http.get(URL)).status_code == 503
+    assert len(send.calls) == 3
+
+
+def test_retries_connection_errors(monkeypatch):
+    http, send, delays = _transport(
+        monkeypatch, [requests.exceptions.ConnectionError("reset"), 200]
+    )
+    assert asyncio.run(http.get(URL)).status_code == 200
+    assert len(send.calls) == 2 and delays == [0.5]
+    # connect timeouts never reached the server: retried for any method
+    http, send, _ = _transport(
+        monkeypatch, [requests.exceptions.ConnectTimeout("connect"), 201]
+    )
+    assert asyncio.run(http.post(URL)).status_code == 201
+    # errors after the request may have been sent: not for POST
+    http, send, _ = _transport(
+        monkeypatch, [requests.exceptions.ReadTimeout("read"), 201]
+    )
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        asyncio.run(http.post(URL))
+    assert len(send.calls) == 1
+    # retries exhausted: last error is raised
+    http, send, _ = _transport(
+        monkeypatch, [requests.exceptions.ConnectionError("reset")] * 2, retries=1
+    )
+    with pytest.raises(requests.exceptions.ConnectionError):
+        asyncio.run(http.get(URL))
+    assert len(send.calls) == 2
+
+
+def test_no_retry_on_4xx(monkeypatch):
+    for status in (400, 401, 404, 422):
+        http, send, delays = _transport(monkeypatch, [status, 200])
+        assert asyncio.run(http.get(URL)).status_code == status
+        assert len(send.calls) == 1 and delays == []
+    # non idempotent requests are only retried when rate limited
+    http, send, _ = _transport(monkeypatch, [503, 200])
+    assert asyncio.run(http.post(URL)).status_code == 503
+    http, send, _ = _transport(monkeypatch, [429, 200])
+    assert asyncio.run(http.post(URL)).status_code == 200
+
+
+class SlowSend:
+    """Blocking request that records how many run at the same time"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def __call__(self, method, url, **kwargs):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self.lock:
+            self.in_flight -= 1
+        return _response(200)
+
+
+async def _gather_gets(http, count):
+    return await asyncio.gather(*[http.get(URL) for _ in range(count)])
+
+
+def test_concurrency_is_bounded(monkeypatch):
+    monkeypatch.setattr(transport, "_executor", ThreadPoolExecutor(max_workers=4))
+    # by the integration limit
+    http = AsyncHttpTransport("test", max_concurrency=2)
+    send = SlowSend()
+    monkeypatch.setattr(http, "_send", send)
+    assert len(asyncio.run(_gather_gets(http, 6))) == 6
+    assert send.max_in_flight == 2
+    # by the size of the shared worker pool
+    http = AsyncHttpTransport("test", max_concurrency=50)
+    send = SlowSend()
+    monkeypatch.setattr(http, "_send", send)
+    assert len(asyncio.run(_gather_gets(http, 12))) == 12
+    assert send.max_in_flight == 4
@@ -0,0 +1,112 @@
+import asyncio
+from uuid import UUID
+
+from starlette.requests import Request
+
+from gqlapi.endpoints.core import metrics as metrics_endpoint
+from gqlapi.repository import CoreDataOrchestationRepository
+from gqlapi.utils.metrics import (
+    Histogram,
+    bind_sql,
+    current_query_stats,
+    observe_query,
+    operation_label,
+    query_caller,
+    register_operations,
+    start_query_stats,
+)
+
+
+class CallerDatabase:
+    """Records the repository method that issued each query"""
+
+    def __init__(self):
+        self.callers = []
+
+    async def execute(self, query, values=None):
+        self.callers.append(query_caller())
+
+
+def test_query_caller_tags_outermost_repository_method():
+    db = CallerDatabase()
+    repo = CoreDataOrchestationRepository(db)
+    asyncio.run(repo._query("SELECT 1", {}, "Test"))
+    asyncio.run(
+        repo.add(
+            core_element_tablename="test",
+            core_element_name="Test",
+            core_query="INSERT INTO test (id) VALUES (:id)",
+            core_values={"id": 1},
+        )
+    )
+    assert db.callers == [
+        ("CoreDataOrchestationRepository", "_query"),
+        ("CoreDataOrchestationRepository", "add"),
+    ]
+    assert query_caller() == ("unknown", "unknown")
+
+
+def test_histogram_render():
+    hist = Histogram("test_seconds", "Test", labels=("method",), buckets=(0.1, 1))
+    hist.observe(0.05, method="fetch")
+    hist.observe(0.5, method="fetch")
+    hist.observe(5, method="fetch")
+    rendered = hist.render()
+    assert 'test_seconds_bucket{method="fetch",le="0.1"} 1' in rendered
+    assert 'test_seconds_bucket{method="fetch",le="1"} 2' in rendered
+    assert 'test_seconds_bucket{method="fetch",le="+Inf"} 3' in rendered
+    assert 'test_seconds_count{method="fetch"} 3' in rendered
+    assert hist.count(method="fetch") == 3
+
+
+def test_query_stats_per_request():
+    async def _resolver():
+        observe_query("sql", "OrdenRepository", "fetch", 0.01)
+
+    async def _request():
+        stats = start_query_stats("getOrdenes")
+        # resolvers running in other tasks share the request stats
+        await asyncio.gather(*[asyncio.create_task(_resolver()) for _ in range(3)])
+        return stats
+
+    stats = asyncio.run(_request())
+    assert stats.queries == 3 and stats.operation == "getOrdenes"
+    assert current_query_stats() is None
+
+
+def test_bind_sql_redacts_values():
+    sql = bind_sql(
+        """SELECT * FROM orden
+        WHERE id = :id AND status = :status AND created_at::date > '2024-01-01'
+        AND supplier_unit_id = ANY(:unit_ids) AND paid = :paid""",
+        {"id": UUID(int=1), "status": "it's", "unit_ids": [1, 2], "paid": None},
+    )
+    assert sql == (
+        "SELECT * FROM orden WHERE id = <UUID> AND status = <str>"
+        " AND created_at::date > '2024-01-01'"
+        " AND supplier_unit_id = ANY(<list[2]>) AND paid = NULL"
+    )
+    assert "it's" not in sql
+
+
+def test_operation_label_is_bounded():
+    register_operations(["getOrdenes"])
+    assert operation_label("getOrdenes") == "getOrdenes"
+    assert operation_label("GetOrdenes") == "getOrdenes"
+    assert operation_label(None) == "anonymous"
+    assert operation_label("randomClientName123") == "other"
+
+
+def test_metrics_endpoint_requires_token_outside_dev(monkeypatch):
+    def _get(env: str, token: str, auth: str = "") -> int:
+        monkeypatch.setattr(metrics_endpoint, "ENV", env)
+        monkeypatch.setattr(metrics_endpoint, "METRICS_TOKEN", token)
+        scope = {"type": "http", "headers": [(b"authorization", auth.encode())]}
+        endpoint = metrics_endpoint.MetricsEndpoint(scope, None, None)  # type: ignore
+        return asyncio.run(endpoint.get(Request(scope))).status_code
+
+    assert _get("DEV", "") == 200
+    assert _get("PROD", "") == 403
+    assert _get("STG", "") == 403
+    assert _get("PROD", "secret") == 401
+    assert _get("PROD", "secret", "Bearer secret") == 200
@@ -0,0 +1,60 @@
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+
+from gqlapi.errors import GQLApiException
+from gqlapi.handlers.core.orden import ORDEN_PAGE_MAX_SIZE, OrdenHandler
+from gqlapi.utils.helpers import encode_cursor
+
+
+class OrdenRepository:
+    def __init__(self):
+        self.calls = []
+
+    async def get_orders(self, filter_values, values):
+        self.calls.append((filter_values, values))
+        return []
+
+
+def _handler(repo):
+    return OrdenHandler(
+        orden_repo=repo,  # type: ignore
+        orden_det_repo=None,  # type: ignore
+        orden_status_repo=None,  # type: ignore
+        orden_payment_repo=None,  # type: ignore
+    )
+
+
+def test_search_orden_invalid_cursor():
+    repo = OrdenRepository()
+    for cursor in [
+        encode_cursor("not-a-date", uuid4()),
+        encode_cursor(date(2024, 5, 1), "not-a-uuid"),
+        "not-a-cursor",
+    ]:
+        with pytest.raises(GQLApiException, match="Invalid pagination cursor"):
+            asyncio.run(
+                _handler(repo).search_orden(first=10, after=cursor, hydrate=set())
+            )
+    assert repo.calls == []
+
+
+def test_search_orden_page_size():
+    repo = OrdenRepository()
+    cursor = encode_cursor(date(2024, 5, 1), uuid4())
+    asyncio.run(_handler(repo).search_orden(first=10, after=cursor, hydrate=set()))
+    ((_, values),) = repo.calls
+    assert values["first"] == 10 and values["after_date"] == date(2024, 5, 1)
+    for first in [0, ORDEN_PAGE_MAX_SIZE + 1]:
+        with pytest.raises(GQLApiException, match="Page size"):
+            asyncio.run(_handler(repo).search_orden(first=first))
+        with pytest.raises(GQLApiException, match="Page size"):
+            asyncio.run(_handler(repo).search_orden_connection(first=first))
+    # connections fetch one extra orden, up to the max page size
+    conn = asyncio.run(
+        _handler(repo).search_orden_connection(first=ORDEN_PAGE_MAX_SIZE, hydrate=set())
+    )
+    assert repo.calls[-1][1]["first"] == ORDEN_PAGE_MAX_SIZE + 1
+    assert conn.edges == [] and not conn.page_info.has_next_page
@@ -0,0 +1,101 @@
+from uuid import uuid4
+
+from gqlapi.utils.product_index import (
+    ProductIndexRegistry,
+    ProductSearchIndex,
+    within_distance,
+)
+
+
+def test_within_distance():
+    assert within_distance("jitomate", "jitomate", 0)
+    assert within_distance("jitomte", "jitomate", 1)
+    assert within_distance("jiotmate", "jitomate", 1)  # transposition
+    assert not within_distance("jitomate", "tomate", 1)
+    assert within_distance("jitomate", "tomate", 2)
+
+
+def test_product_search_index():
+    index = ProductSearchIndex()
+    aguacate, aguas, limon, sku = uuid4(), uuid4(), uuid4(), uuid4()
+    index.upsert(aguacate, "Aguacate Hass KG verduras", "Aguacate Hass")
+    index.upsert(aguas, "Agua mineral 600ml bebidas", "Agua mineral")
+    index.upsert(limon, "Limón sin semilla KG verduras", "Limón sin semilla")
+    index.upsert(sku, "Queso Oaxaca QSO-001", "Queso Oaxaca")
+    # exact before prefix matches
+    assert index.search("agua") == [aguas, aguacate]
+    # accents and case
+    assert index.search("LIMON") == [limon]
+    assert index.search("limón sin") == [limon]
+    # every word must match
+    assert index.search("agua verduras") == [aguacate]
+    assert index.search("agua queso") == []
+    # typos
+    assert index.search("aguacat hsas") == [aguacate]
+    assert index.search("qso 001") == [sku]
+    # updates and removals
+    index.upsert(limon, "Limón persa KG", "Limón persa")
+    assert index.search("semilla") == [] and index.search("persa") == [limon]
+    index.remove(limon)
+    assert index.search("limon") == [] and len(index) == 3
+
+
+def test_product_index_registry_versions():
+    registry = ProductIndexRegistry()
+    sb_id, su_id, prod_id = uuid4(), uuid4(), uuid4()
+    registry.load_snapshot(
+        [
+            {
+                "id": prod_id,
+                "supplier_business_id": sb_id,
+                "description": "Papa blanca",
+                "sku": "PAP-01",
+                "tags": None,
+            }
+        ],
+        {su_id: 3},
+    )
+    assert registry.is_fresh(su_id, 3) and not registry.is_fresh(su_id, 4)
+    assert registry.get(sb_id).search("papa") == [prod_id]  # type: ignore
+    registry.upsert(
+        sb_id,
+        [
+            {
+                "id": prod_id,
+                "supplier_business_id": sb_id,
+                "description": "Papa amarilla",
+                "sku": "PAP-01",
+                "tags": "verduras",
+            }
+        ],
+    )
+    assert registry.get(sb_id).search("amarilla verdura") == [prod_id]  # type: ignore
+
+
+def test_product_index_registry_advance_versions():
+    registry = ProductIndexRegistry()
+    fresh_id, stale_id, new_id = uuid4(), uuid4(), uuid4()
+    registry.set_versions({fresh_id: 3, stale_id: 1})
+    # a single bump since the index was fresh keeps it fresh
+    registry.advance_versions({fresh_id: 4, stale_id: 3, new_id: 1})
+    assert registry.is_fresh(fresh_id, 4)
+    assert not registry.is_fresh(stale_id, 3) and not registry.is_fresh(new_id, 1)
+
+
+def test_product_search_limit():
+    index = ProductSearchIndex()
+    ids = [uuid4() for _ in range(5)]
+    for i, pid in enumerate(ids):
+        index.upsert(pid, f"Agua {i}", f"Agua {i}")
+    assert index.search("a", limit=2) == ids[:2]
+    assert len(index.search("a")) == 5
+
+
+def test_product_index_registry_max_age():
+    registry = ProductIndexRegistry(max_age=60)
+    sb_id = uuid4()
+    registry.load(sb_id, [])
+    assert registry.get(sb_id) is not None
+    # older indexes are dropped, to be reloaded
+    registry._loaded_at[sb_id] -= 61
+    assert registry.get(sb_id) is None and len(registry) == 0
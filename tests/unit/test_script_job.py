@@ -0,0 +1,192 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+
+from gqlapi.endpoints.retool.data_orchestration import validate_data
+from gqlapi.repository.scripts.script_job import (
+    SCRIPT_JOB_CLAIM_LOCK,
+    ScriptJobRepository,
+)
+from gqlapi.scripts.automation import script_job_worker
+from gqlapi.scripts.automation.script_job_worker import ScriptJobWorker
+
+
+class ClaimDatabase:
+    """Records the queries of a claim and returns a queued job"""
+
+    def __init__(self, job):
+        self.job = job
+        self.queries = []
+        self.in_transaction = False
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        yield
+        self.in_transaction = False
+
+    async def execute(self, query, values=None):
+        self.queries.append((query, values, self.in_transaction))
+
+    async def fetch_one(self, query, values=None):
+        self.queries.append((query, values, self.in_transaction))
+        return self.job
+
+
+class FakeJobRepo:
+    def __init__(self, jobs=None, expired=None):
+        self.jobs = list(jobs or [])
+        self.expired = list(expired or [])
+        self.calls = []
+
+    async def claim(self, worker_id, visibility_timeout, limits, default_limit=1):
+        return self.jobs.pop(0) if self.jobs else None
+
+    async def heartbeat(self, id, worker_id, visibility_timeout):
+        return True
+
+    async def complete(self, id, worker_id):
+        self.calls.append(("complete", id, None))
+        return True
+
+    async def fail(self, id, worker_id, error, retry_in=None):
+        self.calls.append(("fail", id, retry_in))
+        return True
+
+    async def fail_expired(self):
+        expired, self.expired = self.expired, []
+        return expired
+
+
+class FakeExecRepo:
+    def __init__(self):
+        self.edits = []
+
+    async def edit(self, id, status=None, script_end=None, data=None):
+        self.edits.append((id, status, json.loads(data) if data else None))
+        return True
+
+
+def _job(attempts: int, max_attempts: int = 3, script_name: str = "test_script"):
+    return {
+        "id": uuid4(),
+        "script_execution_id": uuid4(),
+        "script_name": script_name,
+        "args": {"value": 2},
+        "attempts": attempts,
+        "max_attempts": max_attempts,
+    }
+
+
+def _worker(monkeypatch, script, jobs=None, expired=None):
+    monkeypatch.setitem(script_job_worker.scripts_map, "test_script", script)
+    monkeypatch.setattr(script_job_worker, "SCRIPT_JOB_POLL_INTERVAL", 0)
+    monkeypatch.setattr(script_job_worker, "SCRIPT_JOB_RETRY_BACKOFF", 10.0)
+    return ScriptJobWorker(FakeJobRepo(jobs, expired), FakeExecRepo(), concurrency=2)
+
+
+async def _ok_script(info, value):
+    return value * 2
+
+
+async def _failing_script(info, value):
+    raise Exception("Script failed")
+
+
+def test_claim_takes_advisory_lock_in_transaction():
+    job = _job(1)
+    db = ClaimDatabase({**job, "args": json.dumps(job["args"])})
+    claimed = asyncio.run(
+        ScriptJobRepository(db).claim("worker-1", 30.0, {"test_script": 2}, 1)  # type: ignore
+    )
+    # lock is taken first, and both statements run in the same transaction
+    (lock_qry, lock_vals, lock_tx), (claim_qry, claim_vals, claim_tx) = db.queries
+    assert "pg_advisory_xact_lock" in lock_qry
+    assert lock_vals == {"lock_id": SCRIPT_JOB_CLAIM_LOCK}
+    assert lock_tx and claim_tx
+    assert "FOR UPDATE OF sj SKIP LOCKED" in claim_qry
+    assert json.loads(claim_vals["limits"]) == {"test_script": 2}
+    assert claim_vals["worker_id"] == "worker-1"
+    # args are decoded
+    assert claimed == job
+
+
+def test_claim_without_available_jobs():
+    db = ClaimDatabase(None)
+    assert asyncio.run(ScriptJobRepository(db).claim("worker-1", 30.0, {})) is None  # type: ignore
+
+
+def test_worker_completes_job(monkeypatch):
+    job = _job(1)
+    worker = _worker(monkeypatch, _ok_script)
+    asyncio.run(worker.execute(job))
+    assert worker.job_repo.calls == [("complete", job["id"], None)]  # type: ignore
+    exec_id = job["script_execution_id"]
+    assert worker.exec_repo.edits == [  # type: ignore
+        (exec_id, "running", None),
+        (exec_id, "finished", {"status": "ok", "data": 4}),
+    ]
+
+
+def test_worker_retries_with_backoff(monkeypatch):
+    first, second = _job(1), _job(2)
+    worker = _worker(monkeypatch, _failing_script)
+    asyncio.run(worker.execute(first))
+    asyncio.run(worker.execute(second))
+    # requeued with exponential backoff, execution record back to queued
+    assert worker.job_repo.calls == [  # type: ignore
+        ("fail", first["id"], 10.0),
+        ("fail", second["id"], 20.0),
+    ]
+    assert worker.exec_repo.edits[:2] == [  # type: ignore
+        (first["script_execution_id"], "running", None),
+        (
+            first["script_execution_id"],
+            "queued",
+            {"status": "error", "error": "Script failed", "attempts": 1},
+        ),
+    ]
+    assert [e[1] for e in worker.exec_repo.edits[2:]] == ["running", "queued"]  # type: ignore
+
+
+def test_worker_dead_letters_job_without_attempts_left(monkeypatch):
+    job = _job(3)
+    worker = _worker(monkeypatch, _failing_script)
+    asyncio.run(worker.execute(job))
+    assert worker.job_repo.calls == [("fail", job["id"], None)]  # type: ignore
+    assert worker.exec_repo.edits[-1] == (  # type: ignore
+        job["script_execution_id"],
+        "error",
+        {"status": "error", "error": "Script failed"},
+    )
+
+
+def test_worker_run_burst(monkeypatch):
+    jobs = [_job(1), _job(1)]
+    expired = {"id": uuid4(), "script_execution_id": uuid4(), "script_name": "x"}
+    worker = _worker(monkeypatch, _ok_script, jobs=jobs, expired=[expired])
+    asyncio.run(worker.run(burst=True))
+    assert worker.job_repo.calls == [("complete", j["id"], None) for j in jobs]  # type: ignore
+    # expired jobs without attempts left set their execution as error
+    assert (
+        expired["script_execution_id"],
+        "error",
+        {"status": "error", "error": "Visibility timeout expired"},
+    ) in worker.exec_repo.edits  # type: ignore
+
+
+def test_validate_data():
+    validate_data({"script_name": "script_monitor", "max_attempts": 2})
+    for req, msg in [
+        ({}, "script_name"),
+        ({"script_name": "unknown"}, "not found"),
+        ({"script_name": "script_monitor", "args": [1]}, "args"),
+        ({"script_name": "script_monitor", "max_attempts": "3"}, "max_attempts"),
+        ({"script_name": "script_monitor", "max_attempts": 0}, "max_attempts"),
+        ({"script_name": "script_monitor", "max_attempts": True}, "max_attempts"),
+    ]:
+        with pytest.raises(Exception, match=msg):
+            validate_data(req)
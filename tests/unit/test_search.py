@@ -0,0 +1,31 @@
+from gqlapi.utils.search import escape_like, product_search_filter, search_terms
+
+
+def test_escape_like():
+    assert escape_like("100%_a\\b") == "100\\%\\_a\\\\b"
+    assert escape_like("leche") == "leche"
+
+
+def test_search_terms_escape_wildcards():
+    assert search_terms("  Leche 100%  leche a_b ") == ["leche", "100\\%", "a\\_b"]
+    assert search_terms("   ") == []
+
+
+def test_product_search_filter():
+    cond, rank, values = product_search_filter(
+        "product_search_text(sp.description, sp.sku)", "Jitomate Saladet", "receiver"
+    )
+    assert cond == (
+        "(product_search_text(sp.description, sp.sku) LIKE '%' || f_unaccent(:receiver_0) || '%'"
+        " AND product_search_text(sp.description, sp.sku) LIKE '%' || f_unaccent(:receiver_1) || '%')"
+    )
+    assert (
+        rank
+        == "word_similarity(f_unaccent(:receiver), product_search_text(sp.description, sp.sku))"
+    )
+    assert values == {
+        "receiver": "jitomate saladet",
+        "receiver_0": "jitomate",
+        "receiver_1": "saladet",
+    }
+    assert product_search_filter("product_search_text(name, sku)", "") == ("", "", {})
@@ -0,0 +1,98 @@
+import asyncio
+import json
+from typing import List
+
+import strawberry
+
+from gqlapi.app.extensions import (
+    JsonLinesTraceExporter,
+    OperationTrace,
+    TraceExporter,
+    TracingExtension,
+)
+from gqlapi.utils.metrics import observe_query, register_operations
+
+
+class ListExporter(TraceExporter):
+    def __init__(self):
+        self.traces: List[OperationTrace] = []
+
+    def export(self, trace: OperationTrace) -> None:
+        self.traces.append(trace)
+
+
+@strawberry.type
+class Orden:
+    id: int
+
+    @strawberry.field
+    async def status(self) -> str:
+        observe_query("sql", "OrdenRepository", "fetch_status", 0.002)
+        return "submitted"
+
+
+@strawberry.type
+class Query:
+    @strawberry.field
+    async def ordenes(self) -> List[Orden]:
+        observe_query("sql", "OrdenRepository", "find", 0.01)
+        return [Orden(id=i) for i in range(3)]
+
+
+def _execute(_sample_rate: float) -> List[OperationTrace]:
+    exporter = ListExporter()
+
+    class _Tracing(TracingExtension):
+        exporters = [exporter]
+        sample_rate = _sample_rate
+
+    schema = strawberry.Schema(query=Query, extensions=[_Tracing])
+    result = asyncio.run(schema.execute("query getOrdenes { ordenes { id status } }"))
+    assert result.errors is None
+    return exporter.traces
+
+
+def test_tracing_extension_sampled():
+    register_operations(["getOrdenes"])
+    (trace,) = _execute(_sample_rate=1)
+    assert trace.operation == "getOrdenes" and trace.operation_type == "query"
+    assert set(trace.phases) == {"parse", "validate", "execute"}
+    assert trace.db_queries == 4
+    fields = [name for name, _ in trace.resolvers]
+    assert fields.count("Query.ordenes") == 1
+    assert fields.count("Orden.status") == 3
+    # plain attribute fields are not timed
+    assert "Orden.id" not in fields
+    assert trace.to_json()["resolvers"]["Orden.status"]["count"] == 3
+
+
+def test_tracing_extension_not_sampled(tmp_path):
+    register_operations(["getOrdenes"])
+    (trace,) = _execute(_sample_rate=0)
+    assert trace.db_queries == 4 and trace.resolvers == []
+    exporter = JsonLinesTraceExporter(str(tmp_path / "traces.jsonl"))
+    exporter.export(trace)
+    exporter.export(trace)
+    # written by the writer thread
+    exporter.close()
+    with open(tmp_path / "traces.jsonl") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == 2 and lines[0]["operation"] == "getOrdenes"
+    # exporter restarts after close
+    exporter.export(trace)
+    exporter.close()
+    with open(tmp_path / "traces.jsonl") as f:
+        assert len(f.readlines()) == 3
+
+
+def test_tracing_operation_label_is_bounded():
+    exporter = ListExporter()
+
+    class _Tracing(TracingExtension):
+        exporters = [exporter]
+        sample_rate = 0
+
+    schema = strawberry.Schema(query=Query, extensions=[_Tracing])
+    asyncio.run(schema.execute("query clientOp8f2a { ordenes { id } }"))
+    asyncio.run(schema.execute("{ ordenes { id } }"))
+    assert [t.operation for t in exporter.traces] == ["other", "anonymous"]